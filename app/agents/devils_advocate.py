@@ -1,23 +1,32 @@
 from app.utils import get_mistral_model
 from agno.agent import Agent
-from agno.tools.firecrawl import FirecrawlTools
-from agno.tools.website import WebsiteTools
 
 from app.config import AgentConfig
-from app.prompts.agents import DEVILS_ADVOCATE_INSTRUCTIONS
+from app.ratelimit import rate_limit_tool_hook
+from app.tools.registry import get_toolkit
+from app.events import event_tool_hook
+from app.tools.memo import memoize_tool_hook
+from app.budget import budget_tool_hook
+from app.recording import recording_tool_hook
+from app.telemetry import telemetry_tool_hook
+from app.prompts.assembly import instructions
 
 devils_advocate = Agent(
     name="DevilsAdvocate",
     model=get_mistral_model(AgentConfig.DEVILS_ADVOCATE_MODEL),
     tools=[
-        FirecrawlTools(enable_search=True, enable_scrape=True),
-        WebsiteTools(),
+        get_toolkit("firecrawl"),
+        get_toolkit("website"),
+    ],
+    tool_hooks=[
+        telemetry_tool_hook, event_tool_hook, memoize_tool_hook, budget_tool_hook, recording_tool_hook,
+        rate_limit_tool_hook,
     ],
     # 
     
     
     stream_intermediate_steps=False,
-    instructions=DEVILS_ADVOCATE_INSTRUCTIONS,
+    instructions=instructions("devils_advocate"),
     markdown=True,
     references_format="yaml",
 )
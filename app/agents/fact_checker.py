@@ -2,7 +2,7 @@ from app.utils import get_mistral_model
 from agno.agent import Agent
 
 from app.config import AgentConfig
-from app.prompts.agents import FACT_CHECKER_INSTRUCTIONS
+from app.prompts.assembly import instructions
 from app.utils import shared_db
 
 fact_checker = Agent(
@@ -11,6 +11,6 @@ fact_checker = Agent(
     tools=[],
     db=shared_db,
     stream_intermediate_steps=False,
-    instructions=FACT_CHECKER_INSTRUCTIONS,
+    instructions=instructions("fact_checker"),
     markdown=True,
 )
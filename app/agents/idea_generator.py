@@ -3,7 +3,7 @@ from agno.agent import Agent
 
 from app.config import AgentConfig
 from app.models import IdeaGeneratorOutput
-from app.prompts.agents import IDEA_GENERATOR_INSTRUCTIONS
+from app.prompts.assembly import instructions
 from app.utils import shared_db
 
 idea_generator = Agent(
@@ -12,6 +12,6 @@ idea_generator = Agent(
     tools=[],
     db=shared_db,
     # output_schema=IdeaGeneratorOutput,
-    instructions=IDEA_GENERATOR_INSTRUCTIONS,
+    instructions=instructions("idea_generator"),
     markdown=True,
 )
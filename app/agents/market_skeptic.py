@@ -1,26 +1,34 @@
 from app.utils import get_mistral_model
 from agno.agent import Agent
-from agno.tools.hackernews import HackerNewsTools
-from agno.tools.website import WebsiteTools
-from agno.tools.baidusearch import BaiduSearchTools
-from agno.tools.firecrawl import FirecrawlTools
 
 from app.config import AgentConfig
-from app.prompts.agents import MARKET_SKEPTIC_INSTRUCTIONS
+from app.ratelimit import rate_limit_tool_hook
+from app.tools.registry import get_toolkit
+from app.events import event_tool_hook
+from app.tools.memo import memoize_tool_hook
+from app.tools.market_cache import market_cache_tool_hook
+from app.budget import budget_tool_hook
+from app.recording import recording_tool_hook
+from app.telemetry import telemetry_tool_hook
+from app.prompts.assembly import instructions
 
 market_skeptic = Agent(
     name="MarketSkeptic",
     model=get_mistral_model(AgentConfig.MARKET_SKEPTIC_MODEL),
     tools=[
-        HackerNewsTools(),
-        WebsiteTools(),
-        BaiduSearchTools(),
-        FirecrawlTools(enable_search=True, enable_scrape=True),
+        get_toolkit("hackernews"),
+        get_toolkit("website"),
+        get_toolkit("baidu"),
+        get_toolkit("firecrawl"),
+    ],
+    tool_hooks=[
+        telemetry_tool_hook, event_tool_hook, memoize_tool_hook, market_cache_tool_hook, budget_tool_hook,
+        recording_tool_hook, rate_limit_tool_hook,
     ],
     # 
     
     
     stream_intermediate_steps=False,
-    instructions=MARKET_SKEPTIC_INSTRUCTIONS,
+    instructions=instructions("market_skeptic"),
     markdown=True,
 )
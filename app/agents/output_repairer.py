@@ -0,0 +1,14 @@
+from app.utils import get_mistral_model
+from agno.agent import Agent
+
+from app.config import AgentConfig
+from app.prompts.assembly import instructions
+
+# Stateless and tool-free: only used by the structured pipeline to fix invalid stage outputs
+output_repairer = Agent(
+    name="OutputRepairer",
+    model=get_mistral_model(AgentConfig.STRUCTURED_REPAIR_MODEL),
+    tools=[],
+    instructions=instructions("output_repairer"),
+    markdown=False,
+)
@@ -1,32 +1,40 @@
 from app.utils import get_mistral_model
 from agno.agent import Agent
 from agno.tools.reasoning import ReasoningTools
-from agno.tools.arxiv import ArxivTools
-from agno.tools.website import WebsiteTools
-from agno.tools.firecrawl import FirecrawlTools
-from agno.tools.baidusearch import BaiduSearchTools
 
 from app.config import AgentConfig
+from app.ratelimit import rate_limit_tool_hook
+from app.tools.registry import get_toolkit
+from app.events import event_tool_hook
+from app.tools.memo import memoize_tool_hook
+from app.budget import budget_tool_hook
+from app.recording import recording_tool_hook
+from app.telemetry import telemetry_tool_hook
 from app.models import PaperAnalysisOutput
-from app.prompts.agents import PAPER_ANALYZER_INSTRUCTIONS
+from app.prompts.assembly import instructions
 from app.utils import shared_db
 
 paper_analyzer = Agent(
     name="PaperAnalyzer",
     model=get_mistral_model(AgentConfig.LARGE_MODEL),
     tools=[
-        ArxivTools(),
-        FirecrawlTools(enable_search=True, enable_scrape=True),
-        WebsiteTools(),
-        BaiduSearchTools(),
+        get_toolkit("local_papers"),
+        get_toolkit("arxiv"),
+        get_toolkit("firecrawl"),
+        get_toolkit("website"),
+        get_toolkit("baidu"),
         # ReasoningTools(add_instructions=True),
     ],
+    tool_hooks=[
+        telemetry_tool_hook, event_tool_hook, memoize_tool_hook, budget_tool_hook, recording_tool_hook,
+        rate_limit_tool_hook,
+    ],
     db=shared_db,
     reasoning=False,
     # reasoning_max_steps=AgentConfig.REASONING_MAX_STEPS,
     # output_schema=PaperAnalysisOutput,
     stream_intermediate_steps=False,
-    instructions=PAPER_ANALYZER_INSTRUCTIONS,
+    instructions=instructions("paper_analyzer"),
     markdown=True,
-    tool_call_limit=4,
+    tool_call_limit=6,
 )
@@ -1,7 +1,7 @@
 from app.utils import get_mistral_model
 from agno.agent import Agent
 from app.config import AgentConfig
-from app.prompts.agents import REPORT_GENERATOR_INSTRUCTIONS
+from app.prompts.assembly import instructions
 from app.utils import shared_db
 
 report_generator = Agent(
@@ -11,6 +11,6 @@ report_generator = Agent(
     
     
     stream_intermediate_steps=False,
-    instructions=REPORT_GENERATOR_INSTRUCTIONS,
+    instructions=instructions("report_generator"),
     markdown=True,
 )
@@ -3,7 +3,7 @@ from agno.agent import Agent
 from agno.tools.reasoning import ReasoningTools
 
 from app.config import AgentConfig
-from app.prompts.agents import STRATEGIC_ADVISOR_INSTRUCTIONS
+from app.prompts.assembly import instructions
 from app.utils import shared_db
 
 strategic_advisor = Agent(
@@ -15,6 +15,6 @@ strategic_advisor = Agent(
     
     
     stream_intermediate_steps=False,
-    instructions=STRATEGIC_ADVISOR_INSTRUCTIONS,
+    instructions=instructions("strategic_advisor"),
     markdown=True,
 )
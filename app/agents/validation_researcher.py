@@ -1,27 +1,35 @@
 from app.utils import get_mistral_model
 from agno.agent import Agent
-from agno.tools.firecrawl import FirecrawlTools
-from agno.tools.hackernews import HackerNewsTools
-from agno.tools.website import WebsiteTools
-from agno.tools.baidusearch import BaiduSearchTools
 
 from app.config import AgentConfig
-from app.prompts.agents import VALIDATION_RESEARCHER_INSTRUCTIONS
+from app.ratelimit import rate_limit_tool_hook
+from app.tools.registry import get_toolkit
+from app.events import event_tool_hook
+from app.tools.memo import memoize_tool_hook
+from app.tools.market_cache import market_cache_tool_hook
+from app.budget import budget_tool_hook
+from app.recording import recording_tool_hook
+from app.telemetry import telemetry_tool_hook
+from app.prompts.assembly import instructions
 from app.utils import shared_db
 
 validation_researcher = Agent(
     name="ValidationResearcher",
     model=get_mistral_model(AgentConfig.VALIDATION_RESEARCHER_MODEL),
     tools=[
-        FirecrawlTools(enable_search=True, enable_scrape=True),
-        WebsiteTools(),
-        BaiduSearchTools(),
-        HackerNewsTools(),
+        get_toolkit("firecrawl"),
+        get_toolkit("website"),
+        get_toolkit("baidu"),
+        get_toolkit("hackernews"),
+    ],
+    tool_hooks=[
+        telemetry_tool_hook, event_tool_hook, memoize_tool_hook, market_cache_tool_hook, budget_tool_hook,
+        recording_tool_hook, rate_limit_tool_hook,
     ],
     db=shared_db,
     
     
     stream_intermediate_steps=False,
-    instructions=VALIDATION_RESEARCHER_INSTRUCTIONS,
+    instructions=instructions("validation_researcher"),
     markdown=True,
 )
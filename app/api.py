@@ -0,0 +1,174 @@
+"""
+HTTP routes for long-running Paper2SaaS runs.
+
+POST /paper2saas/stream starts a run and streams its progress:
+    run_started -> stage_start / tool_call / member_output / stage_error / stage_skipped /
+                   stage_stopped / stage_escalated / stage_resumed / budget -> final_report
+GET /paper2saas/runs/{run_id}/events resumes a stream after a disconnect, honouring the
+standard Last-Event-ID header (or a last_event_id query parameter).
+POST /paper2saas/runs/{session_id}/resume reruns a failed run from its last completed stage
+(see app.checkpoint) and streams it like /stream, with stage_resumed for the restored stages.
+
+POST /paper2saas/jobs queues a run on the background job queue and returns at once;
+GET /paper2saas/jobs/{job_id} polls it, and its events stream under the job ID.
+
+GET /paper2saas/metrics serves latency, token, cache and retry metrics in the Prometheus
+text format (AgentOS already owns GET /metrics for its usage metrics).
+GET /paper2saas/health/db checks the session database and reports its connection pool.
+"""
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from app.checkpoint import resumable_run
+from app.db import acheck_health
+from app.events import RunEventStream, run_event_streams
+from app.jobs import job_queue, run_with_event_stream
+from app.models import Paper2SaaSInput
+from app.session_store import flush_sessions
+from app.telemetry import PROMETHEUS_CONTENT_TYPE, render_metrics
+from app.tools.http import close_http_clients
+from app.utils import canonical_arxiv_id, invalid_arxiv_id_message, logger, validate_arxiv_id
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # stop nginx-style proxies from buffering the stream
+}
+RECONNECT_MILLISECONDS = 3000
+
+router = APIRouter(prefix="/paper2saas", tags=["Paper2SaaS"])
+
+# Strong references to running pipelines; runs continue when their client disconnects
+_runs: set = set()
+
+
+async def _sse(stream: RunEventStream, last_event_id: int) -> AsyncIterator[str]:
+    # Events are read from the run's log only as fast as the client consumes them, so a
+    # slow client applies backpressure to its own response without holding up the run.
+    yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+    async for run_event in stream.subscribe(last_event_id):
+        yield ": keep-alive\n\n" if run_event is None else run_event.to_sse()
+
+
+def _validate(arxiv_id: str) -> str:
+    """The request's arXiv ID in canonical form (URLs and arXiv: prefixes are accepted)."""
+    arxiv_id = canonical_arxiv_id(arxiv_id)
+    if not validate_arxiv_id(arxiv_id):
+        raise HTTPException(status_code=400, detail=invalid_arxiv_id_message(arxiv_id))
+    return arxiv_id
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Run the job queue with the server; on shutdown, drain in-flight jobs, then write queued sessions."""
+    await job_queue.start()
+    try:
+        yield
+    finally:
+        await job_queue.shutdown()
+        flush_sessions()
+        close_http_clients()
+
+
+@router.post("/stream")
+async def stream_paper2saas(request: Paper2SaaSInput):
+    """Start a Paper2SaaS run and stream its progress as Server-Sent Events."""
+    arxiv_id = _validate(request.arxiv_id)
+    run_id = str(uuid.uuid4())
+    stream = run_event_streams.create(run_id)
+    stream.emit("run_started", {"run_id": run_id, "arxiv_id": arxiv_id})
+    task = asyncio.create_task(run_with_event_stream(stream, arxiv_id))
+    _runs.add(task)
+    task.add_done_callback(_runs.discard)
+    logger.info(f"Started streaming run {run_id} for arXiv ID: {arxiv_id}")
+    return StreamingResponse(
+        _sse(stream, 0), media_type="text/event-stream", headers={**SSE_HEADERS, "X-Run-ID": run_id}
+    )
+
+
+@router.get("/runs/{run_id}/events")
+async def resume_paper2saas_stream(
+    run_id: str,
+    last_event_id_header: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+    last_event_id: Optional[int] = Query(default=None),
+):
+    """Resume a run's event stream after the last event the client received."""
+    stream = run_event_streams.get(run_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired run: {run_id}")
+    if last_event_id is None:
+        last_event_id = int(last_event_id_header) if (last_event_id_header or "").isdigit() else 0
+    return StreamingResponse(
+        _sse(stream, last_event_id), media_type="text/event-stream", headers={**SSE_HEADERS, "X-Run-ID": run_id}
+    )
+
+
+@router.post("/runs/{session_id}/resume")
+async def resume_paper2saas_run(session_id: str):
+    """
+    Resume a failed or interrupted run from its last completed stage and stream its progress
+    as Server-Sent Events. `session_id` is the failed run's session (its run or job ID).
+    """
+    checkpoint = await asyncio.to_thread(resumable_run, session_id)
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail=f"No checkpoint for session: {session_id}")
+    run_id = str(uuid.uuid4())
+    stream = run_event_streams.create(run_id)
+    stream.emit("run_started", {
+        "run_id": run_id, "arxiv_id": checkpoint["arxiv_id"], "resumed_session_id": session_id,
+        "completed_stages": checkpoint["stages"],
+    })
+    task = asyncio.create_task(run_with_event_stream(
+        stream, checkpoint["arxiv_id"], session_id=session_id, structured=checkpoint["structured"], resume=True
+    ))
+    _runs.add(task)
+    task.add_done_callback(_runs.discard)
+    logger.info(f"Resuming session {session_id} as streaming run {run_id}")
+    return StreamingResponse(
+        _sse(stream, 0), media_type="text/event-stream", headers={**SSE_HEADERS, "X-Run-ID": run_id}
+    )
+
+
+def _job_response(job: dict) -> dict:
+    return {**job, "events_url": f"{router.prefix}/runs/{job['id']}/events"}
+
+
+@router.post("/jobs", status_code=202)
+async def submit_paper2saas_job(request: Paper2SaaSInput, force: bool = False):
+    """
+    Queue a Paper2SaaS run. Resubmitting a paper that is queued, running or already
+    analyzed returns the existing job (200) unless `force=true`.
+    """
+    arxiv_id = _validate(request.arxiv_id)
+    try:
+        job, created = await job_queue.submit(arxiv_id, force=force)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return JSONResponse(_job_response(job), status_code=202 if created else 200)
+
+
+@router.get("/jobs/{job_id}")
+async def get_paper2saas_job(job_id: str):
+    """Status of a queued job, with the final report and metrics once it has finished."""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return _job_response(job)
+
+
+@router.get("/health/db")
+async def database_health():
+    """Round trip to the session database, with the connection pool's state (503 when unreachable)."""
+    health = await acheck_health()
+    return JSONResponse(health, status_code=200 if health["status"] == "ok" else 503)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,188 @@
+"""
+Batch mode: analyze many arXiv papers with bounded concurrency.
+
+Results are yielded as each paper finishes (async generator) and, optionally,
+appended to a JSONL summary with per-paper timings and token counts.
+
+With --roast, each analyzed paper's ideas are then critiqued concurrently by
+idea_roaster_team and a verdict line is printed per idea as it finishes.
+
+Usage:
+    python -m app.batch 2512.24991v1 2512.00001 --max-concurrency 4
+    python -m app.batch --file ids.txt --summary tmp/batch_summary.jsonl
+    python -m app.batch 2512.24991v1 --roast
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import AsyncIterator, Iterable, Optional
+
+from app.config import AgentConfig
+from app.ratelimit import rate_limit_stats
+from app.telemetry import record_retry, setup_telemetry
+from app.teams.paper2saas import arun_paper2saas
+from app.teams.roaster import arun_idea_roaster_batch, ideas_from_result
+from app.utils import canonical_arxiv_id, invalid_arxiv_id_message, logger, validate_arxiv_id
+
+
+def summarize_result(result: dict) -> dict:
+    """Compact, JSON-serializable summary of a run_paper2saas result."""
+    metrics = result.get("metrics") or {}
+    return {
+        "arxiv_id": result.get("arxiv_id"),
+        "status": result.get("status"),
+        "session_id": result.get("session_id"),
+        "attempts": result.get("attempts", 0),
+        "wall_time": result.get("wall_time"),
+        "total_tokens": metrics.get("total_tokens"),
+        "execution_time": metrics.get("execution_time"),
+        "stage_timings": metrics.get("stage_timings"),
+        "resumed_stages": (metrics.get("checkpoint") or {}).get("resumed_stages"),
+        "error": result.get("error"),
+        "error_type": result.get("error_type"),
+    }
+
+
+async def _run_with_retries(arxiv_id: str, max_retries: int, backoff_seconds: float) -> dict:
+    started = time.perf_counter()
+    # One session across attempts: a retry resumes from the stages the failed attempt completed
+    session_id = str(uuid.uuid4())
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            result = await arun_paper2saas(arxiv_id, session_id=session_id, resume=attempt > 1)
+        except Exception as e:
+            logger.error(f"Batch run for {arxiv_id} raised: {e}", exc_info=True)
+            result = {"status": "error", "error": str(e), "error_type": type(e).__name__, "arxiv_id": arxiv_id}
+        if result["status"] == "success" or attempt > max_retries:
+            break
+        # Exponential backoff with jitter so retries from a failing provider spread out
+        delay = backoff_seconds * (2 ** (attempt - 1)) * (0.5 + random.random())
+        record_retry("batch_run")
+        logger.warning(f"Run for {arxiv_id} failed (attempt {attempt}/{max_retries + 1}), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+    result["attempts"] = attempt
+    result["wall_time"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+async def arun_paper2saas_batch(
+    arxiv_ids: Iterable[str],
+    max_concurrency: int = AgentConfig.BATCH_MAX_CONCURRENCY,
+    max_retries: int = AgentConfig.BATCH_MAX_RETRIES,
+    backoff_seconds: float = AgentConfig.BATCH_RETRY_BACKOFF_SECONDS,
+    summary_path: Optional[str] = None,
+) -> AsyncIterator[dict]:
+    """
+    Analyze many papers concurrently, yielding each result dict as soon as it completes.
+
+    Args:
+        arxiv_ids: arXiv IDs to analyze; invalid IDs are rejected up front without running
+        max_concurrency: Maximum number of papers analyzed at the same time
+        max_retries: Retries per paper after a failed run
+        backoff_seconds: Base delay for exponential backoff between retries
+        summary_path: Optional JSONL file that receives one summary line per paper
+
+    Yields:
+        dict in the same shape as arun_paper2saas, plus attempts and wall_time
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results: asyncio.Queue = asyncio.Queue()
+    tasks = set()
+
+    async def worker(arxiv_id: str):
+        try:
+            await results.put(await _run_with_retries(arxiv_id, max_retries, backoff_seconds))
+        finally:
+            semaphore.release()
+
+    async def producer() -> int:
+        scheduled = 0
+        for arxiv_id in arxiv_ids:
+            arxiv_id = canonical_arxiv_id(arxiv_id)
+            if not validate_arxiv_id(arxiv_id):
+                await results.put({
+                    "status": "error",
+                    "error": invalid_arxiv_id_message(arxiv_id),
+                    "error_type": "ValueError",
+                    "arxiv_id": arxiv_id,
+                })
+            else:
+                await semaphore.acquire()
+                task = asyncio.create_task(worker(arxiv_id))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            scheduled += 1
+        return scheduled
+
+    summary_file = open(summary_path, "a", encoding="utf-8") if summary_path else None
+    producer_task = asyncio.create_task(producer())
+    yielded = 0
+    try:
+        while not (producer_task.done() and yielded == producer_task.result()):
+            getter = asyncio.ensure_future(results.get())
+            await asyncio.wait({getter, producer_task}, return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                getter.cancel()
+                producer_task.result()  # Surface producer errors (e.g. a failing ids iterator)
+                continue
+            result = getter.result()
+            yielded += 1
+            if summary_file is not None:
+                summary_file.write(json.dumps(summarize_result(result), default=str) + "\n")
+                summary_file.flush()
+            yield result
+    finally:
+        producer_task.cancel()
+        for task in list(tasks):
+            task.cancel()
+        if summary_file is not None:
+            summary_file.close()
+        logger.info(f"Batch finished: {yielded} papers, rate limiter stats: {rate_limit_stats()}")
+
+
+async def _main(args: argparse.Namespace):
+    arxiv_ids = list(args.arxiv_ids)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            arxiv_ids.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+
+    succeeded = 0
+    async for result in arun_paper2saas_batch(
+        arxiv_ids,
+        max_concurrency=args.max_concurrency,
+        max_retries=args.max_retries,
+        summary_path=args.summary,
+    ):
+        summary = summarize_result(result)
+        succeeded += summary["status"] == "success"
+        print(json.dumps(summary, default=str), flush=True)
+        if args.roast and summary["status"] == "success":
+            async for roast in arun_idea_roaster_batch(ideas_from_result(result), args.roast_concurrency):
+                print(json.dumps({
+                    "arxiv_id": summary["arxiv_id"],
+                    "idea": roast["idea"],
+                    "status": roast["status"],
+                    "verdict": roast["verdict"],
+                    "wall_time": roast["wall_time"],
+                    "error": roast.get("error"),
+                }, default=str), flush=True)
+    print(f"Completed {succeeded}/{len(arxiv_ids)} papers successfully", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze a batch of arXiv papers with Paper2SaaS")
+    parser.add_argument("arxiv_ids", nargs="*", help="arXiv IDs to analyze")
+    parser.add_argument("--file", help="Text file with one arXiv ID per line")
+    parser.add_argument("--max-concurrency", type=int, default=AgentConfig.BATCH_MAX_CONCURRENCY)
+    parser.add_argument("--max-retries", type=int, default=AgentConfig.BATCH_MAX_RETRIES)
+    parser.add_argument("--summary", default="tmp/batch_summary.jsonl", help="JSONL summary output path")
+    parser.add_argument("--roast", action="store_true", help="Critique each paper's ideas with idea_roaster_team")
+    parser.add_argument("--roast-concurrency", type=int, default=AgentConfig.ROASTER_MAX_CONCURRENCY)
+    if AgentConfig.TELEMETRY_ENABLED:
+        setup_telemetry()
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,185 @@
+"""
+Per-run budgets for the Paper2SaaS pipeline.
+
+A RunBudget tracks the tokens (from each stage's RunOutput.metrics), tool calls and wall
+time of one run against configured limits, and the pipeline acts on it:
+
+- a stage that would start after the token or run-time budget is spent is stopped;
+- a stage still running at its deadline (stage or run timeout) is stopped;
+- past BUDGET_DOWNGRADE_AT of the token budget, or once the tool-call budget is spent,
+  tool calls are refused so members answer from what they already have;
+- a stage's `stop_if` check (e.g. low paper-analysis confidence) ends the run early.
+
+Every action is recorded as an event with its reason and returned with the run's metrics.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import AgentConfig
+from app.events import emit
+from app.utils import logger
+
+
+@dataclass
+class BudgetLimits:
+    """Limits of one run; 0 disables a limit"""
+    max_tokens: int = 0
+    max_tool_calls: int = 0
+    stage_timeout_seconds: float = 0.0
+    run_timeout_seconds: float = 0.0
+    # Fraction of max_tokens after which stages run without tools
+    downgrade_at: float = 1.0
+
+    @classmethod
+    def from_config(cls) -> "BudgetLimits":
+        return cls(
+            max_tokens=AgentConfig.BUDGET_MAX_TOKENS,
+            max_tool_calls=AgentConfig.BUDGET_MAX_TOOL_CALLS,
+            stage_timeout_seconds=AgentConfig.BUDGET_STAGE_TIMEOUT_SECONDS,
+            run_timeout_seconds=AgentConfig.BUDGET_RUN_TIMEOUT_SECONDS,
+            downgrade_at=AgentConfig.BUDGET_DOWNGRADE_AT,
+        )
+
+
+class RunBudget:
+    """
+    Thread-safe usage tracker for a single run.
+
+    Args:
+        limits: Limits to enforce (BUDGET_* settings by default)
+    """
+
+    def __init__(self, limits: Optional[BudgetLimits] = None):
+        self.limits = limits if limits is not None else BudgetLimits.from_config()
+        self.started_at = time.perf_counter()
+        self.tokens = 0
+        self.tool_calls = 0
+        self.refused_tool_calls = 0
+        self.stop_reason: Optional[str] = None
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def unlimited(cls) -> "RunBudget":
+        return cls(BudgetLimits())
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def record(self, action: str, reason: str, stage: Optional[str] = None):
+        """Log a budget action (stopped, timeout, downgraded, terminated) and publish it."""
+        event = {"action": action, "stage": stage, "reason": reason, "at": round(self.elapsed, 3)}
+        with self._lock:
+            self.events.append(event)
+        logger.warning(f"Budget {action}{f' at stage {stage}' if stage else ''}: {reason}")
+        emit("budget", **event)
+
+    def stop(self, reason: str, stage: Optional[str] = None):
+        """End the run: stages that have not started yet are stopped with `reason`."""
+        with self._lock:
+            if self.stop_reason is not None:
+                return
+            self.stop_reason = reason
+        self.record("terminated", reason, stage)
+
+    def add_tokens(self, stage: str, tokens: int):
+        """Count a finished stage's tokens, downgrading or stopping the run at the thresholds."""
+        with self._lock:
+            before = self.tokens
+            self.tokens += tokens
+        max_tokens = self.limits.max_tokens
+        if not max_tokens:
+            return
+        downgrade_at = max_tokens * self.limits.downgrade_at
+        if before < downgrade_at <= self.tokens < max_tokens:
+            self.record("downgraded", f"{self.tokens} of {max_tokens} tokens used; remaining stages run without tools", stage)
+        if before < max_tokens <= self.tokens:
+            self.stop(f"Token budget exhausted ({self.tokens} of {max_tokens})", stage)
+
+    def exhausted(self) -> Optional[str]:
+        """Why no further stage may start, or None."""
+        if self.stop_reason is not None:
+            return self.stop_reason
+        if self.limits.run_timeout_seconds and self.elapsed >= self.limits.run_timeout_seconds:
+            self.stop(f"Run time budget exhausted ({self.limits.run_timeout_seconds:g}s)")
+            return self.stop_reason
+        return None
+
+    @property
+    def downgraded(self) -> bool:
+        max_tokens = self.limits.max_tokens
+        return bool(max_tokens) and self.tokens >= max_tokens * self.limits.downgrade_at
+
+    def use_tool(self, function_name: str) -> Optional[str]:
+        """Count a tool call; returns why it is refused, or None if it may run."""
+        with self._lock:
+            if self.downgraded:
+                reason = "Token budget nearly exhausted"
+            elif self.limits.max_tool_calls and self.tool_calls >= self.limits.max_tool_calls:
+                reason = f"Tool-call budget exhausted ({self.limits.max_tool_calls} calls)"
+            else:
+                self.tool_calls += 1
+                return None
+            self.refused_tool_calls += 1
+            first_refusal = self.refused_tool_calls == 1
+        if first_refusal:
+            self.record("tools_refused", reason)
+        return reason
+
+    def deadline(self, started_at: float) -> Optional[float]:
+        """perf_counter() deadline of a stage started at `started_at` (None if unbounded)."""
+        deadlines = []
+        if self.limits.stage_timeout_seconds:
+            deadlines.append(started_at + self.limits.stage_timeout_seconds)
+        if self.limits.run_timeout_seconds:
+            deadlines.append(self.started_at + self.limits.run_timeout_seconds)
+        return min(deadlines) if deadlines else None
+
+    def timeout_reason(self, started_at: float) -> str:
+        stage_timeout, run_timeout = self.limits.stage_timeout_seconds, self.limits.run_timeout_seconds
+        if run_timeout and (not stage_timeout or self.started_at + run_timeout < started_at + stage_timeout):
+            return f"Run time budget exhausted ({run_timeout:g}s)"
+        return f"Stage exceeded its {stage_timeout:g}s time budget"
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limits": asdict(self.limits),
+                "usage": {
+                    "tokens": self.tokens,
+                    "tool_calls": self.tool_calls,
+                    "refused_tool_calls": self.refused_tool_calls,
+                    "seconds": round(self.elapsed, 3),
+                },
+                "degraded": bool(self.events),
+                "stop_reason": self.stop_reason,
+                "events": list(self.events),
+            }
+
+
+_current_budget: ContextVar[Optional[RunBudget]] = ContextVar("run_budget", default=None)
+
+
+@contextmanager
+def budget_scope(budget: RunBudget):
+    """Charge tool calls made in this context to `budget`."""
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def budget_tool_hook(function_name: str, function_call: Callable, arguments: dict):
+    """Agno tool hook that refuses tool calls once the active run's budget no longer allows them."""
+    budget = _current_budget.get()
+    if budget is not None:
+        reason = budget.use_tool(function_name)
+        if reason is not None:
+            return f"Tool call skipped: {reason}. Answer with the information you already have."
+    return function_call(**arguments)
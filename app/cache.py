@@ -0,0 +1,169 @@
+"""
+Persistent, content-addressed cache for stage outputs.
+
+Entries are keyed by the normalized arXiv ID + version, a hash of the agent's
+instructions and the model ID, so editing a prompt or swapping a model never
+serves a stale analysis. Storage is a local SQLite file with TTL expiry and
+LRU eviction.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from app.config import AgentConfig
+from app.utils import logger, normalize_arxiv_id
+
+
+class AnalysisCache:
+    """
+    SQLite-backed cache with TTL and LRU eviction.
+
+    Args:
+        db_file: Path to the SQLite file (parent directory is created on first use)
+        ttl_seconds: Entries older than this are treated as misses and removed
+        max_entries: Least recently used entries beyond this count are evicted
+    """
+
+    def __init__(self, db_file: str, ttl_seconds: int, max_entries: int):
+        self.db_file = db_file
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    key TEXT PRIMARY KEY,
+                    arxiv_id TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    prompt_hash TEXT NOT NULL,
+                    model_id TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_cache_lru ON analysis_cache (last_accessed)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(arxiv_id: str, instructions: str, model_id: str) -> tuple:
+        """Return (key, base_id, version, prompt_hash) for an analysis request."""
+        base_id, version = normalize_arxiv_id(arxiv_id)
+        prompt_hash = hashlib.sha256((instructions or "").encode("utf-8")).hexdigest()[:16]
+        key = hashlib.sha256(f"{base_id}|{version}|{prompt_hash}|{model_id}".encode("utf-8")).hexdigest()
+        return key, base_id, version, prompt_hash
+
+    def get(self, arxiv_id: str, instructions: str, model_id: str) -> Optional[str]:
+        key, _, _, _ = self.make_key(arxiv_id, instructions, model_id)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT content, created_at FROM analysis_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    conn.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+                    conn.commit()
+                self.misses += 1
+                return None
+            conn.execute("UPDATE analysis_cache SET last_accessed = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def contains(self, arxiv_id: str, instructions: str, model_id: str) -> bool:
+        """Whether get() would hit, without counting a lookup or refreshing the entry."""
+        key, _, _, _ = self.make_key(arxiv_id, instructions, model_id)
+        with self._lock:
+            row = self._connection().execute("SELECT created_at FROM analysis_cache WHERE key = ?", (key,)).fetchone()
+        return row is not None and time.time() - row[0] <= self.ttl_seconds
+
+    def put(self, arxiv_id: str, instructions: str, model_id: str, content: str):
+        key, base_id, version, prompt_hash = self.make_key(arxiv_id, instructions, model_id)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, base_id, version, prompt_hash, model_id, content, now, now),
+            )
+            overflow = conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM analysis_cache WHERE key IN "
+                    "(SELECT key FROM analysis_cache ORDER BY last_accessed ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+            conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class AgentStageCache:
+    """
+    Adapts AnalysisCache to a pipeline stage, keyed on the stage agent's prompt and model.
+
+    Args:
+        cache: The underlying AnalysisCache
+        agent: The agent whose instructions and model ID form part of the key
+        output_schema: Pydantic schema of structured-mode outputs, also part of the key so
+            Markdown and JSON analyses of the same paper never replace each other
+    """
+
+    def __init__(self, cache: AnalysisCache, agent, output_schema=None):
+        self.cache = cache
+        self.agent = agent
+        self.output_schema = output_schema
+
+    def _key_parts(self, context) -> tuple:
+        instructions = self.agent.instructions if isinstance(self.agent.instructions, str) else str(self.agent.instructions)
+        if self.output_schema is not None:
+            instructions += json.dumps(self.output_schema.model_json_schema(), sort_keys=True)
+        return context.params["arxiv_id"], instructions, self.agent.model.id
+
+    def get(self, context) -> Optional[str]:
+        try:
+            return self.cache.get(*self._key_parts(context))
+        except Exception as e:
+            logger.warning(f"Analysis cache lookup failed, running stage: {e}")
+            return None
+
+    def contains(self, context) -> bool:
+        try:
+            return self.cache.contains(*self._key_parts(context))
+        except Exception as e:
+            logger.warning(f"Analysis cache lookup failed: {e}")
+            return False
+
+    def put(self, context, content: str):
+        try:
+            self.cache.put(*self._key_parts(context), content)
+        except Exception as e:
+            logger.warning(f"Analysis cache write failed: {e}")
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+
+analysis_cache = AnalysisCache(
+    db_file=AgentConfig.ANALYSIS_CACHE_DB,
+    ttl_seconds=AgentConfig.ANALYSIS_CACHE_TTL_SECONDS,
+    max_entries=AgentConfig.ANALYSIS_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,256 @@
+"""
+Stage checkpoints for resuming failed pipeline runs.
+
+Every stage that succeeds is saved under the run's session ID as soon as it completes:
+its output (the compact JSON in structured mode), duration and token count. When a run
+fails (ProductEngineer times out, a search tool errors, the process dies), resuming the
+session seeds the pipeline with the saved stages and runs only what is left, instead of
+starting again from PaperAnalyzer (see resume_paper2saas in app.teams.paper2saas).
+
+Writes go through one background thread so async runs never wait on SQLite; a run's
+pending writes are flushed before its status is recorded. Checkpoints older than
+CHECKPOINT_TTL_SECONDS are pruned when a run starts.
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from app.config import AgentConfig
+from app.utils import logger
+
+
+class CheckpointStore:
+    """
+    SQLite-backed store of runs and their completed stages.
+
+    Args:
+        db_file: Path to the SQLite file (parent directory is created on first use)
+        ttl_seconds: Runs not updated for this long are removed with their stages
+    """
+
+    def __init__(self, db_file: str, ttl_seconds: float):
+        self.db_file = db_file
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS checkpoint_runs (
+                    session_id TEXT PRIMARY KEY,
+                    arxiv_id TEXT NOT NULL,
+                    structured INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS checkpoint_stages (
+                    session_id TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    duration REAL NOT NULL,
+                    total_tokens INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (session_id, stage)
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_checkpoint_runs_updated ON checkpoint_runs (updated_at)")
+            self._conn.commit()
+        return self._conn
+
+    def start(self, session_id: str, arxiv_id: str, structured: bool, resume: bool = False):
+        """
+        Record an attempt of a run. A fresh run (not `resume`) drops whatever an earlier run
+        with the same session ID saved.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "DELETE FROM checkpoint_stages WHERE session_id IN "
+                "(SELECT session_id FROM checkpoint_runs WHERE updated_at < ?)",
+                (now - self.ttl_seconds,),
+            )
+            conn.execute("DELETE FROM checkpoint_runs WHERE updated_at < ?", (now - self.ttl_seconds,))
+            if not resume:
+                conn.execute("DELETE FROM checkpoint_stages WHERE session_id = ?", (session_id,))
+                conn.execute("DELETE FROM checkpoint_runs WHERE session_id = ?", (session_id,))
+            conn.execute(
+                "INSERT INTO checkpoint_runs VALUES (?, ?, ?, 'running', 1, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET status = 'running', attempts = attempts + 1, updated_at = ?",
+                (session_id, arxiv_id, int(structured), now, now, now),
+            )
+            conn.commit()
+
+    def _save(self, session_id: str, stage: str, content: str, duration: float, total_tokens: int):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoint_stages VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, stage, content, duration, total_tokens, now),
+            )
+            conn.execute("UPDATE checkpoint_runs SET updated_at = ? WHERE session_id = ?", (now, session_id))
+            conn.commit()
+
+    def save(self, session_id: str, stage: str, content: str, duration: float, total_tokens: int) -> Future:
+        """Queue a completed stage for the writer thread."""
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(1, thread_name_prefix="checkpoint-writer")
+        return self._writer.submit(self._save, session_id, stage, content, duration, total_tokens)
+
+    def finish(self, session_id: str, status: str):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "UPDATE checkpoint_runs SET status = ?, updated_at = ? WHERE session_id = ?",
+                (status, time.time(), session_id),
+            )
+            conn.commit()
+
+    def run(self, session_id: str) -> Optional[dict]:
+        """A run's arXiv ID, pipeline, status and attempts, with the stages it completed (None if unknown)."""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT arxiv_id, structured, status, attempts, created_at, updated_at FROM checkpoint_runs "
+                "WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None or time.time() - row[5] > self.ttl_seconds:
+                return None
+            stages = [stage for stage, in conn.execute(
+                "SELECT stage FROM checkpoint_stages WHERE session_id = ? ORDER BY created_at", (session_id,)
+            )]
+        return {
+            "session_id": session_id,
+            "arxiv_id": row[0],
+            "structured": bool(row[1]),
+            "status": row[2],
+            "attempts": row[3],
+            "created_at": row[4],
+            "updated_at": row[5],
+            "stages": stages,
+        }
+
+    def stages(self, session_id: str) -> Dict[str, dict]:
+        """Saved stages of a run: stage name -> content, duration and total_tokens."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT stage, content, duration, total_tokens FROM checkpoint_stages WHERE session_id = ?",
+                (session_id,),
+            ).fetchall()
+        return {stage: {"content": content, "duration": duration, "total_tokens": tokens}
+                for stage, content, duration, tokens in rows}
+
+    def runs(self, status: Optional[str] = None, limit: int = 20) -> List[dict]:
+        """Most recently updated runs, optionally with one status."""
+        query = "SELECT session_id FROM checkpoint_runs"
+        params: tuple = ()
+        if status is not None:
+            query, params = query + " WHERE status = ?", (status,)
+        with self._lock:
+            session_ids = [row[0] for row in self._connection().execute(
+                query + " ORDER BY updated_at DESC LIMIT ?", params + (limit,)
+            )]
+        return [run for run in map(self.run, session_ids) if run is not None]
+
+
+class RunCheckpoint:
+    """
+    Adapts CheckpointStore to one pipeline run (PipelineContext.checkpoint).
+
+    Args:
+        store: The underlying CheckpointStore
+        session_id: Session ID of the run
+        resume: Load the stages an earlier attempt of this session completed
+    """
+
+    def __init__(self, store: CheckpointStore, session_id: str, resume: bool = False):
+        self.store = store
+        self.session_id = session_id
+        self.resume = resume
+        self._pending: List[Future] = []
+
+    def load(self) -> Dict[str, dict]:
+        """Stages to seed the run with (none for a fresh run)."""
+        if not self.resume:
+            return {}
+        try:
+            return self.store.stages(self.session_id)
+        except Exception as e:
+            logger.warning(f"Checkpoint read failed for session {self.session_id}, running every stage: {e}")
+            return {}
+
+    def save(self, result: Any):
+        """Checkpoint a successful StageResult (failures, stops and resumed stages are not saved)."""
+        if result.status != "success" or not result.content or result.resumed:
+            return
+        self._pending.append(self.store.save(
+            self.session_id, result.stage, result.content, result.duration, result.total_tokens
+        ))
+
+    def finish(self, status: str):
+        """Wait for this run's queued stages, then record how the attempt ended."""
+        try:
+            for pending in self._pending:
+                pending.result()
+            self.store.finish(self.session_id, status)
+        except Exception as e:
+            logger.warning(f"Checkpoint write failed for session {self.session_id}: {e}")
+
+
+checkpoint_store = CheckpointStore(AgentConfig.CHECKPOINT_DB, AgentConfig.CHECKPOINT_TTL_SECONDS)
+
+
+def run_checkpoint(session_id: str, arxiv_id: str, structured: bool, resume: bool = False) -> Optional[RunCheckpoint]:
+    """Start checkpointing a run (None when checkpoints are disabled or the store is unavailable)."""
+    if not AgentConfig.CHECKPOINT_ENABLED:
+        return None
+    try:
+        checkpoint_store.start(session_id, arxiv_id, structured, resume)
+    except Exception as e:
+        logger.warning(f"Checkpoints unavailable for session {session_id}, running without them: {e}")
+        return None
+    return RunCheckpoint(checkpoint_store, session_id, resume)
+
+
+def resumable_run(session_id: str) -> Optional[dict]:
+    """The checkpointed run of a session (see CheckpointStore.run), None if there is none or checkpoints are off."""
+    return checkpoint_store.run(session_id) if AgentConfig.CHECKPOINT_ENABLED else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stage checkpoints of Paper2SaaS runs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    listing = commands.add_parser("list", help="Most recent runs and the stages they completed")
+    listing.add_argument("--status", choices=("running", "success", "error"))
+    listing.add_argument("--limit", type=int, default=20)
+    show = commands.add_parser("show", help="Saved stage outputs of one run")
+    show.add_argument("session_id")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for run in checkpoint_store.runs(args.status, args.limit):
+            print(f"{run['session_id']}  arXiv:{run['arxiv_id']}  {run['status']:<7}  "
+                  f"attempts={run['attempts']}  stages={','.join(run['stages']) or '-'}")
+    else:
+        for stage, saved in checkpoint_store.stages(args.session_id).items():
+            print(f"## {stage} ({saved['duration']:.1f}s, {saved['total_tokens']} tokens)\n{saved['content']}\n")
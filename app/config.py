@@ -5,7 +5,7 @@ load_dotenv()
 
 # Environment setup
 os.environ["FIRECRAWL_API_KEY"] = os.getenv("FIRECRAWL_API_KEY", "")
-os.environ["MISTRAL_API_KEY"] = os.getenv("MISTRAL_API_KEY")
+os.environ["MISTRAL_API_KEY"] = os.getenv("MISTRAL_API_KEY", "")
 
 class AgentConfig:
     """Centralized configuration for all agents"""
@@ -30,3 +30,166 @@ class AgentConfig:
     STORE_EVENTS = os.getenv("STORE_EVENTS", "true").lower() == "true"
     SHOW_MEMBER_RESPONSES = os.getenv("SHOW_MEMBER_RESPONSES", "true").lower() == "true"
     DEBUG_MODE = os.getenv("DEBUG_MODE", "false").lower() == "true"
+    
+    # Paper analysis cache (skips PaperAnalyzer for recently analyzed papers)
+    ANALYSIS_CACHE_ENABLED = os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() == "true"
+    ANALYSIS_CACHE_DB = os.getenv("ANALYSIS_CACHE_DB", "tmp/analysis_cache.db")
+    ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "1000"))
+    
+    # Local arXiv paper store (first-tier source for PaperAnalyzer)
+    PAPER_STORE_DB = os.getenv("PAPER_STORE_DB", "tmp/papers.db")
+    PAPER_STORE_DIR = os.getenv("PAPER_STORE_DIR", "tmp/papers")
+    PAPER_STORE_AUTO_INGEST = os.getenv("PAPER_STORE_AUTO_INGEST", "true").lower() == "true"
+    PAPER_STORE_MAX_CHARS = int(os.getenv("PAPER_STORE_MAX_CHARS", "60000"))
+    # Read the run's paper in the background as soon as its ID is validated (see app.prefetch)
+    PAPER_PREFETCH_ENABLED = os.getenv("PAPER_PREFETCH_ENABLED", "true").lower() == "true"
+    
+    # Structured pipeline mode (stages emit app.models schemas and pass compact JSON downstream)
+    STRUCTURED_PIPELINE = os.getenv("STRUCTURED_PIPELINE", "false").lower() == "true"
+    STRUCTURED_REPAIR_MODEL = os.getenv("STRUCTURED_REPAIR_MODEL", SMALL_MODEL)
+    STRUCTURED_REPAIR_ATTEMPTS = int(os.getenv("STRUCTURED_REPAIR_ATTEMPTS", "1"))
+    
+    # Agent instructions (app.prompts.assembly): "full", or "compact" with non-operative prose removed
+    PROMPT_VARIANT = os.getenv("PROMPT_VARIANT", "full")
+    
+    # Adaptive model tiering (easy stage calls go to SMALL_MODEL, failures escalate back; see app.tiering)
+    MODEL_TIERING_ENABLED = os.getenv("MODEL_TIERING_ENABLED", "false").lower() == "true"
+    TIERING_STAGES = os.getenv("TIERING_STAGES", "paper_analysis,validation,engineering,strategy")
+    TIERING_MAX_INPUT_TOKENS = int(os.getenv("TIERING_MAX_INPUT_TOKENS", "2500"))
+    TIERING_MIN_CONFIDENCE = float(os.getenv("TIERING_MIN_CONFIDENCE", "0.8"))
+    
+    # Per-run budgets of the pipeline (0 disables a limit; see app.budget)
+    BUDGET_MAX_TOKENS = int(os.getenv("BUDGET_MAX_TOKENS", "0"))
+    BUDGET_MAX_TOOL_CALLS = int(os.getenv("BUDGET_MAX_TOOL_CALLS", "0"))
+    BUDGET_STAGE_TIMEOUT_SECONDS = float(os.getenv("BUDGET_STAGE_TIMEOUT_SECONDS", "0"))
+    BUDGET_RUN_TIMEOUT_SECONDS = float(os.getenv("BUDGET_RUN_TIMEOUT_SECONDS", "0"))
+    BUDGET_DOWNGRADE_AT = float(os.getenv("BUDGET_DOWNGRADE_AT", "0.8"))
+    BUDGET_MIN_CONFIDENCE = float(os.getenv("BUDGET_MIN_CONFIDENCE", "0.3"))
+    
+    # Chunked retrieval over stored papers (top-k chunks per reading pass instead of full text)
+    PAPER_RETRIEVAL_ENABLED = os.getenv("PAPER_RETRIEVAL_ENABLED", "true").lower() == "true"
+    PAPER_CHUNK_SIZE = int(os.getenv("PAPER_CHUNK_SIZE", "1000"))
+    PAPER_RETRIEVAL_TOP_K = int(os.getenv("PAPER_RETRIEVAL_TOP_K", "3"))
+    
+    # Provider rate limits, shared by all runs in the process (0 disables)
+    MISTRAL_REQUESTS_PER_MINUTE = int(os.getenv("MISTRAL_REQUESTS_PER_MINUTE", "300"))
+    FIRECRAWL_REQUESTS_PER_MINUTE = int(os.getenv("FIRECRAWL_REQUESTS_PER_MINUTE", "100"))
+    
+    # Shared HTTP connection pool for tool calls
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "20"))
+    
+    # Tool-call memoization (per run, plus an optional cross-run scope; TTL 0 disables it)
+    TOOL_MEMO_ENABLED = os.getenv("TOOL_MEMO_ENABLED", "true").lower() == "true"
+    TOOL_MEMO_SHARED_TTL_SECONDS = float(os.getenv("TOOL_MEMO_SHARED_TTL_SECONDS", "0"))
+    TOOL_MEMO_MAX_ENTRIES = int(os.getenv("TOOL_MEMO_MAX_ENTRIES", "2000"))
+    
+    # Market knowledge cache (app.tools.market_cache): searches and page reads of MarketResearcher,
+    # ValidationResearcher and MarketSkeptic keyed by topic and shared across runs and processes.
+    # Fresh entries are served; stale ones are served and refreshed in the background; entries
+    # older than MARKET_CACHE_MAX_AGE_SECONDS are fetched again
+    MARKET_CACHE_ENABLED = os.getenv("MARKET_CACHE_ENABLED", "true").lower() == "true"
+    MARKET_CACHE_DB = os.getenv("MARKET_CACHE_DB", "tmp/market_cache.db")
+    MARKET_CACHE_FRESH_SECONDS = float(os.getenv("MARKET_CACHE_FRESH_SECONDS", str(24 * 3600)))
+    MARKET_CACHE_MAX_AGE_SECONDS = float(os.getenv("MARKET_CACHE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+    MARKET_CACHE_MAX_ENTRIES = int(os.getenv("MARKET_CACHE_MAX_ENTRIES", "5000"))
+    MARKET_CACHE_REFRESH_WORKERS = int(os.getenv("MARKET_CACHE_REFRESH_WORKERS", "2"))
+    
+    # Server-Sent Events progress stream (/paper2saas/stream)
+    STREAM_MAX_EVENTS = int(os.getenv("STREAM_MAX_EVENTS", "2000"))
+    STREAM_RETENTION_SECONDS = float(os.getenv("STREAM_RETENTION_SECONDS", "600"))
+    STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+    
+    # Background job queue (POST /paper2saas/jobs)
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+    JOB_TABLE = os.getenv("JOB_TABLE", "paper2saas_jobs")
+    JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "1800"))
+    JOB_DRAIN_TIMEOUT_SECONDS = float(os.getenv("JOB_DRAIN_TIMEOUT_SECONDS", "600"))
+    
+    # Run deduplication per paper (app.dedup): concurrent runs for one paper share a run, and
+    # successful results are served for RUN_RESULT_CACHE_TTL_SECONDS (0 disables the cache)
+    RUN_DEDUP_ENABLED = os.getenv("RUN_DEDUP_ENABLED", "true").lower() == "true"
+    RUN_RESULT_CACHE_TTL_SECONDS = float(os.getenv("RUN_RESULT_CACHE_TTL_SECONDS", "3600"))
+    RUN_RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RUN_RESULT_CACHE_MAX_ENTRIES", "256"))
+    
+    # Cross-paper idea index (app.idea_index): ideas, validation research and reports of past
+    # runs, searched for the most similar ones to give IdeaGenerator and ValidationResearcher
+    IDEA_INDEX_ENABLED = os.getenv("IDEA_INDEX_ENABLED", "true").lower() == "true"
+    IDEA_INDEX_DB = os.getenv("IDEA_INDEX_DB", "tmp/idea_index.db")
+    IDEA_INDEX_DIM = int(os.getenv("IDEA_INDEX_DIM", "256"))
+    IDEA_INDEX_TOP_K = int(os.getenv("IDEA_INDEX_TOP_K", "3"))
+    IDEA_INDEX_MIN_SIMILARITY = float(os.getenv("IDEA_INDEX_MIN_SIMILARITY", "0.3"))
+    # Characters of each prior entry quoted in a stage's input
+    IDEA_INDEX_MAX_CHARS = int(os.getenv("IDEA_INDEX_MAX_CHARS", "800"))
+    
+    # Stage checkpoints (app.checkpoint): each successful stage output is saved under the run's
+    # session ID, so a failed run resumes from its last completed stage instead of starting over
+    CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+    CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", "tmp/checkpoints.db")
+    CHECKPOINT_TTL_SECONDS = float(os.getenv("CHECKPOINT_TTL_SECONDS", str(7 * 24 * 3600)))
+    
+    # Offline mock model and fake tools (benchmarks, local development without API keys)
+    MOCK_MODELS = os.getenv("MOCK_MODELS", "false").lower() == "true"
+    MOCK_TOOLS = os.getenv("MOCK_TOOLS", "false").lower() == "true"
+    MOCK_MODEL_LATENCY_SECONDS = float(os.getenv("MOCK_MODEL_LATENCY_SECONDS", "0.5"))
+    MOCK_MODEL_TOKENS_PER_SECOND = float(os.getenv("MOCK_MODEL_TOKENS_PER_SECOND", "0"))
+    MOCK_MODEL_OUTPUT_TOKENS = int(os.getenv("MOCK_MODEL_OUTPUT_TOKENS", "0"))
+    MOCK_MODEL_TOOL_ROUNDS = int(os.getenv("MOCK_MODEL_TOOL_ROUNDS", "1"))
+    MOCK_MODEL_OUTPUTS_FILE = os.getenv("MOCK_MODEL_OUTPUTS_FILE")
+    MOCK_TOOL_LATENCY_SECONDS = float(os.getenv("MOCK_TOOL_LATENCY_SECONDS", "0.2"))
+    # Simulated arXiv download when the fake local paper store misses a paper
+    MOCK_PAPER_FETCH_SECONDS = float(os.getenv("MOCK_PAPER_FETCH_SECONDS", "0"))
+    
+    # Record/replay of full runs (python -m app.recording); with REPLAY_FILE set, models and
+    # tools answer from that recording instead of the network
+    RECORD_DIR = os.getenv("RECORD_DIR", "tmp/recordings")
+    REPLAY_FILE = os.getenv("REPLAY_FILE")
+    REPLAY_TIMING = os.getenv("REPLAY_TIMING", "true").lower() == "true"
+    
+    # Telemetry: spans of runs, stages, model requests and tool calls (metrics are always
+    # collected and served at GET /paper2saas/metrics)
+    TELEMETRY_ENABLED = os.getenv("TELEMETRY_ENABLED", "false").lower() == "true"
+    TELEMETRY_SERVICE_NAME = os.getenv("TELEMETRY_SERVICE_NAME", "paper2saas")
+    # Local SQLite span store for offline analysis (empty disables it)
+    TELEMETRY_TRACES_DB = os.getenv("TELEMETRY_TRACES_DB", "tmp/traces.db")
+    # OTLP/HTTP collector; the exporter reads the standard OTEL_EXPORTER_OTLP_* variables
+    TELEMETRY_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+    
+    # Session store (app.session_store): agent/team session writes are queued and flushed in
+    # bulk by a background thread, trimmed to the last SESSION_MAX_RUNS runs (0 keeps all)
+    SESSION_WRITE_BUFFER = os.getenv("SESSION_WRITE_BUFFER", "true").lower() == "true"
+    SESSION_FLUSH_INTERVAL_SECONDS = float(os.getenv("SESSION_FLUSH_INTERVAL_SECONDS", "0.5"))
+    SESSION_FLUSH_BATCH_SIZE = int(os.getenv("SESSION_FLUSH_BATCH_SIZE", "50"))
+    SESSION_MAX_RUNS = int(os.getenv("SESSION_MAX_RUNS", "20"))
+    SESSION_DROP_EVENTS = os.getenv("SESSION_DROP_EVENTS", "RunContent,TeamRunContent")
+    # Stored message/member contents at least this long are zlib-compressed (0 disables)
+    SESSION_COMPRESS_MIN_CHARS = int(os.getenv("SESSION_COMPRESS_MIN_CHARS", "2048"))
+    SESSION_RETENTION_DAYS = float(os.getenv("SESSION_RETENTION_DAYS", "0"))
+    # SQLite fallback database (opened in WAL mode)
+    SQLITE_DB_FILE = os.getenv("SQLITE_DB_FILE", "tmp/paper2saas.db")
+    
+    # Database connections (app.db). DATABASE_URL overrides the Supabase URL, e.g. for a local
+    # Postgres; transaction pooling (no prepared statements) is assumed on the pooler port 6543
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "300"))
+    DB_CONNECT_TIMEOUT_SECONDS = float(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "10"))
+    DB_TRANSACTION_POOLING = (
+        os.getenv("DB_TRANSACTION_POOLING").lower() == "true" if os.getenv("DB_TRANSACTION_POOLING") else None
+    )
+    
+    # AgentOS: agents/teams this process serves ("all", or comma-separated names such as
+    # "idea_roaster_team"); served ones are built at startup, unlisted ones are never constructed
+    AGENTOS_COMPONENTS = os.getenv("AGENTOS_COMPONENTS", "all")
+    
+    # Batch mode
+    BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+    BATCH_MAX_RETRIES = int(os.getenv("BATCH_MAX_RETRIES", "2"))
+    BATCH_RETRY_BACKOFF_SECONDS = float(os.getenv("BATCH_RETRY_BACKOFF_SECONDS", "5"))
+    # Ideas critiqued at the same time by arun_idea_roaster_batch
+    ROASTER_MAX_CONCURRENCY = int(os.getenv("ROASTER_MAX_CONCURRENCY", "3"))
@@ -0,0 +1,162 @@
+"""
+SQLAlchemy engines behind `shared_db`: connection pooling, health checks and pool metrics.
+
+Postgres (Supabase) is reached through its transaction pooler (Supavisor/pgbouncer, port
+6543). That pooler hands every transaction to whichever server connection is free, so:
+
+- the client pool stays small (DB_POOL_SIZE + DB_MAX_OVERFLOW per process); the pooler
+  multiplexes the processes onto the server;
+- pooled connections are pre-pinged and recycled (DB_POOL_RECYCLE_SECONDS) before the
+  pooler's idle timeout drops them;
+- server-side prepared statements are off. They belong to one server connection, so a
+  statement prepared in one transaction is missing in the next. psycopg2 (the default
+  driver) never prepares; psycopg 3 and asyncpg URLs get prepare_threshold=None and
+  statement_cache_size=0.
+
+Transaction pooling is assumed on port 6543 and can be forced with DB_TRANSACTION_POOLING.
+DATABASE_URL points the store at any Postgres, e.g. a local stand-in; SQLite is the fallback.
+
+agno's sync DB calls run on the event loop during `arun`. The buffered session store
+(app.session_store) takes the writes off the loop, and `aprefetch_sessions` serves the reads.
+check_health()/acheck_health() (GET /paper2saas/health/db) time a round trip and report the
+pool. Pool sizes, connects, checkouts and checkout waits are exported at GET /paper2saas/metrics.
+"""
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+from app.config import AgentConfig
+from app.telemetry import DB_CHECKOUT_SECONDS, DB_POOL_CONNECTIONS, DB_POOL_EVENTS
+
+TRANSACTION_POOLER_PORT = 6543
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that observes how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_CHECKOUT_SECONDS.observe(time.perf_counter() - started, db=getattr(self, "db_name", ""))
+
+
+def transaction_pooling(db_url: str) -> bool:
+    if AgentConfig.DB_TRANSACTION_POOLING is not None:
+        return AgentConfig.DB_TRANSACTION_POOLING
+    return make_url(db_url).port == TRANSACTION_POOLER_PORT
+
+
+def connect_args(db_url: str) -> Dict[str, Any]:
+    """Driver connect arguments: timeouts and keepalives, no prepared statements behind a transaction pooler."""
+    driver = make_url(db_url).get_driver_name()
+    pooled = transaction_pooling(db_url)
+    if driver == "asyncpg":
+        args = {"timeout": AgentConfig.DB_CONNECT_TIMEOUT_SECONDS, "server_settings": {"application_name": "paper2saas"}}
+        return {**args, "statement_cache_size": 0} if pooled else args
+    args = {
+        "connect_timeout": int(AgentConfig.DB_CONNECT_TIMEOUT_SECONDS),
+        "application_name": "paper2saas",
+        "keepalives": 1,
+        "keepalives_idle": 30,
+    }
+    if driver == "psycopg" and pooled:
+        args["prepare_threshold"] = None
+    return args
+
+
+def _instrument(engine: Engine, name: str) -> Engine:
+    # Listeners carry over when the engine recreates its pool; read the pool through the engine
+    engine.pool.db_name = name
+    for event_name in ("connect", "checkout", "invalidate"):
+        event.listen(engine.pool, event_name, lambda *_, e=event_name: DB_POOL_EVENTS.inc(db=name, event=e))
+    if isinstance(engine.pool, QueuePool):
+        for state in ("size", "idle", "in_use", "overflow"):
+            DB_POOL_CONNECTIONS.track(lambda s=state: pool_status(engine)[s], db=name, state=state)
+    return engine
+
+
+def postgres_engine(db_url: str, name: str = "shared") -> Engine:
+    """Pooled Postgres engine (see the module docstring for the transaction pooler settings)."""
+    engine = create_engine(
+        db_url,
+        poolclass=TimedQueuePool,
+        pool_size=AgentConfig.DB_POOL_SIZE,
+        max_overflow=AgentConfig.DB_MAX_OVERFLOW,
+        pool_timeout=AgentConfig.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=AgentConfig.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=True,
+        pool_use_lifo=True,  # reuse warm connections; idle extras age out via the recycle time
+        connect_args=connect_args(db_url),
+    )
+    return _instrument(engine, name)
+
+
+def sqlite_engine(db_file: str, name: str = "shared") -> Engine:
+    """Engine for a SQLite file in WAL mode (concurrent readers, one writer, no fsync per commit)."""
+    path = Path(db_file).resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        poolclass=TimedQueuePool,
+        pool_size=AgentConfig.DB_POOL_SIZE,
+        max_overflow=AgentConfig.DB_MAX_OVERFLOW,
+        pool_timeout=AgentConfig.DB_POOL_TIMEOUT_SECONDS,
+        connect_args={"timeout": 30, "check_same_thread": False},
+    )
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(connection, _):
+        cursor = connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=30000")
+        cursor.close()
+
+    return _instrument(engine, name)
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"class": type(pool).__name__}
+    return {
+        "class": type(pool).__name__,
+        "size": pool.size(),
+        "idle": pool.checkedin(),
+        "in_use": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": pool._max_overflow,
+    }
+
+
+def check_health(db: Any = None) -> Dict[str, Any]:
+    """Round-trip `SELECT 1` through the pool of `db` (`shared_db` by default)."""
+    if db is None:
+        from app.utils import shared_db
+        db = shared_db
+    engine = db.db_engine
+    started = time.perf_counter()
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        status, error = "ok", None
+    except Exception as e:
+        status, error = "error", str(e)
+    return {
+        "status": status,
+        "error": error,
+        "dialect": engine.dialect.name,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+        "pool": pool_status(engine),
+    }
+
+
+async def acheck_health(db: Any = None) -> Dict[str, Any]:
+    return await asyncio.to_thread(check_health, db)
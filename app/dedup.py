@@ -0,0 +1,181 @@
+"""
+Deduplication of pipeline runs for the same paper.
+
+Users name one paper as 2512.24991v1, arXiv:2512.24991v1 or an arxiv.org abs/pdf URL, and
+popular papers are requested by several users at once. Entry points reduce the ID with
+canonical_arxiv_id and key runs by resolved_paper_key: a versioned ID names that version,
+and an unversioned ID names the newest version in the local paper store, so "2512.24991"
+and "2512.24991v1" share a run once v1 is known to be the latest. A paper the store does
+not know yet keeps its unversioned key; its successful result is also cached under the
+version the run stored. Per key, RunDeduplicator:
+
+- attaches a run requested while one is in flight to that run, so every caller, sync or
+  async, gets its result;
+- serves a successful result for RUN_RESULT_CACHE_TTL_SECONDS after it finished.
+
+Failed runs are not cached, so a retry starts a new run. Each caller's result carries
+metrics["dedup"] with its outcome: "run" (it ran the pipeline), "joined" or "cached".
+A shared result belongs to the session that ran it, so runs given their own session ID
+(streamed runs, jobs, batch runs, resumes) always run themselves; this layer covers
+run_paper2saas and arun_paper2saas calls that leave the session to the pipeline. Job
+submissions are deduplicated per paper in the job table (app.jobs).
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import AgentConfig
+from app.telemetry import record_cache
+from app.utils import logger, normalize_arxiv_id, paper_key
+
+
+def resolved_paper_key(arxiv_id: str) -> str:
+    """
+    paper_key of an ID, with an unversioned ID resolved to the newest version in the local
+    paper store (unknown papers keep their unversioned key).
+    """
+    base_id, version = normalize_arxiv_id(arxiv_id)
+    if version == "latest":
+        from app.paper_store import paper_store
+
+        try:
+            paper = paper_store.get(base_id)
+        except Exception as e:
+            logger.warning(f"Could not resolve the latest version of {base_id}: {e}")
+            paper = None
+        if paper is not None and paper["version"]:
+            return f"{base_id}{paper['version']}"
+    return paper_key(arxiv_id)
+
+
+class RunDeduplicator:
+    """
+    Single-flight pipeline runs per key, with a TTL cache of successful results.
+
+    Args:
+        ttl_seconds: How long a successful result is served (0 disables the result cache)
+        max_entries: Least recently used results beyond this count are dropped
+    """
+
+    def __init__(self, ttl_seconds: float = AgentConfig.RUN_RESULT_CACHE_TTL_SECONDS,
+                 max_entries: int = AgentConfig.RUN_RESULT_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._results: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._stats = {"run": 0, "joined": 0, "cached": 0}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: str) -> Tuple[str, Optional[dict], Optional[Future]]:
+        """(outcome, cached result, in-flight future) for a caller of `key`."""
+        with self._lock:
+            entry = self._results.pop(key, None)
+            if entry is not None and time.time() - entry[0] <= self.ttl_seconds:
+                self._results[key] = entry
+                outcome, result, future = "cached", entry[1], None
+            elif key in self._inflight:
+                outcome, result, future = "joined", None, self._inflight[key]
+            else:
+                future = self._inflight[key] = Future()
+                # A running future can't be cancelled by a joined caller that gives up waiting
+                future.set_running_or_notify_cancel()
+                outcome, result = "run", None
+            self._stats[outcome] += 1
+        record_cache("run_dedup", outcome)
+        return outcome, result, future
+
+    def _settle(self, key: str, future: Future, result: Optional[dict] = None,
+                error: Optional[BaseException] = None, alias: Optional[Callable[[], str]] = None):
+        cache_keys = [key]
+        if error is None and alias is not None:
+            try:
+                cache_keys.append(alias())
+            except Exception as e:
+                logger.warning(f"Could not resolve an alias of run {key}: {e}")
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is None and result.get("status") == "success" and self.ttl_seconds > 0:
+                for cache_key in dict.fromkeys(cache_keys):
+                    self._results[cache_key] = (time.time(), result)
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    @staticmethod
+    def _tagged(result: dict, outcome: str, key: str) -> dict:
+        # Joined and cached callers share the run's result; each gets its own top-level dicts
+        metrics = {**(result.get("metrics") or {}), "dedup": {"outcome": outcome, "key": key}}
+        return {**result, "metrics": metrics}
+
+    def run(self, key: str, fn: Callable[[], dict], notify: Optional[Callable[[str], None]] = None,
+            alias: Optional[Callable[[], str]] = None) -> dict:
+        """
+        Return `fn()`, or the result of the run already in flight or cached for `key`.
+
+        Args:
+            key: Deduplication key of the run
+            fn: Runs the pipeline and returns its result dict
+            notify: Called with "joined" or "cached" before a deduplicated caller waits
+            alias: Called after a run to get a second key its successful result is cached
+                under (e.g. the version an unversioned request turned out to be)
+        """
+        outcome, result, future = self._lookup(key)
+        if outcome != "run":
+            if notify is not None:
+                notify(outcome)
+            return self._tagged(result if result is not None else future.result(), outcome, key)
+        try:
+            result = fn()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result, alias=alias)
+        return self._tagged(result, outcome, key)
+
+    async def arun(self, key: str, fn: Callable[[], Awaitable[dict]],
+                   notify: Optional[Callable[[str], None]] = None, alias: Optional[Callable[[], str]] = None) -> dict:
+        """Async version of run(); sync and async callers of one key share a run."""
+        outcome, result, future = self._lookup(key)
+        if outcome != "run":
+            if notify is not None:
+                notify(outcome)
+            if result is None:
+                result = await asyncio.wrap_future(future)
+            return self._tagged(result, outcome, key)
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self._settle(key, future, error=RuntimeError(f"The run for {key} was cancelled"))
+            raise
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result, alias=alias)
+        return self._tagged(result, outcome, key)
+
+    def forget(self, key: Optional[str] = None):
+        """Drop cached results: of `key`, or of every key under a paper key "<paper_key>:" (all by default)."""
+        with self._lock:
+            for cached in list(self._results):
+                if key is None or cached == key or cached.startswith(f"{key}:"):
+                    del self._results[cached]
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = sum(self._stats.values())
+            saved = self._stats["joined"] + self._stats["cached"]
+            return {
+                **self._stats,
+                "in_flight": len(self._inflight),
+                "cached_results": len(self._results),
+                "saved_rate": round(saved / requests, 3) if requests else 0.0,
+            }
+
+
+run_deduplicator = RunDeduplicator()
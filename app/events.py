@@ -0,0 +1,214 @@
+"""
+Progress events for pipeline runs.
+
+Stages and tool calls publish events to the RunEventStream active in the current
+context (a no-op when nothing is listening). Each stream keeps an append-only log with
+sequential event IDs, so any number of subscribers can read at their own pace and a
+reconnecting client resumes after the last ID it saw.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from app.config import AgentConfig
+
+# Events that are dropped first when a stream exceeds its event budget
+DROPPABLE_EVENTS = ("tool_call",)
+MAX_ARGUMENT_CHARS = 200
+
+
+@dataclass
+class RunEvent:
+    """One entry in a run's event log"""
+    id: int
+    event: str
+    data: Dict[str, Any]
+    timestamp: float = field(default_factory=time.time)
+
+    def to_sse(self) -> str:
+        payload = json.dumps({**self.data, "timestamp": self.timestamp}, default=str)
+        return f"id: {self.id}\nevent: {self.event}\ndata: {payload}\n\n"
+
+
+class RunEventStream:
+    """
+    Thread-safe event log for one run with async subscribers.
+
+    Publishers never block: events go into the log and waiting subscribers are woken
+    on their own event loop. A slow subscriber only falls behind in the log. When the
+    log exceeds max_events, the oldest tool-call events are dropped and a subscriber
+    that had not read them yet receives a "gap" event instead.
+
+    Args:
+        run_id: Identifier used to look the stream up for resumption
+        max_events: Upper bound on events kept in memory
+    """
+
+    def __init__(self, run_id: str, max_events: int = AgentConfig.STREAM_MAX_EVENTS):
+        self.run_id = run_id
+        self.max_events = max_events
+        self.created_at = time.time()
+        self.closed_at: Optional[float] = None
+        self.first_output_at: Optional[float] = None
+        self._events: List[RunEvent] = []
+        self._next_id = 1
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._waiters: List[tuple] = []  # (loop, asyncio.Event)
+
+    @property
+    def closed(self) -> bool:
+        return self.closed_at is not None
+
+    def emit(self, event: str, data: Dict[str, Any]) -> Optional[RunEvent]:
+        """Append an event (from any thread) and wake subscribers."""
+        with self._lock:
+            if self.closed:
+                return None
+            run_event = RunEvent(id=self._next_id, event=event, data=data)
+            self._next_id += 1
+            self._events.append(run_event)
+            if event == "member_output" and self.first_output_at is None:
+                self.first_output_at = run_event.timestamp
+            if len(self._events) > self.max_events:
+                self._trim()
+            waiters, self._waiters = self._waiters, []
+        self._wake(waiters)
+        return run_event
+
+    def close(self):
+        """Mark the run finished; subscribers drain the log and stop."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed_at = time.time()
+            waiters, self._waiters = self._waiters, []
+        self._wake(waiters)
+
+    def _trim(self):
+        droppable = [i for i, e in enumerate(self._events) if e.event in DROPPABLE_EVENTS]
+        excess = len(self._events) - self.max_events
+        drop = set(droppable[:excess]) if len(droppable) >= excess else set(range(excess))
+        self._events = [e for i, e in enumerate(self._events) if i not in drop]
+        self._dropped += len(drop)
+
+    @staticmethod
+    def _wake(waiters: list):
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:  # subscriber's loop already closed
+                pass
+
+    async def subscribe(self, last_event_id: int = 0, heartbeat: float = AgentConfig.STREAM_HEARTBEAT_SECONDS
+                        ) -> AsyncIterator[Optional[RunEvent]]:
+        """
+        Yield events with IDs greater than last_event_id until the run closes.
+        Yields None after `heartbeat` seconds without events so callers can send keep-alives.
+        """
+        cursor = last_event_id
+        while True:
+            with self._lock:
+                pending = [e for e in self._events if e.id > cursor]
+                closed = self.closed
+                if not pending and not closed:
+                    waiter = asyncio.Event()
+                    self._waiters.append((asyncio.get_running_loop(), waiter))
+            if pending:
+                for run_event in pending:
+                    if run_event.id > cursor + 1:
+                        missing = run_event.id - cursor - 1
+                        yield RunEvent(id=cursor, event="gap", data={"run_id": self.run_id, "dropped_events": missing})
+                    cursor = run_event.id
+                    yield run_event
+                continue
+            if closed:
+                return
+            try:
+                await asyncio.wait_for(waiter.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "events": self._next_id - 1,
+                "buffered": len(self._events),
+                "dropped": self._dropped,
+                "time_to_first_output": (
+                    round(self.first_output_at - self.created_at, 3) if self.first_output_at else None
+                ),
+            }
+
+
+class RunEventStreams:
+    """
+    Registry of active and recently finished streams, keyed by run ID.
+
+    Args:
+        retention_seconds: How long a finished run stays available for resumption
+    """
+
+    def __init__(self, retention_seconds: float = AgentConfig.STREAM_RETENTION_SECONDS):
+        self.retention_seconds = retention_seconds
+        self._streams: "OrderedDict[str, RunEventStream]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self):
+        now = time.time()
+        for run_id, stream in list(self._streams.items()):
+            if stream.closed and now - stream.closed_at > self.retention_seconds:
+                del self._streams[run_id]
+
+    def create(self, run_id: str) -> RunEventStream:
+        with self._lock:
+            self._expire()
+            stream = self._streams[run_id] = RunEventStream(run_id)
+            return stream
+
+    def get(self, run_id: str) -> Optional[RunEventStream]:
+        with self._lock:
+            self._expire()
+            return self._streams.get(run_id)
+
+
+run_event_streams = RunEventStreams()
+
+_current_stream: ContextVar[Optional[RunEventStream]] = ContextVar("run_event_stream", default=None)
+
+
+@contextmanager
+def event_stream_scope(stream: RunEventStream):
+    """Publish events from everything that runs in this context to `stream`."""
+    token = _current_stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _current_stream.reset(token)
+
+
+def emit(event: str, **data):
+    """Publish an event to the active stream, if any."""
+    stream = _current_stream.get()
+    if stream is not None:
+        stream.emit(event, data)
+
+
+def _preview(arguments: dict) -> dict:
+    return {
+        key: value if not isinstance(value, str) or len(value) <= MAX_ARGUMENT_CHARS
+        else value[:MAX_ARGUMENT_CHARS] + "..."
+        for key, value in (arguments or {}).items()
+    }
+
+
+def event_tool_hook(function_name: str, function_call: Callable, arguments: dict, agent: Any = None):
+    """Agno tool hook that publishes a tool_call event before the tool runs."""
+    emit("tool_call", agent=getattr(agent, "name", None), tool=function_name, arguments=_preview(arguments))
+    return function_call(**arguments)
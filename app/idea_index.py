@@ -0,0 +1,384 @@
+"""
+Cross-paper index of generated ideas, validation research and reports.
+
+Every successful pipeline run is ingested: its paper analysis, one entry per SaaS idea,
+the ValidationResearcher's competitor research and the final report. Later runs query
+the index so that:
+
+- IdeaGenerator sees the ideas already generated for the most similar other papers
+  (matched on their analyses), and can build on them instead of starting from scratch;
+- ValidationResearcher gets the competitor research of the runs with the most similar
+  ideas, and only searches for what it does not cover.
+
+Entries are embedded with signed feature hashing of unigrams and bigrams (log1p term
+frequency, L2-normalized, IDEA_INDEX_DIM float32 dimensions), so no embedding service
+is needed and vectors never change as the corpus grows. Entries and vectors live in a
+SQLite file next to the session store; the vectors are held in one numpy matrix and a
+query is a single matrix-vector product plus a partial sort, which stays well under
+100 ms on one core at 100k+ entries (see benchmarks/idea_index.py). Entries written
+by other processes are picked up on the next query.
+
+Usage:
+    python -m app.idea_index stats
+    python -m app.idea_index search "annotation budget planning for ML teams" --kind idea
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import AgentConfig
+from app.retrieval import tokenize
+from app.telemetry import record_cache
+from app.utils import logger, normalize_arxiv_id
+
+KINDS = ("analysis", "idea", "validation", "report")
+
+
+def embed(texts: Sequence[str], dim: int = AgentConfig.IDEA_INDEX_DIM) -> np.ndarray:
+    """
+    Signed hashed unigram + bigram vectors. The hash sign keeps collisions from adding up,
+    so `dim` can be far smaller than a vocabulary (a random projection of the bag of words).
+    """
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = tokenize(text)
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        if not features:
+            continue
+        hashes = np.fromiter((zlib.crc32(f.encode()) for f in features), dtype=np.int64, count=len(features))
+        counts = np.zeros(dim, dtype=np.float32)
+        np.add.at(counts, hashes % dim, np.where(hashes & (1 << 31), -1.0, 1.0).astype(np.float32))
+        vectors[row] = np.sign(counts) * np.log1p(np.abs(counts))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+@dataclass
+class IndexedEntry:
+    """A stored idea, validation research or report."""
+    id: int
+    arxiv_id: str
+    kind: str
+    title: str
+    content: str
+    created_at: float
+
+
+class IdeaIndex:
+    """
+    Persistent vector index of past ideas and research.
+
+    Args:
+        db_file: SQLite file holding entries and their vectors
+        dim: Embedding dimensions (an existing index keeps the dimensions it was built with)
+    """
+
+    def __init__(self, db_file: str, dim: int = AgentConfig.IDEA_INDEX_DIM):
+        self.db_file = db_file
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._kinds = np.zeros(0, dtype=np.int8)
+        self._papers = np.zeros(0, dtype=np.int64)
+        self._size = 0
+        self._last_id = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS idea_index (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    arxiv_id TEXT NOT NULL,
+                    paper TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_idea_index_arxiv_id ON idea_index (arxiv_id, kind)")
+            self._conn.commit()
+            row = self._conn.execute("SELECT vector FROM idea_index LIMIT 1").fetchone()
+            if row is not None and len(row[0]) // 4 != self.dim:
+                logger.info(f"Idea index {self.db_file} has {len(row[0]) // 4} dimensions, using them")
+                self.dim = len(row[0]) // 4
+                self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+        return self._conn
+
+    @staticmethod
+    def _paper_code(paper: str) -> int:
+        return zlib.crc32(paper.encode())
+
+    def _append(self, rows: List[tuple]):
+        """Add (id, paper, kind, vector bytes) rows to the in-memory matrix; caller holds the lock."""
+        needed = self._size + len(rows)
+        if needed > len(self._matrix):
+            capacity = max(needed, 2 * len(self._matrix), 1024)
+            for name in ("_matrix", "_ids", "_kinds", "_papers"):
+                current = getattr(self, name)
+                grown = np.zeros((capacity,) + current.shape[1:], dtype=current.dtype)
+                grown[:self._size] = current[:self._size]
+                setattr(self, name, grown)
+        for offset, (entry_id, paper, kind, vector) in enumerate(rows):
+            position = self._size + offset
+            self._matrix[position] = np.frombuffer(vector, dtype=np.float32)
+            self._ids[position] = entry_id
+            self._kinds[position] = KINDS.index(kind)
+            self._papers[position] = self._paper_code(paper)
+        self._size = needed
+        if rows:
+            self._last_id = rows[-1][0]
+
+    def _sync(self):
+        """Load entries added since the last load (by this or another process); caller holds the lock."""
+        rows = self._connection().execute(
+            "SELECT id, paper, kind, vector FROM idea_index WHERE id > ? ORDER BY id", (self._last_id,)
+        ).fetchall()
+        self._append(rows)
+
+    def add(self, entries: Iterable[Tuple[str, str, str, str]]) -> int:
+        """
+        Store and index entries.
+
+        Args:
+            entries: (arxiv_id, kind, title, content) tuples; kind is one of KINDS
+
+        Returns:
+            Number of entries added
+        """
+        entries = [entry for entry in entries if entry[3].strip()]
+        if not entries:
+            return 0
+        for _, kind, _, _ in entries:
+            if kind not in KINDS:
+                raise ValueError(f"Unknown entry kind '{kind}'. Available: {KINDS}")
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            vectors = embed([f"{title}\n{content}" for _, _, title, content in entries], self.dim)
+            conn.executemany(
+                "INSERT INTO idea_index (arxiv_id, paper, kind, title, content, vector, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (arxiv_id, normalize_arxiv_id(arxiv_id)[0], kind, title, content, vector.tobytes(), now)
+                    for (arxiv_id, kind, title, content), vector in zip(entries, vectors)
+                ],
+            )
+            conn.commit()
+            self._sync()
+        return len(entries)
+
+    def replace(self, arxiv_id: str, entries: Iterable[Tuple[str, str, str]]) -> int:
+        """
+        Index a run's (kind, title, content) entries for `arxiv_id`, replacing what an earlier
+        run of the same paper version stored, so re-runs don't accumulate near-duplicates.
+        """
+        with self._lock:
+            conn = self._connection()
+            deleted = [row[0] for row in conn.execute("SELECT id FROM idea_index WHERE arxiv_id = ?", (arxiv_id,))]
+            if deleted:
+                conn.execute("DELETE FROM idea_index WHERE arxiv_id = ?", (arxiv_id,))
+                conn.commit()
+                self._drop(deleted)
+        return self.add((arxiv_id, kind, title, content) for kind, title, content in entries)
+
+    def _drop(self, entry_ids: List[int]):
+        """
+        Remove deleted entries from the in-memory matrix without rereading the table; caller
+        holds the lock. The kept rows are copied into fresh arrays, so the views of running
+        queries stay intact.
+        """
+        keep = ~np.isin(self._ids[:self._size], entry_ids)
+        for name in ("_matrix", "_ids", "_kinds", "_papers"):
+            setattr(self, name, getattr(self, name)[:self._size][keep])
+        self._size = int(keep.sum())
+
+    def search(self, query: str, top_k: int = AgentConfig.IDEA_INDEX_TOP_K, kind: Optional[str] = None,
+               exclude_arxiv_id: Optional[str] = None,
+               min_similarity: float = AgentConfig.IDEA_INDEX_MIN_SIMILARITY) -> List[Tuple[IndexedEntry, float]]:
+        """
+        Most similar entries to `query`, best first.
+
+        Args:
+            query: Text to match (an idea, a paper analysis)
+            top_k: Number of entries to return
+            kind: Only entries of this kind (all kinds by default)
+            exclude_arxiv_id: Skip entries of this paper (any version)
+            min_similarity: Cosine similarity below which entries are not returned
+        """
+        with self._lock:
+            self._sync()
+            # Rows below `size` are never rewritten, only reallocated, so the views stay valid
+            size = self._size
+            matrix, ids, kinds, papers = self._matrix[:size], self._ids[:size], self._kinds[:size], self._papers[:size]
+        if size == 0 or top_k <= 0:
+            return []
+        scores = matrix @ embed([query], self.dim)[0]
+        if kind is not None:
+            scores[kinds != KINDS.index(kind)] = -np.inf
+        if exclude_arxiv_id:
+            scores[papers == self._paper_code(normalize_arxiv_id(exclude_arxiv_id)[0])] = -np.inf
+        top_k = min(top_k, size)
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        top = [position for position in top if scores[position] >= min_similarity]
+        if not top:
+            return []
+        entries = self._entries([int(ids[position]) for position in top])
+        return [(entries[int(ids[position])], float(scores[position])) for position in top if int(ids[position]) in entries]
+
+    def _entries(self, ids: List[int]) -> dict:
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT id, arxiv_id, kind, title, content, created_at FROM idea_index "
+                f"WHERE id IN ({','.join('?' * len(ids))})", ids,
+            ).fetchall()
+        return {row[0]: IndexedEntry(*row) for row in rows}
+
+    def entries_of(self, arxiv_id: str, kind: str) -> List[IndexedEntry]:
+        """The `kind` entries stored for exactly this paper ID, in the order they were added."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT id, arxiv_id, kind, title, content, created_at FROM idea_index "
+                "WHERE arxiv_id = ? AND kind = ? ORDER BY id", (arxiv_id, kind),
+            ).fetchall()
+        return [IndexedEntry(*row) for row in rows]
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._sync()
+            counts = dict(self._connection().execute("SELECT kind, COUNT(*) FROM idea_index GROUP BY kind").fetchall())
+            papers = self._connection().execute("SELECT COUNT(DISTINCT paper) FROM idea_index").fetchone()[0]
+            return {
+                **{kind: counts.get(kind, 0) for kind in KINDS},
+                "papers": papers,
+                "dim": self.dim,
+                "matrix_mb": round(self._size * self.dim * 4 / 2 ** 20, 1),
+            }
+
+
+def _title(content: str) -> str:
+    first = content.strip().splitlines()[0] if content.strip() else ""
+    return first.lstrip("#").strip()[:200]
+
+
+def run_entries(result: dict) -> List[Tuple[str, str, str]]:
+    """(kind, title, content) entries of a successful run_paper2saas result."""
+    from app.teams.roaster import ideas_from_result
+
+    run_output = result.get("result")
+    stages = getattr(run_output, "stages", {})
+    entries = [("idea", _title(idea), idea) for idea in ideas_from_result(result)]
+    # Stage contents are Markdown, or the schema output's JSON in structured mode
+    for kind, stage_name in (("analysis", "paper_analysis"), ("validation", "validation"), ("report", "report")):
+        stage = stages.get(stage_name)
+        if stage is not None and stage.status == "success" and stage.content:
+            entries.append((kind, f"{result['arxiv_id']}: {_title(stage.content)}", stage.content))
+    return entries
+
+
+def ingest_run(result: dict) -> int:
+    """Index a finished run's paper analysis, ideas, validation research and report (no-op unless it succeeded)."""
+    if not AgentConfig.IDEA_INDEX_ENABLED or result.get("status") != "success":
+        return 0
+    try:
+        return idea_index.replace(result["arxiv_id"], run_entries(result))
+    except Exception as e:
+        logger.warning(f"Idea index ingestion failed for {result.get('arxiv_id')}: {e}")
+        return 0
+
+
+def _quote(content: str, heading: str, max_chars: int) -> str:
+    content = content if len(content) <= max_chars else content[:max_chars].rstrip() + " ..."
+    return f"### {heading}\n{content}"
+
+
+def _search(query: str, kind: str, arxiv_id: str, top_k: int) -> List[Tuple[IndexedEntry, float]]:
+    if not AgentConfig.IDEA_INDEX_ENABLED or not query.strip():
+        return []
+    try:
+        return idea_index.search(query, top_k=top_k, kind=kind, exclude_arxiv_id=arxiv_id)
+    except Exception as e:
+        logger.warning(f"Idea index lookup failed, continuing without prior {kind} entries: {e}")
+        return []
+
+
+def prior_ideas(analysis: str, arxiv_id: str, top_k: int = AgentConfig.IDEA_INDEX_TOP_K,
+                max_chars: int = AgentConfig.IDEA_INDEX_MAX_CHARS) -> str:
+    """
+    Ideas generated for the `top_k` other papers whose analyses are most similar to
+    `analysis`, as Markdown for IdeaGenerator's input (one block per paper, its ideas in
+    ranking order); empty when the index is disabled or has nothing similar enough.
+    """
+    blocks = []
+    for paper, score in _search(analysis, "analysis", arxiv_id, top_k):
+        try:
+            ideas = idea_index.entries_of(paper.arxiv_id, "idea")
+        except Exception as e:
+            logger.warning(f"Idea index lookup failed, continuing without prior ideas: {e}")
+            break
+        if ideas:
+            blocks.append(_quote(
+                "\n".join(idea.content for idea in ideas), f"From arXiv:{paper.arxiv_id} (similarity {score:.2f})", max_chars
+            ))
+    record_cache("idea_index_ideas", "hit" if blocks else "miss")
+    return "\n\n".join(blocks)
+
+
+def prior_validation(ideas: str, arxiv_id: str, top_k: int = AgentConfig.IDEA_INDEX_TOP_K,
+                     max_chars: int = AgentConfig.IDEA_INDEX_MAX_CHARS) -> str:
+    """
+    Validation research of the runs whose ideas are most similar to `ideas`, as Markdown for
+    ValidationResearcher's input (one block per prior run, naming the idea that matched).
+    """
+    matches = _search(ideas, "idea", arxiv_id, top_k)
+    blocks, seen = [], set()
+    for idea, score in matches:
+        if idea.arxiv_id in seen:
+            continue
+        seen.add(idea.arxiv_id)
+        try:
+            research = idea_index.entries_of(idea.arxiv_id, "validation")
+        except Exception as e:
+            logger.warning(f"Idea index lookup failed, continuing without prior validation research: {e}")
+            break
+        if research:
+            heading = f"For \"{idea.title}\" (arXiv:{idea.arxiv_id}, similarity {score:.2f})"
+            blocks.append(_quote(research[-1].content, heading, max_chars))
+    record_cache("idea_index_validation", "hit" if blocks else "miss")
+    return "\n\n".join(blocks)
+
+
+idea_index = IdeaIndex(AgentConfig.IDEA_INDEX_DB)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-paper idea index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Entries per kind, papers and matrix size")
+    search = commands.add_parser("search", help="Most similar entries to a query")
+    search.add_argument("query")
+    search.add_argument("--kind", choices=KINDS)
+    search.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        print(idea_index.stats())
+    else:
+        for entry, score in idea_index.search(args.query, top_k=args.top_k, kind=args.kind, min_similarity=0.0):
+            print(f"{score:.3f}  [{entry.kind}] arXiv:{entry.arxiv_id}  {entry.title}")
@@ -0,0 +1,348 @@
+"""
+Background job queue for Paper2SaaS runs.
+
+Submitting an arXiv ID returns a job immediately; a pool of async workers runs the
+pipeline and records state in a jobs table in `shared_db` (SQLite locally, Postgres in
+production), so HTTP requests never wait on a multi-minute run. Clients poll the job or
+subscribe to its progress events (the job ID doubles as the run ID of the SSE stream).
+A job interrupted by a shutdown or crash resumes from its last completed stage when it is
+picked up again (the job ID is also the run's session ID; see app.checkpoint).
+"""
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, Float, Index, Integer, JSON, MetaData, String, Table, Text, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateSchema
+
+from app.config import AgentConfig
+from app.dedup import resolved_paper_key, run_deduplicator
+from app.events import RunEventStream, emit, event_stream_scope, run_event_streams
+from app.teams.paper2saas import arun_paper2saas
+from app.utils import canonical_arxiv_id, logger, paper_key
+
+# Delay before a job whose claim hit a database error goes back on the in-process queue
+CLAIM_RETRY_SECONDS = 5.0
+
+async def run_with_event_stream(stream: RunEventStream, arxiv_id: str,
+                                runner: Callable[..., Awaitable[dict]] = arun_paper2saas,
+                                session_id: Optional[str] = None, **run_kwargs) -> dict:
+    """
+    Run the pipeline with every progress event published to `stream`, then close it. The
+    run's session ID is the stream's run ID unless `session_id` is given (e.g. to resume it).
+    """
+    with event_stream_scope(stream):
+        try:
+            result = await runner(arxiv_id, session_id=session_id or stream.run_id, **run_kwargs)
+            run_output = result.get("result")
+            emit(
+                "final_report",
+                run_id=stream.run_id,
+                arxiv_id=arxiv_id,
+                status=result["status"],
+                content=getattr(run_output, "content", None),
+                metrics=result.get("metrics"),
+                error=result.get("error"),
+                failed_stage=result.get("failed_stage"),
+                stop_reason=result.get("stop_reason"),
+                stream=stream.stats(),
+            )
+            return result
+        except Exception as e:
+            logger.error(f"Run {stream.run_id} for {arxiv_id} failed: {e}", exc_info=True)
+            emit("run_error", run_id=stream.run_id, error=str(e), error_type=type(e).__name__)
+            return {"status": "error", "error": str(e), "error_type": type(e).__name__, "arxiv_id": arxiv_id}
+        finally:
+            stream.close()
+
+
+class JobStore:
+    """
+    Job rows in the shared agno database.
+
+    `active_key` holds the paper key while a job is queued, running or succeeded and is
+    cleared when it fails; its unique constraint makes resubmission idempotent even
+    across processes sharing one Postgres database.
+
+    Args:
+        db: agno SqliteDb/PostgresDb whose engine (and schema, on Postgres) is reused
+            (`shared_db` by default, connected on first use)
+        table_name: Name of the jobs table
+    """
+
+    def __init__(self, db: Any = None, table_name: str = AgentConfig.JOB_TABLE):
+        self.db = db
+        self.table_name = table_name
+        self._created = False
+
+    def _ensure_table(self):
+        if self._created:
+            return
+        if self.db is None:
+            from app.utils import shared_db
+            self.db = shared_db
+        self.engine = self.db.db_engine
+        self.schema = getattr(self.db, "db_schema", None)
+        self.table = Table(
+            self.table_name,
+            MetaData(schema=self.schema),
+            Column("id", String, primary_key=True),
+            Column("arxiv_id", String, nullable=False),
+            Column("paper_key", String, nullable=False),
+            Column("active_key", String, unique=True, nullable=True),
+            Column("status", String, nullable=False),
+            Column("attempts", Integer, nullable=False, default=0),
+            Column("created_at", Float, nullable=False),
+            Column("started_at", Float),
+            Column("finished_at", Float),
+            Column("content", Text),
+            Column("metrics", JSON),
+            Column("error", Text),
+            Column("error_type", String),
+            Index(f"ix_{self.table_name}_status", "status", "created_at"),
+        )
+        with self.engine.begin() as conn:
+            if self.schema and conn.dialect.name == "postgresql":
+                conn.execute(CreateSchema(self.schema, if_not_exists=True))
+            self.table.metadata.create_all(conn, tables=[self.table])
+        self._created = True
+
+    @staticmethod
+    def _to_dict(row) -> Optional[dict]:
+        if row is None:
+            return None
+        job = dict(row._mapping)
+        job.pop("active_key", None)
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        self._ensure_table()
+        with self.engine.connect() as conn:
+            return self._to_dict(conn.execute(select(self.table).where(self.table.c.id == job_id)).first())
+
+    def _active(self, conn, key: str):
+        return conn.execute(select(self.table).where(self.table.c.active_key == key)).first()
+
+    def create_or_get(self, arxiv_id: str, force: bool = False) -> Tuple[dict, bool]:
+        """
+        Return (job, created). An existing queued, running or succeeded job for the same
+        paper is returned instead of creating a new one, unless `force` retires a
+        succeeded job so the paper is analyzed again.
+        """
+        self._ensure_table()
+        key = paper_key(arxiv_id)
+        for _ in range(3):
+            job_id = str(uuid.uuid4())
+            try:
+                with self.engine.begin() as conn:
+                    existing = self._active(conn, key)
+                    if existing is not None and not (force and existing.status == "succeeded"):
+                        return self._to_dict(existing), False
+                    if existing is not None:
+                        conn.execute(update(self.table).where(self.table.c.id == existing.id).values(active_key=None))
+                    conn.execute(self.table.insert().values(
+                        id=job_id, arxiv_id=arxiv_id, paper_key=key, active_key=key,
+                        status="queued", attempts=0, created_at=time.time(),
+                    ))
+            except IntegrityError:
+                continue  # another process created it first; return theirs on the next pass
+            return self.get(job_id), True
+        raise RuntimeError(f"Could not create or find a job for {arxiv_id}")
+
+    def claim(self, job_id: str) -> bool:
+        """Atomically move a queued job to running; False if another worker got it first."""
+        self._ensure_table()
+        with self.engine.begin() as conn:
+            claimed = conn.execute(
+                update(self.table)
+                .where(self.table.c.id == job_id, self.table.c.status == "queued")
+                .values(status="running", started_at=time.time(), attempts=self.table.c.attempts + 1)
+            )
+            return claimed.rowcount == 1
+
+    def finish(self, job_id: str, result: dict):
+        succeeded = result.get("status") == "success"
+        run_output = result.get("result")
+        values: Dict[str, Any] = {
+            "status": "succeeded" if succeeded else "failed",
+            "finished_at": time.time(),
+            "content": getattr(run_output, "content", None),
+            "metrics": result.get("metrics"),
+            "error": result.get("error"),
+            "error_type": result.get("error_type"),
+        }
+        if not succeeded:
+            values["active_key"] = None  # a failed paper can be resubmitted
+        self._ensure_table()
+        with self.engine.begin() as conn:
+            conn.execute(update(self.table).where(self.table.c.id == job_id).values(**values))
+
+    def requeue(self, job_ids: List[str]):
+        """Return interrupted jobs to the queue."""
+        if not job_ids:
+            return
+        self._ensure_table()
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(self.table)
+                .where(self.table.c.id.in_(job_ids), self.table.c.status == "running")
+                .values(status="queued", started_at=None)
+            )
+
+    def recoverable(self, stale_seconds: float) -> List[str]:
+        """
+        Queued jobs plus running jobs older than `stale_seconds` (left behind by a crashed
+        process), oldest first. Stale running jobs are moved back to queued.
+        """
+        self._ensure_table()
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(self.table)
+                .where(self.table.c.status == "running", self.table.c.started_at < time.time() - stale_seconds)
+                .values(status="queued", started_at=None)
+            )
+            rows = conn.execute(
+                select(self.table.c.id).where(self.table.c.status == "queued").order_by(self.table.c.created_at)
+            ).all()
+        return [row.id for row in rows]
+
+
+class JobQueue:
+    """
+    Pool of async workers draining the job table.
+
+    Args:
+        store: JobStore holding job state
+        workers: Number of jobs run concurrently
+        runner: Coroutine function (arxiv_id, session_id=..., resume=...) -> result dict
+    """
+
+    def __init__(self, store: JobStore, workers: int = AgentConfig.JOB_WORKERS,
+                 runner: Callable[..., Awaitable[dict]] = arun_paper2saas):
+        self.store = store
+        self.workers = workers
+        self.runner = runner
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running: Dict[str, str] = {}  # job_id -> arxiv_id
+        self._stopping = False
+        self._completed = 0
+
+    @property
+    def accepting(self) -> bool:
+        return self._queue is not None and not self._stopping
+
+    async def start(self):
+        """Start the workers and re-enqueue jobs left over from a previous process."""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._stopping = False
+        for job_id in await asyncio.to_thread(self.store.recoverable, AgentConfig.JOB_STALE_SECONDS):
+            self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Job queue started with {self.workers} workers, {self._queue.qsize()} recovered jobs")
+
+    async def submit(self, arxiv_id: str, force: bool = False) -> Tuple[dict, bool]:
+        """Create (or return the existing) job for a paper; returns (job, created)."""
+        if not self.accepting:
+            raise RuntimeError("Job queue is not accepting submissions")
+        arxiv_id = canonical_arxiv_id(arxiv_id)
+        job, created = await asyncio.to_thread(self.store.create_or_get, arxiv_id, force)
+        if created and force:
+            # A forced rerun must not get the cached result, under either form of the ID
+            run_deduplicator.forget(paper_key(arxiv_id))
+            run_deduplicator.forget(await asyncio.to_thread(resolved_paper_key, arxiv_id))
+        if created:
+            # Create the event stream now so clients can subscribe while the job is queued
+            run_event_streams.create(job["id"]).emit("job_queued", {"job_id": job["id"], "arxiv_id": arxiv_id})
+            self._queue.put_nowait(job["id"])
+            logger.info(f"Queued job {job['id']} for arXiv ID: {arxiv_id}")
+        return job, created
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def _fail(self, job_id: str, exc: Exception):
+        """Mark a claimed job failed so it is not left running (and its paper can be resubmitted)."""
+        try:
+            await asyncio.to_thread(self.store.finish, job_id, {
+                "status": "error", "error": f"Job could not be run: {exc}", "error_type": type(exc).__name__,
+            })
+        except Exception as e:
+            logger.error(f"Could not mark job {job_id} failed, it is recovered once stale: {e}")
+
+    def _retry_later(self, job_id: str):
+        """Put a job that could not be claimed back on the queue after CLAIM_RETRY_SECONDS."""
+        queue = self._queue
+
+        def requeue():
+            if not self._stopping and queue is self._queue:
+                queue.put_nowait(job_id)
+
+        asyncio.get_running_loop().call_later(CLAIM_RETRY_SECONDS, requeue)
+
+    async def _worker(self, worker_index: int):
+        while True:
+            job_id = await self._queue.get()
+            if job_id is None or self._stopping:
+                return  # queued jobs stay queued in the table for the next start
+            claimed = False
+            try:
+                # A database error (e.g. a locked SQLite file) fails this job, never the worker
+                if not await asyncio.to_thread(self.store.claim, job_id):
+                    continue
+                claimed = True
+                job = await asyncio.to_thread(self.store.get, job_id)
+                self._running[job_id] = job["arxiv_id"]
+                logger.info(f"Worker {worker_index} running job {job_id} ({job['arxiv_id']})")
+                stream = run_event_streams.get(job_id) or run_event_streams.create(job_id)
+                stream.emit("run_started", {"run_id": job_id, "arxiv_id": job["arxiv_id"]})
+                # A job claimed again after an interruption continues from its checkpoint
+                result = await run_with_event_stream(stream, job["arxiv_id"], self.runner, resume=job["attempts"] > 1)
+                await asyncio.to_thread(self.store.finish, job_id, result)
+                self._completed += 1
+            except Exception as e:
+                logger.error(f"Worker {worker_index} failed on job {job_id}: {e}", exc_info=True)
+                if claimed:
+                    await self._fail(job_id, e)
+                else:
+                    self._retry_later(job_id)
+            finally:
+                self._running.pop(job_id, None)
+
+    async def shutdown(self, timeout: float = AgentConfig.JOB_DRAIN_TIMEOUT_SECONDS):
+        """
+        Stop accepting jobs and let in-flight jobs finish. Jobs still running after
+        `timeout` are cancelled and put back in the queue for the next start.
+        """
+        if self._queue is None:
+            return
+        self._stopping = True
+        for _ in self._tasks:
+            self._queue.put_nowait(None)
+        logger.info(f"Draining job queue: {len(self._running)} in-flight jobs")
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        if pending:
+            interrupted = list(self._running)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await asyncio.to_thread(self.store.requeue, interrupted)
+            logger.warning(f"Job queue drain timed out; re-queued {len(interrupted)} jobs")
+        self._tasks = []
+        self._queue = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "accepting": self.accepting,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": len(self._running),
+            "completed": self._completed,
+        }
+
+
+job_queue = JobQueue(JobStore())
@@ -1,43 +1,34 @@
 from agno.os import AgentOS
 
-from .agents.paper_analyzer import paper_analyzer
-from .agents.market_researcher import market_researcher
-from .agents.idea_generator import idea_generator
-from .agents.validation_researcher import validation_researcher
-from .agents.strategic_advisor import strategic_advisor
-from .agents.report_generator import report_generator
-from .agents.product_engineer import product_engineer
-from .agents.fact_checker import fact_checker
-from .agents.devils_advocate import devils_advocate
-from .agents.market_skeptic import market_skeptic
-
-from .teams.paper2saas import paper2saas_team
-from .teams.roaster import idea_roaster_team
+from .api import lifespan, router as paper2saas_router
 from .config import AgentConfig
+from .registry import AGENTS, TEAMS, get_component, resolve_components
+from .telemetry import get_traces_db, setup_telemetry
+
+# Our own spans (runs, stages, model requests, tool calls) go to the local span store, which
+# AgentOS reads traces from; its built-in tracing needs openinference, so it stays off
+if AgentConfig.TELEMETRY_ENABLED:
+    setup_telemetry()
 
+# AgentOS builds its routes from the agent and team objects, so every served component
+# (with its model, toolkits and the shared DB) is constructed here, at import. Serving
+# everything therefore starts no faster than before the lazy registry; set
+# AGENTOS_COMPONENTS to serve (and construct) only a subset and start faster.
 p2s_os = AgentOS(
     name="p2s-os",
     description="Turns academic papers into battle-tested SaaS opportunities",
-    agents=[
-        paper_analyzer,
-        market_researcher,
-        idea_generator,
-        validation_researcher,
-        strategic_advisor,
-        report_generator,
-        product_engineer,
-        fact_checker,
-        devils_advocate,
-        market_skeptic
-    ],
+    agents=[get_component(name) for name in resolve_components(AgentConfig.AGENTOS_COMPONENTS, AGENTS)],
     teams=[
-        paper2saas_team,     # Main flow
-        idea_roaster_team,   # Brutal critique
+        # paper2saas_team: main flow, idea_roaster_team: brutal critique
+        get_component(name) for name in resolve_components(AgentConfig.AGENTOS_COMPONENTS, TEAMS)
     ],
     tracing=False,
+    tracing_db=get_traces_db() if AgentConfig.TELEMETRY_ENABLED else None,
+    lifespan=lifespan,
 )
 
 app = p2s_os.get_app()
+app.include_router(paper2saas_router)
 
 if __name__ == "__main__":
     p2s_os.serve(app="app.main:app", reload=True)
@@ -0,0 +1,30 @@
+"""
+Rate-limited Mistral chat model.
+
+Kept out of app.utils so that importing the app does not load the Mistral SDK; it is
+imported by get_mistral_model the first time an agent is built.
+"""
+from agno.models.mistral import MistralChat
+
+from app.ratelimit import rate_limiters
+
+
+class RateLimitedMistralChat(MistralChat):
+    """MistralChat that waits for the shared Mistral rate limiter before each request."""
+
+    def invoke(self, *args, **kwargs):
+        rate_limiters["mistral"].acquire()
+        return super().invoke(*args, **kwargs)
+
+    async def ainvoke(self, *args, **kwargs):
+        await rate_limiters["mistral"].aacquire()
+        return await super().ainvoke(*args, **kwargs)
+
+    def invoke_stream(self, *args, **kwargs):
+        rate_limiters["mistral"].acquire()
+        yield from super().invoke_stream(*args, **kwargs)
+
+    async def ainvoke_stream(self, *args, **kwargs):
+        await rate_limiters["mistral"].aacquire()
+        async for chunk in super().ainvoke_stream(*args, **kwargs):
+            yield chunk
@@ -0,0 +1,256 @@
+"""
+Offline stand-in for the Mistral chat model.
+
+MockMistralChat answers every request locally after a configurable delay, with token
+counts derived from the prompt and a canned reply chosen by agent (or team) name.
+Agents that have tools first issue deterministic tool calls, so tool hooks, memoization
+and team delegation run exactly as they do against the real API. Requests with a Pydantic
+response format get the canned reply if it is JSON, else a minimal valid instance.
+
+Enable with MOCK_MODELS=true (and MOCK_TOOLS=true for the fake toolkits in app.tools.fake).
+"""
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.metrics import Metrics
+from agno.models.response import ModelResponse
+from pydantic import BaseModel
+
+from app.config import AgentConfig
+
+DEFAULT_MOCK_OUTPUTS: Dict[str, str] = {
+    "PaperAnalyzer": (
+        "# Mock Paper Title\n- **arXiv ID**: 0000.00000\n- **Authors**: A. Author, B. Author\n"
+        "- **Confidence Score**: 0.9\n\n## Executive Summary\nA method that reduces labeled data needs.\n\n"
+        "## Core Innovations\n- Gradient-similarity metric\n- Data selection procedure\n\n"
+        "## Technical Architecture\nScores examples, selects a subset, fine-tunes.\n\n"
+        "## Limitations & Applications\n- **Limitations**: single domain\n- **Applications**: annotation planning\n"
+    ),
+    "MarketResearcher": (
+        "## Market Signals\n- Teams report annotation costs as a top blocker (source: mock, 2026-01-01)\n\n"
+        "## Pain Points\n1. Over-annotation wastes budget (severity 8/10)\n2. No way to predict data needs (7/10)\n"
+    ),
+    "IdeaGenerator": "\n".join(
+        f"## Idea {i}: Mock Idea {i}\n- **Value Proposition**: Saves time\n- **Target Customer**: ML teams\n"
+        f"- **Score**: {90 - i}\n"
+        for i in range(1, 6)
+    ),
+    "FactChecker": "## Verification\n- Idea 1: VERIFIED\n- Idea 2: PARTIALLY VERIFIED\n",
+    "ValidationResearcher": "## Validation\n- Idea 1: 3 competitors, differentiation clear\n- Idea 2: crowded\n",
+    "ProductEngineer": "## Implementation\n- MVP: 6 weeks\n- Stack: FastAPI, Postgres\n- Reusable repo: example/repo\n",
+    "StrategicAdvisor": "## Recommendation\n1. Idea 1 (score 86)\n2. Idea 2 (score 71)\n",
+    "ReportGenerator": "# Paper-to-SaaS Opportunity Report\n\n## Executive Summary\nMock report.\n",
+    "DevilsAdvocate": "## Critique\n- Distribution is the main risk.\n",
+    "MarketSkeptic": "## Market Reality Check\n- Budget owners are unclear.\n",
+    "Paper2SaaS": "# Paper-to-SaaS Opportunity Report\n\n## Top Recommendation\nMock Idea 1.\n",
+    "IdeaRoaster": (
+        "# Idea Stress Test: Mock Idea\n\n## Technical Assessment\n- Risk Score: 4/10\n\n"
+        "## Market Assessment\n- Risk Score: 6/10\n\n## Combined Verdict\n- Overall Risk: 5\n"
+        "- Proceed Recommendation: INVESTIGATE further: narrow the target customer.\n"
+    ),
+}
+MEMBER_ID_PATTERN = re.compile(r"^\s*-? ?ID: (\S+)$", re.MULTILINE)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, (len(text) + 3) // 4)
+
+
+def _sample(schema: Dict[str, Any], defs: Dict[str, Any]) -> Any:
+    """Smallest value that satisfies a Pydantic JSON schema (required fields, min items, bounds)."""
+    if "$ref" in schema:
+        return _sample(defs[schema["$ref"].split("/")[-1]], defs)
+    if "anyOf" in schema:
+        return _sample(next((s for s in schema["anyOf"] if s.get("type") != "null"), {}), defs)
+    if "enum" in schema or "const" in schema:
+        return schema.get("enum", [schema.get("const")])[0]
+    json_type = schema.get("type", "string")
+    if json_type == "object":
+        properties = schema.get("properties", {})
+        return {name: _sample(properties[name], defs) for name in schema.get("required", [])}
+    if json_type == "array":
+        return [_sample(schema.get("items", {}), defs) for _ in range(schema.get("minItems", 1))]
+    if json_type in ("number", "integer"):
+        value = schema.get("maximum", schema.get("minimum", 1))
+        return int(value) if json_type == "integer" else float(value)
+    if json_type == "boolean":
+        return False
+    return "mock"
+
+
+def sample_output(schema: type) -> str:
+    """JSON for a minimal valid instance of a Pydantic model."""
+    json_schema = schema.model_json_schema()
+    return json.dumps(_sample(json_schema, json_schema.get("$defs", {})))
+
+
+def load_mock_outputs(path: Optional[str] = AgentConfig.MOCK_MODEL_OUTPUTS_FILE) -> Dict[str, str]:
+    """Canned replies per agent name: the defaults, overridden by an optional JSON file."""
+    outputs = dict(DEFAULT_MOCK_OUTPUTS)
+    if path:
+        with open(path, encoding="utf-8") as f:
+            outputs.update(json.load(f))
+    return outputs
+
+
+@dataclass
+class MockMistralChat(Model):
+    """
+    Drop-in replacement for the model returned by get_mistral_model.
+
+    Args:
+        latency_seconds: Delay before every response (time to first token)
+        tokens_per_second: Output generation speed; 0 returns the whole reply at once
+        output_tokens: Pad or trim replies to this many tokens (0 keeps the canned length)
+        tool_rounds: Tool-calling rounds an agent with tools performs before answering
+        outputs: Canned replies keyed by agent or team name ("default" for anything else)
+    """
+    id: str = "mock-mistral"
+    name: str = "MockMistralChat"
+    provider: str = "Mock"
+    supports_native_structured_outputs: bool = True
+    latency_seconds: float = AgentConfig.MOCK_MODEL_LATENCY_SECONDS
+    tokens_per_second: float = AgentConfig.MOCK_MODEL_TOKENS_PER_SECOND
+    output_tokens: int = AgentConfig.MOCK_MODEL_OUTPUT_TOKENS
+    tool_rounds: int = AgentConfig.MOCK_MODEL_TOOL_ROUNDS
+    outputs: Dict[str, str] = field(default_factory=load_mock_outputs)
+
+    # --- Reply construction ---
+
+    def _reply(self, run_response: Any, response_format: Any = None) -> str:
+        owner = getattr(run_response, "agent_name", None) or getattr(run_response, "team_name", None) or "default"
+        text = self.outputs.get(owner) or self.outputs.get("default") or f"Mock response from {owner}."
+        if isinstance(response_format, type) and issubclass(response_format, BaseModel):
+            # Canned JSON is returned as-is, valid or not (to exercise repair); prose is replaced
+            return text if text.lstrip().startswith("{") else sample_output(response_format)
+        if self.output_tokens > 0:
+            target_chars = self.output_tokens * 4
+            text = (text * (target_chars // len(text) + 1))[:target_chars]
+        return text
+
+    @staticmethod
+    def _arguments(tool: Dict[str, Any], messages: List[Message], member_id: Optional[str]) -> Dict[str, Any]:
+        parameters = tool.get("function", {}).get("parameters", {}) or {}
+        arguments: Dict[str, Any] = {}
+        for name in parameters.get("required", []):
+            schema = parameters.get("properties", {}).get(name, {})
+            json_type = schema.get("type", "string")
+            if name == "member_id" and member_id:
+                arguments[name] = member_id
+            elif name in ("task", "query"):
+                arguments[name] = next((m.get_content_string() for m in messages if m.role == "user"), "mock")[:200]
+            elif name == "url":
+                arguments[name] = "https://example.com/mock"
+            elif name == "arxiv_id":
+                arguments[name] = "2512.24991v1"
+            elif json_type == "array":
+                arguments[name] = ["2512.24991v1"] if "id" in name else ["mock"]
+            elif json_type in ("integer", "number"):
+                arguments[name] = 1
+            elif json_type == "boolean":
+                arguments[name] = False
+            else:
+                arguments[name] = "mock"
+        return arguments
+
+    def _tool_calls(self, messages: List[Message], tools: Optional[List[Dict[str, Any]]]) -> Optional[List[dict]]:
+        """Tool calls for this turn, or None when the model should answer."""
+        function_tools = [t for t in tools or [] if t.get("type") == "function"]
+        rounds_done = sum(1 for m in messages if m.role == "assistant" and m.tool_calls)
+        if not function_tools or rounds_done >= self.tool_rounds:
+            return None
+        system = next((m.get_content_string() for m in messages if m.role == "system"), "")
+        member_ids = MEMBER_ID_PATTERN.findall(system)
+        tool = function_tools[rounds_done % len(function_tools)]
+        properties = tool.get("function", {}).get("parameters", {}).get("properties", {})
+        # Team leaders delegate to every member at once; agents call one tool per round
+        targets = member_ids if "member_id" in properties and member_ids else [None]
+        return [
+            {
+                "id": f"mock_call_{rounds_done}_{i}",
+                "type": "function",
+                "function": {
+                    "name": tool["function"]["name"],
+                    "arguments": json.dumps(self._arguments(tool, messages, member_id)),
+                },
+            }
+            for i, member_id in enumerate(targets)
+        ]
+
+    def _respond(self, messages: List[Message], tools: Optional[List[Dict[str, Any]]], run_response: Any,
+                 response_format: Any = None):
+        """Return (ModelResponse, seconds to wait) for this request."""
+        response = ModelResponse(role="assistant")
+        tool_calls = self._tool_calls(messages, tools)
+        if tool_calls:
+            response.tool_calls = tool_calls
+            output = json.dumps(tool_calls)
+        else:
+            response.content = output = self._reply(run_response, response_format)
+        input_tokens = sum(_estimate_tokens(m.get_content_string() or "") for m in messages)
+        output_tokens = _estimate_tokens(output)
+        response.response_usage = Metrics(
+            input_tokens=input_tokens, output_tokens=output_tokens, total_tokens=input_tokens + output_tokens
+        )
+        delay = self.latency_seconds + (output_tokens / self.tokens_per_second if self.tokens_per_second else 0)
+        return response, delay
+
+    @staticmethod
+    def _chunks(response: ModelResponse, size: int = 200) -> Iterator[ModelResponse]:
+        if response.tool_calls:
+            yield response
+            return
+        content = response.content or ""
+        pieces = [content[i:i + size] for i in range(0, len(content), size)] or [""]
+        for index, piece in enumerate(pieces):
+            last = index == len(pieces) - 1
+            yield ModelResponse(role="assistant", content=piece, response_usage=response.response_usage if last else None)
+
+    # --- Model interface ---
+
+    def invoke(self, messages: List[Message], assistant_message: Message, response_format=None, tools=None,
+               tool_choice=None, run_response=None, compress_tool_results: bool = False) -> ModelResponse:
+        assistant_message.metrics.start_timer()
+        response, delay = self._respond(messages, tools, run_response, response_format)
+        time.sleep(delay)
+        assistant_message.metrics.stop_timer()
+        return response
+
+    async def ainvoke(self, messages: List[Message], assistant_message: Message, response_format=None, tools=None,
+                      tool_choice=None, run_response=None, compress_tool_results: bool = False) -> ModelResponse:
+        assistant_message.metrics.start_timer()
+        response, delay = self._respond(messages, tools, run_response, response_format)
+        await asyncio.sleep(delay)
+        assistant_message.metrics.stop_timer()
+        return response
+
+    def invoke_stream(self, messages: List[Message], assistant_message: Message, response_format=None, tools=None,
+                      tool_choice=None, run_response=None, compress_tool_results: bool = False
+                      ) -> Iterator[ModelResponse]:
+        assistant_message.metrics.start_timer()
+        response, delay = self._respond(messages, tools, run_response, response_format)
+        time.sleep(delay)
+        yield from self._chunks(response)
+        assistant_message.metrics.stop_timer()
+
+    async def ainvoke_stream(self, messages: List[Message], assistant_message: Message, response_format=None,
+                             tools=None, tool_choice=None, run_response=None, compress_tool_results: bool = False
+                             ) -> AsyncIterator[ModelResponse]:
+        assistant_message.metrics.start_timer()
+        response, delay = self._respond(messages, tools, run_response, response_format)
+        await asyncio.sleep(delay)
+        for chunk in self._chunks(response):
+            yield chunk
+        assistant_message.metrics.stop_timer()
+
+    def _parse_provider_response(self, response: Any, **kwargs) -> ModelResponse:
+        return response
+
+    def _parse_provider_response_delta(self, response: Any) -> ModelResponse:
+        return response
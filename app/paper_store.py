@@ -0,0 +1,292 @@
+"""
+Local arXiv paper store: SQLite metadata plus on-disk PDF and extracted-text cache.
+
+Papers are ingested once (from a directory of PDFs, a metadata dump, or a one-time
+arXiv download) and then served to PaperAnalyzer without touching the network.
+
+Usage:
+    python -m app.paper_store import-pdfs ~/papers/
+    python -m app.paper_store import-metadata arxiv-metadata-oai-snapshot.json
+    python -m app.paper_store fetch 2512.24991v1 2512.00001
+    python -m app.paper_store show 2512.24991v1
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from typing import Iterator, Optional
+
+from app.config import AgentConfig
+from app.utils import logger, normalize_arxiv_id
+
+ARXIV_ID_IN_TEXT = re.compile(r"(\d{4}\.\d{4,5})(v\d+)?")
+
+
+def _version_num(version: str) -> int:
+    """'v3' -> 3, 'latest'/unknown -> 0"""
+    return int(version[1:]) if version.startswith("v") and version[1:].isdigit() else 0
+
+
+def extract_pdf_text(pdf_path: str) -> str:
+    """Extract plain text from every page of a PDF."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(pdf_path)
+    pages = []
+    for page_number, page in enumerate(reader.pages, start=1):
+        text = page.extract_text() or ""
+        pages.append(f"[page {page_number}]\n{text.strip()}")
+    return "\n\n".join(pages)
+
+
+class PaperStore:
+    """
+    Local paper metadata and full-text store.
+
+    Args:
+        db_file: SQLite file holding paper metadata
+        data_dir: Directory receiving pdf/ and text/ subdirectories
+    """
+
+    def __init__(self, db_file: str, data_dir: str):
+        self.db_file = db_file
+        self.data_dir = data_dir
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._arxiv_client = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+            os.makedirs(os.path.join(self.data_dir, "pdf"), exist_ok=True)
+            os.makedirs(os.path.join(self.data_dir, "text"), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS papers (
+                    arxiv_id TEXT NOT NULL,
+                    version_num INTEGER NOT NULL,
+                    title TEXT,
+                    authors TEXT,
+                    abstract TEXT,
+                    categories TEXT,
+                    published TEXT,
+                    pdf_path TEXT,
+                    text_path TEXT,
+                    source TEXT,
+                    ingested_at REAL NOT NULL,
+                    PRIMARY KEY (arxiv_id, version_num)
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    # --- Lookup ---
+
+    def get(self, arxiv_id: str) -> Optional[dict]:
+        """
+        Metadata for a paper. A versioned ID matches that version only; an unversioned ID
+        returns the newest stored version.
+        """
+        base_id, version = normalize_arxiv_id(arxiv_id)
+        with self._lock:
+            conn = self._connection()
+            if version == "latest":
+                row = conn.execute(
+                    "SELECT * FROM papers WHERE arxiv_id = ? ORDER BY version_num DESC LIMIT 1", (base_id,)
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT * FROM papers WHERE arxiv_id = ? AND version_num = ?", (base_id, _version_num(version))
+                ).fetchone()
+        if row is None:
+            return None
+        paper = dict(row)
+        paper["authors"] = json.loads(paper["authors"] or "[]")
+        paper["categories"] = json.loads(paper["categories"] or "[]")
+        paper["version"] = f"v{paper['version_num']}" if paper["version_num"] else None
+        return paper
+
+    def get_text(self, arxiv_id: str) -> Optional[str]:
+        """Full extracted text, or None if the paper (or its text) is not stored."""
+        paper = self.get(arxiv_id)
+        if paper is None or not paper["text_path"] or not os.path.exists(paper["text_path"]):
+            return None
+        with open(paper["text_path"], encoding="utf-8") as f:
+            return f.read()
+
+    # --- Ingestion ---
+
+    def add(self, arxiv_id: str, title: str = None, authors: list = None, abstract: str = None,
+            categories: list = None, published: str = None, pdf_path: str = None, text: str = None,
+            source: str = "manual") -> dict:
+        """
+        Insert or update a paper. Existing fields are kept when the new value is missing,
+        so a metadata dump and a PDF import for the same paper merge into one row.
+        """
+        base_id, version = normalize_arxiv_id(arxiv_id)
+        version_num = _version_num(version)
+        file_stem = f"{base_id}v{version_num}" if version_num else base_id
+
+        stored_pdf = None
+        if pdf_path:
+            stored_pdf = os.path.join(self.data_dir, "pdf", f"{file_stem}.pdf")
+            if os.path.abspath(pdf_path) != os.path.abspath(stored_pdf):
+                os.makedirs(os.path.dirname(stored_pdf), exist_ok=True)
+                shutil.copyfile(pdf_path, stored_pdf)
+            if text is None:
+                text = extract_pdf_text(stored_pdf)
+
+        stored_text = None
+        if text:
+            stored_text = os.path.join(self.data_dir, "text", f"{file_stem}.txt")
+            os.makedirs(os.path.dirname(stored_text), exist_ok=True)
+            with open(stored_text, "w", encoding="utf-8") as f:
+                f.write(text)
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                """
+                INSERT INTO papers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (arxiv_id, version_num) DO UPDATE SET
+                    title = COALESCE(excluded.title, title),
+                    authors = COALESCE(excluded.authors, authors),
+                    abstract = COALESCE(excluded.abstract, abstract),
+                    categories = COALESCE(excluded.categories, categories),
+                    published = COALESCE(excluded.published, published),
+                    pdf_path = COALESCE(excluded.pdf_path, pdf_path),
+                    text_path = COALESCE(excluded.text_path, text_path),
+                    source = excluded.source,
+                    ingested_at = excluded.ingested_at
+                """,
+                (
+                    base_id, version_num, title,
+                    json.dumps(authors) if authors is not None else None,
+                    abstract,
+                    json.dumps(categories) if categories is not None else None,
+                    published, stored_pdf, stored_text, source, time.time(),
+                ),
+            )
+            conn.commit()
+        logger.info(f"Stored paper {file_stem} in local paper store ({source})")
+        return self.get(file_stem if version_num else base_id)
+
+    def import_pdf_directory(self, directory: str) -> int:
+        """Ingest every PDF whose filename contains an arXiv ID (e.g. 2512.24991v1.pdf)."""
+        imported = 0
+        for name in sorted(os.listdir(directory)):
+            if not name.lower().endswith(".pdf"):
+                continue
+            match = ARXIV_ID_IN_TEXT.search(name)
+            if not match:
+                logger.warning(f"Skipping {name}: no arXiv ID in filename")
+                continue
+            try:
+                self.add(match.group(0), pdf_path=os.path.join(directory, name), source="pdf_import")
+                imported += 1
+            except Exception as e:
+                logger.error(f"Failed to import {name}: {e}")
+        return imported
+
+    @staticmethod
+    def _iter_metadata(path: str) -> Iterator[dict]:
+        """Yield records from a JSON array or JSON-lines metadata dump."""
+        with open(path, encoding="utf-8") as f:
+            first = f.read(1)
+            f.seek(0)
+            if first == "[":
+                yield from json.load(f)
+            else:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def import_metadata_dump(self, path: str) -> int:
+        """
+        Ingest metadata records, either in the arXiv OAI snapshot format (id, title, authors
+        string, abstract, categories string, versions list) or with arxiv_id/authors list keys.
+        """
+        imported = 0
+        for record in self._iter_metadata(path):
+            arxiv_id = record.get("arxiv_id") or record.get("id")
+            if not arxiv_id or not ARXIV_ID_IN_TEXT.fullmatch(arxiv_id):
+                continue
+            versions = record.get("versions") or []
+            if versions and not re.search(r"v\d+$", arxiv_id):
+                arxiv_id += versions[-1]["version"] if isinstance(versions[-1], dict) else versions[-1]
+            authors = record.get("authors")
+            if isinstance(authors, str):
+                authors = [a.strip() for a in re.split(r",| and ", authors) if a.strip()]
+            categories = record.get("categories")
+            if isinstance(categories, str):
+                categories = categories.split()
+            self.add(
+                arxiv_id,
+                title=" ".join((record.get("title") or "").split()) or None,
+                authors=authors,
+                abstract=" ".join((record.get("abstract") or record.get("summary") or "").split()) or None,
+                categories=categories,
+                published=record.get("published") or record.get("update_date"),
+                source="metadata_import",
+            )
+            imported += 1
+        return imported
+
+    def fetch_from_arxiv(self, arxiv_id: str) -> Optional[dict]:
+        """Download metadata and PDF once from the arXiv API and ingest them."""
+        import arxiv
+        import tempfile
+
+        if self._arxiv_client is None:
+            self._arxiv_client = arxiv.Client()
+        base_id, version = normalize_arxiv_id(arxiv_id)
+        query_id = base_id if version == "latest" else f"{base_id}{version}"
+        result = next(self._arxiv_client.results(arxiv.Search(id_list=[query_id])), None)
+        if result is None:
+            return None
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = result.download_pdf(dirpath=tmp_dir)
+            return self.add(
+                result.get_short_id(),
+                title=result.title,
+                authors=[author.name for author in result.authors],
+                abstract=result.summary,
+                categories=result.categories,
+                published=result.published.isoformat() if result.published else None,
+                pdf_path=pdf_path,
+                source="arxiv_api",
+            )
+
+
+paper_store = PaperStore(db_file=AgentConfig.PAPER_STORE_DB, data_dir=AgentConfig.PAPER_STORE_DIR)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the local arXiv paper store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("import-pdfs", help="Import a directory of PDFs").add_argument("directory")
+    subparsers.add_parser("import-metadata", help="Import a JSON/JSONL metadata dump").add_argument("path")
+    subparsers.add_parser("fetch", help="Download papers from arXiv once").add_argument("arxiv_ids", nargs="+")
+    subparsers.add_parser("show", help="Print stored metadata").add_argument("arxiv_id")
+    args = parser.parse_args()
+
+    if args.command == "import-pdfs":
+        print(f"Imported {paper_store.import_pdf_directory(args.directory)} PDFs")
+    elif args.command == "import-metadata":
+        print(f"Imported {paper_store.import_metadata_dump(args.path)} metadata records")
+    elif args.command == "fetch":
+        for arxiv_id in args.arxiv_ids:
+            try:
+                paper = paper_store.fetch_from_arxiv(arxiv_id)
+                print(f"{arxiv_id}: {'stored' if paper else 'not found'}")
+            except Exception as e:
+                print(f"{arxiv_id}: failed ({e})")
+    elif args.command == "show":
+        print(json.dumps(paper_store.get(args.arxiv_id), indent=2))
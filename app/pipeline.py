@@ -0,0 +1,613 @@
+"""
+Deterministic DAG executor for agent pipelines.
+
+Stages declare their upstream dependencies in code, so ordering and fan-out/fan-in
+are decided by the scheduler instead of a supervisor LLM. A stage starts as soon as
+all of its dependencies have succeeded; independent stages run concurrently.
+Stages with an output schema are validated (and repaired if needed) by app.structured.
+Each run is charged to a RunBudget (app.budget): stages are stopped when it is spent or
+their deadline passes, and dependents of a stopped optional stage still run without it.
+An optional router (app.tiering) picks the model tier per stage call; a small-model answer
+that errors or fails validation is escalated to the stage agent's own model.
+Runs and stages are traced and observed by app.telemetry.
+With a checkpoint (app.checkpoint), each successful stage is saved as it completes and a
+resumed run starts from the stages an earlier attempt already finished.
+"""
+import asyncio
+import contextvars
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from agno.agent import Agent
+from agno.run.base import RunStatus
+from pydantic import BaseModel
+
+from app.budget import RunBudget, budget_scope
+from app.events import emit
+from app.structured import arepair_output, compact, repair_output, validate_output
+from app.telemetry import record_run, record_stage, set_span_status, span
+from app.utils import logger
+
+
+@dataclass
+class PipelineContext:
+    """State shared by every stage of a single pipeline run"""
+    session_id: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    results: Dict[str, "StageResult"] = field(default_factory=dict)
+    budget: RunBudget = field(default_factory=RunBudget.unlimited)
+    # Optional object with load() -> {stage: saved output} and save(result) (see app.checkpoint)
+    checkpoint: Optional[Any] = None
+
+    def output(self, stage_name: str, include: Any = None) -> str:
+        """
+        Content produced by an upstream stage (empty string if it produced nothing).
+        For a validated structured output, `include` limits the JSON to the fields a
+        consumer needs (a Pydantic include spec); Markdown outputs are returned whole.
+        """
+        result = self.results.get(stage_name)
+        if result and result.structured is not None and include is not None:
+            return compact(result.structured, include)
+        return result.content if result and result.content else ""
+
+    def structured(self, stage_name: str) -> Optional[BaseModel]:
+        """Validated structured output of an upstream stage, or None (Markdown mode, failed validation)."""
+        result = self.results.get(stage_name)
+        return result.structured if result else None
+
+
+@dataclass
+class Stage:
+    """A single node of the pipeline DAG"""
+    name: str
+    agent: Agent
+    build_input: Callable[[PipelineContext], str]
+    depends_on: Tuple[str, ...] = ()
+    # Optional object with get(context) -> Optional[str] and put(context, content)
+    cache: Optional[Any] = None
+    # Optional Pydantic schema the agent must answer with (structured mode)
+    output_schema: Optional[Type[BaseModel]] = None
+    # Enrichment stage: if the budget stops it, its dependents run without its output
+    optional: bool = False
+    # Optional check of a successful result; returning a reason ends the run early
+    stop_if: Optional[Callable[["StageResult"], Optional[str]]] = None
+
+
+@dataclass
+class StageResult:
+    """Outcome of one stage execution"""
+    stage: str
+    status: str  # "success" | "error" | "skipped" | "stopped" (by the run budget)
+    content: Optional[str] = None
+    run_output: Any = None
+    started_at: float = 0.0
+    duration: float = 0.0
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    cached: bool = False
+    structured: Optional[BaseModel] = None
+    repaired: bool = False
+    repair_tokens: int = 0
+    tier: Optional[str] = None  # "small" | "large" when the pipeline has a router
+    escalated: bool = False
+    # Tokens of the small-model attempt an escalated stage discarded
+    escalation_tokens: int = 0
+    # Restored from an earlier attempt's checkpoint; resumed_tokens is what it cost then
+    resumed: bool = False
+    resumed_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        metrics = getattr(self.run_output, "metrics", None)
+        return (getattr(metrics, "total_tokens", 0) or 0) + self.repair_tokens + self.escalation_tokens
+
+
+@dataclass
+class PipelineRunOutput:
+    """Aggregated result of a pipeline run, shaped like an agno run output"""
+    pipeline: str
+    session_id: str
+    status: str
+    content: Optional[str]
+    stages: Dict[str, StageResult]
+    duration: float
+    budget: Optional[Dict[str, Any]] = None
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(result.total_tokens for result in self.stages.values())
+
+    @property
+    def stop_reason(self) -> Optional[str]:
+        return self.budget.get("stop_reason") if self.budget else None
+
+    @property
+    def stage_timings(self) -> Dict[str, float]:
+        """Wall time per executed stage in seconds, in pipeline order."""
+        return {name: round(result.duration, 3) for name, result in self.stages.items() if result.started_at}
+
+    @property
+    def failed_stage(self) -> Optional[StageResult]:
+        return next((result for result in self.stages.values() if result.status == "error"), None)
+
+
+class Pipeline:
+    """
+    Runs a fixed set of stages according to their declared dependencies.
+
+    Args:
+        name: Pipeline name used in logs
+        stages: Stages in any order; dependencies must reference other stage names
+        router: Optional object with route(stage, context, prompt) -> Optional[TierDecision]
+            choosing the model of each stage call (see app.tiering)
+    """
+
+    def __init__(self, name: str, stages: List[Stage], router: Optional[Any] = None):
+        self.name = name
+        self.router = router
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError(f"Duplicate stage names in pipeline {name}")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        visiting: set = set()
+
+        def visit(stage_name: str):
+            if stage_name in order:
+                return
+            if stage_name in visiting:
+                raise ValueError(f"Cycle detected in pipeline {self.name} at stage {stage_name}")
+            if stage_name not in self.stages:
+                raise ValueError(f"Unknown stage dependency '{stage_name}' in pipeline {self.name}")
+            visiting.add(stage_name)
+            for dep in self.stages[stage_name].depends_on:
+                visit(dep)
+            visiting.discard(stage_name)
+            order.append(stage_name)
+
+        for stage_name in self.stages:
+            visit(stage_name)
+        return order
+
+    @property
+    def final_stage(self) -> str:
+        return self.order[-1]
+
+    def _dependency_met(self, result: StageResult) -> bool:
+        return result.status == "success" or (result.status == "stopped" and self.stages[result.stage].optional)
+
+    def _next_stages(self, context: PipelineContext, running: set) -> List[str]:
+        """Return stages that are ready to start, marking unreachable ones as skipped (or stopped, once the budget is spent)."""
+        ready = []
+        for stage_name in self.order:
+            if stage_name in context.results or stage_name in running:
+                continue
+            deps = [context.results.get(dep) for dep in self.stages[stage_name].depends_on]
+            if any(dep is not None and not self._dependency_met(dep) for dep in deps):
+                context.results[stage_name] = StageResult(stage=stage_name, status="skipped")
+                logger.warning(f"[{self.name}] Skipping stage {stage_name}: upstream stage did not succeed")
+                emit("stage_skipped", stage=stage_name)
+            elif all(dep is not None for dep in deps):
+                reason = context.budget.exhausted()
+                if reason is None:
+                    ready.append(stage_name)
+                else:
+                    context.results[stage_name] = self._stopped(stage_name, reason, "BudgetExceeded")
+                    self._publish(context.results[stage_name])
+        return ready
+
+    def _stopped(self, stage_name: str, reason: str, error_type: str, started_at: float = 0.0) -> StageResult:
+        logger.warning(f"[{self.name}] Stopping stage {stage_name}: {reason}")
+        return StageResult(
+            stage=stage_name,
+            status="stopped",
+            started_at=started_at,
+            duration=time.perf_counter() - started_at if started_at else 0.0,
+            error=reason,
+            error_type=error_type,
+        )
+
+    def _timed_out(self, context: PipelineContext, stage_name: str, started_at: float) -> Optional[StageResult]:
+        """A stopped result if the stage started at `started_at` is past its deadline."""
+        deadline = context.budget.deadline(started_at)
+        if deadline is None or time.perf_counter() < deadline:
+            return None
+        reason = context.budget.timeout_reason(started_at)
+        context.budget.record("timeout", reason, stage_name)
+        return self._stopped(stage_name, reason, "StageTimeout", started_at)
+
+    @staticmethod
+    def _wait_timeout(context: PipelineContext, started: List[float]) -> Optional[float]:
+        """Seconds until the earliest deadline of the running stages (None if none has one)."""
+        deadlines = [d for d in (context.budget.deadline(s) for s in started) if d is not None]
+        return max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+
+    def _check_stop(self, context: PipelineContext, result: StageResult):
+        stop_if = self.stages[result.stage].stop_if
+        if result.status == "success" and stop_if is not None:
+            reason = stop_if(result)
+            if reason:
+                context.budget.stop(reason, result.stage)
+
+    def _complete(self, context: PipelineContext, result: StageResult):
+        """Record a finished stage, charge its tokens, checkpoint it and apply its early-termination check."""
+        context.results[result.stage] = result
+        self._publish(result)
+        record_stage(self.name, self.stages[result.stage], result, getattr(self.stages[result.stage].agent, "name", None))
+        context.budget.add_tokens(result.stage, result.total_tokens)
+        if context.checkpoint is not None:
+            try:
+                context.checkpoint.save(result)
+            except Exception as e:
+                logger.warning(f"[{self.name}] Checkpoint of stage {result.stage} failed: {e}")
+        self._check_stop(context, result)
+
+    def _resume(self, context: PipelineContext):
+        """Seed the run with the stages its checkpoint saved in an earlier attempt."""
+        if context.checkpoint is None:
+            return
+        for stage_name, saved in context.checkpoint.load().items():
+            stage = self.stages.get(stage_name)
+            if stage is None or stage_name in context.results:
+                continue
+            result = StageResult(
+                stage=stage_name,
+                status="success",
+                content=saved["content"],
+                structured=validate_output(saved["content"], stage.output_schema)[0] if stage.output_schema else None,
+                resumed=True,
+                resumed_tokens=saved["total_tokens"],
+            )
+            context.results[stage_name] = result
+            logger.info(f"[{self.name}] Stage {stage_name} resumed from checkpoint")
+            emit("stage_resumed", stage=stage_name, agent=getattr(stage.agent, "name", None),
+                 content=result.content, tokens_saved=result.resumed_tokens)
+            self._check_stop(context, result)
+
+    def _finish(self, stage: Stage, started_at: float, run_output: Any = None, exc: Exception = None) -> StageResult:
+        duration = time.perf_counter() - started_at
+        if exc is None and getattr(run_output, "status", None) == RunStatus.error:
+            exc = RuntimeError(str(run_output.content))
+        if exc is not None:
+            logger.error(f"[{self.name}] Stage {stage.name} failed after {duration:.2f}s: {exc}")
+            return StageResult(
+                stage=stage.name,
+                status="error",
+                run_output=run_output,
+                started_at=started_at,
+                duration=duration,
+                error=str(exc),
+                error_type=type(exc).__name__,
+            )
+        logger.info(f"[{self.name}] Stage {stage.name} completed in {duration:.2f}s")
+        content = run_output.content if run_output is not None else None
+        return StageResult(
+            stage=stage.name,
+            status="success",
+            content=content if content is None or isinstance(content, str) else str(content),
+            run_output=run_output,
+            started_at=started_at,
+            duration=duration,
+        )
+
+    def _from_cache(self, stage: Stage, context: PipelineContext, started_at: float) -> Optional[StageResult]:
+        if stage.cache is None:
+            return None
+        content = stage.cache.get(context)
+        if content is None:
+            return None
+        logger.info(f"[{self.name}] Stage {stage.name} served from cache")
+        return StageResult(
+            stage=stage.name,
+            status="success",
+            content=content,
+            started_at=started_at,
+            duration=time.perf_counter() - started_at,
+            cached=True,
+            structured=validate_output(content, stage.output_schema)[0] if stage.output_schema else None,
+        )
+
+    def _needs_repair(self, stage: Stage, result: StageResult) -> Optional[str]:
+        """Validate a structured stage's answer; returns the validation errors if it needs repair."""
+        if stage.output_schema is None or result.status != "success":
+            return None
+        result.structured, error = validate_output(result.run_output.content, stage.output_schema)
+        if error is not None:
+            logger.warning(f"[{self.name}] Stage {stage.name} failed {stage.output_schema.__name__} validation, repairing")
+        return error
+
+    def _structured(self, stage: Stage, result: StageResult) -> StageResult:
+        """Swap a validated answer's content for its compact JSON (raw content is kept otherwise)."""
+        if result.structured is not None:
+            result.content = compact(result.structured)
+        elif stage.output_schema is not None and result.status == "success":
+            logger.warning(f"[{self.name}] Stage {stage.name} could not be repaired, passing its raw output on")
+        return result
+
+    def _validate(self, stage: Stage, context: PipelineContext, result: StageResult) -> StageResult:
+        error = self._needs_repair(stage, result)
+        if error is not None:
+            try:
+                result.structured, result.repair_tokens = repair_output(
+                    result.run_output.content, stage.output_schema, error, f"{context.session_id}-{stage.name}-repair"
+                )
+                result.repaired = result.structured is not None
+            except Exception as e:
+                logger.warning(f"[{self.name}] Repair of stage {stage.name} failed: {e}")
+            result.duration = time.perf_counter() - result.started_at
+        return self._structured(stage, result)
+
+    async def _avalidate(self, stage: Stage, context: PipelineContext, result: StageResult) -> StageResult:
+        error = self._needs_repair(stage, result)
+        if error is not None:
+            try:
+                result.structured, result.repair_tokens = await arepair_output(
+                    result.run_output.content, stage.output_schema, error, f"{context.session_id}-{stage.name}-repair"
+                )
+                result.repaired = result.structured is not None
+            except Exception as e:
+                logger.warning(f"[{self.name}] Repair of stage {stage.name} failed: {e}")
+            result.duration = time.perf_counter() - result.started_at
+        return self._structured(stage, result)
+
+    def _publish(self, result: StageResult):
+        """Publish a finished stage to the active event stream."""
+        if result.status == "success":
+            emit(
+                "member_output",
+                stage=result.stage,
+                agent=getattr(self.stages[result.stage].agent, "name", None),
+                content=result.content,
+                duration=round(result.duration, 3),
+                total_tokens=result.total_tokens,
+                cached=result.cached,
+                structured=result.structured is not None,
+                repaired=result.repaired,
+                tier=result.tier,
+                escalated=result.escalated,
+            )
+        elif result.status == "stopped":
+            emit("stage_stopped", stage=result.stage, reason=result.error, error_type=result.error_type)
+        else:
+            emit("stage_error", stage=result.stage, error=result.error, error_type=result.error_type)
+
+    def _store(self, stage: Stage, context: PipelineContext, result: StageResult) -> StageResult:
+        # The cache is keyed on the stage agent's model, so small-tier answers stay out of it
+        if stage.cache is not None and result.status == "success" and result.content and result.tier != "small":
+            stage.cache.put(context, result.content)
+        return result
+
+    def _route(self, stage: Stage, context: PipelineContext, prompt: str) -> Optional[Any]:
+        if self.router is None:
+            return None
+        decision = self.router.route(stage, context, prompt)
+        if decision is not None:
+            logger.info(f"[{self.name}] Stage {stage.name} routed to the {decision.tier} model: {decision.reason}")
+        return decision
+
+    def _escalate(self, stage: Stage, decision: Optional[Any], result: StageResult) -> bool:
+        """Whether a small-model attempt failed and the stage should rerun on its own agent."""
+        if decision is None or decision.tier != "small":
+            return False
+        if result.status != "success":
+            reason = result.error
+        elif stage.output_schema is not None:
+            reason = validate_output(result.run_output.content, stage.output_schema)[1]
+        else:
+            return False
+        if reason is not None:
+            logger.warning(f"[{self.name}] Stage {stage.name} failed on the small model, escalating: {reason}")
+            emit("stage_escalated", stage=stage.name, reason=reason)
+        return reason is not None
+
+    @staticmethod
+    def _tiered(result: StageResult, decision: Optional[Any], attempt: Optional[StageResult] = None) -> StageResult:
+        if decision is not None:
+            result.tier = decision.tier
+        if attempt is not None:
+            result.tier, result.escalated, result.escalation_tokens = "large", True, attempt.total_tokens
+        return result
+
+    def _call(self, agent: Agent, stage: Stage, context: PipelineContext, prompt: str, started_at: float) -> StageResult:
+        try:
+            run_output = agent.run(
+                prompt,
+                session_id=f"{context.session_id}-{stage.name}",
+                stream=False,
+                output_schema=stage.output_schema,
+            )
+        except Exception as e:
+            return self._finish(stage, started_at, exc=e)
+        return self._finish(stage, started_at, run_output=run_output)
+
+    async def _acall(self, agent: Agent, stage: Stage, context: PipelineContext, prompt: str,
+                     started_at: float) -> StageResult:
+        try:
+            run_output = await agent.arun(
+                prompt,
+                session_id=f"{context.session_id}-{stage.name}",
+                stream=False,
+                output_schema=stage.output_schema,
+            )
+        except Exception as e:
+            return self._finish(stage, started_at, exc=e)
+        return self._finish(stage, started_at, run_output=run_output)
+
+    def _stage_span(self, stage: Stage, context: PipelineContext):
+        return span(f"stage {stage.name}", **{
+            "pipeline": self.name,
+            "session.id": context.session_id,
+            "agno.agent": getattr(stage.agent, "name", None),
+        })
+
+    @staticmethod
+    def _end_stage_span(current: Any, result: StageResult):
+        metrics = getattr(result.run_output, "metrics", None)
+        set_span_status(
+            current, result.status == "success", result.error,
+            status=result.status,
+            cached=result.cached,
+            tier=result.tier,
+            escalated=result.escalated,
+            repaired=result.repaired,
+            **{"tokens.input": getattr(metrics, "input_tokens", None),
+               "tokens.output": getattr(metrics, "output_tokens", None)},
+        )
+
+    def _run_stage(self, stage: Stage, context: PipelineContext) -> StageResult:
+        with self._stage_span(stage, context) as current:
+            result = self._execute_stage(stage, context)
+            self._end_stage_span(current, result)
+        return result
+
+    async def _arun_stage(self, stage: Stage, context: PipelineContext) -> StageResult:
+        with self._stage_span(stage, context) as current:
+            result = await self._aexecute_stage(stage, context)
+            self._end_stage_span(current, result)
+        return result
+
+    def _execute_stage(self, stage: Stage, context: PipelineContext) -> StageResult:
+        started_at = time.perf_counter()
+        emit("stage_start", stage=stage.name, agent=getattr(stage.agent, "name", None))
+        cached = self._from_cache(stage, context, started_at)
+        if cached is not None:
+            return cached
+        logger.info(f"[{self.name}] Starting stage {stage.name}")
+        try:
+            prompt = stage.build_input(context)
+            decision = self._route(stage, context, prompt)
+        except Exception as e:
+            return self._finish(stage, started_at, exc=e)
+        result = self._call(getattr(decision, "agent", None) or stage.agent, stage, context, prompt, started_at)
+        if self._escalate(stage, decision, result):
+            result = self._tiered(self._call(stage.agent, stage, context, prompt, started_at), decision, result)
+        else:
+            result = self._tiered(result, decision)
+        return self._store(stage, context, self._validate(stage, context, result))
+
+    async def _aexecute_stage(self, stage: Stage, context: PipelineContext) -> StageResult:
+        started_at = time.perf_counter()
+        emit("stage_start", stage=stage.name, agent=getattr(stage.agent, "name", None))
+        cached = self._from_cache(stage, context, started_at)
+        if cached is not None:
+            return cached
+        logger.info(f"[{self.name}] Starting stage {stage.name} (async)")
+        try:
+            # Input builders may read local stores (e.g. the idea index), so off the event loop
+            prompt = await asyncio.to_thread(stage.build_input, context)
+            decision = self._route(stage, context, prompt)
+        except Exception as e:
+            return self._finish(stage, started_at, exc=e)
+        result = await self._acall(getattr(decision, "agent", None) or stage.agent, stage, context, prompt, started_at)
+        if self._escalate(stage, decision, result):
+            result = self._tiered(await self._acall(stage.agent, stage, context, prompt, started_at), decision, result)
+        else:
+            result = self._tiered(result, decision)
+        return self._store(stage, context, await self._avalidate(stage, context, result))
+
+    def _output(self, context: PipelineContext, started_at: float) -> PipelineRunOutput:
+        results = {name: context.results[name] for name in self.order if name in context.results}
+        final = results.get(self.final_stage)
+        # Optional stages stopped by the budget degrade a run without failing it
+        success = final is not None and final.status == "success" and all(
+            self._dependency_met(result) for result in results.values()
+        )
+        output = PipelineRunOutput(
+            pipeline=self.name,
+            session_id=context.session_id,
+            status="success" if success else "error",
+            content=final.content if final else None,
+            stages=results,
+            duration=time.perf_counter() - started_at,
+            budget=context.budget.summary(),
+        )
+        record_run(self.name, output.status, output.duration)
+        return output
+
+    def _run_span(self, context: PipelineContext):
+        return span(f"pipeline {self.name}", **{"pipeline": self.name, "session.id": context.session_id})
+
+    @staticmethod
+    def _end_run_span(current: Any, output: PipelineRunOutput):
+        set_span_status(current, output.status == "success", output.stop_reason,
+                        total_tokens=output.total_tokens, stop_reason=output.stop_reason)
+
+    def run(self, context: PipelineContext) -> PipelineRunOutput:
+        """Execute the pipeline synchronously, running independent stages in threads."""
+        started_at = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=len(self.stages), thread_name_prefix=self.name)
+        futures: Dict[Future, Tuple[str, float]] = {}
+        try:
+            with self._run_span(context) as run_span, budget_scope(context.budget):
+                self._resume(context)
+                while True:
+                    for stage_name in self._next_stages(context, {name for name, _ in futures.values()}):
+                        # Copy the context so per-run scopes (e.g. the tool memo) reach worker threads
+                        stage_context = contextvars.copy_context()
+                        future = executor.submit(stage_context.run, self._run_stage, self.stages[stage_name], context)
+                        futures[future] = (stage_name, time.perf_counter())
+                    if not futures:
+                        break
+                    timeout = self._wait_timeout(context, [started for _, started in futures.values()])
+                    done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        futures.pop(future)
+                        self._complete(context, future.result())
+                    for future, (stage_name, stage_started) in list(futures.items()):
+                        stopped = self._timed_out(context, stage_name, stage_started)
+                        if stopped is not None:
+                            futures.pop(future)
+                            self._complete(context, stopped)
+                output = self._output(context, started_at)
+                self._end_run_span(run_span, output)
+        finally:
+            # A thread cannot be interrupted: a timed-out stage's worker finishes in the
+            # background and its result is discarded, so don't wait for it here
+            executor.shutdown(wait=False, cancel_futures=True)
+        return output
+
+    async def _aprefetch_sessions(self, context: PipelineContext):
+        """Read the stage sessions off the event loop before agno reads them on it (see app.session_store)."""
+        dbs = {id(db): db for db in (getattr(stage.agent, "db", None) for stage in self.stages.values())
+               if hasattr(db, "aprefetch_sessions")}
+        session_ids = [f"{context.session_id}-{name}" for name in self.order]
+        for db in dbs.values():
+            try:
+                await db.aprefetch_sessions(session_ids)
+            except Exception as e:
+                logger.warning(f"[{self.name}] Session prefetch failed, stages read their sessions directly: {e}")
+
+    async def arun(self, context: PipelineContext) -> PipelineRunOutput:
+        """Execute the pipeline on the running event loop, running independent stages concurrently."""
+        started_at = time.perf_counter()
+        tasks: Dict[asyncio.Task, Tuple[str, float]] = {}
+        await self._aprefetch_sessions(context)
+        with self._run_span(context) as run_span, budget_scope(context.budget):
+            self._resume(context)
+            while True:
+                for stage_name in self._next_stages(context, {name for name, _ in tasks.values()}):
+                    task = asyncio.create_task(self._arun_stage(self.stages[stage_name], context))
+                    tasks[task] = (stage_name, time.perf_counter())
+                if not tasks:
+                    break
+                timeout = self._wait_timeout(context, [started for _, started in tasks.values()])
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tasks.pop(task)
+                    self._complete(context, task.result())
+                cancelled = []
+                for task, (stage_name, stage_started) in list(tasks.items()):
+                    stopped = self._timed_out(context, stage_name, stage_started)
+                    if stopped is not None:
+                        tasks.pop(task)
+                        task.cancel()
+                        cancelled.append(task)
+                        self._complete(context, stopped)
+                await asyncio.gather(*cancelled, return_exceptions=True)
+            output = self._output(context, started_at)
+            self._end_run_span(run_span, output)
+        return output
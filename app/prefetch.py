@@ -0,0 +1,139 @@
+"""
+Speculative paper prefetch at the start of a pipeline run.
+
+A run does nothing with its arXiv ID until PaperAnalyzer's model turn asks for the paper,
+and then the first read may have to download the metadata and PDF from arXiv. PaperPrefetch
+makes that first call itself, read_local_paper(arxiv_id) as the analyzer's instructions
+spell it, in a background thread the moment the ID is validated. With auto-ingest the read
+fetches the metadata, abstract and PDF text into the local store and builds the retrieval
+index. The result lands in the run's tool memo, so the analyzer's call is a memo hit, or it
+coalesces with the in-flight fetch and waits only for the rest. When paper_analysis will
+be served from the analysis cache, the analyzer never asks for the paper, so the prefetch
+checks that first (`skip_if`) and fetches nothing.
+
+report() says how much fetch time the prefetch hid from the run. That is the part of the
+fetch done before the analyzer asked, and it is also observed in
+paper2saas_prefetch_hidden_seconds. A prefetch still running when its run ends or is
+aborted is cancelled and its result discarded. A download in progress can't be
+interrupted, but it no longer serves anything.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from app.config import AgentConfig
+from app.recording import recording_tool_hook
+from app.telemetry import record_prefetch
+from app.tools.memo import ToolMemo
+from app.utils import logger
+
+PREFETCH_TOOL = "read_local_paper"
+
+
+class PaperPrefetch:
+    """
+    Background read of a run's paper into its tool memo.
+
+    Args:
+        arxiv_id: The run's validated arXiv ID
+        memo: The run's tool memo (see app.tools.memo.tool_memo_scope)
+        skip_if: Called in the background thread before fetching; True means the run
+            won't read the paper (its analysis is cached) and the prefetch is skipped
+    """
+
+    def __init__(self, arxiv_id: str, memo: ToolMemo, skip_if: Optional[Callable[[], bool]] = None):
+        self.arxiv_id = arxiv_id
+        self.memo = memo
+        self.skip_if = skip_if
+        self.arguments = {"arxiv_id": arxiv_id}
+        self.status = "pending"
+        self.outcome: Optional[str] = None  # how the analyzer's call was served
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.requested_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._cancelled = threading.Event()
+
+    def start(self) -> "PaperPrefetch":
+        self.memo.watch(PREFETCH_TOOL, self.arguments, self._requested)
+        self.started_at = time.perf_counter()
+        # A copied context carries the run's recording or replay scope into the thread
+        self._thread = threading.Thread(
+            target=contextvars.copy_context().run, args=(self._fetch,), name=f"prefetch-{self.arxiv_id}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def _requested(self, outcome: str):
+        if threading.current_thread() is self._thread:
+            # The analyzer asked before the prefetch got going; the prefetch rode on its call
+            self.status = "late"
+            return
+        self.requested_at = time.perf_counter()
+        self.outcome = outcome
+
+    def _fetch(self):
+        if self._cancelled.is_set():
+            return
+        from app.tools.registry import get_toolkit
+
+        try:
+            if self.skip_if is not None and self.skip_if():
+                self.status = "skipped"
+                return
+            self.status = "running"
+            read_local_paper = get_toolkit("local_papers").read_local_paper
+            self.memo.call(
+                PREFETCH_TOOL, self.arguments,
+                lambda: recording_tool_hook(PREFETCH_TOOL, read_local_paper, self.arguments),
+            )
+            if self.status == "running":
+                self.status = "cancelled" if self._cancelled.is_set() else "done"
+        except Exception as e:
+            self.status = "failed"
+            logger.warning(f"Prefetch of {self.arxiv_id} failed, PaperAnalyzer will fetch it itself: {e}")
+        finally:
+            self.finished_at = time.perf_counter()
+
+    def cancel(self):
+        """Stop a prefetch that has not finished; its result is no longer needed."""
+        if self.finished_at is None:
+            self._cancelled.set()
+            if self.status in ("pending", "running"):
+                self.status = "cancelled"
+
+    def report(self) -> Dict[str, Any]:
+        """Fetch time, and how much of it the run did not wait for."""
+        fetch_seconds = None
+        if self.finished_at is not None and self.status != "skipped":
+            fetch_seconds = self.finished_at - self.started_at
+        hidden = waited = 0.0
+        if self.requested_at is not None:
+            ready_at = self.finished_at if self.finished_at is not None else self.requested_at
+            hidden = min(self.requested_at, ready_at) - self.started_at
+            waited = max(0.0, ready_at - self.requested_at)
+        return {
+            "status": self.status,
+            "used": self.requested_at is not None,
+            "outcome": self.outcome,
+            "fetch_seconds": None if fetch_seconds is None else round(fetch_seconds, 3),
+            "hidden_seconds": round(hidden, 3),
+            "waited_seconds": round(waited, 3),
+        }
+
+
+@contextmanager
+def paper_prefetch(arxiv_id: str, memo: ToolMemo,
+                   skip_if: Optional[Callable[[], bool]] = None) -> Iterator[Optional[PaperPrefetch]]:
+    """Prefetch `arxiv_id` for the duration of a run (None when PAPER_PREFETCH_ENABLED is off)."""
+    if not (AgentConfig.PAPER_PREFETCH_ENABLED and AgentConfig.TOOL_MEMO_ENABLED):
+        yield None
+        return
+    prefetch = PaperPrefetch(arxiv_id, memo, skip_if).start()
+    try:
+        yield prefetch
+    finally:
+        prefetch.cancel()
+        record_prefetch(prefetch.report())
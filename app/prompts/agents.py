@@ -4,11 +4,14 @@ PAPER_ANALYZER_INSTRUCTIONS = """
     ## TOOL FALLBACK PROTOCOL (MANDATORY - Execute in Order)
     You MUST attempt tools in this exact sequence until one succeeds:
 
-    1. **PRIMARY**: ArxivTools.search_arxiv(query="{arxiv_id}")
-    2. **FALLBACK 1**: If ArxivTools returns empty/error → FirecrawlTools.scrape(url="https://arxiv.org/abs/{arxiv_id}")
-    3. **FALLBACK 2**: If Firecrawl fails → WebsiteTools.read_url(url="https://arxiv.org/abs/{arxiv_id}")
-    4. **FALLBACK 3**: If WebsiteTools fails → BaiduSearchTools.search(query="arxiv {arxiv_id} paper abstract authors")
-    5. **FINAL**: If ALL tools fail → Set confidence_score=0.0 and return with tool_failures populated
+    1. **PRIMARY**: LocalPaperTools.read_local_paper(arxiv_id="{arxiv_id}")
+       - If it returns a section outline, read the body with LocalPaperTools.search_local_paper
+         (one call per reading pass, see below) instead of asking for the full text
+    2. **FALLBACK 1**: If not found locally → ArxivTools.search_arxiv(query="{arxiv_id}")
+    3. **FALLBACK 2**: If ArxivTools returns empty/error → FirecrawlTools.scrape(url="https://arxiv.org/abs/{arxiv_id}")
+    4. **FALLBACK 3**: If Firecrawl fails → WebsiteTools.read_url(url="https://arxiv.org/abs/{arxiv_id}")
+    5. **FALLBACK 4**: If WebsiteTools fails → BaiduSearchTools.search(query="arxiv {arxiv_id} paper abstract authors")
+    6. **FINAL**: If ALL tools fail → Set confidence_score=0.0 and return with tool_failures populated
 
     Log each attempt:
     - "ATTEMPTING: [tool_name] with [query/url]"
@@ -74,7 +77,8 @@ PAPER_ANALYZER_INSTRUCTIONS = """
     - Claiming capabilities not described in paper
     
     ## The Multi-Pass Reading Strategy
-Never read from the first word to the last in one sitting. Instead, take multiple passes:
+Never read from the first word to the last in one sitting. Instead, take multiple passes.
+When the paper is in the local store, each pass is one search_local_paper call with reading_pass set to the pass number and a query naming what that pass needs (e.g. pass 3: "method architecture training setup experimental results"):
 
 Pass 1: Read the title, abstract, and figures. In deep learning papers, one or two key figures often summarize the entire work. This quick scan gives you the paper’s essence without reading dense text.
 
@@ -812,3 +816,14 @@ You are the Roast Supervisor. Coordinate critical analysis without performing it
 - If members found no issues, report honestly
 - Weight Critical issues heavily in verdict
 """
+
+OUTPUT_REPAIRER_INSTRUCTIONS = """
+    You repair JSON answers that failed schema validation. You do not research or add content.
+
+    ## RULES
+    - Return ONLY the corrected JSON object, matching the requested schema exactly
+    - Keep every value from the original answer that is valid; change only what the errors name
+    - If the original is Markdown or prose, transfer its facts into the schema fields
+    - Missing required facts: use "Not stated" for text, [] for lists, 0.0 for scores
+    - Never invent sources, metrics or names that are not in the original answer
+"""
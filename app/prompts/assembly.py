@@ -0,0 +1,235 @@
+"""
+Prompt assembly: the instructions every agent and team is built with, and what they cost.
+
+The instruction texts in app.prompts.agents are resent as the system message on every model
+call, including every iteration of a tool loop. Providers cache a repeated prompt prefix, but
+only a byte-identical one, so the assembled system message must not change between calls:
+
+- instructions are rendered once per process (PROMPT_VARIANT) and never carry run data;
+  the run's arXiv ID and inputs go in the user message;
+- the source indentation of the triple-quoted constants is removed and blank lines are
+  collapsed ("full" keeps every word);
+- teams get today's date at the end of their instructions instead of agno's
+  `add_datetime_to_context`, whose timestamp changed the system message on every call.
+
+The "compact" variant also rewrites or drops sections that are prose for a human reader
+rather than rules for the model (COMPACT_EDITS): the multi-pass reading essay, search
+strategies that repeat the execution protocol, output requirements that repeat the report
+structure. Select it per deployment with PROMPT_VARIANT=compact.
+
+prompt_report() gives each agent's static prompt tokens per call (system message and tool
+definitions) and whether that prefix is stable across runs:
+
+    python -m app.prompts.assembly [--variant compact] [--agents paper_analyzer,...]
+"""
+import argparse
+import hashlib
+import json
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import AgentConfig
+from app.prompts import agents as prompts
+
+PROMPT_VARIANTS = ("full", "compact")
+
+# Component name (app.registry) -> instructions
+INSTRUCTIONS: Dict[str, str] = {
+    "paper_analyzer": prompts.PAPER_ANALYZER_INSTRUCTIONS,
+    "market_researcher": prompts.MARKET_RESEARCHER_INSTRUCTIONS,
+    "idea_generator": prompts.IDEA_GENERATOR_INSTRUCTIONS,
+    "validation_researcher": prompts.VALIDATION_RESEARCHER_INSTRUCTIONS,
+    "strategic_advisor": prompts.STRATEGIC_ADVISOR_INSTRUCTIONS,
+    "report_generator": prompts.REPORT_GENERATOR_INSTRUCTIONS,
+    "product_engineer": prompts.PRODUCT_ENGINEER_INSTRUCTIONS,
+    "fact_checker": prompts.FACT_CHECKER_INSTRUCTIONS,
+    "devils_advocate": prompts.DEVILS_ADVOCATE_INSTRUCTIONS,
+    "market_skeptic": prompts.MARKET_SKEPTIC_INSTRUCTIONS,
+    "output_repairer": prompts.OUTPUT_REPAIRER_INSTRUCTIONS,
+    "paper2saas_team": prompts.PAPER2SAAS_TEAM_INSTRUCTIONS,
+    "idea_roaster_team": prompts.IDEA_ROASTER_TEAM_INSTRUCTIONS,
+}
+
+# Compact variant: heading -> replacement section (None drops the section and its subsections)
+COMPACT_EDITS: Dict[str, Dict[str, Optional[str]]] = {
+    "paper_analyzer": {
+        "The Multi-Pass Reading Strategy": """## READING PASSES
+Read in passes, never front to back in one go. With the paper in the local store, each pass is one search_local_paper call with reading_pass set to the pass number and a query naming what that pass needs (e.g. pass 3: "method architecture training setup experimental results"):
+1. Title, abstract and key figures
+2. Introduction and conclusion; skim the rest
+3. The body without the math: concepts and experimental results
+4. Everything; move on from parts that stay unclear""",
+        "Key Questions to Answer": """## KEY QUESTIONS
+Your analysis must answer: what the authors tried to accomplish, the key elements of the approach, what is reusable, and which references to follow.""",
+    },
+    "product_engineer": {
+        "GITHUB SEARCH STRATEGIES": """## EXTRA SEARCH QUERIES
+- ML/AI papers: "github awesome [model_type] stars:>1000", "paperswithcode [paper_title]", "huggingface [technique]"
+- Infrastructure/tools: "github [tool_category] production stars:>500", "awesome [domain] infrastructure"
+- Algorithms: "github [algorithm_name] implementation"
+""",
+        "OUTPUT REQUIREMENTS": """## OUTPUT REQUIREMENTS
+- At least 1 verified GitHub repo (aim for 3-5, one with 100+ stars if available); with none, confidence_level = "LOW". List every search query used
+- Recommended repo: highest stars * relevance_score, with the reason
+- 5-8 implementation components, each referencing GitHub code where possible, with realistic hour estimates that sum to an MVP in 4-8 weeks
+- Tech stack choices justified by the analyzed repos (e.g. "React (used in 3/5 analyzed repos)")
+- Honest challenges: gaps between paper and repos, missing implementations, scale/performance""",
+        "QUALITY GATES": None,
+    },
+}
+
+HEADING = re.compile(r"^(#{1,6}) +(.+?) *$")
+
+
+def normalize(text: str) -> str:
+    """Remove the constant's source indentation and trailing spaces, and collapse blank lines."""
+    lines = [line.rstrip() for line in text.strip("\n").splitlines()]
+    first = next((line for line in lines if line), "")
+    base = len(first) - len(first.lstrip(" "))
+    lines = [line[min(base, len(line) - len(line.lstrip(" "))):] for line in lines]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _sections(lines: List[str]) -> List[tuple]:
+    """(level, title, start line) of the Markdown headings outside code fences."""
+    found, fenced = [], False
+    for index, line in enumerate(lines):
+        if line.lstrip().startswith("```"):
+            fenced = not fenced
+            continue
+        match = None if fenced else HEADING.match(line)
+        if match:
+            found.append((len(match.group(1)), match.group(2), index))
+    return found
+
+
+def compact(text: str, edits: Dict[str, Optional[str]]) -> str:
+    """Apply section edits to normalized instructions. A section runs to the next heading of its level or above."""
+    lines = text.splitlines()
+    sections = _sections(lines)
+    replaced = []
+    for position, (level, title, start) in enumerate(sections):
+        if title not in edits:
+            continue
+        end = next((s for lv, _, s in sections[position + 1:] if lv <= level), len(lines))
+        replaced.append((start, end, edits[title]))
+    for start, end, replacement in sorted(replaced, reverse=True):
+        lines[start:end] = [] if replacement is None else replacement.splitlines() + [""]
+    return normalize("\n".join(lines))
+
+
+@lru_cache(maxsize=None)
+def _render(name: str, variant: str) -> str:
+    text = normalize(INSTRUCTIONS[name])
+    return compact(text, COMPACT_EDITS.get(name, {})) if variant == "compact" else text
+
+
+def instructions(name: str, variant: Optional[str] = None) -> str:
+    """
+    Instructions of the agent or team `name`, rendered once per variant.
+
+    Args:
+        name: Component name (see INSTRUCTIONS)
+        variant: "full" or "compact" (PROMPT_VARIANT by default)
+    """
+    variant = variant or AgentConfig.PROMPT_VARIANT
+    if variant not in PROMPT_VARIANTS:
+        raise ValueError(f"Unknown prompt variant '{variant}'. Available: {PROMPT_VARIANTS}")
+    return _render(name, variant)
+
+
+def dated_instructions(name: str, variant: Optional[str] = None) -> Callable[[], str]:
+    """Team instructions ending with today's date, so the system message changes once a day, not per call."""
+    text = instructions(name, variant)
+
+    def _with_date() -> str:
+        return f"{text}\n\nToday's date is {date.today().isoformat()}."
+
+    return _with_date
+
+
+def _tool_definitions(component: Any) -> List[Dict[str, Any]]:
+    from agno.tools.function import Function
+    from agno.tools.toolkit import Toolkit
+
+    definitions = []
+    for tool in getattr(component, "tools", None) or []:
+        functions = tool.functions.values() if isinstance(tool, Toolkit) else [tool] if isinstance(tool, Function) else []
+        for function in functions:
+            function = function.model_copy(deep=True)
+            function.process_entrypoint()
+            definitions.append(function.to_dict())
+    return definitions
+
+
+def system_prefix(component: Any, session_id: str = "prompt-report") -> str:
+    """The system message agno builds for `component` with no run data: the prefix of every call."""
+    from agno.session import AgentSession, TeamSession
+    from agno.team import Team
+
+    session_cls = TeamSession if isinstance(component, Team) else AgentSession
+    message = component.get_system_message(session=session_cls(session_id=session_id))
+    text = message.content if message is not None else ""
+    for tool in getattr(component, "tools", None) or []:
+        if getattr(tool, "add_instructions", False) and getattr(tool, "instructions", None):
+            text += f"{tool.instructions}\n"
+    return text
+
+
+def prompt_report(names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Static prompt tokens per call of each component, as built in this process.
+
+    Args:
+        names: Component names (all of INSTRUCTIONS by default)
+
+    Returns:
+        One dict per component: instruction, system message and tool-definition tokens,
+        their sum, a hash of the prefix, and whether two sessions got the same prefix
+    """
+    from app.registry import COMPONENTS, get_component, import_object
+    from app.retrieval import estimate_tokens
+
+    rows = []
+    for name in names or list(INSTRUCTIONS):
+        # The output repairer is internal to app.structured and not registered
+        component = get_component(name) if name in COMPONENTS else import_object(f"app.agents.{name}:{name}")
+        prefix = system_prefix(component)
+        tools = json.dumps(_tool_definitions(component), sort_keys=True)
+        system_tokens, tool_tokens = estimate_tokens(prefix), estimate_tokens(tools) if tools != "[]" else 0
+        rows.append({
+            "name": name,
+            "agent": component.name,
+            "variant": AgentConfig.PROMPT_VARIANT,
+            "instruction_tokens": estimate_tokens(instructions(name)),
+            "system_tokens": system_tokens,
+            "tool_tokens": tool_tokens,
+            "static_tokens": system_tokens + tool_tokens,
+            "prefix_hash": hashlib.sha256((prefix + tools).encode()).hexdigest()[:12],
+            "stable": system_prefix(component, session_id="prompt-report-2") == prefix,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Static prompt tokens per agent call")
+    parser.add_argument("--variant", choices=PROMPT_VARIANTS, help="Overrides PROMPT_VARIANT")
+    parser.add_argument("--agents", default="all", help="Comma-separated component names")
+    args = parser.parse_args()
+    if args.variant:
+        AgentConfig.PROMPT_VARIANT = args.variant
+
+    selected = {n.strip() for n in args.agents.split(",")}
+    unknown = selected - set(INSTRUCTIONS) - {"all"}
+    if unknown:
+        parser.error(f"Unknown agents {sorted(unknown)}. Available: {list(INSTRUCTIONS)}")
+    report = prompt_report([n for n in INSTRUCTIONS if "all" in selected or n in selected])
+    print(f"| {'agent':<21} | {'variant':<7} | {'instructions':>12} | {'system':>6} | {'tools':>5} | "
+          f"{'static/call':>11} | {'prefix':<12} | stable |")
+    print(f"|{'-' * 23}|{'-' * 9}|{'-' * 13}:|{'-' * 7}:|{'-' * 6}:|{'-' * 12}:|{'-' * 14}|--------|")
+    for row in report:
+        print(f"| {row['agent']:<21} | {row['variant']:<7} | {row['instruction_tokens']:>12} | "
+              f"{row['system_tokens']:>6} | {row['tool_tokens']:>5} | {row['static_tokens']:>11} | "
+              f"{row['prefix_hash']:<12} | {'yes' if row['stable'] else 'no':<6} |")
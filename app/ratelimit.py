@@ -0,0 +1,84 @@
+"""
+Process-wide, per-provider request rate limiting.
+
+Limits are shared by every agent and every concurrent run in the process, so a
+batch of papers cannot exceed the provider quota no matter how many runs are in flight.
+Works from both threads (sync tool calls) and the event loop (async model calls).
+"""
+import asyncio
+import threading
+import time
+from typing import Callable, Dict
+
+from app.config import AgentConfig
+
+
+class RateLimiter:
+    """
+    Spaces requests evenly so that at most `requests_per_minute` start per minute.
+
+    Args:
+        name: Provider name (used for stats)
+        requests_per_minute: Allowed request rate; 0 disables limiting
+    """
+
+    def __init__(self, name: str, requests_per_minute: int):
+        self.name = name
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self.requests = 0
+        self.waited_seconds = 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Claim the next free slot and return how long the caller must wait for it."""
+        with self._lock:
+            self.requests += 1
+            if self.interval == 0:
+                return 0.0
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+            delay = slot - now
+            self.waited_seconds += delay
+            return delay
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "waited_seconds": round(self.waited_seconds, 3)}
+
+
+rate_limiters: Dict[str, RateLimiter] = {
+    "mistral": RateLimiter("mistral", AgentConfig.MISTRAL_REQUESTS_PER_MINUTE),
+    "firecrawl": RateLimiter("firecrawl", AgentConfig.FIRECRAWL_REQUESTS_PER_MINUTE),
+}
+
+# Tool function name -> provider whose quota the call consumes
+TOOL_PROVIDERS = {
+    "scrape_website": "firecrawl",
+    "crawl_website": "firecrawl",
+    "map_website": "firecrawl",
+    "search_web": "firecrawl",
+}
+
+
+def rate_limit_tool_hook(function_name: str, function_call: Callable, arguments: dict):
+    """Agno tool hook that waits for the provider's rate limiter before each call."""
+    provider = TOOL_PROVIDERS.get(function_name)
+    if provider is not None:
+        rate_limiters[provider].acquire()
+    return function_call(**arguments)
+
+
+def rate_limit_stats() -> dict:
+    return {name: limiter.stats() for name, limiter in rate_limiters.items()}
@@ -0,0 +1,475 @@
+"""
+Record/replay of full team and pipeline runs.
+
+A recording captures every model request/response and tool call of a live run, with
+timings, into a compact gzipped JSON-lines file. Replay feeds it back through the same
+Team and Agent objects. Agents are built on ReplayMistralChat, which answers each request
+with the next recorded response of its agent or team. The tool hook returns recorded
+results without calling the tool, so a replay makes no network calls. It can reproduce
+the recorded latencies (to profile orchestration overhead or compare framework versions)
+or run instantly. Each replayed request is fingerprinted against the recorded one, so
+prompt edits in app/prompts show up as divergences.
+
+Usage:
+    python -m app.recording record paper2saas_team "Analyze arXiv paper 2512.24991v1"
+    python -m app.recording record pipeline 2512.24991v1 -o tmp/recordings/pipeline.jsonl.gz
+    python -m app.recording replay tmp/recordings/pipeline.jsonl.gz [--instant]
+    python -m app.recording show tmp/recordings/pipeline.jsonl.gz
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from agno.models.message import Message
+from agno.models.metrics import Metrics
+from agno.models.response import ModelResponse
+
+from app.config import AgentConfig
+from app.mock import MockMistralChat
+from app.tools.memo import make_memo_key
+
+# Volatile parts of prompts (the team's datetime context, session IDs) left out of fingerprints
+VOLATILE = re.compile(
+    r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?|"
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+)
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(VOLATILE.sub("~", text).encode("utf-8")).hexdigest()[:16]
+
+
+def request_fingerprint(messages: List[Message]) -> Dict[str, str]:
+    """Hashes of a request's system prompt and of the rest of its conversation."""
+    system = "\n".join(m.get_content_string() or "" for m in messages if m.role == "system")
+    conversation = "\n".join(f"{m.role}:{m.get_content_string() or ''}" for m in messages if m.role != "system")
+    return {"system": _hash(system), "input": _hash(conversation)}
+
+
+def _owner(run_response: Any) -> str:
+    return getattr(run_response, "agent_name", None) or getattr(run_response, "team_name", None) or "default"
+
+
+def dump_response(response: ModelResponse) -> Dict[str, Any]:
+    usage = response.response_usage
+    content = response.content
+    return {
+        "content": content if content is None or isinstance(content, str) else json.dumps(content, default=str),
+        "tool_calls": response.tool_calls or [],
+        "usage": [usage.input_tokens, usage.output_tokens] if usage is not None else None,
+    }
+
+
+def load_response(data: Dict[str, Any]) -> ModelResponse:
+    response = ModelResponse(role="assistant", content=data.get("content"), tool_calls=list(data.get("tool_calls") or []))
+    if data.get("usage"):
+        input_tokens, output_tokens = data["usage"]
+        response.response_usage = Metrics(
+            input_tokens=input_tokens, output_tokens=output_tokens, total_tokens=input_tokens + output_tokens
+        )
+    return response
+
+
+class Recording:
+    """
+    Model requests and tool calls of one run, in the order they completed.
+
+    Args:
+        meta: What was run (target, input, timestamps); the result is added on save
+        entries: Recorded entries, when loading a file
+    """
+
+    def __init__(self, meta: Optional[Dict[str, Any]] = None, entries: Optional[List[Dict[str, Any]]] = None):
+        self.meta: Dict[str, Any] = meta or {}
+        self.entries: List[Dict[str, Any]] = entries or []
+        self._sequence: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add_model(self, model_id: str, messages: List[Message], run_response: Any, response: ModelResponse,
+                  seconds: float):
+        owner = _owner(run_response)
+        with self._lock:
+            self.entries.append({
+                "kind": "model",
+                "owner": owner,
+                "seq": self._sequence[owner],
+                "model": model_id,
+                "request": request_fingerprint(messages),
+                "response": dump_response(response),
+                "seconds": round(seconds, 4),
+            })
+            self._sequence[owner] += 1
+
+    def add_tool(self, function_name: str, arguments: dict, result: Any, seconds: float, error: Optional[str] = None):
+        entry = {
+            "kind": "tool",
+            "tool": function_name,
+            "key": make_memo_key(function_name, arguments),
+            "result": result if result is None or isinstance(result, str) else json.dumps(result, default=str),
+            "seconds": round(seconds, 4),
+        }
+        if error is not None:
+            entry["error"] = error
+        with self._lock:
+            self.entries.append(entry)
+
+    def summary(self) -> Dict[str, Any]:
+        models = [e for e in self.entries if e["kind"] == "model"]
+        tools = [e for e in self.entries if e["kind"] == "tool"]
+        return {
+            "model_requests": len(models),
+            "tool_calls": len(tools),
+            "model_seconds": round(sum(e["seconds"] for e in models), 3),
+            "tool_seconds": round(sum(e["seconds"] for e in tools), 3),
+            "tokens": sum(sum(e["response"]["usage"] or [0]) for e in models),
+            "owners": sorted({e["owner"] for e in models}),
+        }
+
+    def save(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for line in [{"kind": "meta", **self.meta}, *self.entries]:
+                f.write(json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n")
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        meta = next((line for line in lines if line["kind"] == "meta"), {})
+        meta = {k: v for k, v in meta.items() if k != "kind"}
+        return cls(meta=meta, entries=[line for line in lines if line["kind"] != "meta"])
+
+
+class Replay:
+    """
+    Serves a recording back: model responses per agent/team in order, tool results by call.
+
+    Args:
+        recording: The recording to replay
+        timing: Sleep for the recorded model and tool latencies (False replays instantly)
+    """
+
+    def __init__(self, recording: Recording, timing: bool = True):
+        self.recording = recording
+        self.timing = timing
+        self._models: Dict[str, Deque[dict]] = defaultdict(deque)
+        self._tools: Dict[str, Deque[dict]] = defaultdict(deque)
+        self._tools_by_name: Dict[str, Deque[dict]] = defaultdict(deque)
+        for entry in recording.entries:
+            if entry["kind"] == "model":
+                self._models[entry["owner"]].append(entry)
+            elif entry["kind"] == "tool":
+                self._tools[entry["key"]].append(entry)
+                self._tools_by_name[entry["tool"]].append(entry)
+        self.divergences: List[Dict[str, Any]] = []
+        self.misses: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def next_model(self, owner: str, messages: List[Message]) -> Optional[dict]:
+        """The next recorded response of `owner`, noting where the request differs from the recorded one."""
+        with self._lock:
+            queue = self._models.get(owner)
+            entry = queue.popleft() if queue else None
+            if entry is None:
+                self.misses[f"model:{owner}"] += 1
+                return None
+            fingerprint = request_fingerprint(messages)
+            for part in ("system", "input"):
+                if fingerprint[part] != entry["request"][part]:
+                    self.divergences.append({"owner": owner, "seq": entry["seq"], "part": part})
+        return entry
+
+    def next_tool(self, function_name: str, arguments: dict) -> Optional[dict]:
+        """The recorded result of this exact call, else the next recorded call of the same tool."""
+        with self._lock:
+            queue = self._tools.get(make_memo_key(function_name, arguments))
+            if not queue:
+                queue = self._tools_by_name.get(function_name)
+            entry = queue.popleft() if queue else None
+            if entry is None:
+                self.misses[f"tool:{function_name}"] += 1
+                return None
+            # An entry is served once, whichever index found it
+            other = self._tools_by_name[function_name] if queue is self._tools.get(entry["key"]) else self._tools[entry["key"]]
+            if entry in other:
+                other.remove(entry)
+        return entry
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "unused_model_responses": sum(len(q) for q in self._models.values()),
+                "unused_tool_results": sum(len(q) for q in self._tools.values()),
+                "misses": dict(self.misses),
+                "divergences": list(self.divergences),
+            }
+
+
+_current_recording: ContextVar[Optional[Recording]] = ContextVar("recording", default=None)
+_current_replay: ContextVar[Optional[Replay]] = ContextVar("replay", default=None)
+
+
+@contextmanager
+def recording_scope(recording: Optional[Recording] = None) -> Iterator[Recording]:
+    """Record every model request and tool call made in this context."""
+    recording = recording if recording is not None else Recording()
+    token = _current_recording.set(recording)
+    try:
+        yield recording
+    finally:
+        _current_recording.reset(token)
+
+
+@contextmanager
+def replay_scope(replay: Replay) -> Iterator[Replay]:
+    """Answer model requests and tool calls in this context from `replay`."""
+    token = _current_replay.set(replay)
+    try:
+        yield replay
+    finally:
+        _current_replay.reset(token)
+
+
+@lru_cache(maxsize=1)
+def _file_replay(path: str) -> Replay:
+    return Replay(Recording.load(path), timing=AgentConfig.REPLAY_TIMING)
+
+
+def current_replay() -> Optional[Replay]:
+    """The replay of this context, else the process-wide one loaded from REPLAY_FILE."""
+    replay = _current_replay.get()
+    if replay is None and AgentConfig.REPLAY_FILE:
+        replay = _file_replay(AgentConfig.REPLAY_FILE)
+    return replay
+
+
+class RecordingMixin:
+    """Model mixin that adds every request to the active recording (see `recordable`)."""
+
+    def invoke(self, messages: List[Message], assistant_message: Message, response_format=None, tools=None,
+               tool_choice=None, run_response=None, compress_tool_results: bool = False) -> ModelResponse:
+        recording = _current_recording.get()
+        started = time.perf_counter()
+        response = super().invoke(messages, assistant_message, response_format=response_format, tools=tools,
+                                  tool_choice=tool_choice, run_response=run_response,
+                                  compress_tool_results=compress_tool_results)
+        if recording is not None:
+            recording.add_model(self.id, messages, run_response, response, time.perf_counter() - started)
+        return response
+
+    async def ainvoke(self, messages: List[Message], assistant_message: Message, response_format=None, tools=None,
+                      tool_choice=None, run_response=None, compress_tool_results: bool = False) -> ModelResponse:
+        recording = _current_recording.get()
+        started = time.perf_counter()
+        response = await super().ainvoke(messages, assistant_message, response_format=response_format, tools=tools,
+                                         tool_choice=tool_choice, run_response=run_response,
+                                         compress_tool_results=compress_tool_results)
+        if recording is not None:
+            recording.add_model(self.id, messages, run_response, response, time.perf_counter() - started)
+        return response
+
+    def invoke_stream(self, messages: List[Message], assistant_message: Message, response_format=None, tools=None,
+                      tool_choice=None, run_response=None, compress_tool_results: bool = False):
+        recording = _current_recording.get()
+        started = time.perf_counter()
+        chunks = []
+        for chunk in super().invoke_stream(messages, assistant_message, response_format=response_format, tools=tools,
+                                           tool_choice=tool_choice, run_response=run_response,
+                                           compress_tool_results=compress_tool_results):
+            chunks.append(chunk)
+            yield chunk
+        if recording is not None:
+            recording.add_model(self.id, messages, run_response, _merge(chunks), time.perf_counter() - started)
+
+    async def ainvoke_stream(self, messages: List[Message], assistant_message: Message, response_format=None,
+                             tools=None, tool_choice=None, run_response=None, compress_tool_results: bool = False):
+        recording = _current_recording.get()
+        started = time.perf_counter()
+        chunks = []
+        async for chunk in super().ainvoke_stream(messages, assistant_message, response_format=response_format,
+                                                  tools=tools, tool_choice=tool_choice, run_response=run_response,
+                                                  compress_tool_results=compress_tool_results):
+            chunks.append(chunk)
+            yield chunk
+        if recording is not None:
+            recording.add_model(self.id, messages, run_response, _merge(chunks), time.perf_counter() - started)
+
+
+def _merge(chunks: List[ModelResponse]) -> ModelResponse:
+    """One response from a stream's deltas."""
+    content = "".join(c.content for c in chunks if isinstance(c.content, str))
+    merged = ModelResponse(role="assistant", content=content or None)
+    merged.tool_calls = [call for c in chunks for call in c.tool_calls or []]
+    merged.response_usage = next((c.response_usage for c in reversed(chunks) if c.response_usage is not None), None)
+    return merged
+
+
+@lru_cache(maxsize=None)
+def recordable(model_cls: type) -> type:
+    """Subclass of `model_cls` whose requests are captured by `recording_scope`."""
+    return type(model_cls.__name__, (RecordingMixin, model_cls), {"__module__": model_cls.__module__})
+
+
+@dataclass
+class ReplayMistralChat(MockMistralChat):
+    """
+    Model that answers with the recorded responses of its agent or team, in order.
+    Requests the recording does not cover (e.g. background memory updates) get the mock's canned reply.
+    """
+    id: str = "replay-mistral"
+    name: str = "ReplayMistralChat"
+    provider: str = "Replay"
+
+    def _respond(self, messages: List[Message], tools: Optional[List[Dict[str, Any]]], run_response: Any,
+                 response_format: Any = None):
+        replay = current_replay()
+        entry = replay.next_model(_owner(run_response), messages) if replay is not None else None
+        if entry is None:
+            return super()._respond(messages, tools, run_response, response_format)
+        return load_response(entry["response"]), entry["seconds"] if replay.timing else 0.0
+
+
+def recording_tool_hook(function_name: str, function_call: Callable, arguments: dict):
+    """Agno tool hook that records tool calls, or serves recorded results during a replay."""
+    replay = current_replay()
+    if replay is not None:
+        entry = replay.next_tool(function_name, arguments)
+        if entry is None:
+            return f"Error: no recorded result for {function_name} in this replay"
+        if replay.timing and entry["seconds"] > 0:
+            time.sleep(entry["seconds"])
+        if "error" in entry:
+            raise RuntimeError(entry["error"])
+        return entry["result"]
+
+    recording = _current_recording.get()
+    if recording is None:
+        return function_call(**arguments)
+    started = time.perf_counter()
+    try:
+        result = function_call(**arguments)
+    except Exception as e:
+        recording.add_tool(function_name, arguments, None, time.perf_counter() - started, error=str(e))
+        raise
+    recording.add_tool(function_name, arguments, result, time.perf_counter() - started)
+    return result
+
+
+def _run(target: str, input_text: str, session_id: str) -> Dict[str, Any]:
+    """Run `target` once; returns its final content, status and token count."""
+    from app.registry import get_component
+
+    if target == "pipeline":
+        from app.teams.paper2saas import run_paper2saas
+
+        result = run_paper2saas(input_text, session_id=session_id)
+        run_output = result.get("result")
+        return {
+            "status": result["status"],
+            "content": getattr(run_output, "content", None),
+            "tokens": getattr(run_output, "total_tokens", 0),
+        }
+    response = get_component(target).run(input_text, session_id=session_id)
+    content = response.content
+    return {
+        "status": str(getattr(response.status, "value", response.status) or "completed").lower(),
+        "content": content if content is None or isinstance(content, str) else json.dumps(content, default=str),
+        "tokens": (response.metrics.total_tokens or 0) if response.metrics else 0,
+    }
+
+
+def record(target: str, input_text: str, path: Optional[str] = None) -> Recording:
+    """Run `target` live and save everything it sent to the model and its tools."""
+    import uuid
+
+    session_id = str(uuid.uuid4())
+    path = path or os.path.join(AgentConfig.RECORD_DIR, f"{target}-{session_id[:8]}.jsonl.gz")
+    recording = Recording(meta={"target": target, "input": input_text, "recorded_at": time.time()})
+    started = time.perf_counter()
+    with recording_scope(recording):
+        result = _run(target, input_text, session_id)
+    recording.meta.update(duration=round(time.perf_counter() - started, 3), result=result)
+    recording.save(path)
+    recording.meta["path"] = path
+    return recording
+
+
+def replay(path: str, timing: bool = True) -> Dict[str, Any]:
+    """
+    Run a recording's target again on its recorded responses (no network).
+    Must run before the target's agents are built, so they get ReplayMistralChat models.
+    """
+    import uuid
+
+    AgentConfig.REPLAY_FILE = path
+    AgentConfig.REPLAY_TIMING = timing
+    session = current_replay()
+    recording = session.recording
+    started = time.perf_counter()
+    result = _run(recording.meta["target"], recording.meta["input"], str(uuid.uuid4()))
+    recorded = recording.meta.get("result") or {}
+    return {
+        "target": recording.meta["target"],
+        "recorded_seconds": recording.meta.get("duration"),
+        "replay_seconds": round(time.perf_counter() - started, 3),
+        "status": result["status"],
+        "content_matches": result["content"] == recorded.get("content"),
+        "tokens": result["tokens"],
+        "recorded_tokens": recorded.get("tokens"),
+        **session.summary(),
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Record a live team/pipeline run, or replay one offline")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="Run live and save a recording")
+    record_parser.add_argument("target", help="pipeline, or an agent/team name such as paper2saas_team")
+    record_parser.add_argument("input", help="arXiv ID for the pipeline, else the prompt")
+    record_parser.add_argument("-o", "--output", help=f"Recording file (default: under {AgentConfig.RECORD_DIR})")
+    replay_parser = commands.add_parser("replay", help="Replay a recording with zero network")
+    replay_parser.add_argument("path")
+    replay_parser.add_argument("--instant", action="store_true", help="Skip the recorded model and tool latencies")
+    show_parser = commands.add_parser("show", help="Summarize a recording")
+    show_parser.add_argument("path")
+    args = parser.parse_args()
+
+    # Cached results would hide model and tool calls from the recording, or bypass the replay
+    AgentConfig.ANALYSIS_CACHE_ENABLED = False
+    AgentConfig.MARKET_CACHE_ENABLED = False
+    # Prior ideas and research from other papers change as runs are indexed, so prompts would too
+    AgentConfig.IDEA_INDEX_ENABLED = False
+    if args.command == "record":
+        recorded = record(args.target, args.input, args.output)
+        print(json.dumps({**recorded.meta, **recorded.summary()}, indent=2, default=str))
+    elif args.command == "replay":
+        # Tool results come from the recording; fake toolkits keep the real tool names and signatures
+        AgentConfig.MOCK_TOOLS = True
+        report = replay(args.path, timing=not args.instant)
+        print(json.dumps(report, indent=2, default=str))
+        if report["divergences"]:
+            raise SystemExit(f"{len(report['divergences'])} requests differ from the recording")
+    else:
+        loaded = Recording.load(args.path)
+        meta = {k: v for k, v in loaded.meta.items() if k != "result"}
+        print(json.dumps({**meta, **loaded.summary()}, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    # Run through the imported module: agents reach its recording and replay state via app.utils
+    from app.recording import main as recording_main
+
+    recording_main()
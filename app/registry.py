@@ -0,0 +1,91 @@
+"""
+Lazy registry of the agents and teams served by AgentOS.
+
+Importing the app constructs nothing: each agent or team (with its model, toolkits and the
+shared DB connection) is built the first time it is requested, so a process only pays for
+what it serves. Agent modules still define plain module-level singletons; team modules
+expose theirs through `lazy_module_attributes`, which keeps `from app.teams.roaster import
+idea_roaster_team` working while deferring construction to that access.
+"""
+import importlib
+import sys
+import threading
+from typing import Any, Callable, Dict, List
+
+AGENTS: Dict[str, str] = {
+    "paper_analyzer": "app.agents.paper_analyzer",
+    "market_researcher": "app.agents.market_researcher",
+    "idea_generator": "app.agents.idea_generator",
+    "validation_researcher": "app.agents.validation_researcher",
+    "strategic_advisor": "app.agents.strategic_advisor",
+    "report_generator": "app.agents.report_generator",
+    "product_engineer": "app.agents.product_engineer",
+    "fact_checker": "app.agents.fact_checker",
+    "devils_advocate": "app.agents.devils_advocate",
+    "market_skeptic": "app.agents.market_skeptic",
+}
+TEAMS: Dict[str, str] = {
+    "paper2saas_team": "app.teams.paper2saas",
+    "idea_roaster_team": "app.teams.roaster",
+}
+COMPONENTS: Dict[str, str] = {**AGENTS, **TEAMS}
+
+_locks: Dict[tuple, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def import_object(path: str) -> Any:
+    """Import "package.module:attribute" and return the attribute."""
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def get_component(name: str) -> Any:
+    """
+    Return the agent or team registered as `name`, building it on first use.
+
+    Args:
+        name: One of COMPONENTS (the variable names used in app.agents / app.teams)
+
+    Returns:
+        The process-wide Agent or Team instance
+    """
+    if name not in COMPONENTS:
+        raise KeyError(f"Unknown agent or team '{name}'. Available: {sorted(COMPONENTS)}")
+    return import_object(f"{COMPONENTS[name]}:{name}")
+
+
+def resolve_components(selection: str, registry: Dict[str, str] = COMPONENTS) -> List[str]:
+    """Names from a comma-separated selection ("all" for everything) that are in `registry`, in registry order."""
+    wanted = {s.strip() for s in selection.split(",") if s.strip()}
+    unknown = wanted - set(COMPONENTS) - {"all"}
+    if unknown:
+        raise KeyError(f"Unknown agent or team {sorted(unknown)}. Available: {sorted(COMPONENTS)}")
+    return [name for name in registry if "all" in wanted or name in wanted]
+
+
+def lazy_module_attributes(module_name: str, builders: Dict[str, Callable[[], Any]]) -> Callable[[str], Any]:
+    """
+    Return a module-level `__getattr__` that builds each attribute once, on first access,
+    and stores it in the module so later lookups are plain attribute reads.
+
+    Code inside the module must go through its own getter (not the bare global name),
+    since module `__getattr__` only applies to attribute access from outside.
+    """
+    def __getattr__(name: str) -> Any:
+        builder = builders.get(name)
+        if builder is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        module_globals = sys.modules[module_name].__dict__
+        if name not in module_globals:
+            # One lock per attribute: a team build imports agents, which need the DB
+            # attribute of another module, so a single global lock could deadlock with
+            # the import lock of a concurrent first use.
+            with _locks_guard:
+                lock = _locks.setdefault((module_name, name), threading.Lock())
+            with lock:
+                if name not in module_globals:
+                    module_globals[name] = builder()
+        return module_globals[name]
+
+    return __getattr__
@@ -0,0 +1,205 @@
+"""
+Chunk-and-retrieve context for long papers.
+
+Instead of handing PaperAnalyzer the full text, a paper is split into sections,
+each section is chunked with chonkie, and the chunks are embedded into a small
+per-paper numpy index (hashed TF-IDF, no embedding service needed). Each reading
+pass then asks for only the top-k chunks relevant to its query.
+"""
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from chonkie import RecursiveChunker
+
+from app.config import AgentConfig
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+# Section headings as they appear in PDF-extracted text: "Abstract", "1 Introduction",
+# "3.2. Training Setup", "# Method" (markdown), "A Appendix"
+KNOWN_SECTIONS = (
+    "abstract", "introduction", "background", "related work", "preliminaries", "method", "methods",
+    "methodology", "approach", "model", "experiments", "experimental setup", "results", "evaluation",
+    "analysis", "discussion", "limitations", "conclusion", "conclusions", "future work",
+    "acknowledgements", "acknowledgments", "references", "appendix",
+)
+HEADING_PATTERN = re.compile(
+    r"^(?:#{1,4}\s+(?P<md>.+)|(?P<num>(?:\d+|[A-H])(?:\.\d+)*\.?)\s+(?P<numbered>[A-Z][^\n]{1,80})|(?P<plain>[A-Z][A-Za-z ]{2,40}))$"
+)
+
+# Sections each reading pass concentrates on (see PAPER_ANALYZER_INSTRUCTIONS)
+PASS_SECTIONS = {
+    1: ("abstract", "introduction"),
+    2: ("introduction", "conclusion", "discussion"),
+    3: ("method", "approach", "model", "experiment", "result", "evaluation"),
+    4: (),
+}
+SKIPPED_SECTIONS = ("references", "acknowledgements", "acknowledgments")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough model-token count (about 4 characters per token for English prose)."""
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class PaperChunk:
+    """A retrievable piece of a paper."""
+    index: int
+    section: str
+    text: str
+
+    def to_dict(self, score: Optional[float] = None) -> dict:
+        chunk = {"chunk": self.index, "section": self.section, "text": self.text}
+        if score is not None:
+            chunk["score"] = round(score, 4)
+        return chunk
+
+
+def _heading(line: str) -> Optional[str]:
+    line = line.strip()
+    if not line or len(line) > 90 or line.endswith((".", ",", ";", ":")):
+        return None
+    match = HEADING_PATTERN.match(line)
+    if not match:
+        return None
+    if match.group("md"):
+        return match.group("md").strip()
+    if match.group("numbered"):
+        title = match.group("numbered").strip()
+        # Numbered lines that are really sentences or table rows are not headings
+        return title if len(title.split()) <= 8 and not re.search(r"\d{2,}", title) else None
+    plain = match.group("plain").strip()
+    return plain if plain.lower() in KNOWN_SECTIONS else None
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Split paper text into (section title, body) pairs; text before the first heading is "Front matter"."""
+    sections: List[Tuple[str, List[str]]] = [("Front matter", [])]
+    for line in text.splitlines():
+        title = _heading(line)
+        if title is not None:
+            sections.append((title, []))
+        else:
+            sections[-1][1].append(line)
+    return [(title, "\n".join(lines).strip()) for title, lines in sections if "\n".join(lines).strip()]
+
+
+class HashedTfidfVectorizer:
+    """
+    Unigram + bigram feature hashing with IDF weights fitted on one paper's chunks.
+
+    Args:
+        dim: Number of hashed features
+    """
+
+    def __init__(self, dim: int = 4096):
+        self.dim = dim
+        self.idf: Optional[np.ndarray] = None
+
+    def _counts(self, texts: Sequence[str]) -> np.ndarray:
+        counts = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            if features:
+                buckets = np.fromiter((zlib.crc32(f.encode()) % self.dim for f in features), dtype=np.int64)
+                np.add.at(counts[row], buckets, 1.0)
+        return counts
+
+    def _weigh(self, counts: np.ndarray) -> np.ndarray:
+        vectors = np.log1p(counts) * self.idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def fit_transform(self, texts: Sequence[str]) -> np.ndarray:
+        counts = self._counts(texts)
+        document_frequency = (counts > 0).sum(axis=0)
+        self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1.0).astype(np.float32)
+        return self._weigh(counts)
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        return self._weigh(self._counts(texts))
+
+
+class PaperIndex:
+    """
+    Section-aware chunk index for one paper.
+
+    Args:
+        text: Full paper text
+        chunk_size: Target chunk size in characters
+    """
+
+    def __init__(self, text: str, chunk_size: int = AgentConfig.PAPER_CHUNK_SIZE):
+        chunker = RecursiveChunker(tokenizer="character", chunk_size=chunk_size)
+        self.sections = split_sections(text)
+        self.chunks: List[PaperChunk] = []
+        for title, body in self.sections:
+            for piece in chunker(body):
+                if piece.text.strip():
+                    self.chunks.append(PaperChunk(index=len(self.chunks), section=title, text=piece.text.strip()))
+        self.vectorizer = HashedTfidfVectorizer()
+        self.matrix = self.vectorizer.fit_transform([f"{c.section}\n{c.text}" for c in self.chunks])
+
+    def outline(self) -> List[dict]:
+        """Section titles with their chunk counts, so the agent can see what is available."""
+        outline: "OrderedDict[str, int]" = OrderedDict()
+        for chunk in self.chunks:
+            outline[chunk.section] = outline.get(chunk.section, 0) + 1
+        return [{"section": title, "chunks": count} for title, count in outline.items()]
+
+    def search(self, query: str, top_k: int = AgentConfig.PAPER_RETRIEVAL_TOP_K,
+               sections: Sequence[str] = ()) -> List[Tuple[PaperChunk, float]]:
+        """
+        Top-k chunks by cosine similarity to `query`, in reading order.
+
+        Args:
+            query: What the current pass is looking for
+            top_k: Number of chunks to return
+            sections: Section-name substrings to restrict the search to (falls back to all
+                sections when none match); references and acknowledgements are always skipped
+        """
+        if not self.chunks:
+            return []
+        candidates = np.array([
+            not any(s in c.section.lower() for s in SKIPPED_SECTIONS) for c in self.chunks
+        ])
+        if sections:
+            in_sections = np.array([any(s in c.section.lower() for s in sections) for c in self.chunks])
+            if (in_sections & candidates).any():
+                candidates &= in_sections
+        scores = self.matrix @ self.vectorizer.transform([query])[0]
+        scores = np.where(candidates, scores, -np.inf)
+        top = np.argsort(-scores, kind="stable")[:min(top_k, int(candidates.sum()))]
+        return [(self.chunks[i], float(scores[i])) for i in sorted(top)]
+
+
+_indexes: "OrderedDict[str, PaperIndex]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_paper_index(text: str, chunk_size: int = AgentConfig.PAPER_CHUNK_SIZE, max_indexes: int = 32) -> PaperIndex:
+    """Build (or reuse) the index for a paper's text; recently used indexes stay in memory."""
+    key = f"{chunk_size}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+    with _lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+    index = PaperIndex(text, chunk_size=chunk_size)
+    with _lock:
+        _indexes[key] = index
+        while len(_indexes) > max_indexes:
+            _indexes.popitem(last=False)
+    return index
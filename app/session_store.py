@@ -0,0 +1,311 @@
+"""
+Buffered, trimmed session persistence for `shared_db`.
+
+Every agent and team saves its whole session (runs, messages, member responses, events)
+to `shared_db` at the end of each run. Writes are synchronous, so an async run blocks its
+event loop on every save, and on SQLite concurrent runs serialize on the database lock.
+The BufferedSessions mixin, applied with `buffered(SqliteDb | PostgresDb)`, changes that:
+
+- upsert_session only snapshots the session and queues it. Repeated saves of one session
+  collapse to the latest, and a background thread writes the queue in one bulk upsert
+  per SESSION_FLUSH_INTERVAL_SECONDS (or as soon as SESSION_FLUSH_BATCH_SIZE are queued);
+- before a session is written, the retention policy is applied. It keeps the last
+  SESSION_MAX_RUNS runs and drops SESSION_DROP_EVENTS (e.g. streamed content deltas).
+  Message and member-output contents over SESSION_COMPRESS_MIN_CHARS are zlib-compressed,
+  and sessions older than SESSION_RETENTION_DAYS are purged hourly;
+- reads see queued sessions (read-your-writes) and decompress stored contents, so agno
+  and AgentOS get the sessions back as they were saved, minus what retention dropped;
+- aprefetch_sessions reads the sessions a pipeline run is about to use in one query from
+  a thread, so agno's per-run session read doesn't block the event loop.
+
+Queued writes are flushed on shutdown (the API lifespan and at exit). A crash loses at most
+one flush interval of session history; run results and job state are not buffered.
+"""
+import asyncio
+import atexit
+import base64
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from agno.db.base import SessionType
+from agno.db.utils import deserialize_session_json_fields
+from agno.session import AgentSession, TeamSession, WorkflowSession
+from sqlalchemy import select
+
+from app.config import AgentConfig
+from app.utils import logger
+
+COMPRESSED_PREFIX = "zlib+b64:"
+# How long a prefetched read is served before get_session goes back to the database
+PREFETCH_TTL_SECONDS = 60.0
+SESSION_CLASSES = {
+    SessionType.AGENT: AgentSession,
+    SessionType.TEAM: TeamSession,
+    SessionType.WORKFLOW: WorkflowSession,
+}
+
+
+def compress_text(text: str) -> str:
+    return COMPRESSED_PREFIX + base64.b64encode(zlib.compress(text.encode("utf-8"), 6)).decode("ascii")
+
+
+def decompress_text(text: str) -> str:
+    if not text.startswith(COMPRESSED_PREFIX):
+        return text
+    return zlib.decompress(base64.b64decode(text[len(COMPRESSED_PREFIX):])).decode("utf-8")
+
+
+def _map_contents(value: Any, transform) -> Any:
+    """Apply `transform` to every string stored under a "content" key, at any depth."""
+    if isinstance(value, dict):
+        return {
+            key: transform(item) if key == "content" and isinstance(item, str) else _map_contents(item, transform)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_map_contents(item, transform) for item in value]
+    return value
+
+
+class RetentionPolicy:
+    """
+    What is kept of a session when it is written.
+
+    Args:
+        max_runs: Most recent runs kept per session (0 keeps all)
+        drop_events: Event types removed from stored runs
+        compress_min_chars: Contents at least this long are compressed (0 disables)
+    """
+
+    def __init__(self, max_runs: Optional[int] = None, drop_events: Optional[set] = None,
+                 compress_min_chars: Optional[int] = None):
+        self.max_runs = max_runs if max_runs is not None else AgentConfig.SESSION_MAX_RUNS
+        self.drop_events = drop_events if drop_events is not None else {
+            e.strip() for e in AgentConfig.SESSION_DROP_EVENTS.split(",") if e.strip()
+        }
+        self.compress_min_chars = (
+            compress_min_chars if compress_min_chars is not None else AgentConfig.SESSION_COMPRESS_MIN_CHARS
+        )
+
+    def _compress(self, text: str) -> str:
+        if len(text) < self.compress_min_chars or text.startswith(COMPRESSED_PREFIX):
+            return text
+        return compress_text(text)
+
+    def apply(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Trimmed, compressed copy of a serialized session."""
+        runs = list(data.get("runs") or [])
+        if self.max_runs:
+            # Member runs are stored next to their team run; keep both for the last max_runs
+            top_level = [run["run_id"] for run in runs if not run.get("parent_run_id")][-self.max_runs:]
+            kept = set(top_level)
+            runs = [run for run in runs if run.get("run_id") in kept or run.get("parent_run_id") in kept]
+        if self.drop_events:
+            runs = [
+                {**run, "events": [e for e in run["events"] if e.get("event") not in self.drop_events]}
+                if run.get("events") else run
+                for run in runs
+            ]
+        if self.compress_min_chars:
+            runs = _map_contents(runs, self._compress)
+        return {**data, "runs": runs}
+
+
+def restore(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Decompress a stored session dict."""
+    if not data or not data.get("runs"):
+        return data
+    return {**data, "runs": _map_contents(data["runs"], decompress_text)}
+
+
+def _deserialize(data: Optional[Dict[str, Any]]) -> Any:
+    if not data:
+        return None
+    session_type = data.get("session_type")
+    session_class = SESSION_CLASSES.get(SessionType(session_type)) if session_type else None
+    return session_class.from_dict(data) if session_class is not None else None
+
+
+class BufferedSessions:
+    """DB mixin that queues session writes and applies a RetentionPolicy (see `buffered`)."""
+
+    def _buffer_state(self):
+        state = self.__dict__.get("_session_buffer")
+        if state is None:
+            state = self.__dict__["_session_buffer"] = {
+                "pending": {},  # session_id -> serialized session
+                "prefetched": {},  # session_id -> (expires at, stored session or None)
+                "lock": threading.Condition(),
+                "policy": RetentionPolicy(),
+                "thread": None,
+                "purged_at": 0.0,
+                "stats": {"queued": 0, "coalesced": 0, "written": 0, "flushes": 0, "flush_seconds": 0.0},
+            }
+            atexit.register(self.flush)
+        return state
+
+    def upsert_session(self, session, deserialize: Optional[bool] = True):
+        state = self._buffer_state()
+        # Session.to_dict() leaves out the type the stored row carries
+        session_type = next(t for t, cls in SESSION_CLASSES.items() if isinstance(session, cls))
+        data = {**session.to_dict(), "session_type": session_type.value}
+        with state["lock"]:
+            if session.session_id in state["pending"]:
+                state["stats"]["coalesced"] += 1
+            state["pending"][session.session_id] = data
+            state["prefetched"].pop(session.session_id, None)
+            state["stats"]["queued"] += 1
+            if state["thread"] is None:
+                state["thread"] = threading.Thread(target=self._flush_loop, name="session-writer", daemon=True)
+                state["thread"].start()
+            if len(state["pending"]) >= AgentConfig.SESSION_FLUSH_BATCH_SIZE:
+                state["lock"].notify()
+        return session if deserialize else data
+
+    def _flush_loop(self):
+        state = self._buffer_state()
+        while True:
+            with state["lock"]:
+                state["lock"].wait_for(
+                    lambda: len(state["pending"]) >= AgentConfig.SESSION_FLUSH_BATCH_SIZE,
+                    timeout=AgentConfig.SESSION_FLUSH_INTERVAL_SECONDS,
+                )
+            try:
+                self.flush()
+                if AgentConfig.SESSION_RETENTION_DAYS and time.time() - state["purged_at"] > 3600:
+                    state["purged_at"] = time.time()
+                    self.purge_expired()
+            except Exception as e:
+                logger.error(f"Session writer failed, retrying on the next flush: {e}")
+
+    def flush(self) -> int:
+        """Write every queued session now; returns how many were written."""
+        state = self._buffer_state()
+        with state["lock"]:
+            batch, state["pending"] = state["pending"], {}
+        if not batch:
+            return 0
+        started = time.perf_counter()
+        sessions = [_deserialize(state["policy"].apply(data)) for data in batch.values()]
+        try:
+            super().upsert_sessions([s for s in sessions if s is not None], deserialize=False)
+        except Exception:
+            with state["lock"]:
+                # Requeue unless a newer snapshot arrived meanwhile
+                for session_id, data in batch.items():
+                    state["pending"].setdefault(session_id, data)
+            raise
+        with state["lock"]:
+            stats = state["stats"]
+            stats["written"] += len(sessions)
+            stats["flushes"] += 1
+            stats["flush_seconds"] += time.perf_counter() - started
+        return len(sessions)
+
+    def purge_expired(self, days: Optional[float] = None) -> int:
+        """Delete sessions created more than `days` (SESSION_RETENTION_DAYS) ago; returns how many."""
+        days = AgentConfig.SESSION_RETENTION_DAYS if days is None else days
+        if not days:
+            return 0
+        rows, _ = super().get_sessions(end_timestamp=int(time.time() - days * 86400), deserialize=False)
+        session_ids = [row["session_id"] for row in rows]
+        if session_ids:
+            self.delete_sessions(session_ids)
+            logger.info(f"Purged {len(session_ids)} sessions older than {days:g} days")
+        return len(session_ids)
+
+    def prefetch_sessions(self, session_ids: List[str]) -> int:
+        """
+        Read `session_ids` in one query; the next get_session of each is served from memory.
+
+        agno reads a session synchronously at the start of every run, on the event loop
+        when the run is async. Prefetching from a thread (`aprefetch_sessions`) moves that
+        round trip off the loop. Sessions not in the database are remembered as missing.
+        Returns how many were found.
+        """
+        table = self._get_table(table_type="sessions")
+        rows = {}
+        if table is not None:
+            with self.Session() as sess:
+                result = sess.execute(select(table).where(table.c.session_id.in_(session_ids))).fetchall()
+            rows = {row.session_id: restore(deserialize_session_json_fields(dict(row._mapping))) for row in result}
+        state = self._buffer_state()
+        now = time.monotonic()
+        with state["lock"]:
+            prefetched = state["prefetched"]
+            for session_id in [key for key, (expires, _) in prefetched.items() if expires < now]:
+                del prefetched[session_id]
+            for session_id in session_ids:
+                prefetched[session_id] = (now + PREFETCH_TTL_SECONDS, rows.get(session_id))
+        return len(rows)
+
+    async def aprefetch_sessions(self, session_ids: List[str]) -> int:
+        return await asyncio.to_thread(self.prefetch_sessions, session_ids)
+
+    async def aflush(self) -> int:
+        return await asyncio.to_thread(self.flush)
+
+    def session_write_stats(self) -> Dict[str, Any]:
+        state = self._buffer_state()
+        with state["lock"]:
+            return {**state["stats"], "pending": len(state["pending"])}
+
+    def get_session(self, session_id: str, session_type: SessionType, user_id: Optional[str] = None,
+                    deserialize: Optional[bool] = True):
+        state = self._buffer_state()
+        with state["lock"]:
+            data = state["pending"].get(session_id)
+            expires, prefetched = state["prefetched"].pop(session_id, (0.0, None))
+        if data is None:
+            data = prefetched if expires > time.monotonic() else restore(
+                super().get_session(session_id, session_type, user_id=user_id, deserialize=False)
+            )
+        if data and user_id is not None and data.get("user_id") != user_id:
+            return None
+        return _deserialize(data) if deserialize else data
+
+    def get_sessions(self, *args, deserialize: Optional[bool] = True, **kwargs):
+        self.flush()
+        rows, total = super().get_sessions(*args, deserialize=False, **kwargs)
+        rows = [restore(row) for row in rows]
+        if not deserialize:
+            return rows, total
+        return [session for session in (_deserialize(row) for row in rows) if session is not None]
+
+    def rename_session(self, session_id: str, session_type: SessionType, session_name: str,
+                       deserialize: Optional[bool] = True):
+        self.flush()
+        data = restore(super().rename_session(session_id, session_type, session_name, deserialize=False))
+        return _deserialize(data) if deserialize else data
+
+    def _forget(self, session_ids: List[str]):
+        state = self._buffer_state()
+        with state["lock"]:
+            for session_id in session_ids:
+                state["pending"].pop(session_id, None)
+                state["prefetched"].pop(session_id, None)
+
+    def delete_session(self, session_id: str) -> bool:
+        self._forget([session_id])
+        return super().delete_session(session_id)
+
+    def delete_sessions(self, session_ids: List[str]) -> None:
+        self._forget(session_ids)
+        return super().delete_sessions(session_ids)
+
+
+@lru_cache(maxsize=None)
+def buffered(db_cls: type) -> type:
+    """Subclass of an agno DB class whose session writes are buffered and trimmed."""
+    return type(db_cls.__name__, (BufferedSessions, db_cls), {"__module__": db_cls.__module__})
+
+
+def flush_sessions() -> int:
+    """Write queued sessions of `shared_db`, if it has been connected and is buffered."""
+    import app.utils
+
+    db = app.utils.__dict__.get("shared_db")
+    return db.flush() if isinstance(db, BufferedSessions) else 0
@@ -0,0 +1,108 @@
+"""
+Structured stage outputs for the pipeline.
+
+In structured mode a stage's agent answers with its Pydantic schema (app.models). The
+validated object is kept on the StageResult and handed downstream as compact JSON with
+only the fields each consumer needs, instead of the stage's Markdown prose. An answer
+that fails validation gets one cheap repair pass (a small model fixing the JSON against
+the validation errors) rather than a rerun of the whole stage; if that fails too, the
+raw answer is passed on as-is.
+"""
+import json
+import re
+from typing import Any, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from app.config import AgentConfig
+
+JSON_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def extract_json(text: str) -> str:
+    """The JSON object in a model answer, ignoring code fences and surrounding prose."""
+    fenced = JSON_FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    start, end = text.find("{"), text.rfind("}")
+    return text[start:end + 1] if start != -1 and end > start else text
+
+
+def validate_output(content: Any, schema: Type[BaseModel]) -> Tuple[Optional[BaseModel], Optional[str]]:
+    """Return (validated object, None) or (None, validation error summary)."""
+    if isinstance(content, schema):
+        return content, None
+    try:
+        if isinstance(content, BaseModel):
+            return schema.model_validate(content.model_dump()), None
+        if isinstance(content, dict):
+            return schema.model_validate(content), None
+        return schema.model_validate_json(extract_json(str(content or ""))), None
+    except ValidationError as e:
+        errors = [f"{'.'.join(str(p) for p in error['loc']) or '<root>'}: {error['msg']}" for error in e.errors()]
+        return None, "\n".join(errors[:20])
+
+
+def _prune(value: Any) -> Any:
+    if isinstance(value, dict):
+        pruned = {k: _prune(v) for k, v in value.items()}
+        return {k: v for k, v in pruned.items() if v not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [_prune(v) for v in value]
+    return value
+
+
+def compact(obj: BaseModel, include: Any = None) -> str:
+    """
+    Serialize `obj` for a downstream prompt: minified JSON without empty fields.
+
+    Args:
+        obj: A validated stage output
+        include: Optional Pydantic include spec, e.g. {"ideas": {"__all__": {"name"}}, "ranking": True}
+    """
+    data = _prune(obj.model_dump(mode="json", include=include, exclude_none=True))
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def repair_prompt(content: Any, schema: Type[BaseModel], error: str) -> str:
+    return (
+        f"The answer below should be a JSON object matching the {schema.__name__} schema but failed validation.\n\n"
+        f"## Validation errors\n{error}\n\n"
+        f"## Answer\n{content}"
+    )
+
+
+def _repairer():
+    from app.agents.output_repairer import output_repairer
+    return output_repairer
+
+
+def _tokens(run_output: Any) -> int:
+    return getattr(getattr(run_output, "metrics", None), "total_tokens", 0) or 0
+
+
+def repair_output(content: Any, schema: Type[BaseModel], error: str, session_id: str) -> Tuple[Optional[BaseModel], int]:
+    """Ask the repair model to fix `content`; returns (validated object or None, tokens spent)."""
+    tokens = 0
+    for _ in range(AgentConfig.STRUCTURED_REPAIR_ATTEMPTS):
+        run_output = _repairer().run(repair_prompt(content, schema, error), session_id=session_id, output_schema=schema)
+        tokens += _tokens(run_output)
+        repaired, error = validate_output(run_output.content, schema)
+        if repaired is not None:
+            return repaired, tokens
+    return None, tokens
+
+
+async def arepair_output(content: Any, schema: Type[BaseModel], error: str,
+                         session_id: str) -> Tuple[Optional[BaseModel], int]:
+    """Async version of repair_output."""
+    tokens = 0
+    for _ in range(AgentConfig.STRUCTURED_REPAIR_ATTEMPTS):
+        run_output = await _repairer().arun(
+            repair_prompt(content, schema, error), session_id=session_id, output_schema=schema
+        )
+        tokens += _tokens(run_output)
+        repaired, error = validate_output(run_output.content, schema)
+        if repaired is not None:
+            return repaired, tokens
+    return None, tokens
@@ -1,141 +1,556 @@
 from agno.team import Team
+import asyncio
+import os
+import re
 import uuid
+from typing import Callable, Optional
 
 from app.config import AgentConfig
-from app.utils import shared_db, logger, run_team_with_error_handling, arun_team_with_error_handling, validate_arxiv_id, get_mistral_model
-from app.prompts.agents import PAPER2SAAS_TEAM_INSTRUCTIONS
-
-# Import agents
-from app.agents.paper_analyzer import paper_analyzer
-from app.agents.market_researcher import market_researcher
-from app.agents.idea_generator import idea_generator
-from app.agents.validation_researcher import validation_researcher
-from app.agents.strategic_advisor import strategic_advisor
-from app.agents.fact_checker import fact_checker
-from app.agents.product_engineer import product_engineer
-from app.agents.report_generator import report_generator
+from app.registry import get_component, lazy_module_attributes
+from app.utils import logger, canonical_arxiv_id, invalid_arxiv_id_message, validate_arxiv_id, get_mistral_model
+from app.pipeline import Pipeline, PipelineContext, PipelineRunOutput, Stage, StageResult
+from app.budget import BudgetLimits, RunBudget
+from app.retrieval import estimate_tokens
+from app.tiering import ModelRouter
+from app.cache import AgentStageCache, analysis_cache
+from app.tools.memo import ToolMemo, tool_memo_scope
+from app.tools.market_cache import market_cache_scope
+from app.prefetch import PaperPrefetch, paper_prefetch
+from app.dedup import resolved_paper_key, run_deduplicator
+from app.idea_index import ingest_run, prior_ideas, prior_validation
+from app.checkpoint import RunCheckpoint, resumable_run, run_checkpoint
+from app.events import emit
+from app.models import IdeaGeneratorOutput, MarketResearchOutput, PaperAnalysisOutput, ProductEngineerOutput
+from app.structured import compact
+from app.prompts.assembly import dated_instructions
 
 # --- OPTIMIZED FLAT TEAM (Minimized LLM Overhead) ---
 
-paper2saas_team = Team(
-    name="Paper2SaaS",
-    role="High-efficiency paper-to-SaaS transformation pipeline",
-    model=get_mistral_model(AgentConfig.LARGE_MODEL),
-    stream_intermediate_steps=True,  # Enable streaming for faster perceived response
-    instructions=PAPER2SAAS_TEAM_INSTRUCTIONS,
-    members=[
-        paper_analyzer,          # LARGE_MODEL: Technical extraction
-        market_researcher,       # SMALL_MODEL: Data lookup
-        fact_checker,            # SMALL_MODEL: Verification
-        idea_generator,          # SMALL_MODEL: Synthesis
-        validation_researcher,   # LARGE_MODEL: Competitive research
-        strategic_advisor,       # LARGE_MODEL: Scoring
-        product_engineer,        # LARGE_MODEL: Tech planning
-        report_generator,        # SMALL_MODEL: Final formatting
-    ],
-    db=shared_db,
-    store_events=AgentConfig.STORE_EVENTS,
-    markdown=AgentConfig.ENABLE_MARKDOWN,
-    show_members_responses=AgentConfig.SHOW_MEMBER_RESPONSES,
-    add_datetime_to_context=True,
-    # --- COST & PERFORMANCE OPTIMIZATION ---
-    cache_session=True,          # In-memory hydration
-    enable_user_memories=True,    # Persistent context
-    delegate_to_all_members=True,  # Broadcast to all members simultaneously for parallel execution
-    # Use smaller model for supervisor if possible, but LARGE is safer for complex delegation
-)
-
-logger.info("Optimized Paper2SaaS team for minimal latency and cost (Flat structure + Model Tiering)")
-
-def run_paper2saas(arxiv_id: str) -> dict:
+def _build_paper2saas_team() -> Team:
+    from app.utils import shared_db
+
+    team = Team(
+        name="Paper2SaaS",
+        role="High-efficiency paper-to-SaaS transformation pipeline",
+        model=get_mistral_model(AgentConfig.LARGE_MODEL),
+        stream_intermediate_steps=True,  # Enable streaming for faster perceived response
+        instructions=dated_instructions("paper2saas_team"),
+        members=[
+            get_component("paper_analyzer"),          # LARGE_MODEL: Technical extraction
+            get_component("market_researcher"),       # SMALL_MODEL: Data lookup
+            get_component("fact_checker"),            # SMALL_MODEL: Verification
+            get_component("idea_generator"),          # SMALL_MODEL: Synthesis
+            get_component("validation_researcher"),   # LARGE_MODEL: Competitive research
+            get_component("strategic_advisor"),       # LARGE_MODEL: Scoring
+            get_component("product_engineer"),        # LARGE_MODEL: Tech planning
+            get_component("report_generator"),        # SMALL_MODEL: Final formatting
+        ],
+        db=shared_db,
+        store_events=AgentConfig.STORE_EVENTS,
+        markdown=AgentConfig.ENABLE_MARKDOWN,
+        show_members_responses=AgentConfig.SHOW_MEMBER_RESPONSES,
+        # --- COST & PERFORMANCE OPTIMIZATION ---
+        cache_session=True,          # In-memory hydration
+        enable_user_memories=True,    # Persistent context
+        delegate_to_all_members=True,  # Broadcast to all members simultaneously for parallel execution
+        # Use smaller model for supervisor if possible, but LARGE is safer for complex delegation
+    )
+    logger.info("Optimized Paper2SaaS team for minimal latency and cost (Flat structure + Model Tiering)")
+    return team
+
+
+# --- DETERMINISTIC PIPELINE (No Supervisor Tokens) ---
+# The team above stays registered in AgentOS for interactive chat; programmatic runs
+# use this code-defined DAG, which mirrors the 5 stages of PAPER2SAAS_TEAM_INSTRUCTIONS.
+
+# Structured mode: the fields each consumer receives (Markdown outputs are passed whole)
+IDEA_SUMMARY = {"name", "core_concept", "target_market", "value_proposition", "competitive_moat", "revenue_model"}
+PAPER_FOR_IDEATION = {
+    "paper_title", "executive_summary", "core_innovations", "technical_architecture", "limitations",
+    "applications", "key_metrics", "confidence_score", "unverified_claims",
+}
+MARKET_FOR_IDEATION = {"signals", "pain_points", "opportunity_areas", "data_gaps", "confidence_level"}
+PAPER_FOR_FACT_CHECK = {
+    "paper_title", "core_innovations", "technical_architecture", "key_metrics", "limitations", "unverified_claims",
+}
+PAPER_FOR_ENGINEERING = {"core_innovations", "technical_architecture", "key_metrics", "limitations"}
+IDEAS_FOR_VALIDATION = {"ideas": {"__all__": IDEA_SUMMARY}, "ranking": True}
+IDEAS_FOR_STRATEGY = {
+    "ideas": {"__all__": IDEA_SUMMARY | {"implementation_complexity", "feasibility_score"}}, "ranking": True,
+}
+ENGINEERING_FOR_STRATEGY = {
+    "idea_name", "recommended_repo", "technical_approach", "tech_stack_recommendation", "mvp_timeline",
+    "potential_challenges", "confidence_level",
+}
+
+
+CONFIDENCE_SCORE = re.compile(r"confidence[ _]score\W*?([01](?:\.\d+)?)", re.IGNORECASE)
+
+
+def paper_confidence(result: StageResult) -> Optional[float]:
+    """PaperAnalyzer's confidence score, from its schema output or its Markdown (None if it gave none)."""
+    if result.structured is not None:
+        return result.structured.confidence_score
+    match = CONFIDENCE_SCORE.search(result.content or "")
+    return float(match.group(1)) if match else None
+
+
+def paper_tokens(arxiv_id: str) -> Optional[int]:
+    """Tokens PaperAnalyzer will read for a paper in the local store (None if it is not stored)."""
+    from app.paper_store import paper_store
+
+    paper = paper_store.get(arxiv_id)
+    if paper is None:
+        return None
+    if paper["text_path"] and os.path.exists(paper["text_path"]):
+        return min(os.path.getsize(paper["text_path"]), AgentConfig.PAPER_STORE_MAX_CHARS) // 4
+    return estimate_tokens(paper["abstract"] or "")
+
+
+def _low_confidence(result: StageResult) -> Optional[str]:
+    """Enforce the "TERMINATE early if confidence < 0.3" rule of the team instructions after paper analysis."""
+    if not AgentConfig.BUDGET_MIN_CONFIDENCE:
+        return None
+    score = paper_confidence(result)
+    if score is not None and score < AgentConfig.BUDGET_MIN_CONFIDENCE:
+        return f"Paper analysis confidence {score:.2f} is below {AgentConfig.BUDGET_MIN_CONFIDENCE:g}"
+    return None
+
+
+def _routing_confidence(ctx: PipelineContext) -> Optional[float]:
+    """Paper confidence for model tiering; an analysis without a score counts as not confident."""
+    result = ctx.results.get("paper_analysis")
+    if result is None or result.status != "success":
+        return None
+    score = paper_confidence(result)
+    return 0.0 if score is None else score
+
+
+def _routing_tokens(ctx: PipelineContext, stage_name: str) -> Optional[int]:
+    """The paper PaperAnalyzer reads counts towards its input size; other stages only read their prompt."""
+    return paper_tokens(ctx.params["arxiv_id"]) if stage_name == "paper_analysis" else 0
+
+
+def _top_idea(ctx: PipelineContext) -> str:
+    """The top-ranked idea alone in structured mode; the full ideation output otherwise."""
+    ideas = ctx.structured("ideation")
+    if ideas is None:
+        return ctx.output("ideation")
+    top = next((idea for idea in ideas.ideas if ideas.ranking and idea.name == ideas.ranking[0]), ideas.ideas[0])
+    return compact(top)
+
+
+def _paper_input(ctx: PipelineContext) -> str:
+    return f"Analyze arXiv paper {ctx.params['arxiv_id']}"
+
+
+def _market_input(ctx: PipelineContext) -> str:
+    return (
+        f"Research current market signals and pain points for the research domain of arXiv paper "
+        f"{ctx.params['arxiv_id']} (AI/ML/SaaS)"
+    )
+
+
+def _ideation_input(ctx: PipelineContext) -> str:
+    paper = ctx.output("paper_analysis", PAPER_FOR_IDEATION)
+    prompt = (
+        "Generate SaaS ideas from these verified inputs.\n\n"
+        f"## PaperAnalyzer Output\n{paper}\n\n"
+        f"## MarketResearcher Output\n{ctx.output('market_research', MARKET_FOR_IDEATION)}"
+    )
+    # Ideas already generated for similar papers (see app.idea_index)
+    prior = prior_ideas(paper, ctx.params["arxiv_id"])
+    if prior:
+        prompt += (
+            "\n\n## Prior Ideas From Related Papers\nBuild on or differentiate from these; "
+            f"don't repeat them unless this paper makes them clearly better.\n\n{prior}"
+        )
+    return prompt
+
+
+def _fact_check_input(ctx: PipelineContext) -> str:
+    return (
+        "Fact-check the claims of the TOP-ranked idea only against the paper analysis.\n\n"
+        f"## Ideas\n{_top_idea(ctx)}\n\n"
+        f"## Paper Analysis\n{ctx.output('paper_analysis', PAPER_FOR_FACT_CHECK)}"
+    )
+
+
+def _validation_input(ctx: PipelineContext) -> str:
+    ideas = ctx.output("ideation", IDEAS_FOR_VALIDATION)
+    prompt = f"Validate the top-ranked ideas below with external research.\n\n## Ideas\n{ideas}"
+    # Competitor research done for similar ideas of other papers (see app.idea_index)
+    prior = prior_validation(ideas, ctx.params["arxiv_id"])
+    if prior:
+        prompt += (
+            "\n\n## Prior Validation Research\nCompetitor research from earlier runs for similar ideas. "
+            "Reuse what applies and search only for what it does not cover.\n\n"
+            f"{prior}"
+        )
+    return prompt
+
+
+def _engineering_input(ctx: PipelineContext) -> str:
+    return (
+        f"Create a technical implementation plan for the TOP-ranked idea below, based on arXiv paper "
+        f"{ctx.params['arxiv_id']}.\n\n"
+        f"## Ideas\n{_top_idea(ctx)}\n\n"
+        f"## Paper Analysis\n{ctx.output('paper_analysis', PAPER_FOR_ENGINEERING)}"
+    )
+
+
+def _strategy_input(ctx: PipelineContext) -> str:
+    return (
+        "Evaluate and score the ideas using the validation and technical data below.\n\n"
+        f"## Ideas\n{ctx.output('ideation', IDEAS_FOR_STRATEGY)}\n\n"
+        f"## Validation Research\n{ctx.output('validation')}\n\n"
+        f"## Technical Plan\n{ctx.output('engineering', ENGINEERING_FOR_STRATEGY)}\n\n"
+        f"## Fact Check\n{ctx.output('fact_check')}"
+    )
+
+
+def _report_input(ctx: PipelineContext) -> str:
+    sections = [
+        ("PaperAnalyzer", "paper_analysis"),
+        ("MarketResearcher", "market_research"),
+        ("IdeaGenerator", "ideation"),
+        ("FactChecker", "fact_check"),
+        ("ValidationResearcher", "validation"),
+        ("ProductEngineer", "engineering"),
+        ("StrategicAdvisor", "strategy"),
+    ]
+    body = "\n\n".join(f"## {label} Output\n{ctx.output(stage)}" for label, stage in sections)
+    return f"Compile the final Paper-to-SaaS report for arXiv:{ctx.params['arxiv_id']}.\n\n{body}"
+
+
+def _build_paper2saas_pipeline(structured: bool = False) -> Pipeline:
+    """
+    Args:
+        structured: Stages with an app.models schema answer in it and pass compact JSON
+            downstream instead of Markdown (see app.structured)
+    """
+    def schema(output_schema):
+        return output_schema if structured else None
+
+    paper_analyzer = get_component("paper_analyzer")
+    # Repeated or popular papers skip the most expensive stage entirely
+    paper_analysis_cache = (
+        AgentStageCache(analysis_cache, paper_analyzer, output_schema=schema(PaperAnalysisOutput))
+        if AgentConfig.ANALYSIS_CACHE_ENABLED else None
+    )
+
+    return Pipeline(
+        name="Paper2SaaS (structured)" if structured else "Paper2SaaS",
+        stages=[
+            # Stage 1: Data (parallel)
+            Stage("paper_analysis", paper_analyzer, _paper_input, cache=paper_analysis_cache,
+                  output_schema=schema(PaperAnalysisOutput), stop_if=_low_confidence),
+            Stage("market_research", get_component("market_researcher"), _market_input,
+                  output_schema=schema(MarketResearchOutput), optional=True),
+            # Stage 2: Ideation
+            Stage("ideation", get_component("idea_generator"), _ideation_input,
+                  depends_on=("paper_analysis", "market_research"), output_schema=schema(IdeaGeneratorOutput)),
+            # Stage 3: Quality + Deep Dive (parallel); each can be dropped when the budget runs out
+            Stage("fact_check", get_component("fact_checker"), _fact_check_input, depends_on=("ideation",),
+                  optional=True),
+            Stage("validation", get_component("validation_researcher"), _validation_input, depends_on=("ideation",),
+                  optional=True),
+            Stage("engineering", get_component("product_engineer"), _engineering_input, depends_on=("ideation",),
+                  output_schema=schema(ProductEngineerOutput), optional=True),
+            # Stage 4-5: Synthesis
+            Stage("strategy", get_component("strategic_advisor"), _strategy_input,
+                  depends_on=("fact_check", "validation", "engineering")),
+            Stage("report", get_component("report_generator"), _report_input, depends_on=("strategy",)),
+        ],
+        router=(
+            ModelRouter(confidence=_routing_confidence, context_tokens=_routing_tokens)
+            if AgentConfig.MODEL_TIERING_ENABLED else None
+        ),
+    )
+
+
+# Team and pipelines (and their agents) are built on first access (see app.registry)
+__getattr__ = lazy_module_attributes(__name__, {
+    "paper2saas_team": _build_paper2saas_team,
+    "paper2saas_pipeline": _build_paper2saas_pipeline,
+    "paper2saas_structured_pipeline": lambda: _build_paper2saas_pipeline(structured=True),
+})
+
+
+def get_paper2saas_pipeline(structured: Optional[bool] = None) -> Pipeline:
+    """The Markdown or structured pipeline (STRUCTURED_PIPELINE decides by default)."""
+    if structured is None:
+        structured = AgentConfig.STRUCTURED_PIPELINE
+    return __getattr__("paper2saas_structured_pipeline" if structured else "paper2saas_pipeline")
+
+
+def _invalid_arxiv_id(arxiv_id: str) -> dict:
+    logger.error(f"Invalid arXiv ID format: {arxiv_id}")
+    return {
+        "status": "error",
+        "error": invalid_arxiv_id_message(arxiv_id),
+        "arxiv_id": arxiv_id
+    }
+
+
+def _dedup_key(arxiv_id: str, structured: Optional[bool], budget: Optional[BudgetLimits],
+               resume: bool = False, session_id: Optional[str] = None) -> Optional[str]:
     """
-    Execute paper2saas_team with comprehensive error handling
+    Key under which runs of this paper are shared (None: run on its own, e.g. with custom
+    limits). A caller that names its session expects the run stored under it, so runs with
+    an explicit session ID are never shared either.
+    """
+    if not AgentConfig.RUN_DEDUP_ENABLED or budget is not None or resume or session_id is not None:
+        return None
+    if structured is None:
+        structured = AgentConfig.STRUCTURED_PIPELINE
+    return f"{resolved_paper_key(arxiv_id)}:{'structured' if structured else 'markdown'}"
+
+
+def _dedup_alias(arxiv_id: str, key: str, structured: Optional[bool]) -> Callable[[], str]:
+    """Key of the version an unversioned run stored, once it has run (its result is cached under both)."""
+    return lambda: _dedup_key(arxiv_id, structured, None) or key
+
+
+def _analysis_cached(pipeline: Pipeline, context: PipelineContext) -> Optional[Callable[[], bool]]:
+    """Whether paper_analysis will be a cache hit, so the run never reads the paper (see app.prefetch)."""
+    cache = pipeline.stages["paper_analysis"].cache
+    return None if cache is None else lambda: cache.contains(context)
+
+
+def _deduplicated(arxiv_id: str) -> Callable[[str], None]:
+    def notify(outcome: str):
+        logger.info(f"Run for {arxiv_id} {'joined the run in flight' if outcome == 'joined' else 'served from cache'}")
+        emit("run_deduplicated", arxiv_id=arxiv_id, outcome=outcome)
+    return notify
+
+
+def _build_result(pipeline: Pipeline, run_output: PipelineRunOutput, arxiv_id: str, session_id: str,
+                  tool_memo: ToolMemo, prefetch: Optional[PaperPrefetch] = None,
+                  market_counts: Optional[dict] = None, checkpoint: Optional[RunCheckpoint] = None) -> dict:
+    """Shape a pipeline run like the dict returned by run_team_with_error_handling."""
+    metrics = {
+        "total_tokens": run_output.total_tokens,
+        "execution_time": round(run_output.duration, 3),
+        "stage_timings": run_output.stage_timings,
+    }
+    paper_analysis_cache = pipeline.stages["paper_analysis"].cache
+    if paper_analysis_cache is not None:
+        paper_stage = run_output.stages.get("paper_analysis")
+        metrics["analysis_cache"] = {
+            "hit": bool(paper_stage and paper_stage.cached),
+            **paper_analysis_cache.stats(),
+        }
+    structured_stages = [name for name, stage in pipeline.stages.items() if stage.output_schema is not None]
+    if structured_stages:
+        results = [run_output.stages[name] for name in structured_stages if name in run_output.stages]
+        metrics["structured"] = {
+            "validated": sum(result.structured is not None for result in results),
+            "repaired": sum(result.repaired for result in results),
+            "repair_tokens": sum(result.repair_tokens for result in results),
+        }
+    if pipeline.router is not None:
+        tiers = {name: result.tier for name, result in run_output.stages.items() if result.tier}
+        metrics["tiering"] = {
+            "small": [name for name, tier in tiers.items() if tier == "small"],
+            "escalated": [name for name, result in run_output.stages.items() if result.escalated],
+            "escalation_tokens": sum(result.escalation_tokens for result in run_output.stages.values()),
+        }
+    metrics["tool_memo"] = tool_memo.stats()
+    if market_counts is not None:
+        metrics["market_cache"] = dict(market_counts)
+    if prefetch is not None:
+        metrics["prefetch"] = prefetch.report()
+    if checkpoint is not None:
+        resumed = [name for name, result in run_output.stages.items() if result.resumed]
+        metrics["checkpoint"] = {
+            "resumed_stages": resumed,
+            "tokens_saved": sum(run_output.stages[name].resumed_tokens for name in resumed),
+        }
+    metrics["budget"] = run_output.budget
+    logger.info(f"Execution Metrics: {metrics}")
+
+    result = {"status": run_output.status, "result": run_output, "metrics": metrics}
+    failed = run_output.failed_stage
+    if failed is not None:
+        result["error"] = f"Stage '{failed.stage}' failed: {failed.error}"
+        result["error_type"] = failed.error_type
+        result["failed_stage"] = failed.stage
+    elif run_output.status == "error" and run_output.stop_reason:
+        result["error"] = f"Run stopped early: {run_output.stop_reason}"
+        result["error_type"] = "BudgetExceeded"
+    if run_output.stop_reason:
+        result["stop_reason"] = run_output.stop_reason
+
+    result["arxiv_id"] = arxiv_id
+    result["session_id"] = session_id
+    return result
+
+
+def run_paper2saas(arxiv_id: str, session_id: Optional[str] = None, structured: Optional[bool] = None,
+                   budget: Optional[BudgetLimits] = None, resume: bool = False) -> dict:
+    """
+    Execute the Paper2SaaS pipeline with comprehensive error handling
     
     Args:
-        arxiv_id: The arXiv paper ID to analyze
+        arxiv_id: The arXiv paper ID (or its arxiv.org abs/pdf URL) to analyze
+        session_id: Optional session ID for this run (a new UUID by default); a run with an
+            explicit session ID is never shared with other requests (see app.dedup)
+        structured: Run the structured-output pipeline (STRUCTURED_PIPELINE by default)
+        budget: Limits for this run (the BUDGET_* settings by default)
+        resume: Continue `session_id` from the stages its checkpoint saved (a fresh run
+            if it has none); resumed runs are never shared with other requests
         
     Returns:
         dict with status, result/error, and metadata
     """
-    # Validate input
+    # Validate input (URLs and arXiv: prefixes are reduced to the ID)
+    arxiv_id = canonical_arxiv_id(arxiv_id)
     if not validate_arxiv_id(arxiv_id):
-        logger.error(f"Invalid arXiv ID format: {arxiv_id}")
-        return {
-            "status": "error",
-            "error": f"Invalid arXiv ID format: {arxiv_id}. Expected format: YYMM.NNNNN or YYMM.NNNNNvN",
-            "arxiv_id": arxiv_id
-        }
-    
+        return _invalid_arxiv_id(arxiv_id)
+
+    # Concurrent and repeated requests for the same paper share one run (see app.dedup)
+    key = _dedup_key(arxiv_id, structured, budget, resume, session_id)
+    if key is not None:
+        return run_deduplicator.run(
+            key, lambda: _run_paper2saas(arxiv_id, session_id, structured, budget), notify=_deduplicated(arxiv_id),
+            alias=_dedup_alias(arxiv_id, key, structured),
+        )
+    return _run_paper2saas(arxiv_id, session_id, structured, budget, resume)
+
+
+def _run_paper2saas(arxiv_id: str, session_id: Optional[str], structured: Optional[bool],
+                    budget: Optional[BudgetLimits], resume: bool = False) -> dict:
     # Generate a unique session ID for this run to prevent context pollution
-    session_id = str(uuid.uuid4())
+    session_id = session_id or str(uuid.uuid4())
     logger.info(f"Generated session ID: {session_id} for arXiv ID: {arxiv_id}")
-    
-    result = run_team_with_error_handling(
-        team=paper2saas_team,
-        input_text=f"Analyze arXiv paper {arxiv_id} and generate SaaS opportunities",
-        log_start_msg=f"Starting paper2saas analysis for arXiv ID: {arxiv_id}",
-        log_success_msg=f"Successfully completed analysis for {arxiv_id}",
-        session_id=session_id
-    )
-    
-    # --- PERFORMANCE METRICS ---
-    if result["status"] == "success":
-        run_output = result["result"]
-        metrics = {
-            "total_tokens": getattr(run_output, "metrics", None) and getattr(run_output.metrics, "total_tokens", "N/A"),
-            "execution_time": getattr(run_output, "metrics", None) and getattr(run_output.metrics, "time", "N/A"),
-        }
-        logger.info(f"Execution Metrics: {metrics}")
-        result["metrics"] = metrics
+    logger.info(f"Starting paper2saas analysis for arXiv ID: {arxiv_id}")
 
-    # Add arxiv_id to result
-    result["arxiv_id"] = arxiv_id
-    result["session_id"] = session_id
+    if structured is None:
+        structured = AgentConfig.STRUCTURED_PIPELINE
+    pipeline = get_paper2saas_pipeline(structured)
+    # Completed stages are saved as they finish, so a failed run can be resumed (see app.checkpoint)
+    checkpoint = run_checkpoint(session_id, arxiv_id, structured, resume)
+    context = PipelineContext(
+        session_id=session_id, params={"arxiv_id": arxiv_id}, budget=RunBudget(budget), checkpoint=checkpoint
+    )
+    with (
+        tool_memo_scope() as tool_memo,
+        market_cache_scope() as market_counts,
+        paper_prefetch(arxiv_id, tool_memo, _analysis_cached(pipeline, context)) as prefetch,
+    ):
+        run_output = pipeline.run(context)
+    if checkpoint is not None:
+        checkpoint.finish(run_output.status)
+    if run_output.status == "success":
+        logger.info(f"Successfully completed analysis for {arxiv_id}")
+    result = _build_result(pipeline, run_output, arxiv_id, session_id, tool_memo, prefetch, market_counts, checkpoint)
+    ingest_run(result)
     return result
 
 
-async def arun_paper2saas(arxiv_id: str) -> dict:
+async def arun_paper2saas(arxiv_id: str, session_id: Optional[str] = None,
+                          structured: Optional[bool] = None, budget: Optional[BudgetLimits] = None,
+                          resume: bool = False) -> dict:
     """
-    Async version for minimal latency - executes agents concurrently.
+    Async version for minimal latency - executes independent stages concurrently.
     
     Args:
-        arxiv_id: The arXiv paper ID to analyze
+        arxiv_id: The arXiv paper ID (or its arxiv.org abs/pdf URL) to analyze
+        session_id: Optional session ID for this run (a new UUID by default); a run with an
+            explicit session ID is never shared with other requests (see app.dedup)
+        structured: Run the structured-output pipeline (STRUCTURED_PIPELINE by default)
+        budget: Limits for this run (the BUDGET_* settings by default)
+        resume: Continue `session_id` from the stages its checkpoint saved (a fresh run
+            if it has none); resumed runs are never shared with other requests
         
     Returns:
         dict with status, result/error, and metadata
     """
-    # Validate input
+    # Validate input (URLs and arXiv: prefixes are reduced to the ID)
+    arxiv_id = canonical_arxiv_id(arxiv_id)
     if not validate_arxiv_id(arxiv_id):
-        logger.error(f"Invalid arXiv ID format: {arxiv_id}")
-        return {
-            "status": "error",
-            "error": f"Invalid arXiv ID format: {arxiv_id}. Expected format: YYMM.NNNNN or YYMM.NNNNNvN",
-            "arxiv_id": arxiv_id
-        }
-    
+        return _invalid_arxiv_id(arxiv_id)
+
+    # Concurrent and repeated requests for the same paper share one run (see app.dedup)
+    # The key may read the paper store to resolve an unversioned ID, so off the event loop
+    key = await asyncio.to_thread(_dedup_key, arxiv_id, structured, budget, resume, session_id)
+    if key is not None:
+        return await run_deduplicator.arun(
+            key, lambda: _arun_paper2saas(arxiv_id, session_id, structured, budget), notify=_deduplicated(arxiv_id),
+            alias=_dedup_alias(arxiv_id, key, structured),
+        )
+    return await _arun_paper2saas(arxiv_id, session_id, structured, budget, resume)
+
+
+async def _arun_paper2saas(arxiv_id: str, session_id: Optional[str], structured: Optional[bool],
+                           budget: Optional[BudgetLimits], resume: bool = False) -> dict:
     # Generate a unique session ID for this run to prevent context pollution
-    session_id = str(uuid.uuid4())
+    session_id = session_id or str(uuid.uuid4())
     logger.info(f"Generated session ID: {session_id} for arXiv ID: {arxiv_id} (async)")
-    
-    result = await arun_team_with_error_handling(
-        team=paper2saas_team,
-        input_text=f"Analyze arXiv paper {arxiv_id} and generate SaaS opportunities",
-        log_start_msg=f"Starting async paper2saas analysis for arXiv ID: {arxiv_id}",
-        log_success_msg=f"Successfully completed async analysis for {arxiv_id}",
-        session_id=session_id
-    )
-    
-    # --- PERFORMANCE METRICS ---
-    if result["status"] == "success":
-        run_output = result["result"]
-        metrics = {
-            "total_tokens": getattr(run_output, "metrics", None) and getattr(run_output.metrics, "total_tokens", "N/A"),
-            "execution_time": getattr(run_output, "metrics", None) and getattr(run_output.metrics, "time", "N/A"),
-        }
-        logger.info(f"Async Execution Metrics: {metrics}")
-        result["metrics"] = metrics
+    logger.info(f"Starting async paper2saas analysis for arXiv ID: {arxiv_id}")
 
-    # Add arxiv_id to result
-    result["arxiv_id"] = arxiv_id
-    result["session_id"] = session_id
+    if structured is None:
+        structured = AgentConfig.STRUCTURED_PIPELINE
+    pipeline = get_paper2saas_pipeline(structured)
+    # Completed stages are saved as they finish, so a failed run can be resumed (see app.checkpoint)
+    checkpoint = await asyncio.to_thread(run_checkpoint, session_id, arxiv_id, structured, resume)
+    context = PipelineContext(
+        session_id=session_id, params={"arxiv_id": arxiv_id}, budget=RunBudget(budget), checkpoint=checkpoint
+    )
+    with (
+        tool_memo_scope() as tool_memo,
+        market_cache_scope() as market_counts,
+        paper_prefetch(arxiv_id, tool_memo, _analysis_cached(pipeline, context)) as prefetch,
+    ):
+        run_output = await pipeline.arun(context)
+    if checkpoint is not None:
+        await asyncio.to_thread(checkpoint.finish, run_output.status)
+    if run_output.status == "success":
+        logger.info(f"Successfully completed async analysis for {arxiv_id}")
+    result = _build_result(pipeline, run_output, arxiv_id, session_id, tool_memo, prefetch, market_counts, checkpoint)
+    await asyncio.to_thread(ingest_run, result)
     return result
+
+
+def _no_checkpoint(session_id: str) -> dict:
+    reason = "checkpoints are disabled" if not AgentConfig.CHECKPOINT_ENABLED else "unknown or expired session"
+    logger.error(f"Cannot resume session {session_id}: {reason}")
+    return {
+        "status": "error",
+        "error": f"Cannot resume session {session_id}: {reason}",
+        "error_type": "CheckpointNotFound",
+        "session_id": session_id,
+    }
+
+
+def resume_paper2saas(session_id: str, budget: Optional[BudgetLimits] = None) -> dict:
+    """
+    Resume a failed or interrupted run from its last completed stage.
+
+    Stages the run's checkpoint saved are restored (and reported as stage_resumed events);
+    only the failed, stopped and never-started stages run again, on the same paper and
+    pipeline as the original run.
+
+    Args:
+        session_id: Session ID of the run to resume (result["session_id"] of the failed run)
+        budget: Limits for the resumed stages (the BUDGET_* settings by default)
+
+    Returns:
+        dict in the same shape as run_paper2saas; metrics["checkpoint"] lists the resumed
+        stages and the tokens they had cost
+    """
+    run = resumable_run(session_id)
+    if run is None:
+        return _no_checkpoint(session_id)
+    logger.info(f"Resuming session {session_id} for arXiv ID: {run['arxiv_id']} ({len(run['stages'])} stages completed)")
+    return _run_paper2saas(run["arxiv_id"], session_id, run["structured"], budget, resume=True)
+
+
+async def aresume_paper2saas(session_id: str, budget: Optional[BudgetLimits] = None) -> dict:
+    """Async version of resume_paper2saas."""
+    run = await asyncio.to_thread(resumable_run, session_id)
+    if run is None:
+        return _no_checkpoint(session_id)
+    logger.info(f"Resuming session {session_id} for arXiv ID: {run['arxiv_id']} ({len(run['stages'])} stages completed)")
+    return await _arun_paper2saas(run["arxiv_id"], session_id, run["structured"], budget, resume=True)
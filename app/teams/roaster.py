@@ -1,29 +1,45 @@
 from agno.team import Team
+import asyncio
+import re
+import time
 import uuid
+from typing import Any, AsyncIterator, Iterable, List, Optional, Union
 
 from app.config import AgentConfig
-from app.utils import shared_db, logger, run_team_with_error_handling, get_mistral_model
-from app.prompts.agents import IDEA_ROASTER_TEAM_INSTRUCTIONS
-
-# Import agents
-from app.agents.devils_advocate import devils_advocate
-from app.agents.market_skeptic import market_skeptic
-
-idea_roaster_team = Team(
-    name="IdeaRoaster",
-    role="Stress-test SaaS ideas with evidence-based critique",
-    model=get_mistral_model(AgentConfig.LARGE_MODEL),
-    # reasoning=True,
-    stream_intermediate_steps=False,
-    instructions=IDEA_ROASTER_TEAM_INSTRUCTIONS,
-    members=[devils_advocate, market_skeptic],
-    db=shared_db,
-    store_events=AgentConfig.STORE_EVENTS,
-    markdown=AgentConfig.ENABLE_MARKDOWN,
-    show_members_responses=AgentConfig.SHOW_MEMBER_RESPONSES,
-    add_datetime_to_context=True,
-)
-logger.info("Initialized idea_roaster_team with 2 agents")
+from app.models import IdeaGeneratorOutput, SaaSIdea
+from app.registry import get_component, lazy_module_attributes
+from app.utils import logger, run_team_with_error_handling, arun_team_with_error_handling, get_mistral_model
+from app.prompts.assembly import dated_instructions
+from app.tools.memo import ToolMemo, shared_tool_memo, tool_memo_scope
+from app.tools.market_cache import market_cache_scope
+
+PROCEED_RECOMMENDATION = re.compile(r"Proceed Recommendation\W*\s*(YES|INVESTIGATE|NO)\b", re.IGNORECASE)
+OVERALL_RISK = re.compile(r"Overall Risk\W*\s*(\d+(?:\.\d+)?)")
+IDEA_HEADING = re.compile(r"^#{2,3} +Idea\b", re.MULTILINE)
+
+
+def _build_idea_roaster_team() -> Team:
+    from app.utils import shared_db
+
+    team = Team(
+        name="IdeaRoaster",
+        role="Stress-test SaaS ideas with evidence-based critique",
+        model=get_mistral_model(AgentConfig.LARGE_MODEL),
+        # reasoning=True,
+        stream_intermediate_steps=False,
+        instructions=dated_instructions("idea_roaster_team"),
+        members=[get_component("devils_advocate"), get_component("market_skeptic")],
+        db=shared_db,
+        store_events=AgentConfig.STORE_EVENTS,
+        markdown=AgentConfig.ENABLE_MARKDOWN,
+        show_members_responses=AgentConfig.SHOW_MEMBER_RESPONSES,
+    )
+    logger.info("Initialized idea_roaster_team with 2 agents")
+    return team
+
+
+# Built on first access (see app.registry)
+__getattr__ = lazy_module_attributes(__name__, {"idea_roaster_team": _build_idea_roaster_team})
 
 def run_idea_roaster(idea_context: str) -> dict:
     """
@@ -38,10 +54,140 @@ def run_idea_roaster(idea_context: str) -> dict:
     session_id = str(uuid.uuid4())
     logger.info(f"Starting idea roaster critique with session ID: {session_id}")
 
-    return run_team_with_error_handling(
-        team=idea_roaster_team,
-        input_text=f"Critique this SaaS idea: {idea_context}",
-        log_start_msg="Starting idea roaster critique",
-        log_success_msg="Successfully completed idea critique",
-        session_id=session_id
+    with tool_memo_scope() as tool_memo, market_cache_scope() as market_counts:
+        result = run_team_with_error_handling(
+            team=get_component("idea_roaster_team"),
+            input_text=f"Critique this SaaS idea: {idea_context}",
+            log_start_msg="Starting idea roaster critique",
+            log_success_msg="Successfully completed idea critique",
+            session_id=session_id
+        )
+    result["metrics"] = {"tool_memo": tool_memo.stats(), "market_cache": market_counts}
+    return result
+
+
+async def arun_idea_roaster(idea_context: str, session_id: Optional[str] = None,
+                            tool_memo: Optional[ToolMemo] = None) -> dict:
+    """
+    Async version of run_idea_roaster; the team delegates to its members concurrently.
+
+    Args:
+        idea_context: Context about the idea to critique
+        session_id: Optional session ID for this run (a new UUID by default)
+        tool_memo: Memo to serve tool calls from (a new per-run memo by default); pass one
+            memo to several runs to share their search results
+
+    Returns:
+        dict with status, result/error, and the parsed verdict
+    """
+    session_id = session_id or str(uuid.uuid4())
+    logger.info(f"Starting async idea roaster critique with session ID: {session_id}")
+
+    with tool_memo_scope(tool_memo) as memo, market_cache_scope() as market_counts:
+        result = await arun_team_with_error_handling(
+            team=get_component("idea_roaster_team"),
+            input_text=f"Critique this SaaS idea: {idea_context}",
+            log_start_msg="Starting idea roaster critique",
+            log_success_msg="Successfully completed idea critique",
+            session_id=session_id
+        )
+    result["session_id"] = session_id
+    result["verdict"] = parse_verdict(getattr(result.get("result"), "content", None))
+    result["metrics"] = {"tool_memo": memo.stats(), "market_cache": market_counts}
+    return result
+
+
+def parse_verdict(content: Any) -> Optional[dict]:
+    """Proceed recommendation (YES / INVESTIGATE / NO) and overall risk from a roast, None if absent."""
+    if not isinstance(content, str):
+        return None
+    recommendation = PROCEED_RECOMMENDATION.search(content)
+    if recommendation is None:
+        return None
+    risk = OVERALL_RISK.search(content)
+    return {
+        "recommendation": recommendation.group(1).upper(),
+        "overall_risk": float(risk.group(1)) if risk else None,
+    }
+
+
+def format_idea(idea: SaaSIdea) -> str:
+    """Idea context for the roaster from a structured IdeaGenerator idea."""
+    return (
+        f"{idea.name}\n"
+        f"- Core concept: {idea.core_concept}\n"
+        f"- Target market: {idea.target_market}\n"
+        f"- Value proposition: {idea.value_proposition}\n"
+        f"- Technical approach: {idea.technical_approach}\n"
+        f"- Competitive moat: {idea.competitive_moat}\n"
+        f"- Revenue model: {idea.revenue_model}\n"
+        f"- MVP features: {'; '.join(idea.mvp_features)}\n"
+        f"- Paper innovation: {idea.paper_innovation_link}"
     )
+
+
+def ideas_from_result(result: dict) -> List[str]:
+    """
+    Idea contexts from a run_paper2saas result, in ranking order. Structured runs give one
+    context per SaaSIdea; Markdown runs are split on the IdeaGenerator's "## Idea" headings.
+    """
+    run_output = result.get("result")
+    ideation = getattr(run_output, "stages", {}).get("ideation")
+    if ideation is None or ideation.status != "success":
+        return []
+    if isinstance(ideation.structured, IdeaGeneratorOutput):
+        rank = {name: position for position, name in enumerate(ideation.structured.ranking)}
+        ideas = sorted(ideation.structured.ideas, key=lambda idea: rank.get(idea.name, len(rank)))
+        return [format_idea(idea) for idea in ideas]
+    starts = [match.start() for match in IDEA_HEADING.finditer(ideation.content or "")]
+    return [ideation.content[start:end].strip() for start, end in zip(starts, starts[1:] + [None])]
+
+
+async def arun_idea_roaster_batch(
+    ideas: Iterable[Union[str, SaaSIdea]],
+    max_concurrency: int = AgentConfig.ROASTER_MAX_CONCURRENCY,
+    paper_context: Optional[str] = None,
+) -> AsyncIterator[dict]:
+    """
+    Roast many ideas concurrently, yielding each idea's result as soon as its verdict is in.
+
+    Every roast runs against one tool memo, so ideas from the same paper share search and
+    scrape results (concurrent identical calls are coalesced into one request).
+
+    Args:
+        ideas: Idea contexts, or structured ideas from IdeaGeneratorOutput.ideas
+        max_concurrency: Maximum number of ideas roasted at the same time
+        paper_context: Optional paper summary prepended to every idea
+
+    Yields:
+        dict in the same shape as arun_idea_roaster, plus index, idea and wall_time;
+        empty ideas are skipped, so indexes always refer to positions in `ideas`
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tool_memo = ToolMemo(parent=shared_tool_memo)
+
+    async def roast(index: int, idea: Union[str, SaaSIdea]) -> dict:
+        idea_context = format_idea(idea) if isinstance(idea, SaaSIdea) else idea
+        if paper_context:
+            idea_context = f"{idea_context}\n\nSource paper:\n{paper_context}"
+        async with semaphore:
+            started = time.perf_counter()
+            result = await arun_idea_roaster(idea_context, tool_memo=tool_memo)
+        result["index"] = index
+        result["idea"] = idea.name if isinstance(idea, SaaSIdea) else idea.strip().splitlines()[0].lstrip("# ")[:120]
+        result["wall_time"] = round(time.perf_counter() - started, 3)
+        return result
+
+    tasks = []
+    for index, idea in enumerate(ideas):
+        if not isinstance(idea, SaaSIdea) and not idea.strip():
+            logger.warning(f"Skipping empty idea at index {index}")
+            continue
+        tasks.append(asyncio.create_task(roast(index, idea)))
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+        logger.info(f"Roasted {len(tasks)} ideas, shared tool memo: {tool_memo.stats()}")
@@ -0,0 +1,466 @@
+"""
+Latency and token instrumentation: OpenTelemetry spans and Prometheus metrics.
+
+Pipeline runs, stages, model requests and tool calls are each wrapped in an OpenTelemetry
+span (stages nest under their run; model requests and tool calls under their stage) and
+observed into in-process histograms and counters. Those are served in the Prometheus text
+format at GET /paper2saas/metrics, so no client library is needed.
+
+setup_telemetry() (called by app.main when TELEMETRY_ENABLED) installs the SDK tracer
+provider and exports spans to TELEMETRY_TRACES_DB (the SQLite span store agno's AgentOS
+reads traces from) and, if OTEL_EXPORTER_OTLP_ENDPOINT is set, to an OTLP collector.
+Without it, spans are no-ops and only the metrics are kept.
+
+Offline analysis of the span store, e.g. which member dominates p95 latency:
+    python -m app.telemetry report [--db tmp/traces.db] [--last-hours 24]
+"""
+import math
+import statistics
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from opentelemetry import trace
+from opentelemetry.trace import Status, StatusCode
+
+from app.config import AgentConfig
+from app.utils import logger
+
+SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+INF_BUCKET = 'le="+Inf"'
+
+tracer = trace.get_tracer("paper2saas")
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[Any, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with labels, rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self._values: Dict[Tuple[Any, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            self._values[key] += amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, key)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = SECONDS_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self.buckets = tuple(sorted(buckets))
+        # labels -> (per-bucket counts, sum, count)
+        self._values: Dict[Tuple[Any, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    le = f'le="{_number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {bucket_count}")
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, INF_BUCKET)} {count}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(round(total, 6))}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose labelled values are read from callbacks at scrape time."""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self._callbacks: Dict[Tuple[Any, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def track(self, callback, **labels: Any):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            self._callbacks[key] = callback
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            callbacks = sorted(self._callbacks.items())
+        for key, callback in callbacks:
+            try:
+                value = callback()
+            except Exception:
+                continue
+            lines.append(f"{self.name}{_labels(self.label_names, key)} {_number(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """The process's metrics, served at GET /paper2saas/metrics."""
+
+    def __init__(self):
+        self._metrics: List[Any] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+
+
+registry = MetricsRegistry()
+RUN_SECONDS = registry.register(Histogram(
+    "paper2saas_run_seconds", "Wall time of pipeline runs", ("pipeline", "status")
+))
+STAGE_SECONDS = registry.register(Histogram(
+    "paper2saas_stage_seconds", "Wall time of pipeline stages", ("pipeline", "stage", "agent", "status", "tier")
+))
+STAGE_TOKENS = registry.register(Histogram(
+    "paper2saas_stage_tokens", "Tokens used per pipeline stage", ("pipeline", "stage", "agent", "kind"),
+    buckets=TOKEN_BUCKETS,
+))
+MODEL_REQUEST_SECONDS = registry.register(Histogram(
+    "paper2saas_model_request_seconds", "Latency of model requests", ("agent", "model", "status")
+))
+MODEL_TOKENS = registry.register(Histogram(
+    "paper2saas_model_request_tokens", "Prompt and completion tokens per model request", ("agent", "model", "kind"),
+    buckets=TOKEN_BUCKETS,
+))
+TOOL_SECONDS = registry.register(Histogram(
+    "paper2saas_tool_call_seconds", "Latency of tool calls", ("tool", "status")
+))
+CACHE_REQUESTS = registry.register(Counter(
+    "paper2saas_cache_requests_total", "Cache lookups by cache and outcome", ("cache", "outcome")
+))
+RETRIES = registry.register(Counter(
+    "paper2saas_retries_total", "Repeated work: structured repairs, tier escalations, batch run retries", ("kind",)
+))
+PREFETCH_HIDDEN_SECONDS = registry.register(Histogram(
+    "paper2saas_prefetch_hidden_seconds", "Paper fetch time a run did not wait for thanks to prefetch", ("status",)
+))
+DB_POOL_CONNECTIONS = registry.register(Gauge(
+    "paper2saas_db_pool_connections", "Database pool connections by state", ("db", "state")
+))
+DB_POOL_EVENTS = registry.register(Counter(
+    "paper2saas_db_pool_events_total", "Database pool connects, checkouts and invalidations", ("db", "event")
+))
+DB_CHECKOUT_SECONDS = registry.register(Histogram(
+    "paper2saas_db_checkout_seconds", "Time waiting for a pooled database connection", ("db",),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+))
+
+
+def render_metrics() -> str:
+    return registry.render()
+
+
+def _attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    # OpenTelemetry rejects None attribute values
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Start a span (a no-op until setup_telemetry installs a tracer provider)."""
+    with tracer.start_as_current_span(name, attributes=_attributes(attributes)) as current:
+        yield current
+
+
+def set_span_status(current: Any, ok: bool, description: Optional[str] = None, **attributes: Any):
+    current.set_attributes(_attributes(attributes))
+    current.set_status(Status(StatusCode.OK) if ok else Status(StatusCode.ERROR, description))
+
+
+# --- Observations ---
+
+def record_run(pipeline: str, status: str, seconds: float):
+    RUN_SECONDS.observe(seconds, pipeline=pipeline, status=status)
+
+
+def record_stage(pipeline: str, stage: Any, result: Any, agent: Optional[str]):
+    """Observe a finished pipeline stage (a StageResult) and its cache and retry outcomes."""
+    STAGE_SECONDS.observe(result.duration, pipeline=pipeline, stage=result.stage, agent=agent or "",
+                          status=result.status, tier=result.tier or "")
+    metrics = getattr(result.run_output, "metrics", None)
+    if metrics is not None:
+        for kind, tokens in (("input", metrics.input_tokens), ("output", metrics.output_tokens)):
+            STAGE_TOKENS.observe(tokens or 0, pipeline=pipeline, stage=result.stage, agent=agent or "", kind=kind)
+    if stage.cache is not None and result.status == "success":
+        CACHE_REQUESTS.inc(cache=f"stage_{result.stage}", outcome="hit" if result.cached else "miss")
+    if result.repaired:
+        RETRIES.inc(kind="structured_repair")
+    if result.escalated:
+        RETRIES.inc(kind="tier_escalation")
+
+
+def record_model_request(agent: str, model: str, seconds: float, response: Any = None, error: bool = False):
+    MODEL_REQUEST_SECONDS.observe(seconds, agent=agent, model=model, status="error" if error else "success")
+    usage = getattr(response, "response_usage", None)
+    if usage is not None:
+        MODEL_TOKENS.observe(usage.input_tokens or 0, agent=agent, model=model, kind="prompt")
+        MODEL_TOKENS.observe(usage.output_tokens or 0, agent=agent, model=model, kind="completion")
+
+
+def record_cache(cache: str, outcome: str):
+    CACHE_REQUESTS.inc(cache=cache, outcome=outcome)
+
+
+def record_retry(kind: str):
+    RETRIES.inc(kind=kind)
+
+
+def record_prefetch(report: Dict[str, Any]):
+    """Observe a finished paper prefetch (app.prefetch.PaperPrefetch.report())."""
+    PREFETCH_HIDDEN_SECONDS.observe(report["hidden_seconds"], status=report["status"])
+    if report["status"] == "skipped":
+        return  # nothing was fetched, so nothing could be a hit or a miss
+    CACHE_REQUESTS.inc(cache="paper_prefetch", outcome="hit" if report["used"] else "miss")
+
+
+# --- Model and tool instrumentation ---
+
+def _owner(run_response: Any) -> str:
+    return getattr(run_response, "agent_name", None) or getattr(run_response, "team_name", None) or "default"
+
+
+class TelemetryMixin:
+    """Model mixin that wraps every request in a span and observes its latency and tokens (see `instrumented`)."""
+
+    @contextmanager
+    def _request_span(self, kwargs: dict) -> Iterator[dict]:
+        owner = _owner(kwargs.get("run_response"))
+        observed: Dict[str, Any] = {"response": None}
+        started = time.perf_counter()
+        with span("model.request", **{"agno.agent": owner, "llm.model_name": self.id}) as current:
+            try:
+                yield observed
+            except BaseException as e:
+                record_model_request(owner, self.id, time.perf_counter() - started, error=True)
+                set_span_status(current, False, str(e))
+                raise
+            response = observed["response"]
+            record_model_request(owner, self.id, time.perf_counter() - started, response)
+            usage = getattr(response, "response_usage", None)
+            set_span_status(
+                current, True,
+                **{"llm.token_count.prompt": getattr(usage, "input_tokens", None),
+                   "llm.token_count.completion": getattr(usage, "output_tokens", None)},
+            )
+
+    def invoke(self, *args, **kwargs):
+        with self._request_span(kwargs) as observed:
+            observed["response"] = response = super().invoke(*args, **kwargs)
+        return response
+
+    async def ainvoke(self, *args, **kwargs):
+        with self._request_span(kwargs) as observed:
+            observed["response"] = response = await super().ainvoke(*args, **kwargs)
+        return response
+
+    def invoke_stream(self, *args, **kwargs):
+        with self._request_span(kwargs) as observed:
+            for chunk in super().invoke_stream(*args, **kwargs):
+                if chunk.response_usage is not None:
+                    observed["response"] = chunk
+                yield chunk
+
+    async def ainvoke_stream(self, *args, **kwargs):
+        with self._request_span(kwargs) as observed:
+            async for chunk in super().ainvoke_stream(*args, **kwargs):
+                if chunk.response_usage is not None:
+                    observed["response"] = chunk
+                yield chunk
+
+
+@lru_cache(maxsize=None)
+def instrumented(model_cls: type) -> type:
+    """Subclass of `model_cls` whose requests are traced and observed."""
+    return type(model_cls.__name__, (TelemetryMixin, model_cls), {"__module__": model_cls.__module__})
+
+
+def telemetry_tool_hook(function_name: str, function_call, arguments: dict):
+    """Agno tool hook that wraps each tool call in a span and observes its latency."""
+    started = time.perf_counter()
+    with span(f"tool {function_name}", **{"tool.name": function_name}) as current:
+        try:
+            result = function_call(**arguments)
+        except Exception as e:
+            TOOL_SECONDS.observe(time.perf_counter() - started, tool=function_name, status="error")
+            set_span_status(current, False, str(e))
+            raise
+        failed = isinstance(result, str) and result.lstrip().lower().startswith("error")
+        TOOL_SECONDS.observe(time.perf_counter() - started, tool=function_name, status="error" if failed else "success")
+        set_span_status(current, not failed, result[:200] if failed else None)
+    return result
+
+
+# --- Exporters ---
+
+_setup_lock = threading.Lock()
+_traces_db = None
+
+
+def get_traces_db():
+    """The SQLite span store (TELEMETRY_TRACES_DB), or None if disabled."""
+    global _traces_db
+    if _traces_db is None and AgentConfig.TELEMETRY_TRACES_DB:
+        from agno.db.sqlite import SqliteDb
+
+        _traces_db = SqliteDb(db_file=AgentConfig.TELEMETRY_TRACES_DB, id="paper2saas-traces")
+    return _traces_db
+
+
+def setup_telemetry() -> bool:
+    """Install the tracer provider and span exporters once; returns whether spans are exported."""
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    with _setup_lock:
+        if isinstance(trace.get_tracer_provider(), TracerProvider):
+            return True
+        provider = TracerProvider(resource=Resource.create({"service.name": AgentConfig.TELEMETRY_SERVICE_NAME}))
+        traces_db = get_traces_db()
+        if traces_db is not None:
+            from agno.tracing.exporter import DatabaseSpanExporter
+
+            provider.add_span_processor(BatchSpanProcessor(DatabaseSpanExporter(db=traces_db)))
+        if AgentConfig.TELEMETRY_OTLP_ENDPOINT:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        trace.set_tracer_provider(provider)
+    logger.info(
+        f"Telemetry spans exported to {AgentConfig.TELEMETRY_TRACES_DB or 'no local store'}"
+        f"{f' and {AgentConfig.TELEMETRY_OTLP_ENDPOINT}' if AgentConfig.TELEMETRY_OTLP_ENDPOINT else ''}"
+    )
+    return True
+
+
+def flush_telemetry(timeout_millis: int = 5000):
+    """Export buffered spans now (e.g. before a short-lived script exits)."""
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "force_flush"):
+        provider.force_flush(timeout_millis)
+
+
+# --- Offline analysis ---
+
+def _percentile(values: List[float], share: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, math.ceil(len(values) * share) - 1))]
+
+
+def latency_report(spans: List[Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """p50/p95/max latency and mean tokens of stages, model requests (per agent) and tools."""
+    groups: Dict[Tuple[str, str], List[Any]] = defaultdict(list)
+    for recorded in spans:
+        attributes = recorded.attributes or {}
+        if recorded.name.startswith("stage "):
+            groups[("stages", recorded.name[len("stage "):])].append(recorded)
+        elif recorded.name == "model.request":
+            groups[("model_requests", attributes.get("agno.agent", "?"))].append(recorded)
+        elif recorded.name.startswith("tool "):
+            groups[("tools", recorded.name[len("tool "):])].append(recorded)
+
+    report: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for (kind, name), members in groups.items():
+        seconds = [member.duration_ms / 1000 for member in members]
+        tokens = [
+            (member.attributes.get("llm.token_count.prompt") or member.attributes.get("tokens.input") or 0)
+            + (member.attributes.get("llm.token_count.completion") or member.attributes.get("tokens.output") or 0)
+            for member in members
+        ]
+        report[kind].append({
+            "name": name,
+            "count": len(members),
+            "p50": statistics.median(seconds),
+            "p95": _percentile(seconds, 0.95),
+            "max": max(seconds),
+            "tokens": statistics.mean(tokens),
+            "errors": sum(member.status_code == "ERROR" for member in members),
+        })
+    for rows in report.values():
+        rows.sort(key=lambda row: row["p95"], reverse=True)
+    return report
+
+
+def main():
+    import argparse
+    from datetime import datetime, timedelta, timezone
+
+    from agno.db.sqlite import SqliteDb
+
+    parser = argparse.ArgumentParser(description="Latency report from the local span store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    report_parser = commands.add_parser("report", help="p50/p95 per stage, agent and tool")
+    report_parser.add_argument("--db", default=AgentConfig.TELEMETRY_TRACES_DB or "tmp/traces.db")
+    report_parser.add_argument("--last-hours", type=float, help="Only spans started in the last N hours")
+    args = parser.parse_args()
+
+    spans = SqliteDb(db_file=args.db).get_spans()
+    if args.last_hours:
+        since = datetime.now(timezone.utc) - timedelta(hours=args.last_hours)
+        spans = [recorded for recorded in spans if recorded.start_time >= since]
+    if not spans:
+        raise SystemExit(f"No spans in {args.db}; run with TELEMETRY_ENABLED=true first")
+
+    report = latency_report(spans)
+    print(f"{len(spans)} spans from {args.db}")
+    for kind in ("stages", "model_requests", "tools"):
+        print(f"\n| {kind:<24} | {'count':>5} | {'p50 s':>6} | {'p95 s':>6} | {'max s':>6} | {'tokens':>7} | {'errors':>6} |")
+        print(f"|{'-' * 26}|{'-' * 6}:|{'-' * 7}:|{'-' * 7}:|{'-' * 7}:|{'-' * 8}:|{'-' * 7}:|")
+        for row in report.get(kind, []):
+            print(f"| {row['name']:<24} | {row['count']:>5} | {row['p50']:>6.2f} | {row['p95']:>6.2f} | "
+                  f"{row['max']:>6.2f} | {row['tokens']:>7.0f} | {row['errors']:>6} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Adaptive model tiering for pipeline stages.
+
+AgentConfig pins every agent to LARGE_MODEL or SMALL_MODEL. With MODEL_TIERING_ENABLED,
+a ModelRouter picks the tier per call instead. A stage whose agent runs on the large
+model is sent to SMALL_MODEL when its input is short and the paper analysis was
+confident. The pipeline escalates to the agent's own model when the small model's answer
+fails, either with an error or (in structured mode) with output that fails schema
+validation.
+"""
+import copy
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config import AgentConfig
+from app.retrieval import estimate_tokens
+from app.utils import get_mistral_model
+
+
+@dataclass
+class TierDecision:
+    """Model tier chosen for one stage call"""
+    tier: str  # "small" | "large"
+    reason: str
+    input_tokens: Optional[int]
+    confidence: Optional[float] = None
+    # Agent to run instead of the stage's own (the small-model copy), None for the stage agent
+    agent: Any = None
+
+
+def model_id(agent: Any) -> str:
+    return getattr(getattr(agent, "model", None), "id", None) or ""
+
+
+class ModelRouter:
+    """
+    Routes stage calls between SMALL_MODEL and the stage agent's own model.
+
+    Args:
+        stages: Stage names that may be routed to the small model (TIERING_STAGES by default)
+        max_input_tokens: Largest input, in estimated tokens, sent to the small model
+        min_confidence: Lowest upstream confidence score for which the small model is used
+        small_model: Model the small tier runs on (SMALL_MODEL by default)
+        confidence: Optional callable(context) -> upstream confidence score, None if not known yet
+        context_tokens: Optional callable(context, stage_name) -> tokens the agent will read
+            beyond its prompt (e.g. the paper), None if unknown
+    """
+
+    def __init__(self, stages: Optional[set] = None, max_input_tokens: Optional[int] = None,
+                 min_confidence: Optional[float] = None, small_model: Optional[str] = None,
+                 confidence: Optional[Callable[[Any], Optional[float]]] = None,
+                 context_tokens: Optional[Callable[[Any, str], Optional[int]]] = None):
+        self.stages = stages if stages is not None else {
+            s.strip() for s in AgentConfig.TIERING_STAGES.split(",") if s.strip()
+        }
+        self.max_input_tokens = max_input_tokens if max_input_tokens is not None else AgentConfig.TIERING_MAX_INPUT_TOKENS
+        self.min_confidence = min_confidence if min_confidence is not None else AgentConfig.TIERING_MIN_CONFIDENCE
+        self.small_model = small_model or AgentConfig.SMALL_MODEL
+        self.confidence = confidence
+        self.context_tokens = context_tokens
+        self._small_agents: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    def is_small(self, agent: Any) -> bool:
+        return model_id(agent).endswith(self.small_model.split(":")[-1])
+
+    def decide(self, input_tokens: Optional[int], confidence: Optional[float]) -> Tuple[str, str]:
+        """(tier, reason) for a call of `input_tokens` whose upstream confidence is `confidence`."""
+        if input_tokens is None:
+            return "large", "input size unknown"
+        if input_tokens > self.max_input_tokens:
+            return "large", f"input of {input_tokens} tokens exceeds {self.max_input_tokens}"
+        if confidence is not None and confidence < self.min_confidence:
+            return "large", f"paper confidence {confidence:.2f} is below {self.min_confidence:g}"
+        reason = f"input of {input_tokens} tokens"
+        return "small", reason if confidence is None else f"{reason}, paper confidence {confidence:.2f}"
+
+    def small_agent(self, agent: Any) -> Any:
+        """A copy of `agent` on the small model, built once per agent."""
+        with self._lock:
+            small = self._small_agents.get(id(agent))
+            if small is None:
+                small = copy.copy(agent)
+                small.model = get_mistral_model(self.small_model)
+                self._small_agents[id(agent)] = small
+            return small
+
+    def route(self, stage: Any, context: Any, prompt: str) -> Optional[TierDecision]:
+        """Tier for this call of `stage`, or None if the stage is not routed (its agent's model is used)."""
+        if stage.name not in self.stages or self.is_small(stage.agent):
+            return None
+        input_tokens = estimate_tokens(prompt)
+        if self.context_tokens is not None:
+            extra = self.context_tokens(context, stage.name)
+            input_tokens = None if extra is None else input_tokens + extra
+        confidence = self.confidence(context) if self.confidence is not None else None
+        tier, reason = self.decide(input_tokens, confidence)
+        return TierDecision(
+            tier=tier,
+            reason=reason,
+            input_tokens=input_tokens,
+            confidence=confidence,
+            agent=self.small_agent(stage.agent) if tier == "small" else None,
+        )
@@ -0,0 +1,156 @@
+"""
+Offline fakes of the network toolkits.
+
+Each fake keeps the real toolkit's name, tool names, signatures and docstrings (so tool
+schemas and prompts are unchanged), sleeps for MOCK_TOOL_LATENCY_SECONDS and returns a
+small deterministic payload. Selected by the registry when MOCK_TOOLS=true.
+"""
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from agno.tools import Toolkit
+from agno.tools.arxiv import ArxivTools
+from agno.tools.baidusearch import BaiduSearchTools
+from agno.tools.firecrawl import FirecrawlTools
+from agno.tools.hackernews import HackerNewsTools
+from agno.tools.website import WebsiteTools
+
+from app.config import AgentConfig
+from app.tools.local_papers import LocalPaperTools
+
+
+def _wait():
+    if AgentConfig.MOCK_TOOL_LATENCY_SECONDS > 0:
+        time.sleep(AgentConfig.MOCK_TOOL_LATENCY_SECONDS)
+
+
+def _page(url: str) -> dict:
+    return {"url": url, "title": f"Mock page for {url}", "content": f"Mock content of {url}. " * 20}
+
+
+class FakeArxivTools(Toolkit):
+    """Offline ArxivTools with canned results."""
+
+    def __init__(self, **kwargs):
+        tools: List[Any] = [self.search_arxiv_and_return_articles, self.read_arxiv_papers]
+        super().__init__(name="arxiv_tools", tools=tools, **kwargs)
+
+    def search_arxiv_and_return_articles(self, query: str, num_articles: int = 10) -> str:
+        _wait()
+        return json.dumps([
+            {
+                "title": f"Mock paper {i} for {query}",
+                "id": f"2512.{24991 + i}v1",
+                "authors": ["A. Author", "B. Author"],
+                "summary": "Mock abstract describing a method that reduces labeled data needs. " * 3,
+                "pdf_url": f"https://arxiv.org/pdf/2512.{24991 + i}v1",
+            }
+            for i in range(min(num_articles, 3))
+        ])
+
+    def read_arxiv_papers(self, id_list: List[str], pages_to_read: Optional[int] = None) -> str:
+        _wait()
+        return json.dumps([
+            {"id": arxiv_id, "title": f"Mock paper {arxiv_id}", "content": "Mock page text. " * 200}
+            for arxiv_id in id_list
+        ])
+
+    search_arxiv_and_return_articles.__doc__ = ArxivTools.search_arxiv_and_return_articles.__doc__
+    read_arxiv_papers.__doc__ = ArxivTools.read_arxiv_papers.__doc__
+
+
+class FakeBaiduSearchTools(Toolkit):
+    """Offline BaiduSearchTools with canned results."""
+
+    def __init__(self, **kwargs):
+        super().__init__(name="baidusearch", tools=[self.baidu_search], **kwargs)
+
+    def baidu_search(self, query: str, max_results: int = 5, language: str = "zh") -> str:
+        _wait()
+        return json.dumps([
+            {"title": f"Mock result {i} for {query}", "url": f"https://example.com/{i}", "abstract": "Mock snippet.",
+             "rank": i + 1}
+            for i in range(max_results)
+        ])
+
+    baidu_search.__doc__ = BaiduSearchTools.baidu_search.__doc__
+
+
+class FakeFirecrawlTools(Toolkit):
+    """Offline FirecrawlTools with canned results."""
+
+    def __init__(self, **kwargs):
+        tools: List[Any] = [self.scrape_website, self.search_web]
+        super().__init__(name="firecrawl_tools", tools=tools, **kwargs)
+
+    def scrape_website(self, url: str) -> str:
+        _wait()
+        return json.dumps(_page(url))
+
+    def search_web(self, query: str, limit: Optional[int] = None):
+        _wait()
+        return json.dumps([_page(f"https://example.com/search/{i}") for i in range(limit or 3)])
+
+    scrape_website.__doc__ = FirecrawlTools.scrape_website.__doc__
+    search_web.__doc__ = FirecrawlTools.search_web.__doc__
+
+
+class FakeHackerNewsTools(Toolkit):
+    """Offline HackerNewsTools with canned results."""
+
+    def __init__(self, **kwargs):
+        tools: List[Any] = [self.get_top_hackernews_stories, self.get_user_details]
+        super().__init__(name="hackers_news", tools=tools, **kwargs)
+
+    def get_top_hackernews_stories(self, num_stories: int = 10) -> str:
+        _wait()
+        return json.dumps([
+            {"id": i, "title": f"Mock story {i}", "url": f"https://example.com/hn/{i}", "score": 100 - i,
+             "username": "mock"}
+            for i in range(num_stories)
+        ])
+
+    def get_user_details(self, username: str) -> str:
+        _wait()
+        return json.dumps({"id": username, "karma": 1000, "about": "Mock user", "total_items_submitted": 10})
+
+    get_top_hackernews_stories.__doc__ = HackerNewsTools.get_top_hackernews_stories.__doc__
+    get_user_details.__doc__ = HackerNewsTools.get_user_details.__doc__
+
+
+class FakeWebsiteTools(Toolkit):
+    """Offline WebsiteTools with canned results."""
+
+    def __init__(self, **kwargs):
+        super().__init__(name="website_tools", tools=[self.read_url], **kwargs)
+
+    def read_url(self, url: str) -> str:
+        _wait()
+        page = _page(url)
+        return json.dumps([{"name": url, "meta_data": {"url": url}, "content": page["content"]}])
+
+    read_url.__doc__ = WebsiteTools.read_url.__doc__
+
+
+class FakeLocalPaperTools(LocalPaperTools):
+    """LocalPaperTools over the real store that never downloads; a miss waits MOCK_PAPER_FETCH_SECONDS instead."""
+
+    def __init__(self, **kwargs):
+        super().__init__(auto_ingest=False, **kwargs)
+
+    def _get_paper(self, arxiv_id: str) -> Optional[dict]:
+        paper = self.store.get(arxiv_id)
+        if paper is None and AgentConfig.MOCK_PAPER_FETCH_SECONDS > 0:
+            time.sleep(AgentConfig.MOCK_PAPER_FETCH_SECONDS)
+        return paper
+
+
+FAKE_TOOLKIT_FACTORIES: Dict[str, Callable[[], Toolkit]] = {
+    "arxiv": FakeArxivTools,
+    "baidu": FakeBaiduSearchTools,
+    "firecrawl": FakeFirecrawlTools,
+    "hackernews": FakeHackerNewsTools,
+    "local_papers": FakeLocalPaperTools,  # local reads stay real, never download
+    "website": FakeWebsiteTools,
+}
@@ -0,0 +1,66 @@
+"""
+Process-wide pooled HTTP clients.
+
+Tools share one keep-alive httpx client (and one requests session for SDKs built on
+requests), so concurrent agents reuse TCP/TLS connections instead of opening a new
+connection per call.
+"""
+import threading
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import AgentConfig
+
+_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_requests_session: Optional[requests.Session] = None
+
+
+def get_http_client() -> httpx.Client:
+    """Shared httpx client with connection limits from AgentConfig."""
+    global _http_client
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=AgentConfig.HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=AgentConfig.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=AgentConfig.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                    ),
+                    timeout=AgentConfig.HTTP_TIMEOUT_SECONDS,
+                    follow_redirects=True,
+                )
+    return _http_client
+
+
+def get_requests_session() -> requests.Session:
+    """Shared requests session whose connection pool matches the httpx limits."""
+    global _requests_session
+    if _requests_session is None:
+        with _lock:
+            if _requests_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=AgentConfig.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    pool_maxsize=AgentConfig.HTTP_MAX_CONNECTIONS,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _requests_session = session
+    return _requests_session
+
+
+def close_http_clients():
+    """Close pooled connections (e.g. on application shutdown)."""
+    global _http_client, _requests_session
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+        if _requests_session is not None:
+            _requests_session.close()
+            _requests_session = None
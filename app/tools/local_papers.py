@@ -0,0 +1,103 @@
+"""
+First-tier paper lookup backed by the local paper store.
+"""
+import json
+from typing import Any, List, Optional
+
+from agno.tools import Toolkit
+
+from app.config import AgentConfig
+from app.paper_store import PaperStore, paper_store
+from app.retrieval import PASS_SECTIONS, get_paper_index
+from app.utils import logger
+
+
+class LocalPaperTools(Toolkit):
+    """
+    Serves paper metadata and full text from the local store, downloading a paper from
+    arXiv once (when auto-ingest is enabled) so every later lookup is offline.
+
+    With retrieval enabled, read_local_paper returns metadata, abstract and a section
+    outline, and the body is read pass by pass through search_local_paper (top-k chunks).
+
+    Args:
+        store: PaperStore to read from
+        auto_ingest: Fetch and store papers missing from the local store
+        max_chars: Maximum characters of full text returned per call (retrieval disabled)
+        retrieval: Serve top-k chunks per query instead of the full text
+        top_k: Chunks returned per search_local_paper call
+    """
+
+    def __init__(self, store: PaperStore = paper_store, auto_ingest: bool = AgentConfig.PAPER_STORE_AUTO_INGEST,
+                 max_chars: int = AgentConfig.PAPER_STORE_MAX_CHARS,
+                 retrieval: bool = AgentConfig.PAPER_RETRIEVAL_ENABLED,
+                 top_k: int = AgentConfig.PAPER_RETRIEVAL_TOP_K, **kwargs):
+        self.store = store
+        self.auto_ingest = auto_ingest
+        self.max_chars = max_chars
+        self.retrieval = retrieval
+        self.top_k = top_k
+        tools: List[Any] = [self.read_local_paper]
+        if retrieval:
+            tools.append(self.search_local_paper)
+        super().__init__(name="local_paper_tools", tools=tools, **kwargs)
+
+    def _get_paper(self, arxiv_id: str) -> Optional[dict]:
+        paper = self.store.get(arxiv_id)
+        if paper is None and self.auto_ingest:
+            try:
+                paper = self.store.fetch_from_arxiv(arxiv_id)
+            except Exception as e:
+                logger.warning(f"Local paper store could not ingest {arxiv_id}: {e}")
+        return paper
+
+    def read_local_paper(self, arxiv_id: str) -> str:
+        """Use this function FIRST to read an arXiv paper from the local paper store.
+
+        Args:
+            arxiv_id (str): The arXiv ID, e.g. "2512.24991v1" or "2512.24991".
+
+        Returns:
+            str: JSON with title, authors, abstract, categories and either a section outline
+            (read sections with search_local_paper) or the full text, or a not-found message.
+        """
+        paper = self._get_paper(arxiv_id)
+        if paper is None:
+            return f"Paper {arxiv_id} not found in local paper store. Fall back to the next tool."
+
+        text = self.store.get_text(arxiv_id) or ""
+        result = {
+            "arxiv_id": paper["arxiv_id"],
+            "version": paper["version"],
+            "title": paper["title"],
+            "authors": paper["authors"],
+            "abstract": paper["abstract"],
+            "categories": paper["categories"],
+            "published": paper["published"],
+        }
+        if self.retrieval and text:
+            result["sections"] = get_paper_index(text).outline()
+            result["note"] = "Full text is indexed. Read it with search_local_paper, one call per reading pass."
+        else:
+            result["text"] = text[:self.max_chars]
+            result["text_truncated"] = len(text) > self.max_chars
+        return json.dumps(result)
+
+    def search_local_paper(self, arxiv_id: str, query: str, reading_pass: int = 4) -> str:
+        """Retrieve the passages of a locally stored paper most relevant to a query.
+
+        Args:
+            arxiv_id (str): The arXiv ID, e.g. "2512.24991v1".
+            query (str): What to look for, e.g. "key figures and main contribution" or "training setup and results".
+            reading_pass (int): 1 = abstract/introduction, 2 = introduction/conclusion,
+                3 = method/experiments/results, 4 = whole paper.
+
+        Returns:
+            str: JSON list of the top passages with their section names, or a not-found message.
+        """
+        text = self.store.get_text(arxiv_id) if self._get_paper(arxiv_id) is not None else None
+        if not text:
+            return f"Full text of {arxiv_id} not found in local paper store. Fall back to the next tool."
+        index = get_paper_index(text)
+        hits = index.search(query, top_k=self.top_k, sections=PASS_SECTIONS.get(reading_pass, ()))
+        return json.dumps([chunk.to_dict(score) for chunk, score in hits])
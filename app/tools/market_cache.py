@@ -0,0 +1,263 @@
+"""
+Topic-keyed market knowledge cache shared by MarketResearcher, ValidationResearcher and
+MarketSkeptic.
+
+The three agents search the same domains across papers ("LLM fine-tuning data competitors",
+"competitors LLM fine-tuning data", ...). Their web searches are keyed by topic (the query's
+words, lowercased, minus stopwords, sorted) and their page reads by normalized URL, then
+stored in SQLite with the time they were retrieved. The tool hook consults the cache before
+any external call:
+
+- fresh (younger than MARKET_CACHE_FRESH_SECONDS): served from the cache;
+- stale (younger than MARKET_CACHE_MAX_AGE_SECONDS): served from the cache and refreshed
+  in the background, so the next run gets current results;
+- older or missing: fetched, stored and returned.
+
+Results served from the cache start with the date they were retrieved, which the agents
+report as MarketSignal.date_retrieved. Errors and skipped calls are never stored. Each run
+counts the external calls these agents made and the calls the cache answered
+(metrics["market_cache"]; see market_cache_scope).
+"""
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config import AgentConfig
+from app.telemetry import record_cache
+from app.tools.memo import make_memo_key
+from app.utils import logger
+
+# Tool -> argument that names the topic ("query") or the page ("url"); other arguments
+# (result limits, language) are part of the key as they are
+CACHED_TOOLS = {
+    "search_web": "query",
+    "baidu_search": "query",
+    "scrape_website": "url",
+    "read_url": "url",
+    "get_top_hackernews_stories": None,
+}
+STOPWORDS = frozenset(
+    "a an and are as at by for from how in into is of on or the to vs what which who with 2024 2025 2026".split()
+)
+
+
+def topic_key(function_name: str, arguments: dict) -> Optional[str]:
+    """Cache key of a tool call (None for tools the cache does not cover)."""
+    # Imported here so agent modules don't load the retrieval stack (chonkie) at import time
+    from app.retrieval import tokenize
+
+    if function_name not in CACHED_TOOLS:
+        return None
+    arguments = dict(arguments or {})
+    if CACHED_TOOLS[function_name] == "query":
+        words = sorted({word for word in tokenize(str(arguments.pop("query", ""))) if word not in STOPWORDS})
+        return f"{make_memo_key(function_name, arguments)}:{' '.join(words)}"
+    return make_memo_key(function_name, arguments)
+
+
+def _cacheable(result: Any) -> bool:
+    if not isinstance(result, str) or not result.strip():
+        return False
+    head = result.lstrip().lower()
+    return not head.startswith(("error", "tool call skipped"))
+
+
+def _retrieved(result: str, retrieved_at: float) -> str:
+    day = datetime.fromtimestamp(retrieved_at, tz=timezone.utc).date().isoformat()
+    return f"[Retrieved {day} (market knowledge cache)]\n{result}"
+
+
+class MarketKnowledgeCache:
+    """
+    SQLite-backed topic cache with freshness timestamps and background refresh.
+
+    Args:
+        db_file: Path to the SQLite file (parent directory is created on first use)
+        fresh_seconds: Entries younger than this are served as they are
+        max_age_seconds: Entries younger than this (but not fresh) are served and refreshed
+            in the background; older ones are fetched before answering
+        max_entries: Least recently used entries beyond this count are evicted
+        refresh_workers: Threads refreshing stale entries
+        clock: Source of retrieval and access times (simulated time in benchmarks)
+    """
+
+    def __init__(self, db_file: str, fresh_seconds: float, max_age_seconds: float, max_entries: int,
+                 refresh_workers: int = AgentConfig.MARKET_CACHE_REFRESH_WORKERS,
+                 clock: Callable[[], float] = time.time):
+        self.db_file = db_file
+        self.clock = clock
+        self.fresh_seconds = fresh_seconds
+        self.max_age_seconds = max(max_age_seconds, fresh_seconds)
+        self.max_entries = max_entries
+        self.refresh_workers = refresh_workers
+        self._stats = {"fresh": 0, "stale": 0, "miss": 0, "refreshed": 0, "refresh_failed": 0}
+        self._refreshing: set = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS market_cache (
+                    key TEXT PRIMARY KEY,
+                    function_name TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    retrieved_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_market_cache_lru ON market_cache (last_accessed)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """(result, retrieved_at) of an entry younger than max_age_seconds, or None."""
+        now = self.clock()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT result, retrieved_at FROM market_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.max_age_seconds:
+                return None
+            conn.execute("UPDATE market_cache SET last_accessed = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return row[0], row[1]
+
+    def put(self, key: str, function_name: str, result: str, retrieved_at: Optional[float] = None):
+        retrieved_at = self.clock() if retrieved_at is None else retrieved_at
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO market_cache VALUES (?, ?, ?, ?, ?)",
+                (key, function_name, result, retrieved_at, self.clock()),
+            )
+            overflow = conn.execute("SELECT COUNT(*) FROM market_cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM market_cache WHERE key IN "
+                    "(SELECT key FROM market_cache ORDER BY last_accessed ASC LIMIT ?)",
+                    (overflow,),
+                )
+            conn.commit()
+
+    def _refresh(self, key: str, function_name: str, fn: Callable[[], Any]):
+        try:
+            result = fn()
+            if _cacheable(result):
+                self.put(key, function_name, result)
+                outcome = "refreshed"
+            else:
+                outcome = "refresh_failed"
+        except Exception as e:
+            logger.warning(f"Market cache refresh of {function_name} failed: {e}")
+            outcome = "refresh_failed"
+        with self._lock:
+            self._refreshing.discard(key)
+            self._stats[outcome] += 1
+
+    def schedule_refresh(self, key: str, function_name: str, fn: Callable[[], Any]) -> bool:
+        """Refresh an entry in the background unless it is already being refreshed."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.refresh_workers, thread_name_prefix="market-cache-refresh")
+        # Started outside the run's context: the refresh is not charged to the run's budget
+        self._executor.submit(self._refresh, key, function_name, fn)
+        return True
+
+    def call(self, function_name: str, arguments: dict, fn: Callable[[], Any]) -> Tuple[Any, str]:
+        """
+        Return (result, outcome) where outcome is "fresh", "stale", "miss" or "uncached"
+        (a tool the cache does not cover).
+        """
+        key = topic_key(function_name, arguments)
+        if key is None:
+            return fn(), "uncached"
+        entry = self.get(key)
+        if entry is None:
+            result = fn()
+            if _cacheable(result):
+                self.put(key, function_name, result)
+            outcome = "miss"
+        else:
+            result, retrieved_at = entry
+            outcome = "fresh" if self.clock() - retrieved_at <= self.fresh_seconds else "stale"
+            if outcome == "stale":
+                self.schedule_refresh(key, function_name, fn)
+            result = _retrieved(result, retrieved_at)
+        with self._lock:
+            self._stats[outcome] += 1
+        return result, outcome
+
+    def wait_for_refreshes(self, timeout: Optional[float] = None) -> bool:
+        """Block until background refreshes finish (True), or `timeout` seconds pass (False)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not self._refreshing:
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+
+    def clear(self):
+        with self._lock:
+            self._connection().execute("DELETE FROM market_cache")
+            self._connection().commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM market_cache").fetchone()[0]
+            return {**self._stats, "entries": entries, "refreshing": len(self._refreshing)}
+
+
+market_cache = MarketKnowledgeCache(
+    db_file=AgentConfig.MARKET_CACHE_DB,
+    fresh_seconds=AgentConfig.MARKET_CACHE_FRESH_SECONDS,
+    max_age_seconds=AgentConfig.MARKET_CACHE_MAX_AGE_SECONDS,
+    max_entries=AgentConfig.MARKET_CACHE_MAX_ENTRIES,
+)
+
+_current_counts: ContextVar[Optional[Dict[str, int]]] = ContextVar("market_cache_counts", default=None)
+_counts_lock = threading.Lock()
+
+
+@contextmanager
+def market_cache_scope():
+    """
+    Count, for the run in this context, the external calls of the market agents' tools and
+    the calls the cache answered. Yields the counts dict (see metrics["market_cache"]).
+    """
+    counts = {"external_calls": 0, "fresh_hits": 0, "stale_hits": 0}
+    token = _current_counts.set(counts)
+    try:
+        yield counts
+    finally:
+        _current_counts.reset(token)
+
+
+def market_cache_tool_hook(function_name: str, function_call: Callable, arguments: dict):
+    """Agno tool hook that answers market searches and page reads from the market knowledge cache."""
+    if AgentConfig.MARKET_CACHE_ENABLED:
+        result, outcome = market_cache.call(function_name, arguments, lambda: function_call(**arguments))
+    else:
+        result, outcome = function_call(**arguments), "disabled"
+    if outcome in ("fresh", "stale", "miss"):
+        record_cache("market_cache", "hit" if outcome != "miss" else "miss")
+    counts = _current_counts.get()
+    if counts is not None:
+        with _counts_lock:
+            counts[f"{outcome}_hits" if outcome in ("fresh", "stale") else "external_calls"] += 1
+    return result
@@ -0,0 +1,182 @@
+"""
+Memoization of tool calls across agents.
+
+Within one run, PaperAnalyzer, MarketResearcher, ValidationResearcher and ProductEngineer
+often fetch the same URLs and near-identical queries. The memo hook keys every call by
+tool name + normalized arguments, coalesces concurrent identical calls into one request,
+and serves repeats from a per-run scope (optionally backed by a cross-run TTL scope).
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from app.config import AgentConfig
+from app.telemetry import record_cache
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        if value.startswith(("http://", "https://")):
+            parts = urlsplit(value)
+            path = parts.path.rstrip("/") or "/"
+            return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+        return value.lower()
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def memoizable(result: Any) -> bool:
+    """
+    Whether a tool result may be served again: error strings and budget refusals ("Tool call
+    skipped: ...", see app.budget) describe the run that got them, not the call.
+    """
+    return not (isinstance(result, str) and result.lstrip().lower().startswith(("error", "tool call skipped")))
+
+
+def make_memo_key(function_name: str, arguments: dict) -> str:
+    """Key a tool call by its name and normalized arguments."""
+    return f"{function_name}:{json.dumps(_normalize(arguments or {}), sort_keys=True, default=str)}"
+
+
+class ToolMemo:
+    """
+    Thread-safe memo of tool results with in-flight request coalescing.
+
+    Args:
+        ttl_seconds: Entry lifetime; None keeps entries for the lifetime of the memo
+        max_entries: Least recently used entries beyond this count are dropped
+        parent: Optional longer-lived memo consulted on a miss (e.g. the cross-run scope)
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: int = AgentConfig.TOOL_MEMO_MAX_ENTRIES,
+                 parent: Optional["ToolMemo"] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.parent = parent
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._watchers: Dict[str, Callable[[str], None]] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, function_name: str, outcome: str):
+        tool_stats = self._stats.setdefault(function_name, {"calls": 0, "hits": 0, "coalesced": 0, "shared_hits": 0})
+        tool_stats["calls"] += 1
+        if outcome != "miss":
+            tool_stats[outcome] += 1
+
+    def watch(self, function_name: str, arguments: dict, callback: Callable[[str], None]):
+        """Call `callback(outcome)` the first time a later call of this tool is served by the memo."""
+        with self._lock:
+            self._watchers[make_memo_key(function_name, arguments)] = callback
+
+    def call(self, function_name: str, arguments: dict, fn: Callable[[], Any]) -> Tuple[Any, str]:
+        """
+        Return (result, outcome) where outcome is "hits", "coalesced", "shared_hits" or "miss".
+        Exceptions, error strings and budget refusals are never memoized.
+        """
+        key = make_memo_key(function_name, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl_seconds is None or time.time() - entry[0] <= self.ttl_seconds):
+                self._entries.move_to_end(key)
+                self._count(function_name, "hits")
+                watcher = self._watchers.pop(key, None)
+            else:
+                watcher = entry = None
+                future = self._inflight.get(key)
+                owner = future is None
+                if owner:
+                    future = self._inflight[key] = Future()
+                else:
+                    watcher = self._watchers.pop(key, None)
+
+        if entry is not None:
+            if watcher is not None:
+                watcher("hits")
+            return entry[1], "hits"
+        if not owner:
+            if watcher is not None:
+                watcher("coalesced")
+            try:
+                return future.result(), "coalesced"
+            finally:
+                with self._lock:
+                    self._count(function_name, "coalesced")
+
+        try:
+            if self.parent is not None:
+                result, parent_outcome = self.parent.call(function_name, arguments, fn)
+                outcome = "miss" if parent_outcome == "miss" else "shared_hits"
+            else:
+                result, outcome = fn(), "miss"
+        except BaseException as e:
+            future.set_exception(e)
+            with self._lock:
+                self._inflight.pop(key, None)
+                self._count(function_name, "miss")
+            raise
+
+        future.set_result(result)
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._count(function_name, outcome)
+            if memoizable(result):
+                self._entries[key] = (time.time(), result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return result, outcome
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-tool call counts and hit rates (hits + coalesced + shared hits over calls)."""
+        with self._lock:
+            stats = {}
+            for function_name, tool_stats in self._stats.items():
+                saved = tool_stats["hits"] + tool_stats["coalesced"] + tool_stats["shared_hits"]
+                stats[function_name] = {**tool_stats, "hit_rate": round(saved / tool_stats["calls"], 3)}
+            return stats
+
+
+# Cross-run scope, shared by every run in the process (disabled when TTL is 0)
+shared_tool_memo: Optional[ToolMemo] = (
+    ToolMemo(ttl_seconds=AgentConfig.TOOL_MEMO_SHARED_TTL_SECONDS)
+    if AgentConfig.TOOL_MEMO_SHARED_TTL_SECONDS > 0 else None
+)
+
+_current_memo: ContextVar[Optional[ToolMemo]] = ContextVar("tool_memo", default=None)
+
+
+@contextmanager
+def tool_memo_scope(memo: Optional[ToolMemo] = None):
+    """
+    Activate a per-run memo for every tool call made in this context (including
+    asyncio tasks and threads started from it with a copied context).
+    """
+    if memo is None:
+        memo = ToolMemo(parent=shared_tool_memo)
+    token = _current_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _current_memo.reset(token)
+
+
+def memoize_tool_hook(function_name: str, function_call: Callable, arguments: dict):
+    """Agno tool hook that serves repeated tool calls from the active memo scope."""
+    memo = _current_memo.get() or shared_tool_memo
+    if memo is None or not AgentConfig.TOOL_MEMO_ENABLED:
+        return function_call(**arguments)
+    result, outcome = memo.call(function_name, arguments, lambda: function_call(**arguments))
+    record_cache("tool_memo", outcome)
+    return result
@@ -0,0 +1,119 @@
+"""
+Toolkits that route their HTTP traffic through the shared connection pool.
+
+The stock agno toolkits call module-level `httpx.get` / `requests.post`, which opens a
+fresh connection for every request. These subclasses keep the same tool names,
+signatures and docstrings (so prompts and tool schemas are unchanged) but use the
+pooled clients from app.tools.http.
+"""
+import json
+import time
+from typing import Dict, Optional
+
+from agno.tools.firecrawl import FirecrawlTools
+from agno.tools.hackernews import HackerNewsTools
+from agno.tools.website import WebsiteTools
+from firecrawl.v2.utils.http_client import HttpClient, version as FIRECRAWL_SDK_VERSION
+
+from app.tools.http import get_http_client, get_requests_session
+from app.utils import logger
+
+
+class PooledFirecrawlHttpClient(HttpClient):
+    """Firecrawl v2 HTTP client that reuses the shared requests session (same retry semantics)."""
+
+    def _request(self, method: str, endpoint: str, json_data=None, headers=None, timeout=None,
+                 retries: int = 3, backoff_factor: float = 0.5):
+        if headers is None:
+            headers = self._prepare_headers()
+        url = self._build_url(endpoint)
+        session = get_requests_session()
+
+        for attempt in range(retries):
+            try:
+                response = session.request(method, url, headers=headers, json=json_data, timeout=timeout)
+                if response.status_code == 502 and attempt < retries - 1:
+                    time.sleep(backoff_factor * (2 ** attempt))
+                    continue
+                return response
+            except Exception:
+                if attempt == retries - 1:
+                    raise
+                time.sleep(backoff_factor * (2 ** attempt))
+        raise RuntimeError(f"Unexpected error in {method} request")
+
+    def post(self, endpoint: str, data: Dict, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+             retries: int = 3, backoff_factor: float = 0.5):
+        data["origin"] = f"python-sdk@{FIRECRAWL_SDK_VERSION}"
+        return self._request("POST", endpoint, data, headers, timeout, retries, backoff_factor)
+
+    def get(self, endpoint: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+            retries: int = 3, backoff_factor: float = 0.5):
+        return self._request("GET", endpoint, None, headers, timeout, retries, backoff_factor)
+
+    def delete(self, endpoint: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+               retries: int = 3, backoff_factor: float = 0.5):
+        return self._request("DELETE", endpoint, None, headers, timeout, retries, backoff_factor)
+
+
+class PooledFirecrawlTools(FirecrawlTools):
+    """FirecrawlTools whose SDK client sends requests over the shared session."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        v2_client = getattr(self.app, "_v2_client", None)
+        if v2_client is not None and hasattr(v2_client, "http_client"):
+            v2_client.http_client = PooledFirecrawlHttpClient(self.api_key, v2_client.http_client.api_url)
+        else:
+            logger.warning("Firecrawl SDK layout changed; FirecrawlTools will not use the shared HTTP pool")
+
+
+class PooledHackerNewsTools(HackerNewsTools):
+    """HackerNewsTools backed by the shared httpx client."""
+
+    def get_top_hackernews_stories(self, num_stories: int = 10) -> str:
+        client = get_http_client()
+        story_ids = client.get("https://hacker-news.firebaseio.com/v0/topstories.json").json()
+        stories = []
+        for story_id in story_ids[:num_stories]:
+            story = client.get(f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json").json()
+            story["username"] = story["by"]
+            stories.append(story)
+        return json.dumps(stories)
+
+    def get_user_details(self, username: str) -> str:
+        try:
+            user = get_http_client().get(f"https://hacker-news.firebaseio.com/v0/user/{username}.json").json()
+            user_details = {
+                "id": user.get("user_id"),
+                "karma": user.get("karma"),
+                "about": user.get("about"),
+                "total_items_submitted": len(user.get("submitted", [])),
+            }
+            return json.dumps(user_details)
+        except Exception as e:
+            logger.error(f"Error getting HackerNews user details: {e}")
+            return f"Error getting user details: {e}"
+
+    get_top_hackernews_stories.__doc__ = HackerNewsTools.get_top_hackernews_stories.__doc__
+    get_user_details.__doc__ = HackerNewsTools.get_user_details.__doc__
+
+
+class PooledWebsiteTools(WebsiteTools):
+    """
+    WebsiteTools backed by the shared httpx client.
+
+    Reads only the requested page: the stock reader also crawls up to 10 same-domain
+    links per call, which dominated its latency without adding content agents asked for.
+    """
+
+    def read_url(self, url: str) -> str:
+        from bs4 import BeautifulSoup
+        from agno.knowledge.reader.website_reader import WebsiteReader
+
+        response = get_http_client().get(url)
+        response.raise_for_status()
+        content = WebsiteReader(chunking_strategy=None)._extract_main_content(BeautifulSoup(response.content, "html.parser"))
+        return json.dumps([{"name": url, "meta_data": {"url": str(response.url)}, "content": content}])
+
+    read_url.__doc__ = WebsiteTools.read_url.__doc__
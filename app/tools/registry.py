@@ -0,0 +1,54 @@
+"""
+Process-wide registry of shared tool instances.
+
+Agents ask the registry for toolkits instead of constructing their own, so every
+member of every concurrent run shares the same clients and connection pools.
+Toolkit modules (and the SDKs behind them) are imported only when first requested.
+"""
+import threading
+from typing import Callable, Dict
+
+from agno.tools import Toolkit
+
+from app.config import AgentConfig
+from app.registry import import_object
+
+TOOLKIT_FACTORIES: Dict[str, Callable[[], Toolkit]] = {
+    "arxiv": lambda: import_object("agno.tools.arxiv:ArxivTools")(),
+    # baidusearch already keeps a module-level keep-alive session
+    "baidu": lambda: import_object("agno.tools.baidusearch:BaiduSearchTools")(),
+    "firecrawl": lambda: import_object("app.tools.pooled:PooledFirecrawlTools")(enable_search=True, enable_scrape=True),
+    "hackernews": lambda: import_object("app.tools.pooled:PooledHackerNewsTools")(),
+    "local_papers": lambda: import_object("app.tools.local_papers:LocalPaperTools")(),
+    "website": lambda: import_object("app.tools.pooled:PooledWebsiteTools")(),
+}
+
+_toolkits: Dict[str, Toolkit] = {}
+_lock = threading.Lock()
+
+
+def get_toolkit(name: str) -> Toolkit:
+    """
+    Return the shared toolkit instance for `name`, creating it on first use
+    (the offline fake from app.tools.fake when MOCK_TOOLS is enabled).
+    
+    Args:
+        name: One of TOOLKIT_FACTORIES ("arxiv", "baidu", "firecrawl", "hackernews", "local_papers", "website")
+        
+    Returns:
+        The process-wide Toolkit instance
+    """
+    if name not in TOOLKIT_FACTORIES:
+        raise KeyError(f"Unknown toolkit '{name}'. Available: {sorted(TOOLKIT_FACTORIES)}")
+    toolkit = _toolkits.get(name)
+    if toolkit is None:
+        with _lock:
+            toolkit = _toolkits.get(name)
+            if toolkit is None:
+                if AgentConfig.MOCK_TOOLS:
+                    from app.tools.fake import FAKE_TOOLKIT_FACTORIES
+                    factories = FAKE_TOOLKIT_FACTORIES
+                else:
+                    factories = TOOLKIT_FACTORIES
+                toolkit = _toolkits[name] = factories[name]()
+    return toolkit
@@ -0,0 +1,94 @@
+"""
+Tail latency and tokens per run with and without a run budget (app.budget).
+
+Runs the pipeline offline (MockMistralChat + fake tools). In a share of the runs
+(`--slow-rate`, spread evenly) ValidationResearcher's model stalls for `--slow-seconds`,
+standing in for a slow provider or a runaway tool loop; every configuration replays the
+same sequence of runs. Reports p50/p95/max wall time, mean tokens and how
+often the budget stepped in.
+
+Usage:
+    uv run -m benchmarks.budget --runs 20
+    uv run -m benchmarks.budget --stage-timeout 1 --max-tool-calls 2 --max-tokens 12000
+"""
+import os
+
+os.environ.setdefault("MOCK_MODELS", "true")
+os.environ.setdefault("MOCK_TOOLS", "true")
+os.environ.setdefault("MOCK_MODEL_LATENCY_SECONDS", "0.1")
+os.environ.setdefault("MOCK_TOOL_LATENCY_SECONDS", "0.05")
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+os.environ.setdefault("IDEA_INDEX_ENABLED", "false")
+os.environ.setdefault("MARKET_CACHE_ENABLED", "false")
+
+import argparse
+import asyncio
+import statistics
+from typing import Dict, List
+
+from app.budget import BudgetLimits
+from app.config import AgentConfig
+from app.teams.paper2saas import arun_paper2saas, get_paper2saas_pipeline
+
+ARXIV_ID = "2512.24991v1"
+
+
+def percentile(values: List[float], share: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def measure(limits: BudgetLimits, slow_runs: List[bool], slow_seconds: float) -> Dict[str, float]:
+    model = get_paper2saas_pipeline().stages["validation"].agent.model
+    timings, tokens, stopped, failed = [], [], 0, 0
+    for slow in slow_runs:
+        model.latency_seconds = slow_seconds if slow else AgentConfig.MOCK_MODEL_LATENCY_SECONDS
+        result = asyncio.run(arun_paper2saas(ARXIV_ID, budget=limits))
+        run_output = result["result"]
+        timings.append(run_output.duration)
+        tokens.append(run_output.total_tokens)
+        stopped += any(stage.status == "stopped" for stage in run_output.stages.values())
+        failed += result["status"] != "success"
+    model.latency_seconds = AgentConfig.MOCK_MODEL_LATENCY_SECONDS
+    return {
+        "p50": statistics.median(timings),
+        "p95": percentile(timings, 0.95),
+        "max": max(timings),
+        "tokens": statistics.mean(tokens),
+        "stopped": stopped,
+        "failed": failed,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run budget benchmark (mock model and tools)")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--slow-rate", type=float, default=0.2, help="Share of runs with a stalled member")
+    parser.add_argument("--slow-seconds", type=float, default=3.0, help="Model latency of the stalled member")
+    parser.add_argument("--stage-timeout", type=float, default=1.0)
+    parser.add_argument("--max-tool-calls", type=int, default=2)
+    parser.add_argument("--max-tokens", type=int, default=0, help="Also run with a token budget (0 skips it)")
+    args = parser.parse_args()
+
+    slow_runs = [int((i + 1) * args.slow_rate) > int(i * args.slow_rate) for i in range(args.runs)]
+    configurations = {
+        "no budget": BudgetLimits(),
+        f"stage timeout {args.stage_timeout:g}s": BudgetLimits(stage_timeout_seconds=args.stage_timeout),
+        f"+ max {args.max_tool_calls} tool calls": BudgetLimits(
+            stage_timeout_seconds=args.stage_timeout, max_tool_calls=args.max_tool_calls,
+        ),
+    }
+    if args.max_tokens:
+        configurations[f"+ max {args.max_tokens} tokens"] = BudgetLimits(
+            stage_timeout_seconds=args.stage_timeout, max_tool_calls=args.max_tool_calls, max_tokens=args.max_tokens,
+        )
+
+    asyncio.run(arun_paper2saas(ARXIV_ID, budget=BudgetLimits()))  # warm-up: imports, DB tables
+    print(f"{args.runs} runs, {sum(slow_runs)} with a member stalled for {args.slow_seconds:g}s")
+    print(f"| {'budget':<26} | {'p50 s':>6} | {'p95 s':>6} | {'max s':>6} | {'mean tokens':>11} | "
+          f"{'runs cut':>8} | {'failed':>6} |")
+    print(f"|{'-' * 28}|{'-' * 7}:|{'-' * 7}:|{'-' * 7}:|{'-' * 12}:|{'-' * 9}:|{'-' * 7}:|")
+    for label, limits in configurations.items():
+        row = measure(limits, slow_runs, args.slow_seconds)
+        print(f"| {label:<26} | {row['p50']:>6.2f} | {row['p95']:>6.2f} | {row['max']:>6.2f} | "
+              f"{row['tokens']:>11.0f} | {row['stopped']:>8} | {row['failed']:>6} |")
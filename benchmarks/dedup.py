@@ -0,0 +1,110 @@
+"""
+Duplicate-heavy traffic with and without run deduplication (app.dedup), offline.
+
+`--requests` arun_paper2saas calls arrive at `--rate` per second (Poisson arrivals) for
+`--papers` distinct papers, whose popularity follows a Zipf law. Each request names its
+paper in one of the forms users send: the versioned ID, the unversioned ID, "arXiv:<id>",
+or an abs or pdf URL. All forms except the unversioned ID reduce to the same paper key.
+The benchmark reports how many pipeline runs were executed, the tokens they spent and the
+request latencies, with deduplication off and on. It also counts how many requests the old
+validation (bare IDs only) would have rejected.
+
+Usage:
+    uv run -m benchmarks.dedup --requests 60 --papers 10 --rate 10 --model-latency 0.2
+"""
+import os
+
+os.environ.setdefault("MOCK_MODELS", "true")
+os.environ.setdefault("MOCK_TOOLS", "true")
+os.environ.setdefault("MOCK_TOOL_LATENCY_SECONDS", "0.05")
+os.environ.setdefault("MISTRAL_REQUESTS_PER_MINUTE", "0")
+os.environ.setdefault("FIRECRAWL_REQUESTS_PER_MINUTE", "0")
+os.environ["ANALYSIS_CACHE_ENABLED"] = "false"
+os.environ["IDEA_INDEX_ENABLED"] = "false"
+os.environ["MARKET_CACHE_ENABLED"] = "false"
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Dict, List
+
+from app.config import AgentConfig
+from app.dedup import run_deduplicator
+from app.teams.paper2saas import arun_paper2saas, get_paper2saas_pipeline
+from app.utils import canonical_arxiv_id, paper_key, validate_arxiv_id
+
+FORMS = (
+    "{id}v1",
+    "{id}",
+    "arXiv:{id}v1",
+    "https://arxiv.org/abs/{id}v1",
+    "https://arxiv.org/pdf/{id}v1.pdf",
+)
+
+
+def traffic(requests: int, papers: int, rate: float, seed: int) -> List[tuple]:
+    """(arrival offset in seconds, requested ID) for each request."""
+    rng = random.Random(seed)
+    ids = [f"2512.{24991 + i}" for i in range(papers)]
+    weights = [1 / (rank + 1) for rank in range(papers)]
+    offset, schedule = 0.0, []
+    for _ in range(requests):
+        offset += rng.expovariate(rate)
+        schedule.append((offset, rng.choice(FORMS).format(id=rng.choices(ids, weights)[0])))
+    return schedule
+
+
+async def replay(schedule: List[tuple], dedup: bool) -> Dict[str, float]:
+    AgentConfig.RUN_DEDUP_ENABLED = dedup
+    run_deduplicator.forget()
+    started = time.perf_counter()
+
+    async def request(offset: float, arxiv_id: str) -> tuple:
+        await asyncio.sleep(offset)
+        request_started = time.perf_counter()
+        result = await arun_paper2saas(arxiv_id)
+        return result, time.perf_counter() - request_started
+
+    outcomes = await asyncio.gather(*(request(offset, arxiv_id) for offset, arxiv_id in schedule))
+    wall = time.perf_counter() - started
+    executed = [result for result, _ in outcomes if result["metrics"].get("dedup", {}).get("outcome", "run") == "run"]
+    latencies = sorted(latency for _, latency in outcomes)
+    return {
+        "runs": len(executed),
+        "joined": sum(result["metrics"].get("dedup", {}).get("outcome") == "joined" for result, _ in outcomes),
+        "cached": sum(result["metrics"].get("dedup", {}).get("outcome") == "cached" for result, _ in outcomes),
+        "failed": sum(result["status"] != "success" for result, _ in outcomes),
+        "tokens": sum(result["metrics"]["total_tokens"] for result in executed),
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(0.95 * (len(latencies) - 1))],
+        "wall": wall,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Duplicate-heavy traffic, run deduplication off vs on")
+    parser.add_argument("--requests", type=int, default=60, help="Requests in the trace")
+    parser.add_argument("--papers", type=int, default=10, help="Distinct papers (Zipf popularity)")
+    parser.add_argument("--rate", type=float, default=10.0, help="Mean arrivals per second")
+    parser.add_argument("--model-latency", type=float, default=0.2, help="Mock model seconds per call")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for stage in get_paper2saas_pipeline().stages.values():
+        stage.agent.model.latency_seconds = args.model_latency
+    asyncio.run(arun_paper2saas("2512.00001v1"))  # warm-up: imports, agents, DB tables
+
+    schedule = traffic(args.requests, args.papers, args.rate, args.seed)
+    rejected = sum(not validate_arxiv_id(arxiv_id) for _, arxiv_id in schedule)
+    keys = {paper_key(canonical_arxiv_id(arxiv_id)) for _, arxiv_id in schedule}
+    print(f"{args.requests} requests for {args.papers} papers at {args.rate:g}/s, "
+          f"{len(keys)} distinct paper keys; the old validation rejected {rejected}")
+    print(f"| {'dedup':<5} | {'runs':>4} | {'joined':>6} | {'cached':>6} | {'failed':>6} | {'tokens':>7} | "
+          f"{'p50 s':>5} | {'p95 s':>5} | {'wall s':>6} |")
+    print(f"|{'-' * 7}|{'-' * 5}:|{'-' * 7}:|{'-' * 7}:|{'-' * 7}:|{'-' * 8}:|{'-' * 6}:|{'-' * 6}:|{'-' * 7}:|")
+    for dedup in (False, True):
+        row = asyncio.run(replay(schedule, dedup))
+        print(f"| {'on' if dedup else 'off':<5} | {row['runs']:>4} | {row['joined']:>6} | {row['cached']:>6} | "
+              f"{row['failed']:>6} | {row['tokens']:>7} | {row['p50']:>5.2f} | {row['p95']:>5.2f} | {row['wall']:>6.2f} |")
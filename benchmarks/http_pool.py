@@ -0,0 +1,119 @@
+"""
+Micro-benchmark: per-call HTTP latency with and without the shared connection pool.
+
+Starts a local keep-alive stub server and compares:
+- httpx.get per call (what the stock HackerNews/Website tools do) vs the shared httpx client
+- requests.post per call (what the Firecrawl SDK does) vs the shared requests session
+
+`--handshake-ms` delays every NEW connection on the server side to emulate TCP/TLS setup
+against a remote API, which is the cost pooling removes.
+
+Usage:
+    python -m benchmarks.http_pool --calls 300 --threads 8 --handshake-ms 30
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import requests
+
+from app.tools.http import close_http_clients, get_http_client, get_requests_session
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+    handshake_seconds = 0.0
+    body = json.dumps({"status": "ok", "data": "x" * 512}).encode()
+
+    def setup(self):
+        # Runs once per accepted connection
+        time.sleep(self.handshake_seconds)
+        super().setup()
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(handshake_ms: float) -> ThreadingHTTPServer:
+    StubHandler.handshake_seconds = handshake_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure(call, calls: int, threads: int) -> dict:
+    latencies = []
+    lock = threading.Lock()
+
+    def one(_):
+        start = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    call()  # warm-up (establishes pooled connections, imports)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(one, range(calls)))
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "calls_per_s": calls / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = start_stub_server(args.handshake_ms)
+    url = f"http://127.0.0.1:{server.server_address[1]}/v2/scrape"
+    payload = {"url": "https://arxiv.org/abs/2512.24991"}
+    client, session = get_http_client(), get_requests_session()
+
+    cases = {
+        "httpx.get (unpooled)": lambda: httpx.get(url).raise_for_status(),
+        "httpx shared client": lambda: client.get(url).raise_for_status(),
+        "requests.post (unpooled)": lambda: requests.post(url, json=payload).raise_for_status(),
+        "requests shared session": lambda: session.post(url, json=payload).raise_for_status(),
+    }
+
+    print(f"calls={args.calls} threads={args.threads} handshake_ms={args.handshake_ms}")
+    print(f"{'case':<28}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'calls/s':>10}")
+    for name, call in cases.items():
+        stats = measure(call, args.calls, args.threads)
+        print(f"{name:<28}{stats['mean_ms']:>10.2f}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['calls_per_s']:>10.0f}")
+
+    close_http_clients()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Idea index (app.idea_index) query latency and recall at 100k+ entries, on one core.
+
+Fills a fresh index with synthetic SaaS ideas (5 per paper, drawn from a shared domain
+vocabulary so that many ideas overlap) in steps up to each of `--sizes`. At each size, a
+new IdeaIndex loads the file the way a new process would, and `--queries` queries are run
+the way the pipeline runs them: kind="idea", excluding the querying paper. Each query is a paraphrase of a stored idea (words dropped
+and reordered); recall@k is the share of queries that find that idea in their top k.
+BLAS and OpenMP are limited to one thread before numpy is imported.
+
+Usage:
+    uv run -m benchmarks.idea_index --sizes 25000 100000 200000 --queries 200
+"""
+import os
+
+for variable in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ[variable] = "1"
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from typing import List, Tuple
+
+from app.idea_index import IdeaIndex
+
+DOMAINS = (
+    "annotation", "labeling", "fraud", "compliance", "radiology", "logistics", "retail", "energy", "legal",
+    "recruiting", "insurance", "agriculture", "cybersecurity", "education", "finance", "manufacturing",
+    "pharma", "support", "marketing", "robotics", "climate", "real-estate", "gaming", "biotech",
+)
+TECHNIQUES = (
+    "active learning", "retrieval augmented generation", "graph neural networks", "diffusion models",
+    "anomaly detection", "speculative decoding", "federated learning", "time series forecasting",
+    "contrastive pretraining", "reinforcement learning", "knowledge distillation", "program synthesis",
+    "causal inference", "data selection", "vision transformers", "sparse mixture of experts",
+)
+CUSTOMERS = (
+    "ML teams", "hospitals", "small businesses", "banks", "warehouses", "law firms", "insurers",
+    "universities", "retailers", "utilities", "SOC analysts", "growth teams", "labs", "factories",
+)
+VERBS = ("predicts", "reduces", "automates", "audits", "prioritizes", "summarizes", "detects", "plans")
+OBJECTS = (
+    "annotation spend", "false positives", "manual review", "inventory waste", "claim backlogs",
+    "model drift", "compute cost", "customer churn", "compliance gaps", "lead times", "energy use",
+)
+MODELS = ("usage-based pricing", "per-seat subscription", "enterprise license", "API metering", "freemium tier")
+
+
+def idea(rng: random.Random, number: int) -> str:
+    domain, technique, customer = rng.choice(DOMAINS), rng.choice(TECHNIQUES), rng.choice(CUSTOMERS)
+    return (
+        f"## Idea {number}: {domain.title()} {rng.choice(VERBS).title()} {rng.randrange(10 ** 6)}\n"
+        f"- Core concept: {technique} that {rng.choice(VERBS)} {rng.choice(OBJECTS)} for {domain}\n"
+        f"- Target market: {customer} in {rng.choice(DOMAINS)}\n"
+        f"- Value proposition: {rng.choice(VERBS)} {rng.choice(OBJECTS)} by {rng.randrange(10, 90)}%\n"
+        f"- Revenue model: {rng.choice(MODELS)}"
+    )
+
+
+def paraphrase(rng: random.Random, text: str) -> str:
+    """Drop a fifth of the words and reorder the lines."""
+    lines = [" ".join(word for word in line.split() if rng.random() > 0.2) for line in text.splitlines()]
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def fill(index: IdeaIndex, rng: random.Random, start: int, count: int) -> List[Tuple[str, str]]:
+    """Add `count` ideas for consecutive papers; returns (arxiv_id, idea) pairs."""
+    added = []
+    for number in range(start, start + count):
+        arxiv_id = f"25{number // 5 // 100000 % 100:02d}.{number // 5 % 100000:05d}v1"
+        added.append((arxiv_id, idea(rng, number % 5 + 1)))
+    for offset in range(0, len(added), 5000):
+        batch = added[offset:offset + 5000]
+        index.add((arxiv_id, "idea", text.splitlines()[0][3:], text) for arxiv_id, text in batch)
+    return added
+
+
+def measure(index: IdeaIndex, stored: List[Tuple[str, str]], queries: int, top_k: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    latencies, found = [], 0
+    for arxiv_id, text in rng.sample(stored, queries):
+        query = paraphrase(rng, text)
+        # The excluded paper stores nothing: the filter is paid for and the target stays findable
+        started = time.perf_counter()
+        matches = index.search(query, top_k=top_k, kind="idea", exclude_arxiv_id="2699.99999", min_similarity=0.0)
+        latencies.append(time.perf_counter() - started)
+        found += any(entry.arxiv_id == arxiv_id and entry.content == text for entry, _ in matches)
+    latencies.sort()
+    return {
+        "p50": 1000 * statistics.median(latencies),
+        "p95": 1000 * latencies[int(0.95 * (len(latencies) - 1))],
+        "recall": found / queries,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Idea index query latency and recall on one core")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25000, 100000, 200000], help="Index sizes")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per size")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--dim", type=int, default=256, help="Embedding dimensions")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        db_file = os.path.join(directory, "idea_index.db")
+        index = IdeaIndex(db_file, dim=args.dim)
+        stored: List[Tuple[str, str]] = []
+        print(f"{args.dim} dimensions, top-{args.top_k}, {args.queries} paraphrased queries per size, one thread")
+        print(f"| {'ideas':>7} | {'ingest/s':>8} | {'load s':>6} | {'matrix MB':>9} | {'p50 ms':>6} | {'p95 ms':>6} | "
+              f"{'recall@' + str(args.top_k):>8} |")
+        print(f"|{'-' * 8}:|{'-' * 9}:|{'-' * 7}:|{'-' * 10}:|{'-' * 7}:|{'-' * 7}:|{'-' * 9}:|")
+        for size in sorted(args.sizes):
+            count, started = size - len(stored), time.perf_counter()
+            stored += fill(index, rng, len(stored), count)
+            ingest_rate = count / (time.perf_counter() - started)
+            # A new process loads every vector from SQLite on its first query
+            started = time.perf_counter()
+            reloaded = IdeaIndex(db_file, dim=args.dim)
+            reloaded.search("warm-up", kind="idea")
+            load = time.perf_counter() - started
+            row = measure(reloaded, stored, args.queries, args.top_k, args.seed)
+            print(f"| {size:>7} | {ingest_rate:>8.0f} | {load:>6.2f} | {reloaded.stats()['matrix_mb']:>9.1f} | "
+                  f"{row['p50']:>6.1f} | {row['p95']:>6.1f} | {row['recall']:>8.1%} |")
@@ -0,0 +1,80 @@
+"""
+Throughput of the background job queue under concurrent submissions.
+
+Runs the real pipeline (with stub agents that sleep instead of calling Mistral) through
+JobQueue backed by a temporary SQLite jobs table, for several worker-pool sizes.
+Every paper is submitted `--duplicates` times to exercise idempotent resubmission.
+
+Usage:
+    uv run -m benchmarks.job_queue --papers 32 --duplicates 3 --workers 1 4 16 --scale 0.01
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+
+from agno.db.sqlite import SqliteDb
+
+from app.jobs import JobQueue, JobStore
+from app.teams.paper2saas import paper2saas_pipeline
+from benchmarks.stream_ttfb import STAGE_LATENCY, StubAgent
+
+
+async def run_case(workers: int, papers: int, duplicates: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        queue = JobQueue(JobStore(SqliteDb(db_file=f"{tmp_dir}/jobs.db")), workers=workers)
+        await queue.start()
+        arxiv_ids = [f"2501.{10000 + i}v1" for i in range(papers)] * duplicates
+
+        async def timed_submit(arxiv_id: str):
+            started = time.perf_counter()
+            job, created = await queue.submit(arxiv_id)
+            return job["id"], created, time.perf_counter() - started
+
+        started = time.perf_counter()
+        submissions = await asyncio.gather(*(timed_submit(a) for a in arxiv_ids))
+        job_ids = {job_id for job_id, _, _ in submissions}
+        while True:
+            jobs = [await queue.get(job_id) for job_id in job_ids]
+            if all(job["status"] in ("succeeded", "failed") for job in jobs):
+                break
+            await asyncio.sleep(0.05)
+        elapsed = time.perf_counter() - started
+        await queue.shutdown()
+
+    latencies = sorted(latency * 1000 for _, _, latency in submissions)
+    return {
+        "workers": workers,
+        "submissions": len(submissions),
+        "jobs": len(job_ids),
+        "succeeded": sum(job["status"] == "succeeded" for job in jobs),
+        "submit_p50_ms": statistics.median(latencies),
+        "submit_p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "elapsed": elapsed,
+        "jobs_per_second": len(job_ids) / elapsed,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Job queue throughput benchmark")
+    parser.add_argument("--papers", type=int, default=32)
+    parser.add_argument("--duplicates", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--scale", type=float, default=0.01, help="Multiplier for stub stage latencies")
+    args = parser.parse_args()
+
+    for stage in paper2saas_pipeline.stages.values():
+        stage.agent = StubAgent(stage.name, STAGE_LATENCY[stage.name] * args.scale)
+        stage.cache = None
+
+    run_seconds = sum(STAGE_LATENCY[s] for s in ("paper_analysis", "ideation", "validation", "strategy", "report"))
+    print(f"{args.papers} papers x {args.duplicates} submissions, stub run ~{run_seconds * args.scale:.2f}s each")
+    print(f"| {'workers':>7} | {'submissions':>11} | {'jobs':>4} | {'succeeded':>9} | {'submit p50 ms':>13} | "
+          f"{'submit p95 ms':>13} | {'elapsed s':>9} | {'jobs/s':>6} |")
+    print(f"|{'-' * 8}:|{'-' * 12}:|{'-' * 5}:|{'-' * 10}:|{'-' * 14}:|{'-' * 14}:|{'-' * 10}:|{'-' * 7}:|")
+    for workers in args.workers:
+        r = asyncio.run(run_case(workers, args.papers, args.duplicates))
+        print(f"| {r['workers']:>7} | {r['submissions']:>11} | {r['jobs']:>4} | {r['succeeded']:>9} | "
+              f"{r['submit_p50_ms']:>13.1f} | {r['submit_p95_ms']:>13.1f} | {r['elapsed']:>9.2f} | "
+              f"{r['jobs_per_second']:>6.1f} |")
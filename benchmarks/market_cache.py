@@ -0,0 +1,158 @@
+"""
+External search calls per run with and without the market knowledge cache (app.tools.market_cache).
+
+Replays the searches and page reads that MarketResearcher, ValidationResearcher and
+MarketSkeptic make for `--papers` papers arriving over `--days` days. Each paper falls in
+one of a few research domains (Zipf popularity), so its agents look up that domain's
+market size, pain points, competitors and pricing pages the way the prompts direct them,
+with each agent's own wording (e.g. "fine-tuning data pain points" vs "pain points in
+fine-tuning data"). Queries about a run's specific ideas are unique to that run.
+
+Every call goes through the agents' hook order: the run's ToolMemo, then the market cache
+hook, then a counting stand-in for the network. The cache runs on a simulated clock, so
+entries go stale and are refreshed as they would over the days. Background refreshes are
+external calls too and are reported on their own.
+
+Usage:
+    uv run -m benchmarks.market_cache --papers 60 --days 14
+"""
+import os
+
+os.environ.setdefault("MISTRAL_REQUESTS_PER_MINUTE", "0")
+os.environ.setdefault("FIRECRAWL_REQUESTS_PER_MINUTE", "0")
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import threading
+from typing import Dict, List, Tuple
+
+import app.tools.market_cache as market_cache_module
+from app.config import AgentConfig
+from app.tools.market_cache import MarketKnowledgeCache, market_cache_scope, market_cache_tool_hook
+from app.tools.memo import ToolMemo
+
+DOMAINS = (
+    "LLM fine-tuning data", "data annotation tooling", "document AI extraction", "code review automation",
+    "medical imaging AI", "fraud detection ML", "speech analytics", "demand forecasting",
+)
+PRODUCTS = ("copilot", "API", "dashboard", "auditor", "marketplace", "workbench", "monitor", "planner")
+
+# Per agent: (tool, argument template) pairs; each agent words the shared topics its own way
+AGENT_CALLS = {
+    "MarketResearcher": [
+        ("search_web", "{domain} market size 2026"),
+        ("search_web", "{domain} pain points"),
+        ("baidu_search", "{domain} startups funding"),
+        ("get_top_hackernews_stories", None),
+    ],
+    "ValidationResearcher": [
+        ("search_web", "{idea} competitors"),
+        ("search_web", "competitors for {domain}"),
+        ("search_web", "{domain} pricing"),
+        ("scrape_website", "https://{slug}-leader.com/pricing"),
+        ("read_url", "https://{slug}-runner-up.com/"),
+    ],
+    "MarketSkeptic": [
+        ("search_web", "Pain points in {domain}"),
+        ("search_web", "{domain} competitors"),
+        ("search_web", "{domain} failed startups"),
+        ("scrape_website", "https://{slug}-leader.com/pricing/"),
+    ],
+}
+
+
+def trace(papers: int, days: float, seed: int) -> List[Tuple[float, str, str]]:
+    """(arrival in seconds, domain, idea) per paper, in arrival order."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(DOMAINS))]
+    runs = []
+    for _ in range(papers):
+        domain = rng.choices(DOMAINS, weights)[0]
+        runs.append((rng.uniform(0, days * 86400), domain, f"{domain} {rng.choice(PRODUCTS)} {rng.randrange(1000)}"))
+    return sorted(runs)
+
+
+def calls_of(domain: str, idea: str) -> List[Tuple[str, dict]]:
+    slug = domain.lower().replace(" ", "-")
+    calls = []
+    for agent_calls in AGENT_CALLS.values():
+        for function_name, template in agent_calls:
+            if function_name == "get_top_hackernews_stories":
+                calls.append((function_name, {"num_stories": 10}))
+            elif function_name in ("scrape_website", "read_url"):
+                calls.append((function_name, {"url": template.format(slug=slug)}))
+            else:
+                calls.append((function_name, {"query": template.format(domain=domain, idea=idea)}))
+    return calls
+
+
+def replay(runs: List[Tuple[float, str, str]], enabled: bool, db_file: str) -> Dict[str, float]:
+    now = [0.0]
+    network = {"calls": 0}
+    lock = threading.Lock()
+    AgentConfig.MARKET_CACHE_ENABLED = enabled
+    cache = market_cache_module.market_cache = MarketKnowledgeCache(
+        db_file=db_file,
+        fresh_seconds=AgentConfig.MARKET_CACHE_FRESH_SECONDS,
+        max_age_seconds=AgentConfig.MARKET_CACHE_MAX_AGE_SECONDS,
+        max_entries=AgentConfig.MARKET_CACHE_MAX_ENTRIES,
+        clock=lambda: now[0],
+    )
+    cache.clear()
+
+    def external(function_name: str):
+        def function_call(**arguments) -> str:
+            with lock:
+                network["calls"] += 1
+            return json.dumps({"tool": function_name, "arguments": arguments, "results": ["..."]})
+        return function_call
+
+    per_run, fresh, stale = [], 0, 0
+    for arrival, domain, idea in runs:
+        now[0] = arrival
+        memo = ToolMemo()
+        with market_cache_scope() as counts:
+            for function_name, arguments in calls_of(domain, idea):
+                memo.call(function_name, arguments, lambda: market_cache_tool_hook(
+                    function_name, external(function_name), arguments
+                ))
+        cache.wait_for_refreshes()
+        per_run.append(counts["external_calls"])
+        fresh += counts["fresh_hits"]
+        stale += counts["stale_hits"]
+    stats = cache.stats()
+    return {
+        "mean": statistics.mean(per_run),
+        "last_half": statistics.mean(per_run[len(per_run) // 2:]),
+        "run_calls": sum(per_run),
+        "fresh": fresh,
+        "stale": stale,
+        "refreshes": stats["refreshed"] + stats["refresh_failed"],
+        "network": network["calls"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="External search calls per run, market cache off vs on")
+    parser.add_argument("--papers", type=int, default=60, help="Pipeline runs in the trace")
+    parser.add_argument("--days", type=float, default=14, help="Days the runs are spread over")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    runs = trace(args.papers, args.days, args.seed)
+    per_run = len(calls_of(DOMAINS[0], "idea"))
+    print(f"{args.papers} runs over {args.days:g} days, {len(DOMAINS)} domains, {per_run} market tool calls per run; "
+          f"fresh {AgentConfig.MARKET_CACHE_FRESH_SECONDS / 3600:g} h, "
+          f"max age {AgentConfig.MARKET_CACHE_MAX_AGE_SECONDS / 86400:g} d")
+    print(f"| {'cache':<5} | {'ext./run':>8} | {'2nd half':>8} | {'run calls':>9} | {'fresh':>5} | {'stale':>5} | "
+          f"{'refreshes':>9} | {'network':>7} |")
+    print(f"|{'-' * 7}|{'-' * 9}:|{'-' * 9}:|{'-' * 10}:|{'-' * 6}:|{'-' * 6}:|{'-' * 10}:|{'-' * 8}:|")
+    with tempfile.TemporaryDirectory() as directory:
+        for enabled in (False, True):
+            row = replay(runs, enabled, os.path.join(directory, "market_cache.db"))
+            print(f"| {'on' if enabled else 'off':<5} | {row['mean']:>8.1f} | {row['last_half']:>8.1f} | "
+                  f"{row['run_calls']:>9} | {row['fresh']:>5} | {row['stale']:>5} | {row['refreshes']:>9} | "
+                  f"{row['network']:>7} |")
@@ -0,0 +1,125 @@
+"""
+Orchestration overhead, per-member latency and memory of our pipelines and teams.
+
+Runs everything against MockMistralChat and the fake toolkits (no API calls). Framework
+overhead is the wall time of a run with zero model and tool latency; per-member figures
+come from a run with fixed latencies, where each stage's expected time is
+(model calls x model latency + tool calls x tool latency) and the rest is overhead.
+
+Usage:
+    uv run -m benchmarks.orchestration --runs 5
+    uv run -m benchmarks.orchestration --max-overhead-ms 400   # exit 1 on regression
+"""
+import os
+
+os.environ.setdefault("MOCK_MODELS", "true")
+os.environ.setdefault("MOCK_TOOLS", "true")
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+os.environ.setdefault("IDEA_INDEX_ENABLED", "false")
+os.environ.setdefault("MARKET_CACHE_ENABLED", "false")
+os.environ.setdefault("RUN_DEDUP_ENABLED", "false")
+
+import argparse
+import asyncio
+import gc
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from app.config import AgentConfig
+from app.teams.paper2saas import arun_paper2saas, paper2saas_pipeline, paper2saas_team, run_paper2saas
+from app.teams.roaster import idea_roaster_team
+
+ARXIV_ID = "2512.24991v1"
+
+
+def _models():
+    yield paper2saas_team.model
+    yield idea_roaster_team.model
+    for member in list(paper2saas_team.members) + list(idea_roaster_team.members):
+        yield member.model
+
+
+def set_latency(model_seconds: float, tool_seconds: float):
+    for model in _models():
+        model.latency_seconds = model_seconds
+    AgentConfig.MOCK_TOOL_LATENCY_SECONDS = tool_seconds
+
+
+CASES: Dict[str, Callable[[], object]] = {
+    "pipeline (async)": lambda: asyncio.run(arun_paper2saas(ARXIV_ID)),
+    "pipeline (sync)": lambda: run_paper2saas(ARXIV_ID),
+    "Paper2SaaS team": lambda: asyncio.run(paper2saas_team.arun(f"Analyze arXiv paper {ARXIV_ID}")),
+    "IdeaRoaster team": lambda: asyncio.run(idea_roaster_team.arun("Critique this SaaS idea: data budgeting")),
+}
+
+
+def time_case(run: Callable[[], object], runs: int) -> List[float]:
+    run()  # warm-up: imports, DB tables, toolkit construction
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def peak_memory(run: Callable[[], object]) -> float:
+    """Peak Python heap allocated during one run, in MiB."""
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def member_latency(model_seconds: float, tool_seconds: float) -> List[tuple]:
+    set_latency(model_seconds, tool_seconds)
+    result = asyncio.run(arun_paper2saas(ARXIV_ID))
+    rows = []
+    for name, stage_result in result["result"].stages.items():
+        agent = paper2saas_pipeline.stages[name].agent
+        tool_calls = AgentConfig.MOCK_MODEL_TOOL_ROUNDS if agent.tools else 0
+        expected = (tool_calls + 1) * model_seconds + tool_calls * tool_seconds
+        rows.append((name, agent.name, stage_result.duration, expected))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Orchestration overhead benchmark (mock model and tools)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--model-latency", type=float, default=0.2, help="Mock model latency for per-member timings")
+    parser.add_argument("--tool-latency", type=float, default=0.05, help="Fake tool latency for per-member timings")
+    parser.add_argument("--max-overhead-ms", type=float, help="Fail if async pipeline overhead exceeds this")
+    args = parser.parse_args()
+
+    set_latency(0.0, 0.0)
+    print(f"Framework overhead (zero model/tool latency, median of {args.runs} runs)")
+    print(f"| {'case':<18} | {'median ms':>9} | {'p95 ms':>8} | {'peak heap MiB':>13} |")
+    print(f"|{'-' * 20}|{'-' * 10}:|{'-' * 9}:|{'-' * 14}:|")
+    overhead = {}
+    for name, run in CASES.items():
+        timings = sorted(time_case(run, args.runs))
+        overhead[name] = statistics.median(timings) * 1000
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000
+        print(f"| {name:<18} | {overhead[name]:>9.1f} | {p95:>8.1f} | {peak_memory(run):>13.1f} |")
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    for _ in range(args.runs * 4):
+        CASES["pipeline (async)"]()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\nMax RSS {rss_before:.0f} MiB -> {rss_after:.0f} MiB after {args.runs * 4} more pipeline runs")
+
+    print(f"\nPer-member latency (model {args.model_latency}s, tools {args.tool_latency}s per call)")
+    print(f"| {'stage':<16} | {'agent':<20} | {'measured s':>10} | {'expected s':>10} | {'overhead ms':>11} |")
+    print(f"|{'-' * 18}|{'-' * 22}|{'-' * 11}:|{'-' * 11}:|{'-' * 12}:|")
+    for stage, agent, measured, expected in member_latency(args.model_latency, args.tool_latency):
+        print(f"| {stage:<16} | {agent:<20} | {measured:>10.3f} | {expected:>10.3f} | {(measured - expected) * 1000:>11.1f} |")
+
+    if args.max_overhead_ms is not None and overhead["pipeline (async)"] > args.max_overhead_ms:
+        print(f"\nFAIL: pipeline overhead {overhead['pipeline (async)']:.1f} ms > {args.max_overhead_ms} ms")
+        sys.exit(1)
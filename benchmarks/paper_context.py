@@ -0,0 +1,129 @@
+"""
+Prompt tokens PaperAnalyzer spends on paper text: full text versus chunked retrieval.
+
+Both cases call the real LocalPaperTools against a temporary paper store. The baseline
+is one read_local_paper call returning the (truncated) full text; the retrieval case is
+read_local_paper (metadata + outline) followed by one search_local_paper call per reading
+pass. Prompt tokens are modeled the way the agent loop sends them: every model call
+re-sends the system prompt plus all earlier tool results.
+
+Usage:
+    python -m app.paper_store fetch 2512.24991v1          # once, needs arXiv access
+    uv run -m benchmarks.paper_context --arxiv-id 2512.24991v1
+    uv run -m benchmarks.paper_context --text-file paper.txt
+    uv run -m benchmarks.paper_context --synthetic         # offline stand-in text
+"""
+import argparse
+import json
+import random
+import re
+import tempfile
+import time
+from typing import List
+
+from app.paper_store import PaperStore, paper_store
+from app.prompts.agents import PAPER_ANALYZER_INSTRUCTIONS
+from app.retrieval import estimate_tokens, get_paper_index
+from app.tools.local_papers import LocalPaperTools
+
+SAMPLE_ARXIV_ID = "2512.24991v1"
+SAMPLE_REPORT = "report_2512_24991v1.md"
+
+PASS_QUERIES = {
+    1: "title abstract key figure main contribution",
+    2: "problem motivation contributions conclusion findings",
+    3: "method architecture algorithm training setup experiments results metrics",
+    4: "limitations applications future work implementation details",
+}
+
+SYNTHETIC_SECTIONS = [
+    ("Abstract", 1), ("1 Introduction", 5), ("2 Related Work", 5), ("3 Method", 6),
+    ("3.1 Gradient Similarity Metric", 5), ("3.2 Data Selection", 5), ("4 Experimental Setup", 5),
+    ("5 Results", 8), ("6 Analysis", 6), ("7 Limitations", 2), ("8 Conclusion", 2), ("References", 8),
+]
+
+
+def synthetic_paper(seed: int = 0, paragraph_chars: int = 900) -> str:
+    """
+    Deterministic stand-in with the section layout and length of a typical ML paper,
+    using the vocabulary of the bundled sample report (the paper itself is not in the repo).
+    """
+    rng = random.Random(seed)
+    with open(SAMPLE_REPORT, encoding="utf-8") as f:
+        vocabulary = [w for w in re.findall(r"[A-Za-z][A-Za-z-]+", f.read()) if len(w) > 2]
+    lines = ["Data Efficiency in Fine-Tuning Large Language Models", "Anonymous Authors", ""]
+    for title, paragraphs in SYNTHETIC_SECTIONS:
+        lines.append(title)
+        for _ in range(paragraphs):
+            paragraph = []
+            while sum(len(s) for s in paragraph) < paragraph_chars:
+                words = rng.choices(vocabulary, k=rng.randint(10, 24))
+                paragraph.append(" ".join(words).capitalize() + ". ")
+            lines.extend(["".join(paragraph).strip(), ""])
+    return "\n".join(lines)
+
+
+def _prompt_tokens(system_tokens: int, tool_results: List[str]) -> int:
+    """Sum of prompt tokens over the model calls of one tool-using agent run."""
+    total, context = 0, system_tokens
+    for result in tool_results:
+        total += context          # model call that decides on this tool call
+        context += estimate_tokens(result)
+    return total + context        # final answer call
+
+
+def run(text: str, arxiv_id: str, source: str):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = PaperStore(db_file=f"{tmp_dir}/papers.db", data_dir=tmp_dir)
+        store.add(arxiv_id, title="(benchmark)", abstract=text[:1500], text=text, source="benchmark")
+        full_text = LocalPaperTools(store=store, auto_ingest=False, retrieval=False)
+        chunked = LocalPaperTools(store=store, auto_ingest=False, retrieval=True)
+
+        baseline_results = [full_text.read_local_paper(arxiv_id)]
+        started = time.perf_counter()
+        index = get_paper_index(text)
+        index_ms = (time.perf_counter() - started) * 1000
+        retrieval_results = [chunked.read_local_paper(arxiv_id)]
+        started = time.perf_counter()
+        for reading_pass, query in PASS_QUERIES.items():
+            retrieval_results.append(chunked.search_local_paper(arxiv_id, query, reading_pass=reading_pass))
+        search_ms = (time.perf_counter() - started) * 1000 / len(PASS_QUERIES)
+
+    system_tokens = estimate_tokens(PAPER_ANALYZER_INSTRUCTIONS)
+    baseline_paper = sum(estimate_tokens(r) for r in baseline_results)
+    retrieval_paper = sum(estimate_tokens(r) for r in retrieval_results)
+    baseline_prompt = _prompt_tokens(system_tokens, baseline_results)
+    retrieval_prompt = _prompt_tokens(system_tokens, retrieval_results)
+
+    print(f"source: {source} ({len(text)} chars, ~{estimate_tokens(text)} tokens)")
+    print(f"index: {len(index.sections)} sections, {len(index.chunks)} chunks, built in {index_ms:.1f} ms, "
+          f"{search_ms:.2f} ms per search")
+    print()
+    print(f"| {'case':<26} | {'tool calls':>10} | {'paper tokens':>12} | {'prompt tokens (run)':>19} |")
+    print(f"|{'-' * 28}|{'-' * 11}:|{'-' * 13}:|{'-' * 20}:|")
+    print(f"| {'full text (baseline)':<26} | {len(baseline_results):>10} | {baseline_paper:>12} | {baseline_prompt:>19} |")
+    print(f"| {'chunked retrieval':<26} | {len(retrieval_results):>10} | {retrieval_paper:>12} | {retrieval_prompt:>19} |")
+    print()
+    print(f"paper-text tokens: -{100 * (1 - retrieval_paper / baseline_paper):.1f}%  "
+          f"prompt tokens over the run: -{100 * (1 - retrieval_prompt / baseline_prompt):.1f}%")
+    print(f"pass 3 passages: {[c['section'] for c in json.loads(retrieval_results[3])]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Full-text vs chunked-retrieval prompt tokens for PaperAnalyzer")
+    parser.add_argument("--arxiv-id", default=SAMPLE_ARXIV_ID, help="Paper to read from the local paper store")
+    parser.add_argument("--text-file", help="Plain-text paper to use instead of the paper store")
+    parser.add_argument("--synthetic", action="store_true", help="Use the offline synthetic stand-in paper")
+    args = parser.parse_args()
+
+    if args.text_file:
+        with open(args.text_file, encoding="utf-8") as f:
+            run(f.read(), args.arxiv_id, args.text_file)
+    elif args.synthetic:
+        run(synthetic_paper(), args.arxiv_id, "synthetic stand-in")
+    else:
+        stored_text = paper_store.get_text(args.arxiv_id)
+        if stored_text is None:
+            raise SystemExit(f"{args.arxiv_id} is not in the local paper store; run "
+                             f"`python -m app.paper_store fetch {args.arxiv_id}` or pass --synthetic")
+        run(stored_text, args.arxiv_id, f"paper store {args.arxiv_id}")
@@ -0,0 +1,72 @@
+"""
+Paper prefetch (app.prefetch) on and off, offline.
+
+Runs run_paper2saas with the mock model (`--model-latency` seconds per call) and fake tools.
+The fake local paper store misses the paper and waits `--fetch-seconds` in its place, the
+way a first arXiv download of metadata and PDF would. Each fetch time is run with prefetch
+off and on. The benchmark reports the paper_analysis stage time, the whole run, and the
+prefetch's own report: how much fetch time it hid and how long the analyzer still waited.
+
+Usage:
+    uv run -m benchmarks.prefetch --fetch-seconds 0.5 1.5 3 --model-latency 1.0 --runs 3
+"""
+import os
+
+os.environ.setdefault("MOCK_MODELS", "true")
+os.environ.setdefault("MOCK_TOOLS", "true")
+os.environ.setdefault("MOCK_TOOL_LATENCY_SECONDS", "0.1")
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+os.environ.setdefault("IDEA_INDEX_ENABLED", "false")
+os.environ.setdefault("MARKET_CACHE_ENABLED", "false")
+os.environ.setdefault("RUN_DEDUP_ENABLED", "false")
+
+import argparse
+import statistics
+import uuid
+from typing import Dict
+
+from app.config import AgentConfig
+from app.teams.paper2saas import get_paper2saas_pipeline, run_paper2saas
+
+
+def measure(runs: int, prefetch: bool) -> Dict[str, float]:
+    AgentConfig.PAPER_PREFETCH_ENABLED = prefetch
+    stage, total, hidden, waited = [], [], [], []
+    for _ in range(runs):
+        # The mock analyzer always reads this ID
+        result = run_paper2saas("2512.24991v1", session_id=str(uuid.uuid4()))
+        stage.append(result["metrics"]["stage_timings"]["paper_analysis"])
+        total.append(result["metrics"]["execution_time"])
+        report = result["metrics"].get("prefetch") or {}
+        hidden.append(report.get("hidden_seconds", 0.0))
+        waited.append(report.get("waited_seconds", 0.0))
+    return {
+        "stage": statistics.mean(stage),
+        "total": statistics.mean(total),
+        "hidden": statistics.mean(hidden),
+        "waited": statistics.mean(waited),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Paper prefetch on vs off (mock model and tools)")
+    parser.add_argument("--fetch-seconds", type=float, nargs="+", default=[0.5, 1.5, 3.0],
+                        help="Simulated arXiv download per paper")
+    parser.add_argument("--model-latency", type=float, default=1.0, help="Mock model seconds per call")
+    parser.add_argument("--runs", type=int, default=3, help="Runs averaged per row")
+    args = parser.parse_args()
+
+    for stage in get_paper2saas_pipeline().stages.values():
+        stage.agent.model.latency_seconds = args.model_latency
+    AgentConfig.MOCK_PAPER_FETCH_SECONDS = 0.0
+    run_paper2saas("2512.24991v1")  # warm-up: imports, agents, DB tables
+
+    print(f"Mock model {args.model_latency:g}s per call; {args.runs} runs per row")
+    print(f"| {'fetch s':>7} | {'prefetch':>8} | {'paper_analysis s':>16} | {'run s':>6} | {'hidden s':>8} | {'still waited s':>14} |")
+    print(f"|{'-' * 8}:|{'-' * 9}:|{'-' * 17}:|{'-' * 7}:|{'-' * 9}:|{'-' * 15}:|")
+    for fetch_seconds in args.fetch_seconds:
+        AgentConfig.MOCK_PAPER_FETCH_SECONDS = fetch_seconds
+        for prefetch in (False, True):
+            row = measure(args.runs, prefetch)
+            print(f"| {fetch_seconds:>7.1f} | {'on' if prefetch else 'off':>8} | {row['stage']:>16.2f} | "
+                  f"{row['total']:>6.2f} | {row['hidden']:>8.2f} | {row['waited']:>14.2f} |")
@@ -0,0 +1,85 @@
+"""
+Prompt tokens per run and member: the instructions as they were, and the assembled variants.
+
+Runs run_paper2saas offline (MockMistralChat + fake tools) three times with each stage agent
+built from different instructions:
+
+- raw: the constants of app.prompts.agents as agents used them before app.prompts.assembly;
+- full: the assembled instructions (same words, no source indentation);
+- compact: PROMPT_VARIANT=compact, with non-operative prose rewritten or dropped.
+
+The mock model counts the characters of every message it receives, so a stage's prompt
+tokens include its system message once per model call (tool rounds included) plus its
+task and tool results, which are the same in all three runs. Tool definitions are sent
+too but not counted by the mock; `python -m app.prompts.assembly` reports them.
+
+Usage:
+    uv run -m benchmarks.prompt_tokens
+    uv run -m benchmarks.prompt_tokens --tool-rounds 3
+"""
+import os
+
+os.environ.setdefault("MOCK_MODELS", "true")
+os.environ.setdefault("MOCK_TOOLS", "true")
+os.environ.setdefault("MOCK_MODEL_LATENCY_SECONDS", "0")
+os.environ.setdefault("MOCK_TOOL_LATENCY_SECONDS", "0")
+os.environ.setdefault("MISTRAL_REQUESTS_PER_MINUTE", "0")
+os.environ.setdefault("FIRECRAWL_REQUESTS_PER_MINUTE", "0")
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+os.environ.setdefault("IDEA_INDEX_ENABLED", "false")
+os.environ.setdefault("MARKET_CACHE_ENABLED", "false")
+os.environ.setdefault("RUN_DEDUP_ENABLED", "false")
+
+import argparse
+import uuid
+from typing import Dict
+
+from app.config import AgentConfig
+from app.prompts.assembly import INSTRUCTIONS, instructions
+from app.registry import AGENTS, get_component
+from app.teams.paper2saas import get_paper2saas_pipeline, run_paper2saas
+
+ARXIV_ID = "2512.24991v1"
+VARIANTS = ("raw", "full", "compact")
+
+
+def prompt_tokens(variant: str, tool_rounds: int) -> Dict[str, Dict[str, int]]:
+    """Prompt tokens and model calls per stage of one run, with every stage agent on `variant`."""
+    pipeline = get_paper2saas_pipeline()
+    names = {get_component(name).name: name for name in AGENTS}
+    for stage in pipeline.stages.values():
+        name = names[stage.agent.name]
+        stage.agent.instructions = INSTRUCTIONS[name] if variant == "raw" else instructions(name, variant)
+        stage.agent.model.tool_rounds = tool_rounds
+    result = run_paper2saas(ARXIV_ID, session_id=str(uuid.uuid4()))
+    rows = {}
+    for stage_name, stage_result in result["result"].stages.items():
+        run_output = stage_result.run_output
+        rows[stage_name] = {
+            "agent": run_output.agent_name,
+            "calls": sum(message.role == "assistant" for message in run_output.messages or []),
+            "tokens": run_output.metrics.input_tokens,
+        }
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prompt tokens per member: raw vs assembled instructions")
+    parser.add_argument("--tool-rounds", type=int, default=AgentConfig.MOCK_MODEL_TOOL_ROUNDS,
+                        help="Tool-calling rounds of the mock model per stage that has tools")
+    args = parser.parse_args()
+
+    runs = {variant: prompt_tokens(variant, args.tool_rounds) for variant in VARIANTS}
+    print(f"Prompt tokens per run, mock model with {args.tool_rounds} tool round(s) per stage")
+    print(f"| {'member':<21} | {'calls':>5} | {'raw':>6} | {'full':>6} | {'compact':>7} | {'saved':>6} |")
+    print(f"|{'-' * 23}|{'-' * 6}:|{'-' * 7}:|{'-' * 7}:|{'-' * 8}:|{'-' * 7}:|")
+    totals = dict.fromkeys(VARIANTS, 0)
+    for stage_name, row in runs["raw"].items():
+        tokens = {variant: runs[variant][stage_name]["tokens"] for variant in VARIANTS}
+        for variant in VARIANTS:
+            totals[variant] += tokens[variant]
+        saved = 1 - tokens["compact"] / tokens["raw"]
+        print(f"| {row['agent']:<21} | {row['calls']:>5} | {tokens['raw']:>6} | {tokens['full']:>6} | "
+              f"{tokens['compact']:>7} | {saved:>6.1%} |")
+    saved = 1 - totals["compact"] / totals["raw"]
+    print(f"| {'total':<21} | {'':>5} | {totals['raw']:>6} | {totals['full']:>6} | {totals['compact']:>7} | {saved:>6.1%} |")
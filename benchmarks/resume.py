@@ -0,0 +1,87 @@
+"""
+Cost of recovering a failed run: starting over vs resuming from its checkpoint (app.checkpoint).
+
+Runs the pipeline offline (MockMistralChat + fake tools) with one stage's agent failing,
+standing in for ProductEngineer timing out or a search tool erroring, then recovers the
+run twice from the same failure: once as a new run from PaperAnalyzer, once with
+aresume_paper2saas on the failed run's session. Reports the wall time and tokens of each
+recovery attempt and the stages it had to run, per failing stage.
+
+Usage:
+    uv run -m benchmarks.resume --runs 3
+    uv run -m benchmarks.resume --fail-stages engineering report
+"""
+import os
+
+os.environ.setdefault("MOCK_MODELS", "true")
+os.environ.setdefault("MOCK_TOOLS", "true")
+os.environ.setdefault("MOCK_MODEL_LATENCY_SECONDS", "0.3")
+os.environ.setdefault("MOCK_TOOL_LATENCY_SECONDS", "0.1")
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+os.environ.setdefault("IDEA_INDEX_ENABLED", "false")
+os.environ.setdefault("MARKET_CACHE_ENABLED", "false")
+os.environ.setdefault("RUN_DEDUP_ENABLED", "false")
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+from typing import Dict, List
+
+import app.checkpoint as checkpoint_module
+from app.config import AgentConfig
+from app.teams.paper2saas import aresume_paper2saas, arun_paper2saas, get_paper2saas_pipeline
+
+ARXIV_ID = "2512.24991v1"
+
+
+async def _failing_arun(*args, **kwargs):
+    raise TimeoutError("Simulated stage failure")
+
+
+async def measure(fail_stage: str, runs: int) -> Dict[str, Dict[str, float]]:
+    agent = get_paper2saas_pipeline().stages[fail_stage].agent
+    rows: Dict[str, Dict[str, List[float]]] = {
+        recovery: {"wall": [], "tokens": [], "stages": []} for recovery in ("rerun", "resume")
+    }
+    for _ in range(runs):
+        for recovery in rows:
+            agent.arun = _failing_arun
+            try:
+                failed = await arun_paper2saas(ARXIV_ID)
+            finally:
+                del agent.arun
+            assert failed["status"] == "error" and failed["failed_stage"] == fail_stage, failed.get("error")
+            if recovery == "rerun":
+                result = await arun_paper2saas(ARXIV_ID)
+            else:
+                result = await aresume_paper2saas(failed["session_id"])
+            run_output = result["result"]
+            rows[recovery]["wall"].append(run_output.duration)
+            rows[recovery]["tokens"].append(run_output.total_tokens)
+            rows[recovery]["stages"].append(sum(not stage.resumed for stage in run_output.stages.values()))
+    return {recovery: {name: statistics.mean(values) for name, values in row.items()} for recovery, row in rows.items()}
+
+
+if __name__ == "__main__":
+    stage_names = get_paper2saas_pipeline().order
+    parser = argparse.ArgumentParser(description="Recovering a failed run: rerun from scratch vs resume")
+    parser.add_argument("--runs", type=int, default=3, help="Failures recovered per stage and recovery")
+    parser.add_argument("--fail-stages", nargs="+", choices=stage_names,
+                        default=["market_research", "validation", "engineering", "report"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        AgentConfig.CHECKPOINT_ENABLED = True
+        checkpoint_module.checkpoint_store = checkpoint_module.CheckpointStore(
+            os.path.join(directory, "checkpoints.db"), AgentConfig.CHECKPOINT_TTL_SECONDS
+        )
+        asyncio.run(arun_paper2saas(ARXIV_ID))  # warm-up: imports, agents, DB tables
+        print(f"{len(stage_names)} stages, {AgentConfig.MOCK_MODEL_LATENCY_SECONDS:g} s per model call, "
+              f"{args.runs} recoveries per cell")
+        print(f"| {'failed stage':<15} | {'recovery':<8} | {'wall s':>6} | {'tokens':>6} | {'stages run':>10} |")
+        print(f"|{'-' * 17}|{'-' * 10}|{'-' * 7}:|{'-' * 7}:|{'-' * 11}:|")
+        for fail_stage in args.fail_stages:
+            for recovery, row in asyncio.run(measure(fail_stage, args.runs)).items():
+                print(f"| {fail_stage:<15} | {recovery:<8} | {row['wall']:>6.2f} | {row['tokens']:>6.0f} | "
+                      f"{row['stages']:>10.1f} |")
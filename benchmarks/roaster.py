@@ -0,0 +1,79 @@
+"""
+Roasting a paper's ideas one by one versus concurrently (app.teams.roaster).
+
+Runs idea_roaster_team offline (MockMistralChat + fake tools) on `--ideas` ideas:
+sequentially with run_idea_roaster, then with arun_idea_roaster_batch at each
+`--concurrency`. Reports wall time, the time to the first verdict, and the tool calls that
+reached a toolkit (the batch shares one tool memo, so repeated searches and scrapes across
+ideas of the same paper are served once).
+
+Usage:
+    uv run -m benchmarks.roaster --ideas 8 --concurrency 1 4 8
+"""
+import os
+
+os.environ.setdefault("MOCK_MODELS", "true")
+os.environ.setdefault("MOCK_TOOLS", "true")
+os.environ.setdefault("MOCK_MODEL_LATENCY_SECONDS", "0.3")
+os.environ.setdefault("MOCK_TOOL_LATENCY_SECONDS", "0.2")
+# Measure within-batch sharing only
+os.environ.setdefault("TOOL_MEMO_SHARED_TTL_SECONDS", "0")
+os.environ.setdefault("MARKET_CACHE_ENABLED", "false")
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+from app.teams.roaster import arun_idea_roaster_batch, run_idea_roaster
+
+
+def ideas(count: int) -> List[str]:
+    return [
+        f"Mock Idea {i}: annotation budget planner for ML teams, built on the paper's "
+        f"gradient-similarity data selection (variant {i})"
+        for i in range(1, count + 1)
+    ]
+
+
+def tool_calls(stats: Dict[str, dict]) -> int:
+    """Tool calls that reached a toolkit (memo misses)."""
+    return sum(s["calls"] - s["hits"] - s["coalesced"] - s["shared_hits"] for s in stats.values())
+
+
+def sequential(idea_contexts: List[str]) -> Dict[str, float]:
+    started = time.perf_counter()
+    first, calls = None, 0
+    for idea_context in idea_contexts:
+        result = run_idea_roaster(idea_context)
+        first = first or time.perf_counter() - started
+        calls += tool_calls(result["metrics"]["tool_memo"])
+    return {"wall": time.perf_counter() - started, "first": first, "calls": calls}
+
+
+async def concurrent(idea_contexts: List[str], concurrency: int) -> Dict[str, float]:
+    started = time.perf_counter()
+    first, stats = None, {}
+    async for result in arun_idea_roaster_batch(idea_contexts, max_concurrency=concurrency):
+        first = first or time.perf_counter() - started
+        stats = result["metrics"]["tool_memo"]  # the batch's shared memo
+    return {"wall": time.perf_counter() - started, "first": first, "calls": tool_calls(stats)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sequential vs concurrent idea roasting (mock model and tools)")
+    parser.add_argument("--ideas", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    idea_contexts = ideas(args.ideas)
+    run_idea_roaster(idea_contexts[0])  # warm-up: imports, team construction, DB tables
+    rows = {"sequential (run_idea_roaster)": sequential(idea_contexts)}
+    for concurrency in args.concurrency:
+        rows[f"batch, concurrency {concurrency}"] = asyncio.run(concurrent(idea_contexts, concurrency))
+
+    print(f"{args.ideas} ideas")
+    print(f"| {'mode':<30} | {'wall s':>6} | {'first verdict s':>15} | {'tool calls':>10} |")
+    print(f"|{'-' * 32}|{'-' * 7}:|{'-' * 16}:|{'-' * 11}:|")
+    for label, row in rows.items():
+        print(f"| {label:<30} | {row['wall']:>6.2f} | {row['first']:>15.2f} | {row['calls']:>10} |")
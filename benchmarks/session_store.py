@@ -0,0 +1,147 @@
+"""
+Session-store writes with and without buffering (app.session_store), events on and off.
+
+1. writes: `--sessions` copies of a real idea_roaster_team session (a streamed mock run with
+   every event stored) are saved from `--threads` threads. The test runs against three stores:
+   plain SqliteDb with SQLite's default rollback journal, the same store in WAL mode, and the
+   buffered WAL store `shared_db` uses. It reports durable writes/sec (for buffered, up to the
+   final flush), the median time a caller is blocked per save, and the size of the stored runs per session.
+2. runs: `--runs` concurrent streamed idea_roaster_team runs (mock model and tools), the way
+   AgentOS serves them. They are measured with store_events on (every event kept, content
+   deltas included) and off, against the direct and the buffered WAL store, and the test
+   reports mean and p95 run latency.
+
+Usage:
+    uv run -m benchmarks.session_store --sessions 500 --threads 8 --runs 16
+"""
+import os
+
+os.environ.setdefault("MOCK_MODELS", "true")
+os.environ.setdefault("MOCK_TOOLS", "true")
+os.environ.setdefault("MOCK_MODEL_LATENCY_SECONDS", "0.05")
+os.environ.setdefault("MOCK_TOOL_LATENCY_SECONDS", "0.05")
+os.environ.setdefault("MOCK_MODEL_OUTPUT_TOKENS", "600")
+os.environ.setdefault("MISTRAL_REQUESTS_PER_MINUTE", "0")
+os.environ.setdefault("FIRECRAWL_REQUESTS_PER_MINUTE", "0")
+os.environ.setdefault("MARKET_CACHE_ENABLED", "false")
+
+import argparse
+import asyncio
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+from agno.db.base import SessionType
+from agno.db.sqlite import SqliteDb
+from agno.session import TeamSession
+
+from app.registry import get_component
+from app.db import sqlite_engine
+from app.session_store import buffered
+
+
+def make_db(kind: str, db_file: str):
+    if kind == "default journal":
+        return SqliteDb(db_file=db_file)
+    if kind == "WAL":
+        return SqliteDb(db_engine=sqlite_engine(db_file), db_file=db_file)
+    return buffered(SqliteDb)(db_engine=sqlite_engine(db_file), db_file=db_file)
+
+
+async def streamed_run(team, session_id: str) -> float:
+    started = time.perf_counter()
+    async for _ in team.arun(f"Critique this SaaS idea: Mock Idea {session_id[:8]}", session_id=session_id,
+                             stream=True, stream_events=True):
+        pass
+    return time.perf_counter() - started
+
+
+def configure(team, db, events: bool) -> None:
+    team.db = db
+    team.store_events = events
+    team.events_to_skip = [] if events else None
+
+
+def sample_session(workdir: Path) -> TeamSession:
+    team = get_component("idea_roaster_team")
+    db = make_db("WAL", str(workdir / "sample.db"))
+    configure(team, db, events=True)
+    session_id = str(uuid.uuid4())
+    asyncio.run(streamed_run(team, session_id))
+    return db.get_session(session_id, SessionType.TEAM)
+
+
+def writes(kind: str, session: TeamSession, count: int, threads: int, workdir: Path) -> Dict[str, float]:
+    db_file = workdir / f"writes-{kind.replace(' ', '-')}.db"
+    db = make_db(kind, str(db_file))
+    template = session.to_dict()
+    copies = [TeamSession.from_dict({**template, "session_id": str(uuid.uuid4())}) for _ in range(count)]
+    db.upsert_session(TeamSession.from_dict({**template, "session_id": "warm-up"}))  # create the table
+    blocked: List[float] = []
+
+    def save(copy):
+        started = time.perf_counter()
+        db.upsert_session(copy)
+        blocked.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(save, copies))
+    if hasattr(db, "flush"):
+        db.flush()
+    elapsed = time.perf_counter() - started
+    with sqlite3.connect(db_file) as connection:
+        stored = connection.execute(f"SELECT avg(length(runs)) FROM {db.session_table_name}").fetchone()[0]
+    return {"rate": count / elapsed, "blocked_ms": statistics.median(blocked) * 1000, "bytes": stored}
+
+
+async def runs(kind: str, events: bool, count: int, workdir: Path) -> Dict[str, float]:
+    team = get_component("idea_roaster_team")
+    db = make_db(kind, str(workdir / f"runs-{kind}-{events}.db"))
+    configure(team, db, events)
+    await streamed_run(team, str(uuid.uuid4()))  # warm-up: table creation
+    started = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(streamed_run(team, str(uuid.uuid4())) for _ in range(count))))
+    if hasattr(db, "flush"):
+        db.flush()
+    return {
+        "mean": statistics.mean(latencies),
+        "p95": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "wall": time.perf_counter() - started,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Buffered vs direct session writes (mock model and tools)")
+    parser.add_argument("--sessions", type=int, default=500, help="Sessions saved in the write test")
+    parser.add_argument("--threads", type=int, default=8, help="Threads saving sessions at once")
+    parser.add_argument("--runs", type=int, default=16, help="Concurrent team runs in the latency test")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        session = sample_session(workdir)
+        events = sum(len(run.events or []) for run in session.runs or [])
+        print(f"Sample session: {len(session.runs)} runs, {events} events, "
+              f"{len(str(session.to_dict())) / 1024:.0f} KB serialized")
+
+        print(f"\n{args.sessions} saves from {args.threads} threads")
+        print(f"| {'store':<18} | {'writes/s':>8} | {'blocked per save ms':>19} | {'stored runs KB':>17} |")
+        print(f"|{'-' * 20}|{'-' * 9}:|{'-' * 20}:|{'-' * 18}:|")
+        for kind in ("default journal", "WAL", "buffered WAL"):
+            row = writes(kind, session, args.sessions, args.threads, workdir)
+            print(f"| {kind:<18} | {row['rate']:>8.0f} | {row['blocked_ms']:>19.2f} | {row['bytes'] / 1024:>17.1f} |")
+
+        print(f"\n{args.runs} concurrent streamed idea_roaster_team runs")
+        print(f"| {'store':<14} | {'events':>6} | {'mean s':>6} | {'p95 s':>6} | {'wall s':>6} |")
+        print(f"|{'-' * 16}|{'-' * 7}:|{'-' * 7}:|{'-' * 7}:|{'-' * 7}:|")
+        for kind in ("WAL", "buffered WAL"):
+            for events_on in (False, True):
+                row = asyncio.run(runs(kind, events_on, args.runs, workdir))
+                print(f"| {kind:<14} | {'on' if events_on else 'off':>6} | {row['mean']:>6.2f} | "
+                      f"{row['p95']:>6.2f} | {row['wall']:>6.2f} |")
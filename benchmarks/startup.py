@@ -0,0 +1,95 @@
+"""
+Cold-start cost of the app: wall time and `python -X importtime` breakdown.
+
+Each target runs in a fresh interpreter (so nothing is cached between runs), once per
+`--runs`. The report lists the median wall time and import time per target, then the
+packages that dominate the first target's import time, grouped by top-level package.
+
+Usage:
+    uv run -m benchmarks.startup --runs 5
+    uv run -m benchmarks.startup --max-ms 4000   # exit 1 if `import app.main` regresses
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# (label, extra environment, statement run in a fresh interpreter)
+TARGETS: List[Tuple[str, Dict[str, str], str]] = [
+    ("app.main (all components)", {"AGENTOS_COMPONENTS": "all"}, "import app.main"),
+    ("app.main (idea_roaster_team)", {"AGENTOS_COMPONENTS": "idea_roaster_team"}, "import app.main"),
+    ("app.api (no agents built)", {}, "import app.api"),
+    ("app.teams.paper2saas", {}, "import app.teams.paper2saas"),
+    ("+ build pipeline", {}, "import app.teams.paper2saas as m; m.get_paper2saas_pipeline()"),
+]
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, int, int, str]]:
+    """(depth, self us, cumulative us, module) for every `-X importtime` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def run_target(env: Dict[str, str], statement: str) -> Tuple[float, List[tuple]]:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env={**os.environ, **env}, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"`{statement}` failed:\n{completed.stderr[-2000:]}")
+    return elapsed, parse_importtime(completed.stderr)
+
+
+def by_package(rows: List[tuple]) -> Dict[str, int]:
+    totals: Dict[str, int] = defaultdict(int)
+    for _, self_us, _, name in rows:
+        totals[name.split(".")[0]] += self_us
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Startup / import-time benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12, help="Packages to list in the breakdown")
+    parser.add_argument("--max-ms", type=float, help="Fail if the first target's median wall time exceeds this")
+    args = parser.parse_args()
+
+    print(f"Fresh interpreter per run, median of {args.runs}")
+    print(f"| {'target':<30} | {'wall ms':>8} | {'imports ms':>10} | {'modules':>7} |")
+    print(f"|{'-' * 32}|{'-' * 9}:|{'-' * 11}:|{'-' * 8}:|")
+    medians = []
+    breakdown: List[tuple] = []
+    for label, env, statement in TARGETS:
+        walls, imports, modules = [], [], []
+        for _ in range(args.runs):
+            wall, rows = run_target(env, statement)
+            walls.append(wall * 1000)
+            imports.append(sum(cumulative for depth, _, cumulative, _ in rows if depth == 0) / 1000)
+            modules.append(len(rows))
+            breakdown = breakdown or rows
+        medians.append(statistics.median(walls))
+        print(f"| {label:<30} | {medians[-1]:>8.0f} | {statistics.median(imports):>10.0f} | "
+              f"{statistics.median(modules):>7.0f} |")
+
+    print(f"\nImport time by top-level package ({TARGETS[0][0]}, one run, self time)")
+    print(f"| {'package':<20} | {'ms':>7} |")
+    print(f"|{'-' * 22}|{'-' * 8}:|")
+    packages = sorted(by_package(breakdown).items(), key=lambda item: item[1], reverse=True)
+    for package, self_us in packages[:args.top]:
+        print(f"| {package:<20} | {self_us / 1000:>7.0f} |")
+
+    if args.max_ms is not None and medians[0] > args.max_ms:
+        print(f"\nFAIL: {TARGETS[0][0]} took {medians[0]:.0f} ms > {args.max_ms} ms")
+        sys.exit(1)
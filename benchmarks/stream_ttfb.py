@@ -0,0 +1,125 @@
+"""
+Time-to-first-useful-byte of the SSE progress stream versus a blocking JSON response.
+
+Serves the real /paper2saas routes with uvicorn, but every pipeline stage is a stub agent
+that sleeps for a fixed latency (scaled with --scale) instead of calling Mistral.
+
+Usage:
+    uv run -m benchmarks.stream_ttfb --scale 0.1 --runs 3
+"""
+import os
+
+os.environ.setdefault("RUN_DEDUP_ENABLED", "false")
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from app.api import router
+from app.events import emit
+from app.teams.paper2saas import arun_paper2saas, paper2saas_pipeline
+
+# Rough per-stage latencies (seconds) of real runs, before scaling
+STAGE_LATENCY = {
+    "paper_analysis": 40, "market_research": 35, "ideation": 30, "fact_check": 20,
+    "validation": 35, "engineering": 30, "strategy": 25, "report": 30,
+}
+
+
+class StubAgent:
+    """Stands in for an agno Agent: sleeps, reports one tool call, returns canned content."""
+
+    def __init__(self, name: str, latency: float):
+        self.name = name
+        self.latency = latency
+
+    async def arun(self, input: str, session_id: str = None, stream: bool = False, **kwargs):
+        emit("tool_call", agent=self.name, tool="stub_tool", arguments={"input": input[:40]})
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(content=f"{self.name} output", status=None, metrics=SimpleNamespace(total_tokens=1000))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _serve(port: int) -> uvicorn.Server:
+    app = FastAPI()
+    app.include_router(router)
+
+    @app.post("/paper2saas/blocking")
+    async def blocking(body: dict):
+        result = await arun_paper2saas(body["arxiv_id"])
+        return {"status": result["status"], "content": result["result"].content, "metrics": result["metrics"]}
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def measure_stream(client: httpx.Client, base: str) -> dict:
+    started = time.perf_counter()
+    timings = {}
+    with client.stream("POST", f"{base}/paper2saas/stream", json={"arxiv_id": "2512.24991v1"}) as response:
+        event = None
+        for line in response.iter_lines():
+            now = time.perf_counter() - started
+            timings.setdefault("first_byte", now)
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+                timings.setdefault(event, now)
+            elif line.startswith("data: ") and event == "final_report":
+                timings["server_time_to_first_output"] = json.loads(line[6:])["stream"]["time_to_first_output"]
+    timings["done"] = time.perf_counter() - started
+    return timings
+
+
+def measure_blocking(client: httpx.Client, base: str) -> float:
+    started = time.perf_counter()
+    client.post(f"{base}/paper2saas/blocking", json={"arxiv_id": "2512.24991v1"}).raise_for_status()
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SSE time-to-first-useful-byte benchmark")
+    parser.add_argument("--scale", type=float, default=0.1, help="Multiplier for stub stage latencies")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    for stage in paper2saas_pipeline.stages.values():
+        stage.agent = StubAgent(stage.name, STAGE_LATENCY[stage.name] * args.scale)
+        stage.cache = None
+
+    port = _free_port()
+    server = _serve(port)
+    base = f"http://127.0.0.1:{port}"
+    streamed, blocking = [], []
+    with httpx.Client(timeout=None) as client:
+        for _ in range(args.runs):
+            streamed.append(measure_stream(client, base))
+            blocking.append(measure_blocking(client, base))
+    server.should_exit = True
+
+    def median(key):
+        return statistics.median(t[key] for t in streamed)
+
+    print(f"stub stage latencies x{args.scale}, {args.runs} runs (median seconds)")
+    print(f"| {'response':<10} | {'first byte':>10} | {'first stage_start':>17} | {'first member_output':>19} | {'full report':>11} |")
+    print(f"|{'-' * 12}|{'-' * 11}:|{'-' * 18}:|{'-' * 20}:|{'-' * 12}:|")
+    block = statistics.median(blocking)
+    print(f"| {'blocking':<10} | {block:>10.3f} | {'-':>17} | {'-':>19} | {block:>11.3f} |")
+    print(f"| {'SSE':<10} | {median('first_byte'):>10.3f} | {median('stage_start'):>17.3f} | "
+          f"{median('member_output'):>19.3f} | {median('final_report'):>11.3f} |")
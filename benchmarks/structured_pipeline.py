@@ -0,0 +1,232 @@
+"""
+Tokens per run: Markdown hand-offs versus the structured pipeline (STRUCTURED_PIPELINE).
+
+Runs both pipelines offline (MockMistralChat + fake tools) with the same facts in each
+schema stage's answer: rendered as Markdown for the Markdown pipeline, as JSON for the
+structured one. Reports per-stage hand-off tokens (the upstream outputs a stage receives),
+model input/output tokens and the run total. `--corrupt STAGE` makes that stage answer
+with invalid JSON to show the cost of a repair pass next to the stage it saves rerunning.
+
+The Markdown side is a lower bound: real answers also carry the scaffolding the prompts
+ask for (source notes, tool logs, mapping tables), which structured answers drop.
+
+Usage:
+    uv run -m benchmarks.structured_pipeline
+    uv run -m benchmarks.structured_pipeline --corrupt ideation
+"""
+import os
+
+os.environ.setdefault("MOCK_MODELS", "true")
+os.environ.setdefault("MOCK_TOOLS", "true")
+os.environ.setdefault("MOCK_MODEL_LATENCY_SECONDS", "0")
+os.environ.setdefault("MOCK_TOOL_LATENCY_SECONDS", "0")
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+os.environ.setdefault("IDEA_INDEX_ENABLED", "false")
+os.environ.setdefault("MARKET_CACHE_ENABLED", "false")
+os.environ.setdefault("RUN_DEDUP_ENABLED", "false")
+
+import argparse
+import asyncio
+import json
+from typing import Any, Dict
+
+from app.retrieval import estimate_tokens
+from app.teams.paper2saas import arun_paper2saas, get_paper2saas_pipeline
+
+ARXIV_ID = "2512.24991v1"
+
+PAPER = {
+    "paper_title": "Gradient-Similarity Data Budgeting for Efficient Fine-Tuning",
+    "arxiv_id": ARXIV_ID,
+    "authors": ["L. Chen", "R. Okafor", "M. Duarte"],
+    "executive_summary": (
+        "The paper predicts how many labeled examples a fine-tuning task needs by measuring gradient "
+        "similarity between a small pilot set and the pre-training distribution, then selects the most "
+        "informative subset. On 14 classification and extraction benchmarks it matches full-data accuracy "
+        "with 18-35% of the labels."
+    ),
+    "core_innovations": [
+        "Gradient-similarity metric that estimates label requirements from a 200-example pilot set",
+        "Greedy submodular selection of training examples under a labeling budget",
+        "Early-stopping rule that halts annotation when marginal gain drops below a threshold",
+    ],
+    "technical_architecture": (
+        "Embed pilot examples, compute per-example gradients on a frozen backbone, cluster by gradient "
+        "direction, then select examples greedily by coverage of under-represented clusters."
+    ),
+    "limitations": ["Evaluated on English text only", "Needs white-box gradient access to the backbone"],
+    "applications": ["Annotation budget planning", "Active learning for document extraction", "Dataset audits"],
+    "key_metrics": "Full-data accuracy within 0.8 points using 18-35% of labels; 4.1x lower annotation cost",
+    "data_sources_used": ["LocalPaperTools.read_local_paper", "LocalPaperTools.search_local_paper"],
+    "tool_failures": [],
+    "confidence_score": 0.86,
+    "unverified_claims": ["Cost savings on non-English corpora"],
+}
+
+MARKET = {
+    "signals": [
+        {"signal": f"ML teams cite labeling spend as a top-3 cost in {topic}", "source": source, "date_retrieved": "2026-10-01"}
+        for topic, source in [
+            ("document AI projects", "news.ycombinator.com/item?id=41234567"),
+            ("healthcare NLP", "example.com/annotation-survey-2026"),
+            ("LLM fine-tuning", "example.com/finetuning-costs"),
+            ("customer-support automation", "example.com/support-ai-report"),
+        ]
+    ],
+    "pain_points": [
+        {"description": description, "affected_segment": segment, "evidence": evidence, "source": source}
+        for description, segment, evidence, source in [
+            ("Teams over-annotate because they cannot predict data needs", "ML platform teams",
+             "Survey: 62% labeled more data than they used", "example.com/annotation-survey-2026"),
+            ("Annotation vendors bill per label with no quality-per-dollar view", "Data ops leads",
+             "HN thread on vendor pricing", "news.ycombinator.com/item?id=41234567"),
+            ("Fine-tuning projects stall waiting for labels", "Applied ML startups",
+             "Median 5-week labeling delay reported", "example.com/finetuning-costs"),
+        ]
+    ],
+    "opportunity_areas": ["Annotation budget forecasting", "Label-efficient fine-tuning services"],
+    "data_gaps": ["No public data on annotation spend outside the US"],
+    "tools_used": ["HackerNewsTools", "FirecrawlTools"],
+    "confidence_level": "MEDIUM",
+}
+
+IDEAS = {
+    "ideas": [
+        {
+            "name": name,
+            "core_concept": concept,
+            "target_market": market,
+            "value_proposition": value,
+            "technical_approach": "Pilot-set gradient similarity plus greedy subset selection from the paper",
+            "competitive_moat": "Label-requirement predictions calibrated on every customer project",
+            "revenue_model": revenue,
+            "implementation_complexity": complexity,
+            "complexity_reason": "Needs gradient access to customer models, hosted or on-prem",
+            "mvp_features": ["Pilot-set upload", "Label budget forecast", "Subset export to labeling tools"],
+            "paper_innovation_link": "Gradient-similarity metric",
+            "market_pain_link": "Teams over-annotate because they cannot predict data needs",
+            "feasibility_score": score,
+        }
+        for name, concept, market, value, revenue, complexity, score in [
+            ("LabelBudget", "Forecast how many labels a fine-tuning task needs before buying them",
+             "ML platform teams", "Cut annotation spend 60% with a forecast before labeling starts",
+             "Per-project subscription", "Medium", 8.4),
+            ("SubsetSelect", "API that picks the most informative examples to label next",
+             "Applied ML startups", "Reach target accuracy with a third of the labels", "Usage-based API", "Low", 7.9),
+            ("VendorLens", "Quality-per-dollar dashboard across annotation vendors",
+             "Data ops leads", "Know which vendor labels actually improve the model", "Seat-based SaaS", "Medium", 6.8),
+            ("AuditSet", "Dataset audit that flags redundant and missing coverage",
+             "Regulated ML teams", "Document dataset sufficiency for audits", "Annual license", "High", 6.1),
+            ("StopLabel", "Labeling-tool plugin that stops annotation at diminishing returns",
+             "Labeling platforms", "Stop paying for labels that no longer help", "Revenue share", "Low", 7.2),
+        ]
+    ],
+    "ranking": ["LabelBudget", "SubsetSelect", "StopLabel", "VendorLens", "AuditSet"],
+    "methodology_notes": "Ideas pair each paper innovation with a verified pain point; weak mappings were dropped.",
+}
+
+ENGINEERING = {
+    "idea_name": "LabelBudget",
+    "github_repos_found": [
+        {"url": "https://github.com/example/grad-select", "stars": 1200, "description": "Gradient-based data selection",
+         "language": "Python", "relevance_score": 8.5, "source": "similar_paper"},
+        {"url": "https://github.com/example/al-toolkit", "stars": 3400, "description": "Active learning toolkit",
+         "language": "Python", "relevance_score": 6.0, "source": "search"},
+    ],
+    "recommended_repo": "https://github.com/example/grad-select",
+    "technical_approach": "Wrap grad-select behind a FastAPI service; customers upload a pilot set and a model handle.",
+    "implementation_components": [
+        {"component_name": name, "description": description, "complexity": complexity, "estimated_hours": hours,
+         "dependencies": dependencies}
+        for name, description, complexity, hours, dependencies in [
+            ("Pilot ingestion", "Upload and validate the pilot set", "Low", 16, ["FastAPI", "S3"]),
+            ("Gradient worker", "Per-example gradients on a frozen backbone", "High", 80, ["PyTorch", "Ray"]),
+            ("Forecast model", "Label requirement estimate with intervals", "Medium", 40, ["numpy", "scikit-learn"]),
+            ("Subset export", "Export selected IDs to Label Studio / Scale", "Low", 12, ["Label Studio API"]),
+        ]
+    ],
+    "architecture_diagram": "Client -> API -> Queue -> Gradient workers (GPU) -> Forecast -> Postgres -> Dashboard",
+    "tech_stack_recommendation": ["FastAPI", "PyTorch", "Ray", "Postgres", "Next.js"],
+    "mvp_timeline": "6 weeks for one engineer with a GPU budget of ~$400/month",
+    "code_snippets": [],
+    "potential_challenges": ["Gradient access to closed models", "GPU cost for large pilot sets"],
+    "github_search_queries_used": ["gradient data selection", "label budget active learning"],
+    "confidence_level": "MEDIUM",
+}
+
+OUTPUTS = {"paper_analysis": PAPER, "market_research": MARKET, "ideation": IDEAS, "engineering": ENGINEERING}
+
+
+def to_markdown(value: Any, level: int = 2) -> str:
+    """Render a stage answer the way the Markdown prompts lay it out: headings, bold labels, bullets."""
+    if isinstance(value, dict):
+        lines = []
+        for key, item in value.items():
+            label = key.replace("_", " ").title()
+            if isinstance(item, (dict, list)) and item:
+                lines.append(f"{'#' * level} {label}\n{to_markdown(item, level + 1)}")
+            else:
+                lines.append(f"- **{label}**: {item if item not in ([], None, '') else 'None'}")
+        return "\n".join(lines)
+    if isinstance(value, list):
+        if value and isinstance(value[0], dict):
+            return "\n\n".join(f"{'#' * level} {i}. {to_markdown(item, level + 1)}" for i, item in enumerate(value, 1))
+        return "\n".join(f"- {item}" for item in value)
+    return str(value)
+
+
+def configure(structured: bool, corrupt: str = None):
+    pipeline = get_paper2saas_pipeline(structured)
+    for stage_name, data in OUTPUTS.items():
+        agent = pipeline.stages[stage_name].agent
+        if structured and stage_name == corrupt:
+            reply = json.dumps({key: value for key, value in data.items() if not isinstance(value, list)})
+        else:
+            reply = json.dumps(data) if structured else to_markdown(data)
+        agent.model.outputs = {**agent.model.outputs, agent.name: reply}
+    return pipeline
+
+
+def measure(structured: bool, corrupt: str = None) -> Dict[str, Any]:
+    pipeline = configure(structured, corrupt)
+    result = asyncio.run(arun_paper2saas(ARXIV_ID, structured=structured))
+    run_output = result["result"]
+    stages = {}
+    for name, stage_result in run_output.stages.items():
+        metrics = getattr(stage_result.run_output, "metrics", None)
+        messages = getattr(stage_result.run_output, "messages", None) or []
+        handoff = next((m.get_content_string() for m in messages if m.role == "user"), "")
+        stages[name] = {
+            "handoff": estimate_tokens(handoff),
+            "input": getattr(metrics, "input_tokens", 0) or 0,
+            "output": getattr(metrics, "output_tokens", 0) or 0,
+            "structured": pipeline.stages[name].output_schema is not None,
+        }
+    return {"stages": stages, "total": run_output.total_tokens, "structured": result["metrics"].get("structured")}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Token cost of Markdown vs structured stage hand-offs")
+    parser.add_argument("--corrupt", choices=sorted(OUTPUTS), help="Make this stage answer with invalid JSON")
+    args = parser.parse_args()
+
+    markdown = measure(structured=False)
+    structured = measure(structured=True, corrupt=args.corrupt)
+
+    print(f"| {'stage':<16} | {'hand-off md':>11} | {'hand-off json':>13} | {'input md':>8} | {'input json':>10} | "
+          f"{'output md':>9} | {'output json':>11} |")
+    print(f"|{'-' * 18}|{'-' * 12}:|{'-' * 14}:|{'-' * 9}:|{'-' * 11}:|{'-' * 10}:|{'-' * 12}:|")
+    for name, md in markdown["stages"].items():
+        js = structured["stages"][name]
+        marker = "*" if js["structured"] else " "
+        print(f"| {name + marker:<16} | {md['handoff']:>11} | {js['handoff']:>13} | {md['input']:>8} | "
+              f"{js['input']:>10} | {md['output']:>9} | {js['output']:>11} |")
+    saved = markdown["total"] - structured["total"]
+    print(f"\n* stage answers with its schema in structured mode")
+    print(f"Run total: {markdown['total']} tokens (Markdown) vs {structured['total']} (structured), "
+          f"{saved:+d} saved ({saved / markdown['total']:.1%})")
+    print(f"Structured stages: {structured['structured']}")
+    if args.corrupt:
+        rerun = markdown["stages"][args.corrupt]["input"] + markdown["stages"][args.corrupt]["output"]
+        print(f"Repairing {args.corrupt} cost {structured['structured']['repair_tokens']} tokens "
+              f"(a rerun of the stage costs ~{rerun})")
@@ -0,0 +1,186 @@
+"""
+Offline evaluation of model tiering (app.tiering) against recorded pipeline runs.
+
+Reads the stage runs agno stored in the shared database (one session per
+"<run session>-<stage>"). For each stage call it replays the router's decision from the
+recorded prompt and the run's paper-analysis confidence, then estimates what routing
+would have saved:
+
+- latency: each routed call's recorded duration, scaled by the large/small time per model
+  request measured on the recorded runs (or `--speedup`), on the pipeline's critical path;
+- tokens: large-model tokens moved to the small model, and their cost at
+  `--large-price` / `--small-price` ($ per 1M tokens);
+- break-even escalation rate: the share of routed calls that could fail and rerun on the
+  large model before routing stops paying for itself.
+
+`--record N` first stores N offline runs (mock model, fake tools, tiering off) with
+`--large-latency` / `--small-latency` seconds per model call and evaluates just those, so
+the evaluation works without API keys. Point it at a database of real runs (`--last N`
+for the most recent ones) to evaluate production traffic.
+
+Usage:
+    uv run -m benchmarks.tiering --record 5
+    uv run -m benchmarks.tiering --last 200 --max-input-tokens 4000 --min-confidence 0.7
+"""
+import os
+
+os.environ.setdefault("MOCK_MODELS", "true")
+os.environ.setdefault("MOCK_TOOLS", "true")
+os.environ.setdefault("MOCK_TOOL_LATENCY_SECONDS", "0")
+os.environ.setdefault("ANALYSIS_CACHE_ENABLED", "false")
+os.environ.setdefault("IDEA_INDEX_ENABLED", "false")
+os.environ.setdefault("MARKET_CACHE_ENABLED", "false")
+os.environ["MODEL_TIERING_ENABLED"] = "false"
+
+import argparse
+import json
+import re
+import statistics
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from agno.db.base import SessionType
+
+from app.pipeline import StageResult
+from app.retrieval import estimate_tokens
+from app.teams.paper2saas import get_paper2saas_pipeline, paper_confidence, paper_tokens, run_paper2saas
+from app.tiering import ModelRouter
+
+ARXIV_ID = re.compile(r"\d{4}\.\d{4,5}(?:v\d+)?")
+
+
+def record(runs: int, large_latency: float, small_latency: float, router: ModelRouter) -> List[str]:
+    pipeline = get_paper2saas_pipeline()
+    for stage in pipeline.stages.values():
+        stage.agent.model.latency_seconds = small_latency if router.is_small(stage.agent) else large_latency
+    return [run_paper2saas(f"2512.{24991 + i}v1", session_id=str(uuid.uuid4()))["session_id"] for i in range(runs)]
+
+
+def _content(run: Any) -> str:
+    content = run.content
+    return content if isinstance(content, str) else json.dumps(content, default=str)
+
+
+def load_runs(stage_names: set, sessions: Optional[List[str]] = None,
+              last: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """Recorded stage runs grouped by pipeline run: {run session: {stage: agno RunOutput}}."""
+    from app.utils import shared_db
+
+    runs: Dict[str, Dict[str, Any]] = defaultdict(dict)
+    created: Dict[str, int] = {}
+    for session in shared_db.get_sessions(session_type=SessionType.AGENT) or []:
+        run_session, _, stage = session.session_id.rpartition("-")
+        completed = [run for run in session.runs or [] if run.metrics is not None and run.content is not None]
+        if stage in stage_names and completed and (sessions is None or run_session in sessions):
+            runs[run_session][stage] = completed[-1]
+            created[run_session] = max(created.get(run_session, 0), session.created_at or 0)
+    complete = sorted((s for s, stages in runs.items() if "paper_analysis" in stages), key=created.get)
+    return {session: runs[session] for session in complete[-last if last else None:]}
+
+
+def _tokens(run: Any) -> int:
+    return run.metrics.total_tokens or 0
+
+
+def seconds_per_request(runs: Dict[str, Dict[str, Any]]) -> Dict[str, float]:
+    """Median wall time per model request, per model (a stage with tool rounds makes several)."""
+    samples: Dict[str, List[float]] = defaultdict(list)
+    for stages in runs.values():
+        for run in stages.values():
+            requests = sum(message.role == "assistant" for message in run.messages or []) or 1
+            samples[run.model].append((run.metrics.duration or 0.0) / requests)
+    return {model: statistics.median(values) for model, values in samples.items()}
+
+
+def critical_path(durations: Dict[str, float]) -> float:
+    pipeline = get_paper2saas_pipeline()
+    finished: Dict[str, float] = {}
+    for name in pipeline.order:
+        start = max((finished.get(dep, 0.0) for dep in pipeline.stages[name].depends_on), default=0.0)
+        finished[name] = start + durations.get(name, 0.0)
+    return max(finished.values(), default=0.0)
+
+
+def evaluate(runs: Dict[str, Dict[str, Any]], router: ModelRouter, speedup: Optional[float]) -> Dict[str, Any]:
+    small_id = router.small_model.split(":")[-1]
+    rates = seconds_per_request(runs)
+    large_rates = [rate for model, rate in rates.items() if not model.endswith(small_id)]
+    small_rates = [rate for model, rate in rates.items() if model.endswith(small_id)]
+    if speedup is None:
+        speedup = statistics.mean(large_rates) / statistics.mean(small_rates) if large_rates and small_rates else 1.0
+
+    per_stage: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    baseline_latency, tiered_latency, large_tokens, routed_tokens = [], [], 0, 0
+    for stages in runs.values():
+        analysis = stages["paper_analysis"]
+        confidence = paper_confidence(StageResult("paper_analysis", "success", content=_content(analysis)))
+        confidence = 0.0 if confidence is None else confidence
+        durations = {name: run.metrics.duration or 0.0 for name, run in stages.items()}
+        baseline_latency.append(critical_path(durations))
+        for name, run in stages.items():
+            if name not in router.stages or run.model.endswith(small_id):
+                continue
+            prompt_tokens = estimate_tokens(run.input.input_content_string() if run.input else "")
+            if name == "paper_analysis":
+                match = ARXIV_ID.search(run.input.input_content_string() if run.input else "")
+                extra = paper_tokens(match.group(0)) if match else None
+                tier, _ = router.decide(None if extra is None else prompt_tokens + extra, None)
+            else:
+                tier, _ = router.decide(prompt_tokens, confidence)
+            large_tokens += _tokens(run)
+            per_stage[name]["calls"] += 1
+            if tier == "small":
+                durations[name] /= speedup
+                routed_tokens += _tokens(run)
+                per_stage[name]["routed"] += 1
+                per_stage[name]["tokens"] += _tokens(run)
+        tiered_latency.append(critical_path(durations))
+    return {
+        "runs": len(runs),
+        "speedup": speedup,
+        "per_stage": per_stage,
+        "baseline_latency": sum(baseline_latency) / max(1, len(runs)),
+        "tiered_latency": sum(tiered_latency) / max(1, len(runs)),
+        "large_tokens": large_tokens,
+        "routed_tokens": routed_tokens,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline evaluation of adaptive model tiering on recorded runs")
+    parser.add_argument("--record", type=int, default=0, help="First record this many offline (mock) runs")
+    parser.add_argument("--last", type=int, help="Evaluate only the most recent N recorded runs")
+    parser.add_argument("--large-latency", type=float, default=0.6, help="Mock latency per large-model call")
+    parser.add_argument("--small-latency", type=float, default=0.2, help="Mock latency per small-model call")
+    parser.add_argument("--max-input-tokens", type=int)
+    parser.add_argument("--min-confidence", type=float)
+    parser.add_argument("--speedup", type=float, help="Small-model speedup (measured on the recorded runs by default)")
+    parser.add_argument("--large-price", type=float, default=2.0, help="$ per 1M large-model tokens")
+    parser.add_argument("--small-price", type=float, default=0.2, help="$ per 1M small-model tokens")
+    args = parser.parse_args()
+
+    router = ModelRouter(max_input_tokens=args.max_input_tokens, min_confidence=args.min_confidence)
+    sessions = record(args.record, args.large_latency, args.small_latency, router) if args.record else None
+    runs = load_runs(set(get_paper2saas_pipeline().stages), sessions, args.last)
+    if not runs:
+        raise SystemExit("No recorded pipeline runs in the shared database; use --record N")
+    report = evaluate(runs, router, args.speedup)
+
+    print(f"{report['runs']} recorded runs; router: stages {sorted(router.stages)}, "
+          f"input <= {router.max_input_tokens} tokens, confidence >= {router.min_confidence:g}")
+    print(f"| {'stage':<16} | {'large calls':>11} | {'routed':>6} | {'routed tokens':>13} |")
+    print(f"|{'-' * 18}|{'-' * 12}:|{'-' * 7}:|{'-' * 14}:|")
+    for name, row in report["per_stage"].items():
+        print(f"| {name:<16} | {row['calls']:>11.0f} | {row['routed']:>6.0f} | {row['tokens']:>13.0f} |")
+
+    saved_cost = report["routed_tokens"] * (args.large_price - args.small_price) / 1e6
+    baseline_cost = report["large_tokens"] * args.large_price / 1e6
+    # An escalated call pays the small attempt on top of the large rerun
+    break_even = (args.large_price - args.small_price) / args.large_price if report["routed_tokens"] else 0.0
+    print(f"\nSmall model {report['speedup']:.1f}x faster per request" + ("" if args.speedup else " (recorded runs)"))
+    print(f"Critical path per run: {report['baseline_latency']:.2f}s -> {report['tiered_latency']:.2f}s "
+          f"({1 - report['tiered_latency'] / report['baseline_latency']:.0%} faster)")
+    print(f"Large-model tokens in routable stages: {report['large_tokens']} -> {report['large_tokens'] - report['routed_tokens']} "
+          f"(${baseline_cost:.4f} -> ${baseline_cost - saved_cost:.4f} over all runs)")
+    print(f"Break-even escalation rate: {break_even:.0%} of routed calls")